@@ -1,11 +1,53 @@
 """
 New Project package
+
+Public interfaces are exposed at package level but their modules are only imported
+on first attribute access (PEP 562), so importing the package is cheap and free of
+side effects. Settings are loaded on first access as well (see :py:mod:`newproject.settings`).
 """
 
+import importlib
 import warnings
 
-from newproject.interfaces import *
-
 warnings.simplefilter("ignore")
 
 __version__ = "0.1.0"
+
+# Lazy attributes (name: module):
+_lazy = {
+    "GenericInterface": "newproject.interfaces.generic",
+    "DeclarativeInterface": "newproject.interfaces.declarative",
+    "DeclarativeMeta": "newproject.interfaces.declarative",
+    "SimpleCase": "newproject.interfaces.examples",
+    "SimpleCaseWithSerializer": "newproject.interfaces.examples",
+    "SimpleDeclarativeCase": "newproject.interfaces.examples",
+    "TemporalCase": "newproject.interfaces.examples",
+    "ValidatedCase": "newproject.interfaces.examples",
+    "InterfaceCollection": "newproject.interfaces.collection",
+    "CachedInterface": "newproject.interfaces.cache",
+    "load_iter": "newproject.interfaces.stream",
+    "async_dump": "newproject.interfaces.aio",
+    "async_load": "newproject.interfaces.aio",
+}
+
+# Lazy subpackages:
+_subpackages = ("interfaces",)
+
+
+def __getattr__(name):
+    """
+    Imports lazy attributes and subpackages on first access and caches them in the
+    package namespace.
+    """
+    if name in _subpackages:
+        return importlib.import_module("{}.{}".format(__name__, name))
+    module = _lazy.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy) | set(_subpackages))
@@ -0,0 +1,8 @@
+"""
+Package entrypoint (``python -m newproject``), see :py:mod:`newproject._new`
+"""
+
+from newproject._new import main
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,32 @@ import sys
 import newproject
 from newproject.settings import settings
 
+#: Sub commands (name: module exposing a main function returning the exit status)
+commands = {
+    "convert": "newproject.convert",
+}
 
-def main():
+
+def main(arguments=None):
     """
-    Module entrypoint
+    Module entrypoint, dispatches sub commands (``newproject convert ...``)
     """
-    settings.logger.info("New package {}".format(newproject.__version__))
-    sys.exit(0)
+    import argparse
+    import importlib
+
+    cli_parser = argparse.ArgumentParser(prog="newproject", description="New package")
+    cli_parser.add_argument(
+        "command", nargs="?", choices=sorted(commands), help="Sub command"
+    )
+    cli_parser.add_argument(
+        "arguments", nargs=argparse.REMAINDER, help="Sub command arguments"
+    )
+    cli_parameters = cli_parser.parse_args(arguments)
+    if cli_parameters.command is None:
+        settings.logger.info("New package {}".format(newproject.__version__))
+        sys.exit(0)
+    module = importlib.import_module(commands[cli_parameters.command])
+    sys.exit(module.main(cli_parameters.arguments))
 
 
 if __name__ == "__main__":
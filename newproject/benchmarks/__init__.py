@@ -0,0 +1,264 @@
+"""
+Package :py:mod:`newproject.benchmarks` holds the package benchmark suite.
+
+Benchmarks are registered with the :func:`benchmark` decorator on a generator function
+which prepares the measured callable, yields it, and cleans up once measured:
+
+.. code-block:: python
+
+    @benchmark("to_json", number=10000)
+    def to_json():
+        instance = SimpleCase(value="Hello World!")
+        yield instance.to_json
+
+Each benchmark is timed :attr:`repeat` times over :attr:`Benchmark.number` calls and
+its median duration per item is reported. Results are written as JSON and compared
+against a baseline result file: a benchmark regresses when its median duration exceeds
+the baseline one by more than its threshold (relative).
+Suite is run from the command line (see :func:`main`), eg. by the nox ``benchmarks`` session:
+
+.. code-block:: bash
+
+    python -m newproject.benchmarks --output .cache/reports/benchmarks.json \\
+        --baseline .cache/reports/benchmarks-baseline.json --threshold 0.25
+
+"""
+
+import collections
+import contextlib
+import datetime
+import fnmatch
+import importlib
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import timeit
+from typing import Callable, Dict, Iterable, List, Optional
+
+import newproject
+
+#: Benchmark definition
+Benchmark = collections.namedtuple(
+    "Benchmark", ["name", "setup", "number", "items", "threshold"]
+)
+
+#: Modules defining benchmarks
+modules = [
+    "newproject.benchmarks.serialization",
+    "newproject.benchmarks.imports",
+    "newproject.benchmarks.service",
+    "newproject.benchmarks.store",
+    "newproject.benchmarks.repository",
+]
+
+_registry: Dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str, number: int = 1000, items: int = 1, threshold: Optional[float] = None
+) -> Callable:
+    """
+    Registers a benchmark setup generator. The yielded callable is timed over number
+    calls, each call processing items items. Threshold overrides the suite
+    regression threshold for noisy benchmarks.
+    """
+
+    def decorator(setup: Callable) -> Callable:
+        _registry[name] = Benchmark(
+            name, contextlib.contextmanager(setup), number, items, threshold
+        )
+        return setup
+
+    return decorator
+
+
+def registry() -> Dict[str, Benchmark]:
+    """
+    Returns registered benchmarks (benchmark modules are imported on first call).
+    """
+    for module in modules:
+        importlib.import_module(module)
+    return dict(_registry)
+
+
+def select(patterns: Iterable[str] = ("*",)) -> List[Benchmark]:
+    """
+    Returns benchmarks whose name matches any of the shell-style patterns.
+    """
+    patterns = list(patterns)
+    return [
+        item
+        for name, item in registry().items()
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+    ]
+
+
+def measure(item: Benchmark, repeat: int = 5, scale: float = 1.0) -> dict:
+    """
+    Times a benchmark and returns its durations per item (seconds).
+    Number of calls is scaled by scale (at least one call).
+    """
+    number = max(1, int(item.number * scale))
+    with item.setup() as target:
+        target()
+        timings = timeit.Timer(target).repeat(repeat=repeat, number=number)
+    durations = [timing / (number * item.items) for timing in timings]
+    return {
+        "median": statistics.median(durations),
+        "min": min(durations),
+        "max": max(durations),
+        "repeat": repeat,
+        "number": number,
+        "items": item.items,
+        "threshold": item.threshold,
+    }
+
+
+def run(patterns: Iterable[str] = ("*",), repeat: int = 5, scale: float = 1.0) -> dict:
+    """
+    Runs selected benchmarks and returns results with run metadata.
+    """
+    return {
+        "metadata": {
+            "version": newproject.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        "benchmarks": {
+            item.name: measure(item, repeat=repeat, scale=scale)
+            for item in select(patterns)
+        },
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.25) -> List[dict]:
+    """
+    Compares results with baseline results, benchmark by benchmark.
+    Returns the comparison of benchmarks present in both, flagged as regressions when the
+    median ratio exceeds ``1 + threshold`` (benchmark threshold when it defines one).
+    """
+    comparison = []
+    for name, result in results["benchmarks"].items():
+        reference = baseline.get("benchmarks", {}).get(name)
+        if reference is None:
+            continue
+        limit = result.get("threshold")
+        limit = threshold if limit is None else limit
+        ratio = result["median"] / reference["median"]
+        comparison.append(
+            {
+                "name": name,
+                "baseline": reference["median"],
+                "median": result["median"],
+                "ratio": ratio,
+                "threshold": limit,
+                "regression": ratio > 1.0 + limit,
+            }
+        )
+    return comparison
+
+
+def report(results: dict, comparison: List[dict]) -> str:
+    """
+    Returns results as a text table.
+    """
+    compared = {row["name"]: row for row in comparison}
+    lines = [
+        "{:<28} {:>12} {:>12} {:>8}  {}".format(
+            "benchmark", "median (us)", "ops/s", "ratio", "status"
+        )
+    ]
+    for name, result in results["benchmarks"].items():
+        row = compared.get(name)
+        ratio, status = "", "new"
+        if row is not None:
+            ratio = "{:.2f}".format(row["ratio"])
+            status = "REGRESSION" if row["regression"] else "ok"
+        lines.append(
+            "{:<28} {:>12.3f} {:>12.0f} {:>8}  {}".format(
+                name, result["median"] * 1e6, 1.0 / result["median"], ratio, status
+            )
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Benchmarks entrypoint, returns 1 when a benchmark regressed and 0 otherwise.
+    When the baseline file is missing (or ``--update-baseline`` is given), results
+    are stored as the new baseline.
+    """
+
+    import argparse
+
+    # CLI Arguments:
+    cli_parser = argparse.ArgumentParser(
+        description="Benchmarks Command Line",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    cli_parser.add_argument(
+        "--filter",
+        type=str,
+        action="append",
+        default=None,
+        help="Shell-style pattern of benchmarks to run (repeatable, default all)",
+    )
+    cli_parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of timing rounds"
+    )
+    cli_parser.add_argument(
+        "--scale", type=float, default=1.0, help="Scale factor of calls per round"
+    )
+    cli_parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        default=pathlib.Path(".cache/reports/benchmarks.json"),
+        help="Results file",
+    )
+    cli_parser.add_argument(
+        "--baseline",
+        type=pathlib.Path,
+        default=pathlib.Path(".cache/reports/benchmarks-baseline.json"),
+        help="Baseline results file",
+    )
+    cli_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown flagged as a regression",
+    )
+    cli_parser.add_argument(
+        "--update-baseline", action="store_true", help="Store results as baseline"
+    )
+    cli_parser.add_argument("--list", action="store_true", help="List benchmarks")
+    cli_parameters = cli_parser.parse_args(argv)
+
+    patterns = cli_parameters.filter or ["*"]
+    if cli_parameters.list:
+        print("\n".join(item.name for item in select(patterns)))
+        return 0
+
+    results = run(patterns, repeat=cli_parameters.repeat, scale=cli_parameters.scale)
+    baseline_path = cli_parameters.baseline
+    comparison = []
+    if baseline_path.exists() and not cli_parameters.update_baseline:
+        baseline = json.loads(baseline_path.read_text())
+        comparison = compare(results, baseline, threshold=cli_parameters.threshold)
+    results["comparison"] = comparison
+
+    cli_parameters.output.parent.mkdir(parents=True, exist_ok=True)
+    cli_parameters.output.write_text(json.dumps(results, indent=2))
+    if cli_parameters.update_baseline or not baseline_path.exists():
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2))
+
+    print(report(results, comparison))
+    regressions = [row["name"] for row in comparison if row["regression"]]
+    if regressions:
+        print("Regressions: {}".format(", ".join(regressions)), file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,10 @@
+"""
+Benchmarks entrypoint (see :func:`newproject.benchmarks.main`)
+"""
+
+import sys
+
+from newproject.benchmarks import main
+
+if __name__ == "__main__":
+    sys.exit(main())
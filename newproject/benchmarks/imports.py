@@ -0,0 +1,45 @@
+"""
+Module :py:mod:`newproject.benchmarks.imports` benchmarks package and settings import
+in fresh interpreters (timings include the interpreter startup).
+"""
+
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+from newproject.benchmarks import benchmark
+
+_root = str(pathlib.Path(__file__).parents[2])
+
+
+def _interpreter(code: str):
+    """
+    Yields a callable running code in a fresh interpreter with a temporary home directory.
+    """
+    with tempfile.TemporaryDirectory() as home:
+        environment = dict(
+            os.environ,
+            HOME=home,
+            PYTHONPATH=os.pathsep.join(
+                filter(None, [_root, os.environ.get("PYTHONPATH")])
+            ),
+        )
+        command = [sys.executable, "-c", code]
+        yield lambda: subprocess.run(command, env=environment, check=True)
+
+
+@benchmark("import.interpreter", number=5, threshold=0.5)
+def import_interpreter():
+    yield from _interpreter("pass")
+
+
+@benchmark("import.package", number=5, threshold=0.5)
+def import_package():
+    yield from _interpreter("import newproject")
+
+
+@benchmark("import.settings", number=5, threshold=0.5)
+def import_settings():
+    yield from _interpreter("from newproject.settings import settings")
@@ -0,0 +1,45 @@
+"""
+Module :py:mod:`newproject.benchmarks.repository` benchmarks the SQLite repository
+(one insert per object, batch inserts and iteration) on an in-memory database.
+"""
+
+from newproject.benchmarks import benchmark
+
+#: Number of objects inserted or read per benchmark call
+SIZE = 5000
+
+
+def _repository():
+    """
+    Yields an in-memory repository and SIZE objects.
+    """
+    from newproject.interfaces.examples import SimpleCase
+    from newproject.repository import Repository
+
+    instances = [SimpleCase(value={"index": i}) for i in range(SIZE)]
+    with Repository(SimpleCase, "sqlite://") as repository:
+        yield repository, instances
+
+
+@benchmark("repository.add", number=5, items=SIZE)
+def repository_add():
+    for repository, instances in _repository():
+
+        def add():
+            for instance in instances:
+                repository.add(instance)
+
+        yield add
+
+
+@benchmark("repository.add_many", number=5, items=SIZE)
+def repository_add_many():
+    for repository, instances in _repository():
+        yield lambda: repository.add_many(instances, batch_size=1000)
+
+
+@benchmark("repository.iterate", number=5, items=SIZE)
+def repository_iterate():
+    for repository, instances in _repository():
+        repository.add_many(instances)
+        yield lambda: sum(1 for _ in repository.iterate())
@@ -0,0 +1,185 @@
+"""
+Module :py:mod:`newproject.benchmarks.serialization` benchmarks single and bulk
+serialization of interfaces, streamed loading, JSON patches against full serialization
+and object construction round-trips.
+"""
+
+import datetime
+import json
+
+from newproject.benchmarks import benchmark
+from newproject.interfaces.examples import (
+    SimpleCase,
+    SimpleCaseWithSerializer,
+    SimpleDeclarativeCase,
+    TemporalCase,
+    ValidatedCase,
+)
+
+#: Configuration value of benchmarked objects
+VALUE = {"index": 1234, "label": "item-1234", "ratio": 176.28, "tags": ["a", "b"]}
+
+#: Number of objects of bulk benchmarks
+BULK = 1000
+
+
+@benchmark("to_dict", number=100000)
+def to_dict():
+    yield SimpleCase(value=VALUE).to_dict
+
+
+@benchmark("to_dict.declarative", number=100000)
+def to_dict_declarative():
+    yield SimpleDeclarativeCase(value=VALUE).to_dict
+
+
+@benchmark("to_json", number=20000)
+def to_json():
+    yield SimpleCase(value=VALUE).to_json
+
+
+@benchmark("to_bytes", number=20000)
+def to_bytes():
+    yield SimpleCase(value=VALUE).to_bytes
+
+
+@benchmark("serializer", number=100000)
+def serializer():
+    value = datetime.datetime(2020, 1, 1)
+    yield lambda: SimpleCaseWithSerializer.serializer(value)
+
+
+@benchmark("serializer.registry", number=100000)
+def serializer_registry():
+    value = datetime.date(2020, 1, 1)
+    yield lambda: SimpleCase.serializer(value)
+
+
+@benchmark("config_hash", number=20000)
+def config_hash():
+    yield SimpleCase(value=VALUE).config_hash
+
+
+@benchmark("intern", number=20000)
+def intern():
+    instance = SimpleCase(value=VALUE)
+    shared = instance.intern()
+    yield lambda: shared is instance.intern()
+
+
+@benchmark("to_json_many", number=20, items=BULK)
+def to_json_many():
+    instances = [SimpleCase(value=VALUE) for _ in range(BULK)]
+    yield lambda: "".join(SimpleCase.to_json_many(instances))
+
+
+@benchmark("to_ndjson_many", number=20, items=BULK)
+def to_ndjson_many():
+    instances = [SimpleCase(value=VALUE) for _ in range(BULK)]
+    yield lambda: "".join(SimpleCase.to_ndjson_many(instances))
+
+
+@benchmark("to_json.loop", number=20, items=BULK)
+def to_json_loop():
+    instances = [SimpleCase(value=VALUE) for _ in range(BULK)]
+    yield lambda: "".join([instance.to_json() + "\n" for instance in instances])
+
+
+@benchmark("load_iter", number=20, items=BULK)
+def load_iter():
+    from newproject.interfaces import stream
+
+    data = "".join(
+        SimpleCase.to_json_many(SimpleCase(value=VALUE) for _ in range(BULK))
+    ).encode()
+    yield lambda: list(stream.load_iter([data], SimpleCase))
+
+
+@benchmark("load_iter.json_loads", number=20, items=BULK)
+def load_iter_json_loads():
+    data = "".join(
+        SimpleCase.to_json_many(SimpleCase(value=VALUE) for _ in range(BULK))
+    ).encode()
+    yield lambda: [SimpleCase(**item) for item in json.loads(data)]
+
+
+def _patched():
+    """
+    Returns an object of 500 nested entries with one label changed since its snapshot.
+    """
+    value = {
+        "key%d" % index: {"values": list(range(20)), "label": "x" * 20}
+        for index in range(500)
+    }
+    instance = SimpleCase(value=value)
+    instance.snapshot()
+    value["key10"]["label"] = "changed"
+    return instance
+
+
+@benchmark("to_json.large", number=20)
+def to_json_large():
+    yield _patched().to_json
+
+
+@benchmark("to_json_patch", number=20)
+def to_json_patch():
+    instance = _patched()
+    yield lambda: instance.to_json_patch(update=False)
+
+
+@benchmark("roundtrip.dict", number=50000)
+def roundtrip_dict():
+    instance = SimpleCase(value=VALUE)
+    yield lambda: SimpleCase(**instance.to_dict())
+
+
+@benchmark("roundtrip.json", number=20000)
+def roundtrip_json():
+    instance = SimpleCase(value=VALUE)
+    yield lambda: SimpleCase(**json.loads(instance.to_json()))
+
+
+@benchmark("roundtrip.bytes", number=20000)
+def roundtrip_bytes():
+    instance = SimpleCase(value=VALUE)
+    yield lambda: SimpleCase.from_bytes(instance.to_bytes())
+
+
+@benchmark("roundtrip.from_json.temporal", number=20000)
+def roundtrip_from_json_temporal():
+    text = TemporalCase(
+        start=datetime.datetime(2021, 1, 1), end=datetime.date(2021, 1, 2)
+    ).to_json()
+    yield lambda: TemporalCase.from_json(text)
+
+
+@benchmark("roundtrip.from_json.temporal.manual", number=20000)
+def roundtrip_from_json_temporal_manual():
+    text = TemporalCase(
+        start=datetime.datetime(2021, 1, 1), end=datetime.date(2021, 1, 2)
+    ).to_json()
+
+    def decode():
+        configuration = json.loads(text)
+        return TemporalCase(
+            start=datetime.datetime.fromisoformat(configuration["start"]),
+            end=datetime.date.fromisoformat(configuration["end"]),
+        )
+
+    yield decode
+
+
+@benchmark("construct.validated", number=100000)
+def construct_validated():
+    start = datetime.datetime(2021, 1, 1)
+    yield lambda: ValidatedCase(name="case", count=2, ratio=0.5, start=start)
+
+
+@benchmark("validate_many", number=100)
+def validate_many():
+    configurations = [
+        {"name": "case-%d" % index, "count": index, "start": "2021-01-01T00:00:00"}
+        for index in range(BULK)
+    ]
+    yield lambda: ValidatedCase.validate_many(configurations)
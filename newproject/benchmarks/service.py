@@ -0,0 +1,53 @@
+"""
+Module :py:mod:`newproject.benchmarks.service` benchmarks service request latency
+over a local TCP connection (sequential and pipelined requests).
+"""
+
+import asyncio
+
+from newproject.benchmarks import benchmark
+
+#: Number of requests per benchmark call
+REQUESTS = 100
+
+_payload = {"value": {"index": 1234, "label": "item-1234"}}
+
+
+def _client(requests):
+    """
+    Starts a service in a private event loop and yields a callable running
+    the coroutine function requests(client) on it.
+    """
+    from newproject.interfaces.examples import SimpleCase
+    from newproject.service import Client, Service
+
+    loop = asyncio.new_event_loop()
+    service = Service(SimpleCase, port=0)
+    try:
+        loop.run_until_complete(service.start())
+        port = service.addresses[0][1]
+        client = loop.run_until_complete(Client.connect(port=port))
+        yield lambda: loop.run_until_complete(requests(client))
+        loop.run_until_complete(client.close())
+    finally:
+        loop.run_until_complete(service.close(grace=0.1))
+        loop.close()
+
+
+async def _sequential(client):
+    for _ in range(REQUESTS):
+        await client.request(_payload)
+
+
+async def _pipelined(client):
+    await client.pipeline([_payload] * REQUESTS)
+
+
+@benchmark("service.request", number=20, items=REQUESTS, threshold=0.5)
+def service_request():
+    yield from _client(_sequential)
+
+
+@benchmark("service.pipeline", number=20, items=REQUESTS, threshold=0.5)
+def service_pipeline():
+    yield from _client(_pipelined)
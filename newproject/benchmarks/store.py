@@ -0,0 +1,81 @@
+"""
+Module :py:mod:`newproject.benchmarks.store` benchmarks the append-only store
+(reopening, random reads and sequential scans) against loading a JSON file.
+"""
+
+import json
+import pathlib
+import tempfile
+
+from newproject.benchmarks import benchmark
+
+#: Number of stored objects
+SIZE = 10000
+
+#: Number of random reads per benchmark call
+GETS = 100
+
+
+def _store():
+    """
+    Yields the path of a store holding SIZE objects and the path of their JSON file.
+    """
+    from newproject.interfaces.examples import SimpleCase
+    from newproject.store import Store
+
+    instances = [
+        SimpleCase(value={"index": i, "label": "item-%d" % i, "ratio": i / 7})
+        for i in range(SIZE)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory)
+        with (path / "cases.json").open("w") as handler:
+            SimpleCase.dump_json(instances, handler)
+        with Store(path / "store", SimpleCase) as store:
+            store.put_many(("key-%d" % i, item) for i, item in enumerate(instances))
+        yield path / "store", path / "cases.json"
+
+
+@benchmark("store.open", number=20)
+def store_open():
+    from newproject.interfaces.examples import SimpleCase
+    from newproject.store import Store
+
+    for path, _ in _store():
+        yield lambda: Store(path, SimpleCase).close()
+
+
+@benchmark("store.get", number=20, items=GETS)
+def store_get():
+    from newproject.interfaces.examples import SimpleCase
+    from newproject.store import Store
+
+    keys = ["key-%d" % i for i in range(0, SIZE, SIZE // GETS)]
+    for path, _ in _store():
+        with Store(path, SimpleCase) as store:
+            yield lambda: [store[key] for key in keys]
+
+
+@benchmark("store.scan", number=10, items=SIZE)
+def store_scan():
+    from newproject.interfaces.examples import SimpleCase
+    from newproject.store import Store
+
+    for path, _ in _store():
+        with Store(path, SimpleCase) as store:
+            yield lambda: list(store.scan())
+
+
+@benchmark("store.json_load", number=10, items=SIZE)
+def store_json_load():
+    from newproject.interfaces.examples import SimpleCase
+
+    for _, path in _store():
+
+        def load():
+            with path.open() as handler:
+                return [
+                    SimpleCase(**configuration) for configuration in json.load(handler)
+                ]
+
+        yield load
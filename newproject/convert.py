@@ -0,0 +1,737 @@
+"""
+Module :py:mod:`newproject.convert` converts large files of interface configurations
+between formats, on several processes and with resumable progress.
+
+Supported formats are JSON arrays (``json``), newline delimited JSON (``ndjson``),
+concatenated frames of the package binary format (``binary``, see
+:py:mod:`newproject.interfaces.binary`), CSV (``csv``) and Parquet (``parquet``, requires
+``pyarrow``). Formats are detected from file extensions unless given. Tabular formats
+hold one column per :meth:`__init__` parameter, values which are not JSON scalars
+(eg. lists) are stored as JSON text and strings which would read as JSON are quoted,
+so JSON native configurations survive a round-trip.
+
+Input is read by batches of :attr:`GenericInterface.chunksize` records by the calling
+process, which only splits records (NDJSON lines are not even parsed). Each batch is
+shipped to a worker which builds objects with :meth:`GenericInterface.from_dict`
+(so typed fields are decoded and validated interfaces checked) and encodes them into
+the output format. Batches are submitted through
+:func:`newproject.interfaces.parallel.ordered_map`: at most ``window`` batches are in
+flight and results are written in input order, so memory stays bounded whatever the
+input size. Small inputs are converted in process.
+
+The conversion state (input offset, records written and output size) is saved into a
+checkpoint file at most every ``interval`` seconds, after the output is flushed to disk.
+Offsets are byte offsets for JSON, NDJSON and binary inputs and row numbers for tabular
+inputs. An interrupted conversion started again with ``resume=True`` truncates the
+output to its checkpointed size and goes on from the checkpointed input offset,
+the checkpoint is removed once the conversion completes:
+
+.. code-block:: python
+
+    convert("export.ndjson", "export.bin", SimpleCase, workers=8, resume=True)
+
+Module is exposed by the package command line:
+
+.. code-block:: bash
+
+    newproject convert export.ndjson export.csv \\
+        --interface newproject.interfaces.examples.SimpleCase --workers 8 --resume
+
+"""
+
+import collections
+import functools
+import inspect
+import itertools
+import json
+import os
+import pathlib
+import struct
+import sys
+import time
+from typing import IO, Any, Callable, Iterator, List, Optional, Tuple, Type
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import arrays, binary, generic, parallel, stream
+
+#: Supported formats
+formats = ("json", "ndjson", "binary", "csv", "parquet")
+
+#: Formats detected from file extensions
+extensions = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".bin": "binary",
+    ".msgpack": "binary",
+    ".csv": "csv",
+    ".parquet": "parquet",
+}
+
+#: Records read from the input: kind of items (``"json"`` documents, ``"dict"``
+#: configurations or ``"table"`` rows), items, input offset following them and
+#: malformed records errors
+Batch = collections.namedtuple("Batch", ["kind", "items", "offset", "errors"])
+
+#: Conversion state reported to progress callbacks: records written, records rejected,
+#: input offset, input size (None when unknown) and elapsed seconds
+Progress = collections.namedtuple(
+    "Progress", ["records", "errors", "offset", "total", "seconds"]
+)
+
+
+def detect(path: Any, format: Optional[str] = None) -> str:
+    """
+    Returns the given format or the format detected from the path extension.
+    """
+    if format is None:
+        format = extensions.get(pathlib.Path(path).suffix.lower())
+        if format is None:
+            raise InvalidParameter(
+                "Cannot detect format of {!r}, use one of {}".format(str(path), formats)
+            )
+    if format not in formats:
+        raise InvalidParameter(
+            "Format must be one of {}, received {!r}".format(formats, format)
+        )
+    return format
+
+
+def _parquet() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise InvalidParameter("Parquet format requires pyarrow") from error
+    return pyarrow
+
+
+def columns(factory: Type[generic.GenericInterface]) -> List[str]:
+    """
+    Returns the columns of tabular formats: the named parameters of :meth:`__init__`.
+    """
+    init: Callable = getattr(factory.__init__, "__wrapped__", factory.__init__)
+    parameters = list(inspect.signature(init).parameters.values())[1:]
+    return [
+        parameter.name
+        for parameter in parameters
+        if parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY)
+    ]
+
+
+def _cell(value: Any, text: bool = False) -> Any:
+    """
+    Returns the tabular cell of a JSON native value: scalars are kept unless text is true,
+    other values are JSON encoded and strings which would read as JSON are quoted.
+    """
+    if value is None:
+        return "" if text else None
+    if isinstance(value, str):
+        if not value:
+            return '""'
+        if value[0] in _JSON_START:
+            try:
+                json.loads(value)
+            except ValueError:
+                return value
+            return json.dumps(value, ensure_ascii=False)
+        return value
+    if not text and isinstance(value, (bool, int, float)):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _value(cell: Any) -> Any:
+    """
+    Returns the JSON native value of a tabular cell (see :func:`_cell`).
+    """
+    if not isinstance(cell, str):
+        return cell
+    if not cell:
+        return None
+    try:
+        return json.loads(cell)
+    except ValueError:
+        return cell
+
+
+#: First characters of JSON texts
+_JSON_START = frozenset('-0123456789"tfn[{ \t\r\n')
+
+
+# Readers:
+
+
+def _read_ndjson(path: Any, offset: int, size: int) -> Iterator[Batch]:
+    """
+    Yields batches of NDJSON lines (parsed by workers) from offset.
+    """
+    with open(path, "rb") as handler:
+        handler.seek(offset)
+        lines: List[bytes] = []
+        tail = b""
+        position = offset
+        for chunk in stream.chunks(handler):
+            data = tail + chunk
+            start = 0
+            while True:
+                end = data.find(b"\n", start)
+                if end < 0:
+                    break
+                line = data[start:end]
+                if line and not line.isspace():
+                    lines.append(line)
+                start = end + 1
+                if len(lines) >= size:
+                    yield Batch("json", lines, position + start, [])
+                    lines = []
+            tail = data[start:]
+            position += start
+        if tail.strip():
+            lines.append(tail)
+        if lines:
+            yield Batch("json", lines, position + len(tail), [])
+
+
+def _read_json(path: Any, offset: int, size: int) -> Iterator[Batch]:
+    """
+    Yields batches of JSON array elements from offset (an element or separator offset).
+    """
+    parser = stream.StreamParser(mode="array")
+    # Absolute offset of the parser stream start:
+    base = 0
+    with open(path, "rb") as handler:
+        sources = stream.chunks(handler)
+        if offset:
+            handler.seek(offset)
+            head = handler.read(stream.CHUNK_SIZE)
+            stripped = head.lstrip(b" \t\r\n,")
+            base = offset + len(head) - len(stripped) - 1
+            sources = itertools.chain([b"[" + stripped], sources)
+        pending: list = []
+        for records in map(parser.feed, sources):
+            pending += records
+            while len(pending) >= size:
+                batch, pending = pending[:size], pending[size:]
+                after = pending[0].offset if pending else parser.offset
+                yield _batch(batch, base, base + after)
+        pending += parser.close()
+        if pending:
+            yield _batch(pending, base, base + parser.offset)
+
+
+def _batch(records: List[stream.Record], base: int, offset: int) -> Batch:
+    """
+    Returns the batch of parsed records with errors of malformed ones.
+    """
+    items, errors = [], []
+    for record in records:
+        if record.error is None:
+            items.append(record.value)
+        else:
+            message = str(record.error).partition(": ")[2]
+            errors.append(stream.malformed(base + record.offset, message))
+    return Batch("dict", items, offset, errors)
+
+
+def _ext(code: int, view: memoryview) -> Any:
+    return arrays.from_ext(code, view, copy=True)
+
+
+def _read_binary(path: Any, offset: int, size: int) -> Iterator[Batch]:
+    """
+    Yields batches of configurations decoded from concatenated binary frames.
+    """
+    with open(path, "rb") as handler:
+        handler.seek(offset)
+        buffer = bytearray()
+        # Absolute offset of the buffer start:
+        position = offset
+        items: list = []
+        for chunk in stream.chunks(handler):
+            buffer += chunk
+            start = 0
+            while start < len(buffer):
+                try:
+                    value, start = binary.unpack_from(buffer, start, ext_hook=_ext)
+                except InvalidParameter as error:
+                    if isinstance(error.__cause__, (IndexError, struct.error)):
+                        # Frame continues in the next chunk:
+                        break
+                    raise InvalidParameter(
+                        "Invalid frame at byte {}: {}".format(position + start, error)
+                    ) from error
+                items.append(value)
+                if len(items) >= size:
+                    yield Batch("dict", items, position + start, [])
+                    items = []
+            del buffer[:start]
+            position += start
+        if buffer:
+            raise InvalidParameter("Truncated frame at byte {}".format(position))
+        if items:
+            yield Batch("dict", items, position, [])
+
+
+def _read_csv(path: Any, offset: int, size: int) -> Iterator[Batch]:
+    """
+    Yields batches of CSV rows from row offset.
+    """
+    import pandas as pd
+
+    reader = pd.read_csv(
+        path,
+        dtype=str,
+        keep_default_na=False,
+        na_filter=False,
+        chunksize=size,
+        skiprows=range(1, offset + 1),
+    )
+    with reader:
+        for frame in reader:
+            offset += len(frame)
+            yield Batch("table", frame.to_dict("records"), offset, [])
+
+
+def _read_parquet(path: Any, offset: int, size: int) -> Iterator[Batch]:
+    """
+    Yields batches of Parquet rows from row offset.
+    """
+    pyarrow = _parquet()
+    position = 0
+    for table in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=size):
+        rows = table.num_rows
+        position += rows
+        if position <= offset:
+            continue
+        records = table.to_pylist()[max(0, offset - position + rows) :]
+        yield Batch("table", records, position, [])
+
+
+_readers = {
+    "json": _read_json,
+    "ndjson": _read_ndjson,
+    "binary": _read_binary,
+    "csv": _read_csv,
+    "parquet": _read_parquet,
+}
+
+
+def _total(path: Any, format: str) -> Optional[int]:
+    """
+    Returns the input size in offset units, None when unknown.
+    """
+    if format == "csv":
+        return None
+    if format == "parquet":
+        rows: int = _parquet().parquet.ParquetFile(path).metadata.num_rows
+        return rows
+    return os.path.getsize(path)
+
+
+# Workers:
+
+
+def _encode(
+    factory: Type[generic.GenericInterface], format: str, instances: List[Any]
+) -> Any:
+    """
+    Returns instances encoded in the output format.
+    """
+    if format == "binary":
+        return b"".join(instance.to_bytes() for instance in instances)
+    iterencode = generic._make_iterencoder(factory.encoder())
+    documents = ["".join(iterencode(instance.to_dict())) for instance in instances]
+    if format == "json":
+        return ", ".join(documents).encode()
+    if format == "ndjson":
+        return "".join(document + "\n" for document in documents).encode()
+    names = columns(factory)
+    text = format == "csv"
+    rows = []
+    for configuration in json.loads("[" + ", ".join(documents) + "]"):
+        extra = configuration.keys() - set(names)
+        if extra:
+            raise InvalidParameter(
+                "Keys {} are not {} parameters".format(sorted(extra), factory.__name__)
+            )
+        rows.append({name: _cell(configuration.get(name), text) for name in names})
+    if format == "parquet":
+        return rows
+    import pandas as pd
+
+    text = pd.DataFrame(rows, columns=names).to_csv(
+        index=False, header=False, lineterminator="\n"
+    )
+    return text.encode()
+
+
+def _convert_chunk(
+    factory: Type[generic.GenericInterface],
+    kind: str,
+    format: str,
+    skip: bool,
+    task: Tuple[int, list],
+) -> Tuple[Any, int, List[Tuple[int, str]]]:
+    """
+    Returns a batch of records converted to the output format with the number of objects
+    and errors of rejected records (raised unless skip is true).
+    """
+    start, items = task
+    instances = []
+    errors = []
+    for index, item in enumerate(items, start):
+        try:
+            if kind == "json":
+                item = json.loads(item)
+            elif kind == "table":
+                item = {key: _value(cell) for key, cell in item.items()}
+            if not isinstance(item, dict):
+                raise InvalidParameter(
+                    "record must be an object, received {}".format(type(item).__name__)
+                )
+            instances.append(factory.from_dict(item))
+        except (TypeError, ValueError, InvalidParameter) as error:
+            message = "{}: {}".format(type(error).__name__, error)
+            if not skip:
+                raise InvalidParameter(
+                    "Invalid record {}: {}".format(index, message)
+                ) from error
+            errors.append((index, message))
+    try:
+        return _encode(factory, format, instances), len(instances), errors
+    except (TypeError, ValueError) as error:
+        raise InvalidParameter(
+            "Cannot encode records {} to {}: {}".format(
+                start, start + len(items) - 1, error
+            )
+        ) from error
+
+
+# Output:
+
+
+class _Writer:
+    """
+    Output file writer, appending to the checkpointed size when resuming.
+    """
+
+    def __init__(
+        self,
+        path: Any,
+        format: str,
+        factory: Type[generic.GenericInterface],
+        size: Optional[int],
+        records: int,
+    ) -> None:
+        self.format = format
+        self.records = records
+        self.names = columns(factory)
+        self.path = path
+        # File of non Parquet outputs, Parquet tables are written by pyarrow:
+        self.handler: Optional[IO[bytes]] = None
+        self._parquet: Any = None
+        self._schema: Any = None
+        if format == "parquet":
+            if size is not None:
+                raise InvalidParameter("Parquet outputs cannot be resumed")
+            return
+        handler: IO[bytes]
+        if size is None:
+            handler = open(path, "wb")
+            if format == "json":
+                handler.write(b"[")
+            elif format == "csv":
+                handler.write((",".join(self.names) + "\n").encode())
+        else:
+            handler = open(path, "r+b")
+            handler.truncate(size)
+            handler.seek(size)
+        self.handler = handler
+
+    def _file(self) -> IO[bytes]:
+        """
+        Returns the output file, Parquet outputs have none.
+        """
+        assert self.handler is not None, "Parquet outputs are not written to a file"
+        return self.handler
+
+    def write(self, payload: Any, count: int) -> None:
+        if count == 0:
+            return
+        if self.format == "parquet":
+            pyarrow = _parquet()
+            if self._parquet is None:
+                table = pyarrow.Table.from_pylist(payload)
+                self._schema = table.schema
+                self._parquet = pyarrow.parquet.ParquetWriter(self.path, self._schema)
+            else:
+                try:
+                    table = pyarrow.Table.from_pylist(payload, schema=self._schema)
+                except (pyarrow.ArrowException, TypeError, ValueError) as error:
+                    raise InvalidParameter(
+                        "Records do not match the Parquet schema: {}".format(error)
+                    ) from error
+            self._parquet.write_table(table)
+        else:
+            handler = self._file()
+            if self.format == "json" and self.records:
+                handler.write(b", ")
+            handler.write(payload)
+        self.records += count
+
+    def sync(self) -> Optional[int]:
+        """
+        Flushes the output to disk and returns its size (None for Parquet outputs).
+        """
+        if self.handler is None:
+            return None
+        self.handler.flush()
+        os.fsync(self.handler.fileno())
+        return self.handler.tell()
+
+    def close(self, complete: bool) -> None:
+        if self.handler is not None:
+            if complete and self.format == "json":
+                self.handler.write(b"]")
+            self.handler.close()
+        elif self._parquet is not None:
+            self._parquet.close()
+        elif complete:
+            # Empty table with string columns:
+            pyarrow = _parquet()
+            schema = pyarrow.schema([(name, pyarrow.string()) for name in self.names])
+            pyarrow.parquet.write_table(schema.empty_table(), self.path)
+
+
+def _save(path: pathlib.Path, state: dict) -> None:
+    """
+    Writes the checkpoint state atomically.
+    """
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(json.dumps(state))
+    os.replace(temporary, path)
+
+
+def convert(
+    source: Any,
+    target: Any,
+    factory: Type[generic.GenericInterface],
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    window: Optional[int] = None,
+    checkpoint: Optional[Any] = None,
+    resume: bool = False,
+    interval: float = 1.0,
+    on_error: Optional[Callable[[InvalidParameter], Any]] = None,
+    progress: Optional[Callable[[Progress], Any]] = None,
+) -> Progress:
+    """
+    Converts the records of source into objects of factory written to target
+    (see module :py:mod:`newproject.convert`) and returns the final progress.
+
+    Records are read by batches of batch_size records (defaulting to the factory
+    :attr:`chunksize`) and converted on workers processes (defaulting to the number
+    of CPUs) with at most window batches in flight (see
+    :func:`newproject.interfaces.parallel.map_tasks`).
+    State is saved at most every interval seconds into checkpoint (defaulting to the
+    target path suffixed by ``.checkpoint``), conversion goes on from it when resume is
+    true and it exists. Invalid records raise :class:`InvalidParameter` unless on_error
+    is given: it is then called with the error (holding ``error.offset`` for malformed
+    input records or ``error.index`` for rejected records) and conversion goes on.
+    Progress is called with the conversion state at most every interval seconds
+    and once completed.
+    """
+    input_format = detect(source, input_format)
+    output_format = detect(target, output_format)
+    batch_size = batch_size or factory.chunksize
+    checkpoint = pathlib.Path(checkpoint or str(target) + ".checkpoint")
+    identity = {
+        "source": str(source),
+        "target": str(target),
+        "input_format": input_format,
+        "output_format": output_format,
+        "interface": generic._type_name(factory),
+    }
+    state = None
+    if resume and checkpoint.exists():
+        state = json.loads(checkpoint.read_text())
+        if {key: state.get(key) for key in identity} != identity:
+            raise InvalidParameter(
+                "Checkpoint {} belongs to another conversion".format(checkpoint)
+            )
+    offset = state["offset"] if state else 0
+    records = state["records"] if state else 0
+    errors = state["errors"] if state else 0
+    total = _total(source, input_format)
+    writer = _Writer(
+        target, output_format, factory, state["size"] if state else None, records
+    )
+    pending: collections.deque = collections.deque()
+
+    def tasks() -> Iterator[Tuple[int, list]]:
+        index = records + errors
+        for batch in _readers[input_format](source, offset, batch_size):
+            # Malformed records are reported when their batch is written:
+            pending.append((batch.offset, batch.errors))
+            yield index, batch.items
+            index += len(batch.items)
+
+    kind = {"ndjson": "json", "csv": "table", "parquet": "table"}.get(
+        input_format, "dict"
+    )
+    function = functools.partial(
+        _convert_chunk, factory, kind, output_format, on_error is not None
+    )
+    started = time.perf_counter()
+    saved = reported = started
+    complete = False
+
+    def current() -> Progress:
+        return Progress(
+            writer.records, errors, offset, total, time.perf_counter() - started
+        )
+
+    try:
+        for payload, count, failed in parallel.map_tasks(
+            function, tasks(), workers, window
+        ):
+            offset, malformed = pending.popleft()
+            for error in malformed:
+                if on_error is None:
+                    raise error
+                errors += 1
+                on_error(error)
+            writer.write(payload, count)
+            for index, message in failed:
+                error = InvalidParameter("Invalid record {}: {}".format(index, message))
+                error.index = index
+                if on_error is None:
+                    raise error
+                errors += 1
+                on_error(error)
+            now = time.perf_counter()
+            if now - saved >= interval and output_format != "parquet":
+                _save(
+                    checkpoint,
+                    dict(
+                        identity,
+                        offset=offset,
+                        records=writer.records,
+                        errors=errors,
+                        size=writer.sync(),
+                    ),
+                )
+                saved = now
+            if progress is not None and now - reported >= interval:
+                progress(current())
+                reported = now
+        complete = True
+    finally:
+        writer.close(complete)
+    if checkpoint.exists():
+        checkpoint.unlink()
+    summary = current()
+    if progress is not None:
+        progress(summary)
+    return summary
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    """
+    Command line of ``newproject convert``, returns the exit status.
+    """
+    import argparse
+
+    from newproject.service import resolve_interface
+    from newproject.settings import settings
+
+    cli_parser = argparse.ArgumentParser(
+        prog="newproject convert",
+        description="Convert files of interface configurations between formats",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    cli_parser.add_argument("source", type=str, help="Input file")
+    cli_parser.add_argument("target", type=str, help="Output file")
+    cli_parser.add_argument(
+        "--interface",
+        type=str,
+        default="newproject.interfaces.examples.SimpleCase",
+        help="Interface class used to build objects",
+    )
+    cli_parser.add_argument(
+        "--from", dest="input_format", choices=formats, help="Input format"
+    )
+    cli_parser.add_argument(
+        "--to", dest="output_format", choices=formats, help="Output format"
+    )
+    cli_parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (CPUs by default)"
+    )
+    cli_parser.add_argument(
+        "--batch-size", type=int, default=None, help="Records per batch"
+    )
+    cli_parser.add_argument(
+        "--window", type=int, default=None, help="Batches in flight"
+    )
+    cli_parser.add_argument(
+        "--checkpoint", type=str, default=None, help="Checkpoint file path"
+    )
+    cli_parser.add_argument(
+        "--resume", action="store_true", help="Resume from the checkpoint file"
+    )
+    cli_parser.add_argument(
+        "--skip-errors", action="store_true", help="Log and skip invalid records"
+    )
+    cli_parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="Progress and checkpoint interval (s)",
+    )
+    cli_parameters = cli_parser.parse_args(arguments)
+
+    def report(state: Progress) -> None:
+        rate = state.records / state.seconds if state.seconds else 0.0
+        done = (
+            " ({:.1f}%)".format(100.0 * state.offset / state.total)
+            if state.total
+            else ""
+        )
+        settings.logger.info(
+            "Converted %d records%s, %d errors, %.0f records/s",
+            state.records,
+            done,
+            state.errors,
+            rate,
+        )
+
+    def skip(error: InvalidParameter) -> None:
+        settings.logger.warning("Skipped: %s", error)
+
+    try:
+        convert(
+            cli_parameters.source,
+            cli_parameters.target,
+            resolve_interface(cli_parameters.interface),
+            input_format=cli_parameters.input_format,
+            output_format=cli_parameters.output_format,
+            workers=cli_parameters.workers,
+            batch_size=cli_parameters.batch_size,
+            window=cli_parameters.window,
+            checkpoint=cli_parameters.checkpoint,
+            resume=cli_parameters.resume,
+            interval=cli_parameters.interval,
+            on_error=skip if cli_parameters.skip_errors else None,
+            progress=report,
+        )
+    except (InvalidParameter, OSError) as error:
+        settings.logger.error("Conversion failed: %s", error)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@
 Module :py:mod:`newproject.errors` defines package exceptions.
 """
 
+from typing import Dict
+
 
 class GenericException(Exception):
     """
@@ -16,3 +18,12 @@ class InvalidParameter(GenericException):
     :class:`InvalidParameter` stands for any error occuring with function parameters.
     It is usually raised when invalid parameter is passed to :meth:`__init__`.
     """
+
+    #: Byte offset of a malformed stream record (see :py:mod:`newproject.interfaces.stream`)
+    offset: int
+
+    #: Messages by invalid parameter (see :py:mod:`newproject.interfaces.validation`)
+    errors: Dict[str, str]
+
+    #: Index of a rejected record (see :py:mod:`newproject.convert`)
+    index: int
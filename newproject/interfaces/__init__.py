@@ -13,5 +13,30 @@ Any interface must inherit either from :class:`newproject.interfaces.generic.Gen
 or one of its subclasses.
 """
 
+import importlib
+
+from newproject.interfaces.cache import CachedInterface
+from newproject.interfaces.declarative import *
 from newproject.interfaces.examples import *
 from newproject.interfaces.generic import *
+
+# Lazy attributes depending on heavy modules (name: module):
+_lazy = {
+    "InterfaceCollection": "newproject.interfaces.collection",
+}
+
+
+def __getattr__(name):
+    """
+    Imports lazy attributes on first access and caches them in the package namespace.
+    """
+    module = _lazy.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy))
@@ -0,0 +1,171 @@
+"""
+Module :py:mod:`newproject.interfaces.aio` writes and reads interface objects over asyncio
+streams without stalling the event loop.
+
+:func:`async_dump` encodes objects from an iterable or an asynchronous iterable by chunks
+of :attr:`GenericInterface.chunksize` objects. Each chunk is written then the writer is
+drained: when the peer reads slower than objects are encoded, the transport buffer
+reaches its high-water mark and ``drain()`` suspends the coroutine until it is flushed,
+so memory is bounded by one chunk plus the transport buffer. The coroutine yields to the
+loop between chunks and encoding can be offloaded to a thread or process executor,
+leaving the loop free while chunks are encoded:
+
+.. code-block:: python
+
+    reader, writer = await asyncio.open_connection(host, port)
+    await async_dump(writer, instances, executor=pool)
+
+:func:`async_load` reads chunks from a stream reader and decodes them with
+:class:`newproject.interfaces.stream.StreamParser` (NDJSON or JSON array), objects are
+yielded as soon as their record is complete. Chunks are only read when objects are
+consumed, so a slow consumer lets the reader buffer fill up and pauses the transport:
+
+.. code-block:: python
+
+    async for instance in async_load(reader, SimpleCase):
+        ...
+
+"""
+
+import asyncio
+import concurrent.futures
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import generic, stream
+
+#: Supported output formats
+formats = ("ndjson", "json")
+
+
+async def _items(
+    instances: Union[Iterable[Any], AsyncIterable[Any]], size: int
+) -> AsyncIterator[List[Tuple[type, dict]]]:
+    """
+    Yields lists of at most size classes and configurations of instances.
+    """
+    chunk: List[Tuple[type, dict]] = []
+    if hasattr(instances, "__aiter__"):
+        async for instance in instances:
+            chunk.append((type(instance), instance.to_dict()))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for instance in instances:
+            chunk.append((type(instance), instance.to_dict()))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _encode(
+    items: List[Tuple[Type[generic.GenericInterface], dict]],
+    prefix: str,
+    separator: str,
+    suffix: str,
+) -> bytes:
+    """
+    Returns the UTF-8 encoding of configurations JSON strings joined by separator,
+    each configuration is encoded by its class encoder.
+    """
+    encoders: dict = {}
+    documents = []
+    for cls, configuration in items:
+        iterencode = encoders.get(cls)
+        if iterencode is None:
+            iterencode = encoders[cls] = generic._make_iterencoder(cls.encoder())
+        documents.append("".join(iterencode(configuration)))
+    return (prefix + separator.join(documents) + suffix).encode()
+
+
+async def async_dump(
+    writer: Any,
+    instances: Union[Iterable[Any], AsyncIterable[Any]],
+    format: str = "ndjson",
+    chunksize: Optional[int] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> int:
+    """
+    Writes instances configurations as newline delimited JSON (``format="ndjson"``) or
+    as a JSON array (``format="json"``) into a :class:`asyncio.StreamWriter` (or any object
+    with ``write`` and coroutine ``drain`` methods), by chunks of chunksize objects.
+    Chunks are encoded on executor when given. Returns the number of objects written.
+    """
+    if format not in formats:
+        raise InvalidParameter(
+            "Format must be one of {}, received {!r}".format(formats, format)
+        )
+    chunksize = chunksize or generic.GenericInterface.chunksize
+    loop = asyncio.get_running_loop()
+    ndjson = format == "ndjson"
+    prefix, separator, suffix = ("", "\n", "\n") if ndjson else ("[", ", ", "")
+    count = 0
+    async for items in _items(instances, chunksize):
+        if executor is None:
+            data = _encode(items, prefix, separator, suffix)
+        else:
+            data = await loop.run_in_executor(
+                executor, _encode, items, prefix, separator, suffix
+            )
+        writer.write(data)
+        await writer.drain()
+        count += len(items)
+        if not ndjson:
+            prefix = ", "
+        # Drain only suspends when the transport buffer is full:
+        await asyncio.sleep(0)
+    if not ndjson:
+        writer.write(b"]" if count else b"[]")
+        await writer.drain()
+    return count
+
+
+async def async_load(
+    reader: Any,
+    factory: Callable[..., Any],
+    chunk_size: int = stream.CHUNK_SIZE,
+    on_error: Optional[Callable[[InvalidParameter], Any]] = None,
+    mode: Optional[str] = None,
+    object_hook: Optional[Callable] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> AsyncIterator[Any]:
+    """
+    Yields objects created with ``factory(**record)`` from the NDJSON or JSON array stream
+    of a :class:`asyncio.StreamReader` (or any object with a coroutine ``read`` method),
+    read by chunks of chunk_size bytes. Malformed records are handled like in
+    :func:`newproject.interfaces.stream.load_iter`. Chunks are parsed on executor
+    when given, it must be a thread executor since the parser state stays in process.
+    """
+    if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        raise InvalidParameter(
+            "Stream parser cannot run in worker processes, use a thread executor"
+        )
+    parser = stream.StreamParser(mode=mode, object_hook=object_hook)
+    loop = asyncio.get_running_loop()
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            break
+        if executor is None:
+            records = parser.feed(chunk)
+        else:
+            records = await loop.run_in_executor(executor, parser.feed, chunk)
+        for instance in stream.build(records, factory, on_error):
+            yield instance
+        await asyncio.sleep(0)
+    for instance in stream.build(parser.close(), factory, on_error):
+        yield instance
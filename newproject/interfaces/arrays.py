@@ -0,0 +1,104 @@
+"""
+Module :py:mod:`newproject.interfaces.arrays` provides NumPy array encodings used by
+:class:`newproject.interfaces.generic.GenericInterface` serialization methods.
+
+In JSON, arrays are exported as an envelope holding their base64 encoded buffer,
+decoded back by :func:`object_hook`:
+
+.. code-block:: python
+
+    instance = SimpleCase(value=np.arange(3.0))
+    instance.to_json()
+    # returns: '{"value": {"__ndarray__": "AAAAAAAAAAAAAAAAAADwPwAAAAAAAABA",
+    #                      "dtype": "<f8", "shape": [3]}}'
+    json.loads(instance.to_json(), object_hook=object_hook)
+    # returns: {"value": array([0., 1., 2.])}
+
+In the binary format, arrays are exported as an extension value (code :data:`EXT_NDARRAY`)
+holding their raw buffer, decoded without copy by :meth:`GenericInterface.from_bytes`.
+Arrays of Python objects and structured arrays are exported as nested lists.
+
+NumPy is only imported when an array is decoded.
+"""
+
+import base64
+import sys
+from typing import Any
+
+from newproject.interfaces import binary
+
+#: Binary format extension code of NumPy arrays
+EXT_NDARRAY = 1
+
+#: Key identifying JSON array envelopes
+ENVELOPE_KEY = "__ndarray__"
+
+
+def is_ndarray(instance: Any) -> bool:
+    """
+    Returns whether the instance is a NumPy array, without importing NumPy.
+    """
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(instance, numpy.ndarray)
+
+
+def _raw(array: Any) -> memoryview:
+    """
+    Returns the bytes of an array in C order (copied only when not C contiguous).
+    """
+    if not array.flags.c_contiguous:
+        array = array.copy(order="C")
+    return memoryview(array.reshape(-1).view("u1"))
+
+
+def to_json(array: Any) -> Any:
+    """
+    Returns the JSON envelope of an array
+    (nested lists for arrays of Python objects or structured arrays).
+    """
+    if array.dtype.hasobject or array.dtype.names:
+        return array.tolist()
+    return {
+        ENVELOPE_KEY: base64.b64encode(_raw(array)).decode("ascii"),
+        "dtype": array.dtype.str,
+        "shape": list(array.shape),
+    }
+
+
+def object_hook(mapping: dict) -> Any:
+    """
+    JSON decoding hook (see :func:`json.loads`) converting array envelopes to arrays.
+    """
+    if ENVELOPE_KEY not in mapping:
+        return mapping
+    import numpy as np
+
+    data = bytearray(base64.b64decode(mapping[ENVELOPE_KEY]))
+    return np.frombuffer(data, dtype=mapping["dtype"]).reshape(mapping["shape"])
+
+
+def to_ext(array: Any) -> Any:
+    """
+    Returns the binary format extension value of an array: a header holding
+    its dtype and shape followed by its raw buffer
+    (nested lists for arrays of Python objects or structured arrays).
+    """
+    if array.dtype.hasobject or array.dtype.names:
+        return array.tolist()
+    header = binary.packb([array.dtype.str, list(array.shape)])
+    return binary.ExtType(EXT_NDARRAY, header + _raw(array))
+
+
+def from_ext(code: int, data: memoryview, copy: bool = True) -> Any:
+    """
+    Binary decoding hook (see :func:`newproject.interfaces.binary.unpackb`) converting
+    array extension values to arrays. When copy is false, arrays are views of the decoded
+    buffer (read-only when the buffer is).
+    """
+    if code != EXT_NDARRAY:
+        return binary.ExtType(code, bytes(data))
+    import numpy as np
+
+    (dtype, shape), offset = binary.unpack_from(data)
+    array = np.frombuffer(data, dtype=dtype, offset=offset).reshape(shape)
+    return array.copy() if copy else array
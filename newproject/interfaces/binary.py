@@ -0,0 +1,403 @@
+"""
+Module :py:mod:`newproject.interfaces.binary` implements the compact binary wire format
+used by :meth:`newproject.interfaces.generic.GenericInterface.to_bytes`.
+
+Format is a self-describing subset of `MessagePack <https://msgpack.org>`_ implemented
+with :mod:`struct`: nil, booleans, integers (up to 64 bits), doubles, UTF-8 strings,
+binary blobs, arrays, maps and extension types (:class:`ExtType`).
+Values without native encoding are converted by the ``default`` hook, exactly like the
+``default`` argument of :func:`json.dumps`.
+
+Decoding works on a :class:`memoryview` of the input buffer and never copies it,
+binary blobs can even be returned as views of the input (``zero_copy=True``):
+
+.. code-block:: python
+
+    data = packb({"value": [1, 2.5, "text", b"raw"]})
+    unpackb(data)  # returns: {"value": [1, 2.5, "text", b"raw"]}
+
+"""
+
+import collections
+import struct
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from newproject.errors import InvalidParameter
+
+#: Extension value (application defined type code in [0, 127] and raw payload)
+ExtType = collections.namedtuple("ExtType", ["code", "data"])
+
+_uint8 = struct.Struct(">B")
+_uint16 = struct.Struct(">H")
+_uint32 = struct.Struct(">I")
+_uint64 = struct.Struct(">Q")
+_int8 = struct.Struct(">b")
+_int16 = struct.Struct(">h")
+_int32 = struct.Struct(">i")
+_int64 = struct.Struct(">q")
+_float64 = struct.Struct(">d")
+_float32 = struct.Struct(">f")
+
+_fixext = {1: 0xD4, 2: 0xD5, 4: 0xD6, 8: 0xD7, 16: 0xD8}
+_fixed = {
+    0xCA: _float32,
+    0xCC: _uint8,
+    0xCD: _uint16,
+    0xCE: _uint32,
+    0xCF: _uint64,
+    0xD0: _int8,
+    0xD1: _int16,
+    0xD2: _int32,
+    0xD3: _int64,
+}
+
+
+def _header(buffer: bytearray, size: int, fix: int, limit: int, codes: tuple) -> None:
+    """
+    Appends the header of a sized value (string, binary, array, map), using the fixed
+    format ``fix | size`` below limit and the 8, 16 or 32 bits size codes above.
+    """
+    if size < limit:
+        buffer.append(fix | size)
+    elif size <= 0xFF and codes[0]:
+        buffer.append(codes[0])
+        buffer.append(size)
+    elif size <= 0xFFFF:
+        buffer.append(codes[1])
+        buffer += _uint16.pack(size)
+    elif size <= 0xFFFFFFFF:
+        buffer.append(codes[2])
+        buffer += _uint32.pack(size)
+    else:
+        raise OverflowError("Size {} exceeds 32 bits".format(size))
+
+
+def _pack_int(buffer: bytearray, obj: int) -> None:
+    if 0 <= obj < 0x80:
+        buffer.append(obj)
+    elif -0x20 <= obj < 0:
+        buffer.append(obj & 0xFF)
+    elif obj >= 0:
+        if obj <= 0xFF:
+            buffer.append(0xCC)
+            buffer.append(obj)
+        elif obj <= 0xFFFF:
+            buffer.append(0xCD)
+            buffer += _uint16.pack(obj)
+        elif obj <= 0xFFFFFFFF:
+            buffer.append(0xCE)
+            buffer += _uint32.pack(obj)
+        elif obj <= 0xFFFFFFFFFFFFFFFF:
+            buffer.append(0xCF)
+            buffer += _uint64.pack(obj)
+        else:
+            raise OverflowError("Integer {} exceeds 64 bits".format(obj))
+    elif obj >= -0x80:
+        buffer.append(0xD0)
+        buffer += _int8.pack(obj)
+    elif obj >= -0x8000:
+        buffer.append(0xD1)
+        buffer += _int16.pack(obj)
+    elif obj >= -0x80000000:
+        buffer.append(0xD2)
+        buffer += _int32.pack(obj)
+    elif obj >= -0x8000000000000000:
+        buffer.append(0xD3)
+        buffer += _int64.pack(obj)
+    else:
+        raise OverflowError("Integer {} exceeds 64 bits".format(obj))
+
+
+def _pack_ext(buffer: bytearray, obj: ExtType) -> None:
+    if not 0 <= obj.code <= 127:
+        raise InvalidParameter(
+            "Extension code must be in [0, 127], received {}".format(obj.code)
+        )
+    data = memoryview(obj.data).cast("B")
+    size = data.nbytes
+    if size in _fixext:
+        buffer.append(_fixext[size])
+    else:
+        _header(buffer, size, 0, 0, (0xC7, 0xC8, 0xC9))
+    buffer.append(obj.code)
+    buffer += data
+
+
+_STR = (0xD9, 0xDA, 0xDB)
+_BIN = (0xC4, 0xC5, 0xC6)
+_ARRAY = (0, 0xDC, 0xDD)
+_MAP = (0, 0xDE, 0xDF)
+_BASES: Dict[type, Callable[[Any], Any]] = {
+    str: str.__str__,
+    int: int.__index__,
+    float: float.__float__,
+    dict: dict,
+    list: list,
+    tuple: tuple,
+    bytes: bytes,
+    bytearray: bytes,
+}
+_BASE_TYPES = tuple(_BASES)
+
+
+def _pack(buffer: bytearray, obj: Any, default: Optional[Callable[[Any], Any]]) -> None:
+    """
+    Appends the encoding of a value to the buffer.
+    Exact builtin types are tested first, then subclasses, then the default hook is used.
+    """
+    kind = type(obj)
+    if kind is str:
+        data = obj.encode("utf-8")
+        size = len(data)
+        if size < 32:
+            buffer.append(0xA0 | size)
+        else:
+            _header(buffer, size, 0xA0, 32, _STR)
+        buffer += data
+    elif kind is int:
+        if 0 <= obj < 0x80:
+            buffer.append(obj)
+        else:
+            _pack_int(buffer, obj)
+    elif kind is float:
+        buffer.append(0xCB)
+        buffer += _float64.pack(obj)
+    elif kind is dict:
+        size = len(obj)
+        if size < 16:
+            buffer.append(0x80 | size)
+        else:
+            _header(buffer, size, 0x80, 16, _MAP)
+        for key, value in obj.items():
+            _pack(buffer, key, default)
+            _pack(buffer, value, default)
+    elif kind is list or kind is tuple:
+        size = len(obj)
+        if size < 16:
+            buffer.append(0x90 | size)
+        else:
+            _header(buffer, size, 0x90, 16, _ARRAY)
+        for value in obj:
+            _pack(buffer, value, default)
+    elif obj is None:
+        buffer.append(0xC0)
+    elif obj is True:
+        buffer.append(0xC3)
+    elif obj is False:
+        buffer.append(0xC2)
+    elif kind is bytes or kind is bytearray or kind is memoryview:
+        data = memoryview(obj).cast("B")
+        _header(buffer, data.nbytes, 0, 0, _BIN)
+        buffer += data
+    elif kind is ExtType:
+        _pack_ext(buffer, obj)
+    elif isinstance(obj, _BASE_TYPES):
+        # subclasses (eg. IntEnum, namedtuple) are encoded as their builtin base, like in JSON
+        for base, convert in _BASES.items():
+            if isinstance(obj, base):
+                _pack(buffer, convert(obj), default)
+                break
+    elif default is None:
+        raise TypeError(
+            "Object of type {} is not serializable".format(type(obj).__name__)
+        )
+    else:
+        converted = default(obj)
+        if type(converted) is kind:
+            raise TypeError(
+                "Default hook cannot serialize object of type {}".format(kind.__name__)
+            )
+        _pack(buffer, converted, default)
+
+
+def packb(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Returns the binary encoding of a value, values without native encoding
+    are converted using the default hook.
+    Cyclic or too deeply nested values raise :class:`InvalidParameter`.
+    """
+    buffer = bytearray()
+    try:
+        _pack(buffer, obj, default)
+    except RecursionError as error:
+        raise InvalidParameter(
+            "Value nesting is too deep (circular reference?)"
+        ) from error
+    return bytes(buffer)
+
+
+def _sized(view: memoryview, offset: int, byte: int) -> Tuple[int, int]:
+    """
+    Returns the size and payload offset of a value with an 8, 16 or 32 bits size
+    given the index (0, 1 or 2) of its size width.
+    """
+    if byte == 0:
+        return view[offset], offset + 1
+    if byte == 1:
+        return _uint16.unpack_from(view, offset)[0], offset + 2
+    return _uint32.unpack_from(view, offset)[0], offset + 4
+
+
+def _slice(view: memoryview, offset: int, size: int) -> memoryview:
+    end = offset + size
+    if end > len(view):
+        raise IndexError(end)
+    return view[offset:end]
+
+
+def _unpack(
+    view: memoryview,
+    offset: int,
+    ext_hook: Optional[Callable[[int, memoryview], Any]],
+    zero_copy: bool,
+) -> Tuple[Any, int]:
+    """
+    Decodes the value at offset and returns it with the offset following it.
+    """
+    byte = view[offset]
+    offset += 1
+    if byte < 0x80:
+        return byte, offset
+    if 0xA0 <= byte < 0xC0:
+        end = offset + (byte & 0x1F)
+        if end > len(view):
+            raise IndexError(end)
+        return str(view[offset:end], "utf-8"), end
+    if byte < 0xA0:
+        size = byte & 0x0F
+        if byte < 0x90:
+            return _unpack_map(view, offset, size, ext_hook, zero_copy)
+        return _unpack_array(view, offset, size, ext_hook, zero_copy)
+    if byte >= 0xE0:
+        return byte - 0x100, offset
+    if byte == 0xCB:
+        return _float64.unpack_from(view, offset)[0], offset + 8
+    if byte == 0xC0:
+        return None, offset
+    if byte == 0xC2:
+        return False, offset
+    if byte == 0xC3:
+        return True, offset
+    if byte in _fixed:
+        codec = _fixed[byte]
+        return codec.unpack_from(view, offset)[0], offset + codec.size
+    if 0xD9 <= byte <= 0xDB:
+        size, offset = _sized(view, offset, byte - 0xD9)
+        data = _slice(view, offset, size)
+        return str(data, "utf-8"), offset + size
+    if 0xC4 <= byte <= 0xC6:
+        size, offset = _sized(view, offset, byte - 0xC4)
+        data = _slice(view, offset, size)
+        return (data if zero_copy else bytes(data)), offset + size
+    if byte == 0xDC or byte == 0xDD:
+        size, offset = _sized(view, offset, byte - 0xDB)
+        return _unpack_array(view, offset, size, ext_hook, zero_copy)
+    if byte == 0xDE or byte == 0xDF:
+        size, offset = _sized(view, offset, byte - 0xDD)
+        return _unpack_map(view, offset, size, ext_hook, zero_copy)
+    if 0xD4 <= byte <= 0xD8:
+        size = 1 << (byte - 0xD4)
+    elif 0xC7 <= byte <= 0xC9:
+        size, offset = _sized(view, offset, byte - 0xC7)
+    else:
+        raise InvalidParameter(
+            "Invalid type byte 0x{:02x} at offset {}".format(byte, offset - 1)
+        )
+    code = _int8.unpack_from(view, offset)[0]
+    data = _slice(view, offset + 1, size)
+    offset += 1 + size
+    if ext_hook is not None:
+        return ext_hook(code, data), offset
+    return ExtType(code, bytes(data)), offset
+
+
+def _unpack_array(
+    view: memoryview,
+    offset: int,
+    size: int,
+    ext_hook: Optional[Callable[[int, memoryview], Any]],
+    zero_copy: bool,
+) -> Tuple[list, int]:
+    items: List[Any] = []
+    append = items.append
+    for _ in range(size):
+        item, offset = _unpack(view, offset, ext_hook, zero_copy)
+        append(item)
+    return items, offset
+
+
+def _unpack_map(
+    view: memoryview,
+    offset: int,
+    size: int,
+    ext_hook: Optional[Callable[[int, memoryview], Any]],
+    zero_copy: bool,
+) -> Tuple[dict, int]:
+    items = {}
+    for _ in range(size):
+        byte = view[offset]
+        if 0xA0 <= byte < 0xC0:
+            # short string keys are decoded inline
+            start = offset + 1
+            offset = start + (byte & 0x1F)
+            if offset > len(view):
+                raise IndexError(offset)
+            key = str(view[start:offset], "utf-8")
+        else:
+            start = offset
+            key, offset = _unpack(view, offset, ext_hook, zero_copy)
+        value, offset = _unpack(view, offset, ext_hook, zero_copy)
+        try:
+            items[key] = value
+        except TypeError as error:
+            raise InvalidParameter(
+                "Unhashable {} map key at offset {}".format(type(key).__name__, start)
+            ) from error
+    return items, offset
+
+
+def unpack_from(
+    data: Any,
+    offset: int = 0,
+    ext_hook: Optional[Callable[[int, memoryview], Any]] = None,
+    zero_copy: bool = False,
+) -> Tuple[Any, int]:
+    """
+    Decodes the value starting at offset in a buffer (bytes, bytearray, memoryview, mmap...)
+    and returns it with the offset following it.
+    Extension values are passed to ext_hook (with a view of their payload) when given,
+    or returned as :class:`ExtType`. Binary blobs are returned as views of the buffer
+    when zero_copy is true.
+    """
+    view = memoryview(data)
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    try:
+        return _unpack(view, offset, ext_hook, zero_copy)
+    except (IndexError, struct.error) as error:
+        raise InvalidParameter(
+            "Truncated data, {} bytes available from offset {}".format(
+                len(view) - offset, offset
+            )
+        ) from error
+    except UnicodeDecodeError as error:
+        raise InvalidParameter("Invalid UTF-8 string: {}".format(error)) from error
+    except RecursionError as error:
+        raise InvalidParameter("Data nesting is too deep") from error
+
+
+def unpackb(
+    data: Any,
+    ext_hook: Optional[Callable[[int, memoryview], Any]] = None,
+    zero_copy: bool = False,
+) -> Any:
+    """
+    Decodes a buffer holding a single value (see :func:`unpack_from`).
+    """
+    obj, offset = unpack_from(data, 0, ext_hook=ext_hook, zero_copy=zero_copy)
+    size = memoryview(data).nbytes
+    if offset != size:
+        raise InvalidParameter(
+            "Extra data: value ends at offset {} of {} bytes".format(offset, size)
+        )
+    return obj
@@ -0,0 +1,213 @@
+"""
+Module :py:mod:`newproject.interfaces.cache` defines the opt-in caching mixin
+:class:`CachedInterface` which memoizes :meth:`to_dict`, :meth:`to_json` and :meth:`config_hash`
+outputs per instance.
+
+Outputs are stored in a process-wide bounded LRU cache (:data:`cache`) and invalidated
+as soon as an attribute of the instance is set or deleted:
+
+.. code-block:: python
+
+    class CachedCase(CachedInterface, SimpleCase):
+        pass
+
+    a = CachedCase(value="dummy")
+    a.to_json()  # computed and cached
+    a.to_json()  # returned from cache
+    a.value = "other"
+    a.to_json()  # computed again
+    cache.info()  # CacheInfo(hits=1, misses=2, evictions=0, maxsize=4096, currsize=...)
+
+Mutations of nested mutable values (eg. appending to a list attribute) are not detected,
+call :meth:`CachedInterface.invalidate` after such changes.
+"""
+
+import collections
+import functools
+import itertools
+import threading
+from typing import Any, Callable, Hashable
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces.generic import GenericInterface
+
+CacheInfo = collections.namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe bounded Least Recently Used cache with hit, miss and eviction counters.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 0:
+            raise InvalidParameter(
+                "Cache size must be positive, received {}".format(maxsize)
+            )
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: collections.OrderedDict = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value cached for key (marked as most recently used) or default.
+        """
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Caches value for key and evicts least recently used entries above :attr:`maxsize`.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Removes the value cached for key if any.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Changes the cache size, evicting entries if needed.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """
+        Returns cache statistics.
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, self.maxsize, len(self._data)
+            )
+
+    def _evict(self) -> None:
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+#: Process-wide cache shared by all :class:`CachedInterface` subclasses.
+cache = LRUCache()
+
+_tokens = itertools.count()
+
+# Memoized methods names and whether their outputs are returned as copies:
+_memoized_names = (("to_dict", True), ("to_json", False), ("config_hash", False))
+
+
+def _memoize(function: Callable, copy: bool = False) -> Callable:
+    """
+    Returns the method caching the output of function in the interface cache.
+    Cached dictionaries are returned as shallow copies when copy is true.
+    """
+
+    @functools.wraps(function)
+    def wrapper(self: "CachedInterface") -> Any:
+        key = (self._cache_token(), id(self), function)
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = function(self)
+            self.cache.set(key, value)
+        return dict(value) if copy else value
+
+    setattr(wrapper, "_memoized", function)
+    return wrapper
+
+
+class CachedInterface(GenericInterface):
+    """
+    Mixin memoizing :meth:`to_dict`, :meth:`to_json` and :meth:`config_hash` outputs of
+    its subclasses in the :attr:`cache` (see module :py:mod:`newproject.interfaces.cache`).
+    Place it first in bases so it applies to methods inherited from other interfaces.
+    """
+
+    __slots__ = ("_cache_key",)
+
+    #: Unique token of the instance in the cache, set on first memoized call
+    _cache_key: int
+
+    #: Cache storing memoized outputs
+    cache: LRUCache = cache
+
+    #: Memoized methods of the class
+    _memoized_methods: tuple = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for name, copy in _memoized_names:
+            method = getattr(cls, name)
+            if getattr(method, "__isabstractmethod__", False) or hasattr(
+                method, "_memoized"
+            ):
+                continue
+            setattr(cls, name, _memoize(method, copy=copy))
+        cls._memoized_methods = tuple(
+            {
+                klass.__dict__[name]._memoized
+                for klass in cls.__mro__
+                for name, _ in _memoized_names
+                if hasattr(klass.__dict__.get(name), "_memoized")
+            }
+        )
+
+    def _cache_token(self) -> int:
+        """
+        Returns the unique token identifying the instance in the cache.
+        """
+        try:
+            return self._cache_key
+        except AttributeError:
+            token = next(_tokens)
+            object.__setattr__(self, "_cache_key", token)
+            return token
+
+    def invalidate(self) -> None:
+        """
+        Removes cached outputs of the instance.
+        """
+        try:
+            token = self._cache_key
+        except AttributeError:
+            return
+        for function in self._memoized_methods:
+            self.cache.pop((token, id(self), function))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self.invalidate()
+
+    def __delattr__(self, name: str) -> None:
+        super().__delattr__(name)
+        self.invalidate()
@@ -0,0 +1,291 @@
+"""
+Module :py:mod:`newproject.interfaces.collection` defines the class :class:`InterfaceCollection`
+which holds large homogeneous batches of interface configurations column-wise.
+
+Each configuration field is stored in a NumPy array, so filtering, aggregates and exports
+are vectorized instead of looping over interface objects. Objects are only created on
+access using the collection factory:
+
+.. code-block:: python
+
+    collection = InterfaceCollection.from_instances(
+        SimpleCase, [SimpleCase(value=i) for i in range(1000)]
+    )
+    values = collection.column("value")       # numpy.ndarray of int64
+    subset = collection.filter(values > 500)  # InterfaceCollection of 499 items
+    subset[0]                                 # SimpleCase instance (value=501)
+    subset.to_dataframe()                     # pandas.DataFrame with a value column
+
+"""
+
+import itertools
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces.generic import GenericInterface, _make_iterencoder
+
+
+def _column(values: list) -> np.ndarray:
+    """
+    Returns values as a one dimensional array.
+    Homogeneous booleans, integers or floats are stored with a native dtype,
+    any other values are stored as Python objects.
+    """
+    kinds = set(map(type, values))
+    if len(kinds) == 1 and kinds <= {bool, int, float}:
+        array = np.asarray(values)
+        if array.ndim == 1 and array.dtype.kind in "biuf":
+            return array
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _item(column: np.ndarray, index: int) -> Any:
+    """
+    Returns the value at index as a Python object.
+    """
+    value = column[index]
+    return value if column.dtype.kind == "O" else value.item()
+
+
+class InterfaceCollection:
+    """
+    Column oriented container of interface configurations sharing the same factory.
+    Collection is created from a mapping of field names to columns (array-like of same length)
+    or using one of the constructors :meth:`from_instances`, :meth:`from_dicts` and
+    :meth:`from_dataframe`.
+    """
+
+    def __init__(self, factory: type, columns: dict) -> None:
+        """
+        Initialization method takes the interface class used to materialize objects
+        and the configuration columns.
+        """
+        if not (isinstance(factory, type) and issubclass(factory, GenericInterface)):
+            raise InvalidParameter(
+                "Factory must be a GenericInterface subclass, received {!r}".format(
+                    factory
+                )
+            )
+        self.factory = factory
+        self.columns = {
+            name: column if isinstance(column, np.ndarray) else _column(list(column))
+            for name, column in columns.items()
+        }
+        sizes = {len(column) for column in self.columns.values()}
+        if len(sizes) > 1:
+            raise InvalidParameter(
+                "Columns must have the same length, received {}".format(
+                    {name: len(column) for name, column in self.columns.items()}
+                )
+            )
+        self.size = sizes.pop() if sizes else 0
+
+    @classmethod
+    def from_dicts(
+        cls, factory: type, configurations: Iterable[dict], decode: bool = False
+    ) -> "InterfaceCollection":
+        """
+        Creates a collection from configuration dictionaries.
+        All configurations must define the same keys.
+        When decode is true, JSON encoded values of annotated fields are decoded column-wise:
+        timestamps and dates are parsed at once into ``datetime64`` columns, durations into
+        ``timedelta64`` columns (see :func:`newproject.interfaces.decoding.columns`).
+        """
+        configurations = list(configurations)
+        fields = getattr(factory, "_fields", None)
+        if fields is None:
+            fields = tuple(configurations[0]) if configurations else ()
+        columns: Dict[str, List[Any]] = {field: [] for field in fields}
+        appenders = [(field, columns[field].append) for field in fields]
+        for index, configuration in enumerate(configurations):
+            if len(configuration) != len(fields):
+                raise InvalidParameter(
+                    "Configuration #{} keys {} do not match collection fields {}".format(
+                        index, list(configuration), list(fields)
+                    )
+                )
+            try:
+                for field, append in appenders:
+                    append(configuration[field])
+            except KeyError as error:
+                raise InvalidParameter(
+                    "Configuration #{} misses field {}".format(index, error)
+                ) from error
+        if decode:
+            from newproject.interfaces import decoding
+
+            columns = decoding.columns(factory, columns)
+        return cls(
+            factory,
+            {
+                field: column if isinstance(column, np.ndarray) else _column(column)
+                for field, column in columns.items()
+            },
+        )
+
+    @classmethod
+    def from_instances(
+        cls, factory: type, instances: Iterable[GenericInterface]
+    ) -> "InterfaceCollection":
+        """
+        Creates a collection from interface objects configurations.
+        """
+        return cls.from_dicts(factory, (instance.to_dict() for instance in instances))
+
+    @classmethod
+    def from_dataframe(cls, factory: type, frame: Any) -> "InterfaceCollection":
+        """
+        Creates a collection from a :class:`pandas.DataFrame` (one column per field).
+        """
+        return cls(
+            factory, {str(name): frame[name].to_numpy() for name in frame.columns}
+        )
+
+    @property
+    def fields(self) -> tuple:
+        """
+        Returns collection field names.
+        """
+        return tuple(self.columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns the array of values of a field.
+        """
+        try:
+            return self.columns[name]
+        except KeyError as error:
+            raise InvalidParameter(
+                "Unknown field {!r}, collection fields are {}".format(
+                    name, list(self.columns)
+                )
+            ) from error
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return "{}(factory={}, size={}, fields={})".format(
+            type(self).__name__,
+            self.factory.__qualname__,
+            self.size,
+            list(self.columns),
+        )
+
+    def __getitem__(
+        self, key: Union[int, slice, np.ndarray, list]
+    ) -> Union[GenericInterface, "InterfaceCollection"]:
+        """
+        Returns the materialized object at an integer position,
+        or a sub-collection for slices, boolean masks and integer index arrays.
+        """
+        if isinstance(key, (int, np.integer)):
+            if not -self.size <= key < self.size:
+                raise IndexError("Collection index out of range")
+            return self.factory(
+                **{name: _item(column, key) for name, column in self.columns.items()}
+            )
+        return self.take(key)
+
+    def __iter__(self) -> Iterator[GenericInterface]:
+        """
+        Yields materialized objects one at a time.
+        """
+        for configuration in self.iter_dicts():
+            yield self.factory(**configuration)
+
+    def take(self, key: Union[slice, np.ndarray, list]) -> "InterfaceCollection":
+        """
+        Returns the sub-collection selected by a slice, a boolean mask or integer indices.
+        """
+        if not isinstance(key, slice):
+            key = np.asarray(key)
+            if key.dtype.kind == "b" and key.shape != (self.size,):
+                raise InvalidParameter(
+                    "Mask length {} does not match collection size {}".format(
+                        key.shape, self.size
+                    )
+                )
+        return type(self)(
+            self.factory, {name: column[key] for name, column in self.columns.items()}
+        )
+
+    def filter(self, mask: np.ndarray) -> "InterfaceCollection":
+        """
+        Returns the sub-collection of items where the boolean mask is true.
+        Mask is usually computed from columns, eg.: ``collection.column("value") > 0``.
+        """
+        return self.take(np.asarray(mask, dtype=bool))
+
+    def where(self, **values: Any) -> "InterfaceCollection":
+        """
+        Returns the sub-collection of items where each given field equals the given value.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for name, value in values.items():
+            mask &= self.column(name) == value
+        return self.take(mask)
+
+    def sort(self, field: str, reverse: bool = False) -> "InterfaceCollection":
+        """
+        Returns the collection sorted by a field (stable sort).
+        """
+        order = np.argsort(self.column(field), kind="stable")
+        return self.take(order[::-1] if reverse else order)
+
+    def iter_dicts(self, chunksize: Optional[int] = None) -> Iterator[dict]:
+        """
+        Yields configuration dictionaries, columns are converted to Python values
+        by chunks of :attr:`factory.chunksize` items.
+        """
+        chunksize = chunksize or self.factory.chunksize
+        fields = self.fields
+        for start in range(0, self.size, chunksize):
+            stop = start + chunksize
+            rows = zip(
+                *[column[start:stop].tolist() for column in self.columns.values()]
+            )
+            for row in rows:
+                yield dict(zip(fields, row))
+
+    def to_dicts(self) -> list:
+        """
+        Returns the list of configuration dictionaries.
+        """
+        fields = self.fields
+        rows = zip(*[column.tolist() for column in self.columns.values()])
+        return [dict(zip(fields, row)) for row in rows]
+
+    def to_ndjson(self, chunksize: Optional[int] = None) -> Iterator[str]:
+        """
+        Yields chunks of newline delimited JSON configurations encoded by the factory
+        encoder without materializing objects.
+        """
+        chunksize = chunksize or self.factory.chunksize
+        iterencode = _make_iterencoder(self.factory.encoder())
+        configurations = self.iter_dicts(chunksize=chunksize)
+        while True:
+            chunk = [
+                "".join(iterencode(configuration))
+                for configuration in itertools.islice(configurations, chunksize)
+            ]
+            if not chunk:
+                break
+            yield "\n".join(chunk) + "\n"
+
+    def dump_ndjson(self, fp: IO[str], chunksize: Optional[int] = None) -> None:
+        """
+        Writes configurations as newline delimited JSON into the file-like object.
+        """
+        for chunk in self.to_ndjson(chunksize=chunksize):
+            fp.write(chunk)
+
+    def to_dataframe(self) -> Any:
+        """
+        Returns configurations as a :class:`pandas.DataFrame` (one column per field).
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, copy=False)
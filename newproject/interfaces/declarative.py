@@ -0,0 +1,230 @@
+"""
+Module :py:mod:`newproject.interfaces.declarative` defines the class
+:class:`DeclarativeInterface` which generates interfaces boilerplate from a declarative
+fields specification.
+
+Fields are declared either by class annotations (default values are given as class
+attributes) or by a ``fields`` tuple of names:
+
+.. code-block:: python
+
+    class Point(DeclarativeInterface):
+        x: float
+        y: float = 0.0
+
+    class Pair(DeclarativeInterface):
+        fields = ("left", "right")
+
+At class creation, :class:`DeclarativeMeta` compiles a specialized :meth:`__init__`,
+:meth:`to_dict`, :meth:`to_json` and :meth:`__repr__` for the declared fields and sets
+``__slots__`` so instances do not carry a ``__dict__``. Methods defined in the class body
+are kept as is.
+"""
+
+import abc
+import functools
+import keyword
+from typing import Any, Dict, Tuple
+
+from newproject.interfaces.generic import GenericInterface
+
+_MISSING = object()
+
+
+def _compile(name: str, source: str, scope: dict) -> Any:
+    """
+    Compiles the source of a function definition and returns the function.
+    """
+    exec(source, scope)  # nosec: source is generated from validated identifiers
+    return scope[name]
+
+
+def _inherited(bases: tuple, attribute: str) -> Any:
+    """
+    Returns the attribute as it would be inherited from bases.
+    """
+    for base in bases:
+        for klass in base.__mro__:
+            if attribute in klass.__dict__:
+                return klass.__dict__[attribute]
+    return None
+
+
+def _generated(function: Any) -> bool:
+    """
+    Returns True when the function was generated by :class:`DeclarativeMeta`
+    (or is the abstract or default implementation it replaces).
+    """
+    return (
+        function is None
+        or function is object.__init__
+        or function is object.__repr__
+        or getattr(function, "__isabstractmethod__", False)
+        or getattr(function, "_declarative", False)
+    )
+
+
+class DeclarativeMeta(abc.ABCMeta):
+    """
+    Metaclass compiling interfaces methods from their fields specification.
+    """
+
+    _fields: Tuple[str, ...]
+    _field_defaults: Dict[str, Any]
+    _field_types: Dict[str, Any]
+
+    def __new__(mcs, name: str, bases: tuple, namespace: dict, **kwargs: Any) -> type:
+        if not any(isinstance(base, DeclarativeMeta) for base in bases):
+            return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+        # Inherited fields:
+        fields = {}
+        types = {}
+        for base in reversed(bases):
+            for field in getattr(base, "_fields", ()):
+                fields[field] = base._field_defaults.get(field, _MISSING)
+                types[field] = base._field_types.get(field, Any)
+
+        # Own fields:
+        annotations = namespace.get("__annotations__", {})
+        if "fields" in namespace:
+            own = {field: Any for field in namespace.pop("fields")}
+        else:
+            own = {
+                field: kind
+                for field, kind in annotations.items()
+                if not str(kind).startswith(("ClassVar", "typing.ClassVar"))
+            }
+        for field, kind in own.items():
+            if (
+                not field.isidentifier()
+                or keyword.iskeyword(field)
+                or field == "self"
+                or field.startswith("__")
+            ):
+                raise TypeError("Invalid field name {!r}".format(field))
+            default = namespace.pop(field, _MISSING)
+            if isinstance(default, (list, dict, set)):
+                raise TypeError(
+                    "Mutable default {} is not allowed for field {!r}".format(
+                        type(default).__name__, field
+                    )
+                )
+            fields[field] = default
+            types[field] = kind
+
+        # Defaults must follow required fields:
+        seen_default = None
+        for field, default in fields.items():
+            if default is not _MISSING:
+                seen_default = field
+            elif seen_default is not None:
+                raise TypeError(
+                    "Field {!r} without default follows field {!r} with default".format(
+                        field, seen_default
+                    )
+                )
+
+        # Slots:
+        slots = tuple(namespace.get("__slots__", ()))
+        inherited = {
+            slot
+            for base in bases
+            for klass in base.__mro__
+            for slot in klass.__dict__.get("__slots__", ())
+        }
+        slots += tuple(field for field in own if field not in inherited)
+        if not any(getattr(base, "__weakrefoffset__", 0) for base in bases):
+            slots += ("__weakref__",)
+        namespace["__slots__"] = slots
+
+        # Compiled methods:
+        scope = {"_defaults": {k: v for k, v in fields.items() if v is not _MISSING}}
+        lookup = functools.partial(_inherited, bases)
+        if "__init__" not in namespace and _generated(lookup("__init__")):
+            namespace["__init__"] = mcs._compile_init(fields, scope)
+        if "to_dict" not in namespace and _generated(lookup("to_dict")):
+            namespace["to_dict"] = mcs._compile_to_dict(fields, scope)
+            if "to_json" not in namespace:
+                namespace["to_json"] = mcs._compile_to_json(fields, scope)
+        elif "to_json" not in namespace:
+            namespace["to_json"] = GenericInterface.to_json
+        if "__repr__" not in namespace and _generated(lookup("__repr__")):
+            namespace["__repr__"] = mcs._compile_repr(fields, scope)
+
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        cls._fields = tuple(fields)
+        cls._field_defaults = scope["_defaults"]
+        cls._field_types = types
+        return cls
+
+    @staticmethod
+    def _compile_init(fields: dict, scope: dict) -> Any:
+        """
+        Returns the compiled initialization method assigning each field.
+        """
+        parameters = ", ".join(
+            field if default is _MISSING else "{0}=_defaults[{0!r}]".format(field)
+            for field, default in fields.items()
+        )
+        body = "".join("    self.{0} = {0}\n".format(field) for field in fields)
+        source = "def __init__(self{}{}):\n{}".format(
+            ", " if parameters else "", parameters, body or "    pass\n"
+        )
+        function = _compile("__init__", source, scope)
+        function._declarative = True
+        return function
+
+    @staticmethod
+    def _compile_to_dict(fields: dict, scope: dict) -> Any:
+        """
+        Returns the compiled method building the configuration dictionary.
+        """
+        items = ", ".join("{0!r}: self.{0}".format(field) for field in fields)
+        source = "def to_dict(self):\n    return {{{}}}\n".format(items)
+        function = _compile("to_dict", source, scope)
+        function._declarative = True
+        return function
+
+    @staticmethod
+    def _compile_to_json(fields: dict, scope: dict) -> Any:
+        """
+        Returns the compiled method encoding the configuration as JSON.
+        """
+        items = ", ".join("{0!r}: self.{0}".format(field) for field in fields)
+        source = (
+            "def to_json(self):\n    return self.encoder().encode({{{}}})\n".format(
+                items
+            )
+        )
+        function = _compile("to_json", source, scope)
+        function._declarative = True
+        return function
+
+    @staticmethod
+    def _compile_repr(fields: dict, scope: dict) -> Any:
+        """
+        Returns the compiled representation method.
+        """
+        items = ", ".join("{0}={{self.{0}!r}}".format(field) for field in fields)
+        source = "def __repr__(self):\n    return f'{{type(self).__qualname__}}({})'\n".format(
+            items
+        )
+        function = _compile("__repr__", source, scope)
+        function._declarative = True
+        return function
+
+
+class DeclarativeInterface(GenericInterface, metaclass=DeclarativeMeta):
+    """
+    Interface generating its :meth:`__init__`, :meth:`to_dict`, :meth:`to_json`
+    and ``__slots__`` from declared fields (see module :py:mod:`newproject.interfaces.declarative`).
+    Field names, default values and types are exposed by class members :attr:`_fields`,
+    :attr:`_field_defaults` and :attr:`_field_types`.
+    """
+
+    __slots__ = ()
+
+    _fields: tuple = ()
+    _field_defaults: dict = {}
+    _field_types: dict = {}
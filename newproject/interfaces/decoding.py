@@ -0,0 +1,337 @@
+"""
+Module :py:mod:`newproject.interfaces.decoding` decodes JSON configurations back to the
+types of interface fields (see :meth:`GenericInterface.from_json`).
+
+Serializers export values which are not JSON native as strings or numbers (eg. ISO 8601
+strings for temporal values), so ``factory(**json.loads(text))`` hands these encoded
+values to :meth:`__init__`. Field types are read from the annotations of declarative
+fields or of :meth:`__init__` parameters, and each annotated field gets a value decoder:
+
+======================================  =============================================
+Annotation                              Decoded from
+======================================  =============================================
+:class:`datetime.datetime`, ``date``,   ISO 8601 strings (a ``Z`` suffix stands for
+``time``                                UTC)
+:class:`datetime.timedelta`             seconds
+:class:`decimal.Decimal`                strings or numbers
+:class:`uuid.UUID`, paths               strings
+:class:`enum.Enum` subclasses           member values
+:class:`numpy.ndarray`                  array envelopes (see :py:mod:`.arrays`)
+interfaces                              configuration dictionaries (decoded
+                                        recursively)
+``Optional[X]``, ``List[X]``,           containers of decoded values
+``Tuple[X, ...]``, ``Set[X]``,
+``Dict[K, X]``
+======================================  =============================================
+
+Values which are not in their encoded form (eg. already decoded) are kept as is,
+fields without annotations or annotated with other types are not decoded.
+Decoders are resolved once per class and cached as its decoder plan:
+
+.. code-block:: python
+
+    text = TemporalCase(start=datetime.datetime(2021, 1, 1)).to_json()
+    TemporalCase.from_json(text).start  # datetime.datetime(2021, 1, 1, 0, 0)
+
+Large batches of timestamps are decoded column-wise into NumPy ``datetime64`` arrays by
+:func:`parse_datetimes`, used by :meth:`InterfaceCollection.from_dicts` when decode is true.
+"""
+
+import collections.abc
+import datetime
+import decimal
+import enum
+import pathlib
+import types
+import typing
+import uuid
+import warnings
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Type
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import arrays, generic
+
+_UNIONS = (typing.Union, getattr(types, "UnionType", typing.Union))
+
+
+def _datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.datetime.fromisoformat(value)
+    return value
+
+
+def _date(value: Any) -> Any:
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    return value
+
+
+def _time(value: Any) -> Any:
+    if isinstance(value, str):
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.time.fromisoformat(value)
+    return value
+
+
+def _timedelta(value: Any) -> Any:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.timedelta(seconds=value)
+    return value
+
+
+def _decimal(value: Any) -> Any:
+    if isinstance(value, (str, int)):
+        return decimal.Decimal(value)
+    if isinstance(value, float):
+        return decimal.Decimal(repr(value))
+    return value
+
+
+def _ndarray(value: Any) -> Any:
+    if isinstance(value, dict):
+        return arrays.object_hook(value)
+    return value
+
+
+#: Decoders of scalar types
+_scalars: Dict[type, Callable[[Any], Any]] = {
+    datetime.datetime: _datetime,
+    datetime.date: _date,
+    datetime.time: _time,
+    datetime.timedelta: _timedelta,
+    decimal.Decimal: _decimal,
+}
+
+
+def _converter(kind: type, encoded: type) -> Callable[[Any], Any]:
+    """
+    Returns the decoder calling kind on values of the encoded type (except None).
+    """
+
+    def decode(value: Any) -> Any:
+        if (
+            value is not None
+            and isinstance(value, encoded)
+            and not isinstance(value, kind)
+        ):
+            return kind(value)
+        return value
+
+    return decode
+
+
+def _interface(kind: Type[generic.GenericInterface]) -> Callable[[Any], Any]:
+    def decode(value: Any) -> Any:
+        if isinstance(value, dict):
+            return kind.from_dict(value)
+        return value
+
+    return decode
+
+
+def _container(
+    origin: type, item: Callable[[Any], Any], keys: bool = False
+) -> Callable[[Any], Any]:
+    """
+    Returns the decoder of lists (converted to origin) or dictionaries of decoded items.
+    """
+    if keys:
+        return lambda value: (
+            {key: item(x) for key, x in value.items()}
+            if isinstance(value, dict)
+            else value
+        )
+    return lambda value: (
+        origin(item(x) for x in value) if isinstance(value, (list, tuple)) else value
+    )
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def value_decoder(kind: Any) -> Optional[Callable[[Any], Any]]:
+    """
+    Returns the decoder of JSON values encoding values of the annotated type,
+    or None when values of this type are not decoded.
+    """
+    origin = typing.get_origin(kind)
+    arguments = typing.get_args(kind)
+    if origin in _UNIONS:
+        candidates = [argument for argument in arguments if argument is not type(None)]
+        # Decoders keep None, ambiguous unions are not decoded:
+        return value_decoder(candidates[0]) if len(candidates) == 1 else None
+    if origin is not None:
+        if origin in (dict, collections.abc.Mapping, collections.abc.MutableMapping):
+            item = value_decoder(arguments[1]) if len(arguments) == 2 else None
+            return _container(dict, item, keys=True) if item else None
+        if origin is tuple and arguments and arguments[-1] is not Ellipsis:
+            items = [value_decoder(argument) or _identity for argument in arguments]
+            return lambda value: (
+                tuple(item(x) for item, x in zip(items, value))
+                if isinstance(value, list)
+                else value
+            )
+        if origin in (list, tuple, set, frozenset, collections.abc.Sequence):
+            item = value_decoder(arguments[0]) if arguments else None
+            if origin in (list, collections.abc.Sequence):
+                return _container(list, item) if item else None
+            return _container(origin, item or _identity)
+        return None
+    if not isinstance(kind, type):
+        return None
+    if kind in _scalars:
+        return _scalars[kind]
+    if kind in (tuple, set, frozenset):
+        return _container(kind, _identity)
+    if issubclass(kind, enum.Enum):
+        return _converter(kind, object)
+    if issubclass(kind, (uuid.UUID, pathlib.PurePath)):
+        return _converter(kind, str)
+    if issubclass(kind, generic.GenericInterface):
+        return _interface(kind)
+    if generic._type_name(kind) == "numpy.ndarray":
+        return _ndarray
+    return None
+
+
+def field_types(cls: Type[generic.GenericInterface]) -> Dict[str, Any]:
+    """
+    Returns the annotated types of an interface fields: declared fields types for
+    declarative interfaces, :meth:`__init__` parameters annotations otherwise.
+    """
+    declared = getattr(cls, "_field_types", None)
+    try:
+        hints = typing.get_type_hints(cls if declared is not None else cls.__init__)
+    except (NameError, TypeError):
+        # Unresolved forward references:
+        hints = {}
+    if declared is not None:
+        return {name: hints.get(name, kind) for name, kind in declared.items()}
+    hints.pop("return", None)
+    return hints
+
+
+def plan(cls: Type[generic.GenericInterface]) -> Dict[str, Callable[[Any], Any]]:
+    """
+    Returns the decoders of an interface fields which values are decoded, resolved once
+    per class.
+    """
+    decoders = cls.__dict__.get("_decoder_plan")
+    if decoders is None:
+        decoders = {}
+        for name, kind in field_types(cls).items():
+            decoder = value_decoder(kind)
+            if decoder is not None:
+                decoders[name] = decoder
+        cls._decoder_plan = decoders
+    return decoders
+
+
+def decode(cls: Type[generic.GenericInterface], configuration: dict) -> dict:
+    """
+    Returns the configuration with values of annotated fields decoded (the configuration
+    itself is left unchanged). Invalid encoded values raise :class:`InvalidParameter`.
+    """
+    decoders = plan(cls)
+    if not decoders:
+        return configuration
+    result = dict(configuration)
+    for name, decoder in decoders.items():
+        if name in result:
+            try:
+                result[name] = decoder(result[name])
+            except (TypeError, ValueError, ArithmeticError, InvalidParameter) as error:
+                raise InvalidParameter(
+                    "Invalid value for field {!r} of {}: {}".format(
+                        name, cls.__name__, error
+                    )
+                ) from error
+    return result
+
+
+def decode_many(
+    cls: Type[generic.GenericInterface], configurations: Iterable[dict]
+) -> Iterator[dict]:
+    """
+    Yields decoded configurations (see :func:`decode`).
+    """
+    for configuration in configurations:
+        yield decode(cls, configuration)
+
+
+def parse_datetimes(values: Iterable[Any], unit: str = "us") -> Any:
+    """
+    Returns ISO 8601 strings (or datetime objects) as a NumPy ``datetime64`` array of the
+    given unit, parsed at once. None values become ``NaT``, values with a UTC offset are
+    converted to UTC.
+    """
+    import numpy as np
+
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    try:
+        with warnings.catch_warnings():
+            # Timezone offsets are deprecated by NumPy:
+            warnings.simplefilter("ignore")
+            return np.array(values, dtype="datetime64[{}]".format(unit))
+    except (TypeError, ValueError) as error:
+        raise InvalidParameter("Invalid datetime values: {}".format(error)) from error
+
+
+def parse_timedeltas(values: Iterable[Any], unit: str = "us") -> Any:
+    """
+    Returns durations in seconds (or timedelta objects) as a NumPy ``timedelta64`` array
+    of the given unit. None values become ``NaT``.
+    """
+    import numpy as np
+
+    values = [
+        value.total_seconds() if isinstance(value, datetime.timedelta) else value
+        for value in values
+    ]
+    try:
+        seconds = np.array(values, dtype=float)
+    except (TypeError, ValueError) as error:
+        raise InvalidParameter("Invalid duration values: {}".format(error)) from error
+    dtype = "timedelta64[{}]".format(unit)
+    scale = np.timedelta64(1, "s") // np.array(1, dtype=dtype)
+    result = np.round(seconds * scale).astype(dtype)
+    result[np.isnan(seconds)] = np.timedelta64("NaT")
+    return result
+
+
+def columns(
+    cls: Type[generic.GenericInterface], values: Dict[str, list]
+) -> Dict[str, Any]:
+    """
+    Returns columns of encoded values decoded column-wise: datetime and date fields
+    become ``datetime64`` arrays, timedelta fields ``timedelta64`` arrays (with
+    microsecond and day units, converted back to Python objects on access), values
+    of other annotated fields are decoded one by one.
+    """
+    decoders = plan(cls)
+    result: Dict[str, Any] = {}
+    for name, column in values.items():
+        decoder = decoders.get(name)
+        if decoder is _datetime:
+            result[name] = parse_datetimes(column, unit="us")
+        elif decoder is _date:
+            result[name] = parse_datetimes(column, unit="D")
+        elif decoder is _timedelta:
+            result[name] = parse_timedeltas(column, unit="us")
+        elif decoder is not None:
+            try:
+                result[name] = [decoder(value) for value in column]
+            except (TypeError, ValueError, ArithmeticError) as error:
+                raise InvalidParameter(
+                    "Invalid value for field {!r} of {}: {}".format(
+                        name, cls.__name__, error
+                    )
+                ) from error
+        else:
+            result[name] = column
+    return result
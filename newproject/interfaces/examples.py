@@ -6,8 +6,9 @@ and :py:mod:`newproject.tests.test_interfaces_examples` modules for operational
 """
 
 import datetime
-from typing import Any
+from typing import Any, Optional, Sequence
 
+from newproject.interfaces.declarative import DeclarativeInterface
 from newproject.interfaces.generic import GenericInterface
 
 
@@ -49,7 +50,8 @@ class SimpleCaseWithSerializer(SimpleCase):
     """
     This class shows a simple case inherited from :class:`SimpleCase` with serializer.
     It overrides the :meth:`newproject.interfaces.generic.GenericInterface.serializer`
-    method in order to provide the missing helper for :class:`datetime.datetime` object.
+    method in order to provide its own helper for :class:`datetime.datetime` object,
+    any other value is dispatched to handlers registered on the class.
 
     .. code-block:: python
 
@@ -62,8 +64,8 @@ class SimpleCaseWithSerializer(SimpleCase):
 
     """
 
-    @staticmethod
-    def serializer(instance: Any) -> Any:
+    @classmethod
+    def serializer(cls, instance: Any) -> Any:
         """
         Provides an helper for :class:`datetime.datetime` object as it is not JSON serializable.
         Returns the result of parent serializer in any other cases.
@@ -71,3 +73,90 @@ class SimpleCaseWithSerializer(SimpleCase):
         if isinstance(instance, datetime.datetime):
             return instance.isoformat()
         return super().serializer(instance)
+
+
+class SimpleDeclarativeCase(DeclarativeInterface):
+    """
+    This class shows the declarative counterpart of :class:`SimpleCase`.
+    Its :meth:`__init__`, :meth:`to_dict` and :meth:`to_json` methods are generated
+    from the annotated field and instances store it in slots instead of a ``__dict__``:
+
+    .. code-block:: python
+
+        a = SimpleDeclarativeCase(value="dummy")
+        a.to_dict()  # returns: {"value": "dummy"}
+        a.to_json()  # returns: '{"value": "dummy"}'
+        a  # returns: SimpleDeclarativeCase(value='dummy')
+
+    """
+
+    value: Any = None
+
+
+class TemporalCase(DeclarativeInterface):
+    """
+    This class shows a declarative interface with typed temporal fields. Values are exported
+    as ISO 8601 strings and seconds by :meth:`to_json` and decoded back to their types by
+    :meth:`from_json` (see module :py:mod:`newproject.interfaces.decoding`):
+
+    .. code-block:: python
+
+        a = TemporalCase(start=datetime.datetime(2021, 1, 1), duration=datetime.timedelta(hours=1))
+        a.to_json()
+        # returns: '{"start": "2021-01-01T00:00:00", "duration": 3600.0, "end": null}'
+        TemporalCase.from_json(a.to_json()).to_dict() == a.to_dict()  # returns: True
+
+    """
+
+    start: datetime.datetime
+    duration: datetime.timedelta = datetime.timedelta(0)
+    end: Optional[datetime.date] = None
+
+
+class ValidatedCase(GenericInterface):
+    """
+    This class shows an interface validating its constructor arguments from the annotations
+    of :meth:`__init__` (see module :py:mod:`newproject.interfaces.validation`). Arguments
+    in their JSON encoded form are coerced and invalid ones raise
+    :class:`newproject.errors.InvalidParameter`:
+
+    .. code-block:: python
+
+        a = ValidatedCase(name="dummy", ratio=1, start="2021-01-01T00:00:00")
+        a.ratio  # returns: 1.0
+        a.start  # returns: datetime.datetime(2021, 1, 1, 0, 0)
+        ValidatedCase(name=None, count="1")
+        # InvalidParameter: Invalid ValidatedCase parameters: name: expected str, ...
+
+    """
+
+    validated = True
+
+    def __init__(
+        self,
+        name: str,
+        count: int = 0,
+        ratio: float = 1.0,
+        start: Optional[datetime.datetime] = None,
+        tags: Sequence[str] = (),
+    ) -> None:
+        """
+        Initialization method stores checked arguments into the object.
+        """
+        self.name = name
+        self.count = count
+        self.ratio = ratio
+        self.start = start
+        self.tags = list(tags)
+
+    def to_dict(self) -> dict:
+        """
+        Returns the object configuration as a dictionary.
+        """
+        return {
+            "name": self.name,
+            "count": self.count,
+            "ratio": self.ratio,
+            "start": self.start,
+            "tags": self.tags,
+        }
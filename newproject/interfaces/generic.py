@@ -5,8 +5,132 @@ all interfaces must implement.
 """
 
 import abc
+import datetime
+import decimal
+import enum
+import itertools
 import json
-from typing import Any
+import pathlib
+import uuid
+from json import encoder as _json_encoder
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import arrays, binary
+
+#: Serializer handler of values of a type
+Handler = Callable[[Any], Any]
+
+
+def _make_iterencoder(encoder: json.JSONEncoder) -> Callable[[Any], Iterable[str]]:
+    """
+    Returns a function encoding an object into string chunks using a single encoder
+    instance. When the C accelerator is available, the returned function is a bare C encoder
+    (with its own circular reference markers) which avoids the per call setup
+    of :meth:`json.JSONEncoder.encode`.
+    """
+    make_encoder = getattr(_json_encoder, "c_make_encoder", None)
+    if make_encoder is None or encoder.indent is not None:
+        return lambda o: encoder.iterencode(o, _one_shot=True)
+    c_encoder = make_encoder(
+        {} if encoder.check_circular else None,
+        encoder.default,
+        (
+            _json_encoder.encode_basestring_ascii
+            if encoder.ensure_ascii
+            else _json_encoder.encode_basestring
+        ),
+        None,
+        encoder.key_separator,
+        encoder.item_separator,
+        encoder.sort_keys,
+        encoder.skipkeys,
+        encoder.allow_nan,
+    )
+    return lambda o: c_encoder(o, 0)
+
+
+def _identity(instance: Any) -> Any:
+    """Returns JSON native values unchanged"""
+    return instance
+
+
+def _fallback(instance: Any) -> Any:
+    """Returns the instance attributes, used when no handler is registered for its type"""
+    return instance.__dict__
+
+
+def _isoformat(instance: Union[datetime.date, datetime.time]) -> str:
+    """Returns ISO 8601 representation of temporal values"""
+    return instance.isoformat()
+
+
+def _total_seconds(instance: datetime.timedelta) -> float:
+    """Returns the duration in seconds"""
+    return instance.total_seconds()
+
+
+def _string(instance: Any) -> str:
+    """Returns the string representation of the value"""
+    return str(instance)
+
+
+def _enum(instance: enum.Enum) -> Any:
+    """Returns the value of enumeration members"""
+    return instance.value
+
+
+def _set(instance: Union[set, frozenset]) -> list:
+    """Returns set items as a list (sorted when items are comparable)"""
+    try:
+        return sorted(instance)
+    except TypeError:
+        return list(instance)
+
+
+def _item(instance: Any) -> Any:
+    """Returns NumPy scalars as Python scalars"""
+    return instance.item()
+
+
+def _configuration(instance: "GenericInterface") -> dict:
+    """Returns the configuration of nested interfaces"""
+    return instance.to_dict()
+
+
+def _type_name(kind: type) -> str:
+    """Returns the fully qualified name of a type"""
+    return "{}.{}".format(kind.__module__, kind.__qualname__)
+
+
+def _lookup(registries: List[Dict[Any, Handler]], kind: type) -> Handler:
+    """Returns the first handler matching the type MRO in the ordered registries"""
+    for base in kind.__mro__:
+        name = _type_name(base)
+        for registry in registries:
+            handler = registry.get(base) or registry.get(name)
+            if handler is not None:
+                return handler
+    return _fallback
+
+
+def _subclasses(cls: type) -> Iterator[Any]:
+    """Yields the class and all its subclasses recursively"""
+    yield cls
+    subclasses: List[type] = cls.__subclasses__()
+    for subclass in subclasses:
+        yield from _subclasses(subclass)
 
 
 class GenericInterface(abc.ABC):
@@ -15,6 +139,73 @@ class GenericInterface(abc.ABC):
     This class must be subclassed by any other interfaces.
     """
 
+    __slots__ = ()
+
+    #: Number of objects encoded before a chunk is yielded by bulk serialization methods.
+    chunksize = 1024
+
+    #: Objects are compared by configuration and hashed by configuration digest when
+    #: true, by identity otherwise (see module :py:mod:`newproject.interfaces.hashing`).
+    #: Hashable objects must not be mutated once hashed.
+    hashable = False
+
+    #: JSON encoder of the class, created on first use (see :meth:`encoder`).
+    _encoder: ClassVar[json.JSONEncoder]
+    #: Binary format default hook of the class, created on first use
+    #: (see :meth:`binary_serializer`).
+    _binary_serializer: ClassVar[Handler]
+    #: Canonical JSON encoding function of the class, created on first use
+    #: (see :func:`newproject.interfaces.hashing.encoder`).
+    _canonical_encoder: ClassVar[Callable[[Any], Iterable[str]]]
+    #: Decoders of the fields which values are decoded, resolved on first use
+    #: (see :func:`newproject.interfaces.decoding.plan`).
+    _decoder_plan: ClassVar[Dict[str, Handler]]
+    #: Compiled checks of the class, resolved on first construction
+    #: (see :func:`newproject.interfaces.validation.plan`).
+    _validator_plan: ClassVar[Any]
+
+    #: Serializer handlers registered on this class, keyed by type or fully qualified type name.
+    _serializers = {
+        str: _identity,
+        int: _identity,
+        float: _identity,
+        bool: _identity,
+        type(None): _identity,
+        list: _identity,
+        tuple: _identity,
+        dict: _identity,
+        datetime.date: _isoformat,
+        datetime.time: _isoformat,
+        datetime.timedelta: _total_seconds,
+        decimal.Decimal: _string,
+        uuid.UUID: _string,
+        pathlib.PurePath: _string,
+        enum.Enum: _enum,
+        set: _set,
+        frozenset: _set,
+        "numpy.generic": _item,
+        "numpy.ndarray": arrays.to_json,
+    }
+    #: Handlers resolved per concrete type.
+    _serializer_cache: Dict[type, Handler] = {}
+
+    #: Validates and coerces :meth:`__init__` arguments from their annotations when true
+    #: (see module :py:mod:`newproject.interfaces.validation`).
+    validated = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._serializers = {}
+        cls._serializer_cache = {}
+        if cls.validated or getattr(cls.__init__, "_validated", False):
+            from newproject.interfaces import validation
+
+            validation.install(cls)
+        if cls.hashable or "hashable" in cls.__dict__:
+            from newproject.interfaces import hashing
+
+            hashing.install(cls)
+
     @abc.abstractmethod
     def to_dict(self) -> dict:
         """
@@ -25,20 +216,413 @@ class GenericInterface(abc.ABC):
         Override :meth:`serializer` method to add JSON serialization helpers if needed.
         """
 
-    @staticmethod
-    def serializer(instance: Any) -> Any:
+    @classmethod
+    def serializer(cls, instance: Any) -> Any:
         """
         JSON Serializer provided as default to :meth:`to_json` method when serializing
         object configuration.
         This method must provide missing serialization helpers in order to allow
         valid JSON export and object reconstruction.
+
+        Helpers are dispatched on the value type using handlers registered with
+        :meth:`register_serializer`, the handler of each concrete type is resolved once
+        and cached (see :meth:`resolve_serializer`). When no handler applies, the instance
+        attributes are returned. Subclasses overriding this method should call
+        ``super().serializer(instance)`` for values they do not handle.
+        """
+        try:
+            handler = cls._serializer_cache[type(instance)]
+        except KeyError:
+            handler = cls.resolve_serializer(type(instance))
+        return handler(instance)
+
+    @classmethod
+    def register_serializer(
+        cls, kind: Union[type, str], handler: Optional[Handler] = None
+    ) -> Callable:
+        """
+        Registers a serializer handler for values of the given type (and its subtypes)
+        on this class and its subclasses. Type can be given by its fully qualified name
+        (eg. ``"numpy.ndarray"``) to avoid importing its module.
+        Can be used as a decorator when handler is omitted:
+
+        .. code-block:: python
+
+            @SimpleCase.register_serializer(complex)
+            def complex_serializer(instance):
+                return [instance.real, instance.imag]
+
         """
-        if isinstance(instance, (str, int, float)) or instance is None:
-            return instance
-        return instance.__dict__
+        if handler is None:
+            return lambda handler: cls.register_serializer(kind, handler)
+        cls._serializers[kind] = handler
+        for subclass in _subclasses(cls):
+            subclass._serializer_cache.clear()
+        return handler
+
+    @classmethod
+    def resolve_serializer(cls, kind: type) -> Callable[[Any], Any]:
+        """
+        Returns the serializer handler for values of the given type and caches it.
+        The most specific registered type in the value type MRO wins, for the same type
+        handlers registered on subclasses take precedence over their parents.
+        """
+        cache = cls._serializer_cache
+        if kind in cache:
+            return cache[kind]
+        registries = [klass.__dict__.get("_serializers", {}) for klass in cls.__mro__]
+        handler = _lookup(registries, kind)
+        cache[kind] = handler
+        return handler
+
+    @classmethod
+    def encoder(cls) -> json.JSONEncoder:
+        """
+        Returns the JSON encoder of the class configured with its :meth:`serializer`.
+        The encoder is created once per class and reused by all serialization methods.
+        """
+        encoder = cls.__dict__.get("_encoder")
+        if encoder is None:
+            encoder = json.JSONEncoder(default=cls.serializer)
+            cls._encoder = encoder
+        return encoder
 
     def to_json(self) -> str:
         """
         Returns the object configuration as a JSON string.
         """
-        return json.dumps(self.to_dict(), default=self.serializer)
+        return self.encoder().encode(self.to_dict())
+
+    @classmethod
+    def binary_serializer(cls) -> Callable[[Any], Any]:
+        """
+        Returns the default hook of the binary format configured with :meth:`serializer`,
+        NumPy arrays are exported as raw buffers (see module :py:mod:`newproject.interfaces.arrays`).
+        The hook is created once per class.
+        """
+        default = cls.__dict__.get("_binary_serializer")
+        if default is None:
+            serializer = cls.serializer
+
+            def default(instance: Any) -> Any:
+                if arrays.is_ndarray(instance):
+                    return arrays.to_ext(instance)
+                return serializer(instance)
+
+            cls._binary_serializer = default
+        return default
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the object configuration in the compact binary format
+        (see module :py:mod:`newproject.interfaces.binary`).
+        Values are converted by :meth:`serializer` exactly like in :meth:`to_json`.
+        """
+        return binary.packb(self.to_dict(), default=self.binary_serializer())
+
+    @classmethod
+    def from_bytes(cls, data: Any, zero_copy: bool = False) -> "GenericInterface":
+        """
+        Creates an object from a configuration encoded by :meth:`to_bytes`.
+        Data can be any bytes-like object (bytes, bytearray, memoryview, mmap...),
+        it is decoded in place without being copied. When zero_copy is true,
+        binary values and NumPy arrays are views of data instead of copies.
+        """
+        configuration = binary.unpackb(
+            data,
+            ext_hook=lambda code, view: arrays.from_ext(code, view, copy=not zero_copy),
+            zero_copy=zero_copy,
+        )
+        if not isinstance(configuration, dict):
+            raise InvalidParameter(
+                "Binary data must encode a configuration mapping, received {}".format(
+                    type(configuration).__name__
+                )
+            )
+        return cls(**configuration)
+
+    @classmethod
+    def from_dict(cls, configuration: dict) -> "GenericInterface":
+        """
+        Creates an object from a configuration where values of annotated fields may be
+        in their JSON encoded form (eg. ISO 8601 strings for datetime fields): they are
+        decoded back to the field types with the class decoder plan
+        (see module :py:mod:`newproject.interfaces.decoding`).
+        """
+        from newproject.interfaces import decoding
+
+        return cls(**decoding.decode(cls, configuration))
+
+    @classmethod
+    def from_json(cls, text: Union[str, bytes]) -> "GenericInterface":
+        """
+        Creates an object from a configuration encoded by :meth:`to_json`, values of
+        annotated fields are decoded back to their types (see :meth:`from_dict`).
+        """
+        configuration = json.loads(text)
+        if not isinstance(configuration, dict):
+            raise InvalidParameter(
+                "JSON data must encode a configuration mapping, received {}".format(
+                    type(configuration).__name__
+                )
+            )
+        return cls.from_dict(configuration)
+
+    @classmethod
+    def from_dicts(cls, configurations: Iterable[dict]) -> Iterator["GenericInterface"]:
+        """
+        Yields objects created from configurations (see :meth:`from_dict`),
+        the decoder plan is resolved once for all configurations.
+        """
+        from newproject.interfaces import decoding
+
+        for configuration in decoding.decode_many(cls, configurations):
+            yield cls(**configuration)
+
+    @classmethod
+    def validate_many(cls, configurations: Iterable[Any]) -> Any:
+        """
+        Checks configurations against the annotations of :meth:`__init__` parameters in one
+        pass and returns coerced configurations with per-record errors instead of raising
+        (see :func:`newproject.interfaces.validation.validate_many`).
+        """
+        from newproject.interfaces import validation
+
+        return validation.validate_many(cls, configurations)
+
+    def config_hash(self) -> str:
+        """
+        Returns the hexadecimal digest of the object configuration canonical form: its JSON
+        encoding with sorted keys, independent from keys order and stable across processes
+        (see module :py:mod:`newproject.interfaces.hashing`).
+        """
+        from newproject.interfaces import hashing
+
+        return hashing.config_hash(self)
+
+    def intern(self) -> "GenericInterface":
+        """
+        Returns the shared object equal to this one from the process-wide intern table,
+        this object is shared when no equal object is alive
+        (see :class:`newproject.interfaces.hashing.InternTable`).
+        """
+        from newproject.interfaces import hashing
+
+        shared: GenericInterface = hashing.table.intern(self)
+        return shared
+
+    def to_graph(self) -> dict:
+        """
+        Returns the object encoded as a graph: objects and containers referenced several times
+        (including cycles) are encoded once and referenced by identifiers afterward
+        (see module :py:mod:`newproject.interfaces.graph`). Output is JSON serializable.
+        """
+        from newproject.interfaces import graph
+
+        data: dict = graph.encode(self, type(self).serializer)
+        return data
+
+    def to_json_graph(self) -> str:
+        """
+        Returns the graph encoding of the object (see :meth:`to_graph`) as a JSON string.
+        """
+        return json.dumps(self.to_graph())
+
+    @classmethod
+    def from_graph(cls, data: Any, types: Iterable[type] = ()) -> "GenericInterface":
+        """
+        Creates an object from its graph encoding (see :meth:`to_graph`) restoring shared
+        references and cycles. Objects which are not interfaces are only rebuilt
+        when their type is allowed in types.
+        """
+        from newproject.interfaces import graph
+
+        instance = graph.decode(data, types=types)
+        if not isinstance(instance, cls):
+            raise InvalidParameter(
+                "Graph does not encode a {} object, received {}".format(
+                    cls.__name__, type(instance).__name__
+                )
+            )
+        return instance
+
+    @classmethod
+    def from_json_graph(
+        cls, text: str, types: Iterable[type] = ()
+    ) -> "GenericInterface":
+        """
+        Creates an object from the JSON string of its graph encoding (see :meth:`from_graph`).
+        """
+        return cls.from_graph(json.loads(text), types=types)
+
+    def snapshot(self) -> None:
+        """
+        Records a copy of the current object configuration, later changes are exported
+        by :meth:`to_patch` (see module :py:mod:`newproject.interfaces.patch`).
+        """
+        from newproject.interfaces import patch
+
+        patch.snapshot(self, self.to_dict())
+
+    def to_patch(self, update: bool = True) -> list:
+        """
+        Returns the JSON patch (RFC 6902 operations) of the configuration changes since
+        the last snapshot. When update is true, the snapshot is moved to the current
+        configuration so successive patches are incremental.
+        """
+        from newproject.interfaces import patch
+
+        return patch.changes(self, self.to_dict(), update=update)
+
+    def to_json_patch(self, update: bool = True) -> str:
+        """
+        Returns the JSON patch of the configuration changes (see :meth:`to_patch`)
+        as a JSON string, values are converted by :meth:`serializer`.
+        """
+        return self.encoder().encode(self.to_patch(update=update))
+
+    def apply_patch(self, operations: Union[list, str, bytes]) -> "GenericInterface":
+        """
+        Returns a new object created from the object configuration patched by the JSON patch
+        (list of operations or its JSON string), the object itself is left unchanged.
+        """
+        from newproject.interfaces import patch
+
+        changes: list = (
+            json.loads(operations)
+            if isinstance(operations, (str, bytes))
+            else operations
+        )
+        return type(self)(**patch.apply(self.to_dict(), changes))
+
+    @classmethod
+    def load_iter(
+        cls,
+        source: Any,
+        chunk_size: Optional[int] = None,
+        on_error: Optional[Callable[[InvalidParameter], Any]] = None,
+    ) -> Iterator["GenericInterface"]:
+        """
+        Yields objects lazily from a NDJSON or JSON array stream (path, file-like object,
+        socket or iterable of chunks) read by chunks, malformed records raise
+        :class:`InvalidParameter` with their byte offset unless on_error is given
+        (see :func:`newproject.interfaces.stream.load_iter`).
+        """
+        from newproject.interfaces import stream
+
+        return stream.load_iter(
+            source, cls, chunk_size=chunk_size or stream.CHUNK_SIZE, on_error=on_error
+        )
+
+    @classmethod
+    def to_json_many(
+        cls, instances: Iterable["GenericInterface"], chunksize: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Yields chunks of a JSON array holding the configurations of all instances.
+        Chunks are built from at most :attr:`chunksize` objects encoded at once by a single
+        encoder, so memory stays flat regardless of the number of instances.
+        Joined chunks are equal to the JSON array of each object :meth:`to_json` output.
+        """
+        iterencode = _make_iterencoder(cls.encoder())
+        chunksize = chunksize or cls.chunksize
+        iterator = iter(instances)
+        separator = "["
+        while True:
+            chunk = [
+                instance.to_dict() for instance in itertools.islice(iterator, chunksize)
+            ]
+            if not chunk:
+                break
+            yield separator + "".join(iterencode(chunk))[1:-1]
+            separator = ", "
+        yield "[]" if separator == "[" else "]"
+
+    @classmethod
+    def to_ndjson_many(
+        cls, instances: Iterable["GenericInterface"], chunksize: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Yields chunks of newline delimited JSON (one object configuration per line).
+        Chunks are built from at most :attr:`chunksize` objects.
+        """
+        iterencode = _make_iterencoder(cls.encoder())
+        chunksize = chunksize or cls.chunksize
+        iterator = iter(instances)
+        while True:
+            chunk = [
+                "".join(iterencode(instance.to_dict()))
+                for instance in itertools.islice(iterator, chunksize)
+            ]
+            if not chunk:
+                break
+            yield "\n".join(chunk) + "\n"
+
+    @classmethod
+    def dump_json(
+        cls,
+        instances: Iterable["GenericInterface"],
+        fp: IO[str],
+        chunksize: Optional[int] = None,
+    ) -> None:
+        """
+        Writes instances configurations as a JSON array into the file-like object.
+        """
+        for chunk in cls.to_json_many(instances, chunksize=chunksize):
+            fp.write(chunk)
+
+    @classmethod
+    def dump_ndjson(
+        cls,
+        instances: Iterable["GenericInterface"],
+        fp: IO[str],
+        chunksize: Optional[int] = None,
+    ) -> None:
+        """
+        Writes instances configurations as newline delimited JSON into the file-like object.
+        """
+        for chunk in cls.to_ndjson_many(instances, chunksize=chunksize):
+            fp.write(chunk)
+
+    @classmethod
+    def encode_parallel(
+        cls,
+        instances: Iterable["GenericInterface"],
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        executor: Any = None,
+    ) -> Iterator[str]:
+        """
+        Yields the JSON strings of instances configurations in input order, encoded by chunks
+        of :attr:`chunksize` objects on a pool of workers processes (or on the given executor).
+        Small inputs are encoded in process
+        (see :func:`newproject.interfaces.parallel.encode_parallel`).
+        """
+        from newproject.interfaces import parallel
+
+        return parallel.encode_parallel(
+            cls, instances, workers=workers, chunksize=chunksize, executor=executor
+        )
+
+    @classmethod
+    def decode_parallel(
+        cls,
+        documents: Iterable[Union[str, bytes]],
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        executor: Any = None,
+    ) -> Iterator["GenericInterface"]:
+        """
+        Yields objects created from JSON documents (eg. NDJSON lines) in input order,
+        documents are parsed by chunks on a pool of workers processes
+        (see :func:`newproject.interfaces.parallel.decode_parallel`).
+        """
+        from newproject.interfaces import parallel
+
+        return parallel.decode_parallel(
+            cls, documents, workers=workers, chunksize=chunksize, executor=executor
+        )
+
+
+# Interfaces nested in configurations are exported as their configuration:
+GenericInterface._serializers[GenericInterface] = _configuration
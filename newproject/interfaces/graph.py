@@ -0,0 +1,230 @@
+"""
+Module :py:mod:`newproject.interfaces.graph` encodes object graphs preserving shared
+references and cycles (see :meth:`GenericInterface.to_graph`).
+
+Plain :meth:`GenericInterface.to_json` encodes a value once per reference: sub-objects shared
+by several parents are repeated (exponentially for deep DAGs) and cycles fail.
+Graph encoding walks the configuration twice: first to count references of each
+distinct container and object, then to emit JSON values where objects referenced
+more than once are written on first occurrence with an ``$id`` and replaced by
+``{"$ref": id}`` afterward. Encoding is linear in the number of distinct objects.
+Nodes of the encoded graph are:
+
+- interface objects: ``{"$type": name, "$config": {...}}``, rebuilt with
+  ``factory(**config)`` (shared ones are allocated first and initialized once their
+  configuration is decoded, so cycles through them are restored);
+- objects serialized by the attributes fallback of :meth:`GenericInterface.serializer`:
+  ``{"$type": name, "$state": {...}}``, rebuilt by restoring their ``__dict__``;
+- shared lists and dictionaries: ``{"$id": id, "$list": [...]}`` and
+  ``{"$id": id, "$dict": {...}}``, dictionaries having keys starting with ``$``
+  are escaped as ``{"$dict": {...}}``;
+- any other value is converted by the interface :meth:`serializer`.
+
+.. code-block:: python
+
+    shared = SimpleCase(value="leaf")
+    root = SimpleCase(value=[shared, shared])
+    root.value.append(root)  # cycle
+    data = root.to_graph()
+    # {"$id": 1, "$type": "...SimpleCase", "$config": {"value": {"$list": [
+    #     {"$id": 2, "$type": "...SimpleCase", "$config": {"value": "leaf"}},
+    #     {"$ref": 2}, {"$ref": 1}]}}}
+    copy = SimpleCase.from_graph(data)
+    copy.value[0] is copy.value[1] and copy.value[2] is copy  # True
+
+On load, types are only resolved among interface classes and the types explicitly allowed,
+no module is imported from the data.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import generic
+
+_NATIVE = (str, int, float, bool, type(None))
+
+# Node kind ("$config", "$state" or None for containers), content and content serializer:
+_Node = Tuple[Optional[str], Any, Callable[[Any], Any]]
+
+
+class _Encoder:
+    """
+    Two passes graph encoder (see module :py:mod:`newproject.interfaces.graph`).
+    """
+
+    def __init__(self) -> None:
+        # Values by id (kept alive until the end of encoding) and their references count:
+        self.values: Dict[int, Any] = {}
+        self.counts: Dict[int, int] = {}
+        # Node kind, content and content serializer of objects and containers by id:
+        self.nodes: Dict[int, _Node] = {}
+        # Serializer outputs by converted value id:
+        self.substitutes: Dict[int, Any] = {}
+        self.ids: Dict[int, int] = {}
+
+    def count(self, value: Any, serializer: Callable[[Any], Any]) -> None:
+        """
+        First pass: counts references of containers and objects.
+        """
+        if isinstance(value, _NATIVE):
+            return
+        key = id(value)
+        if key in self.substitutes:
+            self.count(self.substitutes[key], serializer)
+            return
+        if key in self.counts:
+            self.counts[key] += 1
+            return
+        self.values[key] = value
+        node: _Node
+        if isinstance(value, generic.GenericInterface):
+            node = ("$config", value.to_dict(), type(value).serializer)
+        elif isinstance(value, (dict, list, tuple)):
+            node = (None, value, serializer)
+        else:
+            result = serializer(value)
+            if result is not getattr(value, "__dict__", None):
+                # Converted values are replaced by the serializer output:
+                self.substitutes[key] = result
+                self.count(result, serializer)
+                return
+            node = ("$state", result, serializer)
+        self.counts[key] = 1
+        self.nodes[key] = node
+        _, content, serializer = node
+        for item in content.values() if isinstance(content, dict) else content:
+            self.count(item, serializer)
+
+    def emit(self, value: Any) -> Any:
+        """
+        Second pass: returns the JSON value of a counted value.
+        """
+        if isinstance(value, _NATIVE):
+            return value
+        key = id(value)
+        if key in self.substitutes:
+            return self.emit(self.substitutes[key])
+        if key in self.ids:
+            return {"$ref": self.ids[key]}
+        kind, content, _ = self.nodes[key]
+        node: dict = {}
+        if self.counts[key] > 1:
+            self.ids[key] = node["$id"] = len(self.ids) + 1
+        if kind is not None:
+            node["$type"] = generic._type_name(type(value))
+            node[kind] = {name: self.emit(item) for name, item in content.items()}
+            return node
+        if isinstance(content, dict):
+            items = {name: self.emit(item) for name, item in content.items()}
+            if node or any(str(name).startswith("$") for name in items):
+                node["$dict"] = items
+                return node
+            return items
+        elements = [self.emit(item) for item in content]
+        if node:
+            node["$list"] = elements
+            return node
+        return elements
+
+
+def encode(instance: Any, serializer: Optional[Callable[[Any], Any]] = None) -> Any:
+    """
+    Returns the graph encoding of an interface object (or any value, converted by
+    serializer, defaulting to :meth:`GenericInterface.serializer`).
+    Too deeply nested values raise :class:`InvalidParameter`.
+    """
+    encoder = _Encoder()
+    serializer = serializer or generic.GenericInterface.serializer
+    try:
+        encoder.count(instance, serializer)
+        return encoder.emit(instance)
+    except RecursionError as error:
+        raise InvalidParameter("Value nesting is too deep") from error
+
+
+class _Decoder:
+    """
+    Graph decoder (see module :py:mod:`newproject.interfaces.graph`).
+    """
+
+    def __init__(self, types: Dict[str, type]) -> None:
+        self.types = types
+        self.objects: Dict[Any, Any] = {}
+
+    def resolve(self, name: Any) -> type:
+        kind = self.types.get(name)
+        if kind is None:
+            raise InvalidParameter(
+                "Type {!r} is not an interface nor an allowed type".format(name)
+            )
+        return kind
+
+    def register(self, node: dict, value: Any) -> Any:
+        if "$id" in node:
+            self.objects[node["$id"]] = value
+        return value
+
+    def decode(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        if "$ref" in value:
+            try:
+                return self.objects[value["$ref"]]
+            except (KeyError, TypeError) as error:
+                raise InvalidParameter(
+                    "Reference {!r} is not defined before use".format(value["$ref"])
+                ) from error
+        if "$list" in value:
+            items = self.register(value, [])
+            items.extend(self.decode(item) for item in value["$list"])
+            return items
+        if "$dict" in value:
+            items = self.register(value, {})
+            items.update(
+                (name, self.decode(item)) for name, item in value["$dict"].items()
+            )
+            return items
+        if "$config" in value:
+            return self.decode_interface(value)
+        if "$state" in value:
+            kind: Any = self.resolve(value.get("$type"))
+            instance = self.register(value, kind.__new__(kind))
+            instance.__dict__.update(
+                (name, self.decode(item)) for name, item in value["$state"].items()
+            )
+            return instance
+        return {name: self.decode(item) for name, item in value.items()}
+
+    def decode_interface(self, node: dict) -> Any:
+        kind = self.resolve(node.get("$type"))
+        if not issubclass(kind, generic.GenericInterface):
+            raise InvalidParameter(
+                "Type {!r} is not an interface".format(node["$type"])
+            )
+        if "$id" not in node:
+            return kind(**self.decode(node["$config"]))
+        # Shared objects are referenced before they are initialized:
+        instance = self.register(node, kind.__new__(kind))
+        instance.__init__(**self.decode(node["$config"]))
+        return instance
+
+
+def decode(data: Any, types: Iterable[type] = ()) -> Any:
+    """
+    Returns the value of a graph encoding with shared references restored.
+    Interface types are resolved among loaded :class:`GenericInterface` subclasses,
+    other object types (attributes fallback) must be allowed in types.
+    """
+    names = {
+        generic._type_name(kind): kind
+        for kind in generic._subclasses(generic.GenericInterface)
+    }
+    names.update((generic._type_name(kind), kind) for kind in types)
+    try:
+        return _Decoder(names).decode(data)
+    except (AttributeError, TypeError) as error:
+        raise InvalidParameter("Invalid graph encoding: {}".format(error)) from error
+    except RecursionError as error:
+        raise InvalidParameter("Graph encoding nesting is too deep") from error
@@ -0,0 +1,216 @@
+"""
+Module :py:mod:`newproject.interfaces.hashing` provides content identity of interface
+objects (see :meth:`GenericInterface.config_hash`).
+
+The canonical form of an object is the compact JSON encoding of its configuration with
+keys sorted at every level, values being converted by the class :meth:`serializer`.
+It does not depend on keys insertion order and is identical across processes, so its
+BLAKE2b digest (:func:`config_hash`) identifies configurations in persistent caches
+as well. The canonical form does not tell apart values serialized alike (a date and its
+ISO string, a tuple and a list, ``{1: "a"}`` and ``{"1": "a"}``): objects of the same
+class are equal when their configurations hold equal values of the same types at every
+level (:func:`equal`). Interface objects are compared and hashed by identity unless
+their class sets :attr:`GenericInterface.hashable` to true: they are then compared by
+configuration and hashed by digest (see :func:`install`):
+
+.. code-block:: python
+
+    class Point(SimpleCase):
+        hashable = True
+
+    Point(value=[1, 2]) == Point(value=[1, 2])  # True
+    len({Point(value=1), Point(value=1)})  # 1
+
+:class:`InternTable` maps canonical digests to a shared instance, so equal objects
+can be deduplicated in constant time and memory:
+
+.. code-block:: python
+
+    a = SimpleCase(value={"x": 1, "y": 2}).intern()
+    b = SimpleCase(value={"y": 2, "x": 1}).intern()
+    a is b  # True
+
+Tables hold weak references: an entry is dropped as soon as no one else uses its instance.
+An object sharing the digest of an interned object without being equal to it is returned
+as is. Interned instances are shared and hashed objects are looked up by content, they
+must not be mutated afterward.
+"""
+
+import hashlib
+import json
+import threading
+import weakref
+from typing import Any, Callable, Iterable, Type
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import arrays, generic
+
+#: Size in bytes of configuration digests
+digest_size = 16
+
+
+def encoder(cls: Type["generic.GenericInterface"]) -> Callable[[Any], Iterable[str]]:
+    """
+    Returns the canonical JSON encoding function of an interface class (created once
+    per class). It does not track circular references so it can be shared by threads,
+    cycles are reported by the recursion limit.
+    """
+    encode = cls.__dict__.get("_canonical_encoder")
+    if encode is None:
+        encode = generic._make_iterencoder(
+            json.JSONEncoder(
+                default=cls.serializer,
+                sort_keys=True,
+                separators=(",", ":"),
+                check_circular=False,
+            )
+        )
+        cls._canonical_encoder = encode
+    return encode
+
+
+def canonical(instance: Any) -> str:
+    """
+    Returns the canonical JSON form of an interface object configuration.
+    """
+    try:
+        return "".join(encoder(type(instance))(instance.to_dict()))
+    except RecursionError as error:
+        raise InvalidParameter(
+            "{} configuration is circular or too deep".format(type(instance).__name__)
+        ) from error
+    except TypeError as error:
+        if "not supported between instances" not in str(error):
+            raise
+        raise InvalidParameter(
+            "{} configuration keys cannot be sorted: {}".format(
+                type(instance).__name__, error
+            )
+        ) from error
+
+
+def config_hash(instance: Any) -> str:
+    """
+    Returns the hexadecimal BLAKE2b digest of the canonical form of an interface object.
+    """
+    data = canonical(instance).encode()
+    return hashlib.blake2b(data, digest_size=digest_size).hexdigest()
+
+
+def equal(first: Any, second: Any) -> bool:
+    """
+    Returns True when configuration values are equal and of the same types at every level,
+    dictionary keys included (NumPy arrays are compared by dtype, shape and content).
+    """
+    if type(first) is not type(second):
+        return False
+    if type(first) is dict:
+        return (
+            len(first) == len(second)
+            and all(
+                key in second and equal(item, second[key])
+                for key, item in first.items()
+            )
+            and {(type(key), key) for key in first}
+            == {(type(key), key) for key in second}
+        )
+    if type(first) is list or type(first) is tuple:
+        return len(first) == len(second) and all(map(equal, first, second))
+    if arrays.is_ndarray(first):
+        import numpy as np
+
+        return first.dtype == second.dtype and np.array_equal(first, second)
+    try:
+        return bool(first == second)
+    except (TypeError, ValueError):
+        # Objects holding arrays:
+        return False
+
+
+def _eq(self: "generic.GenericInterface", other: Any) -> Any:
+    """
+    Objects of the same class are equal when their configurations hold equal values
+    of the same types (see :func:`equal`).
+    """
+    if self is other:
+        return True
+    if type(other) is not type(self):
+        return NotImplemented
+    return equal(self.to_dict(), other.to_dict())
+
+
+def _hash(self: "generic.GenericInterface") -> int:
+    """
+    Returns the hash of the object class and configuration digest, objects must not be
+    mutated while they are stored in sets or used as dictionary keys.
+    Objects without canonical form are not hashable.
+    """
+    try:
+        return hash((type(self), self.config_hash()))
+    except (AttributeError, TypeError, ValueError, InvalidParameter) as error:
+        raise TypeError(
+            "unhashable {} configuration: {}".format(type(self).__name__, error)
+        ) from error
+
+
+def install(cls: Type["generic.GenericInterface"]) -> None:
+    """
+    Compares objects of cls by configuration and hashes them by digest when
+    :attr:`GenericInterface.hashable` is true, by identity otherwise. Methods defined
+    by cls itself are kept.
+    """
+    if cls.hashable:
+        methods = {"__eq__": _eq, "__hash__": _hash}
+    else:
+        methods = {"__eq__": object.__eq__, "__hash__": object.__hash__}
+    for name, method in methods.items():
+        if name not in cls.__dict__:
+            setattr(cls, name, method)
+
+
+class InternTable:
+    """
+    Thread-safe table of shared interface objects keyed by class and configuration digest
+    (see module :py:mod:`newproject.interfaces.hashing`).
+    """
+
+    def __init__(self) -> None:
+        self._instances: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def intern(self, instance: Any) -> Any:
+        """
+        Returns the shared object equal to instance, instance itself becomes
+        the shared object when the table holds none. Instance is returned unshared when
+        the shared object of its digest is not equal to it (see :func:`equal`).
+        """
+        key = (type(instance), instance.config_hash())
+        with self._lock:
+            shared = self._instances.get(key)
+            if shared is not None:
+                if equal(shared.to_dict(), instance.to_dict()):
+                    return shared
+                return instance
+            try:
+                self._instances[key] = instance
+            except TypeError as error:
+                raise InvalidParameter(
+                    "{} objects do not support weak references required by interning".format(
+                        type(instance).__name__
+                    )
+                ) from error
+            return instance
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._instances.clear()
+
+
+#: Process-wide intern table used by :meth:`GenericInterface.intern`
+table = InternTable()
@@ -0,0 +1,213 @@
+"""
+Module :py:mod:`newproject.interfaces.parallel` encodes and decodes large collections of
+interface objects on a pool of processes (see :meth:`GenericInterface.encode_parallel`
+and :meth:`GenericInterface.decode_parallel`).
+
+Inputs are consumed lazily and split into chunks of :attr:`GenericInterface.chunksize`
+objects. Each chunk is shipped to a worker as a single task holding the class (pickled
+by reference) and plain data: configurations to encode or JSON documents to decode,
+objects themselves are never pickled. Results are yielded in input order by
+:func:`ordered_map` with at most ``window`` chunks in flight, so memory is bounded
+whatever the input size:
+
+.. code-block:: python
+
+    with open("export.ndjson", "w") as handler:
+        for document in SimpleCase.encode_parallel(instances, workers=8):
+            handler.write(document + "\\n")
+
+Inputs of less than :attr:`minimum` objects are processed in the calling process, where
+pool start-up and transfers would cost more than they save. Pools are started with
+``fork`` when available, so serializers registered at runtime are known by workers.
+"""
+
+import collections
+import concurrent.futures
+import functools
+import itertools
+import json
+import multiprocessing
+import os
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Type
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import decoding, generic
+
+#: Minimum number of objects processed on a pool of processes
+minimum = 8192
+
+
+def ordered_map(
+    function: Callable[[Any], Any],
+    items: Iterable,
+    executor: concurrent.futures.Executor,
+    window: int,
+) -> Iterator[Any]:
+    """
+    Yields ``function(item)`` for each item, computed by the executor and in the order of
+    items. Items are consumed lazily: at most window calls are pending at once, calls
+    still pending when the iterator is closed are cancelled.
+    """
+    if window < 1:
+        raise InvalidParameter("Window must be positive, received {}".format(window))
+    pending: collections.deque = collections.deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[Tuple[int, list]]:
+    """
+    Yields lists of size items with the index of their first item.
+    """
+    iterator = iter(items)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _encode_chunk(
+    cls: Type[generic.GenericInterface], task: Tuple[int, list]
+) -> List[str]:
+    """
+    Returns the JSON strings of a chunk of configurations.
+    """
+    start, configurations = task
+    iterencode = generic._make_iterencoder(cls.encoder())
+    try:
+        return ["".join(iterencode(configuration)) for configuration in configurations]
+    except (TypeError, ValueError):
+        pass
+    # Locates the object which failed:
+    for index, configuration in enumerate(configurations, start):
+        try:
+            "".join(iterencode(configuration))
+        except (TypeError, ValueError) as error:
+            raise InvalidParameter(
+                "Cannot encode object {}: {}".format(index, error)
+            ) from error
+    raise AssertionError("Chunk encoding failed")  # pragma: no cover
+
+
+def _decode_chunk(
+    cls: Type[generic.GenericInterface], task: Tuple[int, list]
+) -> List[dict]:
+    """
+    Returns the configurations of a chunk of JSON documents, decoded with the class
+    decoder plan.
+    """
+    start, documents = task
+    configurations = []
+    for index, document in enumerate(documents, start):
+        try:
+            configuration = json.loads(document)
+        except (TypeError, ValueError) as error:
+            raise InvalidParameter(
+                "Malformed document {}: {}".format(index, error)
+            ) from error
+        if not isinstance(configuration, dict):
+            raise InvalidParameter(
+                "Document {} must be a JSON object, received {}".format(
+                    index, type(configuration).__name__
+                )
+            )
+        configurations.append(decoding.decode(cls, configuration))
+    return configurations
+
+
+def map_tasks(
+    function: Callable[[Tuple[int, list]], Any],
+    tasks: Iterator[Tuple[int, list]],
+    workers: Optional[int] = None,
+    window: Optional[int] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> Iterator[Any]:
+    """
+    Yields the results of function on tasks (index of their first item and items)
+    in order, in process when tasks hold less than :attr:`minimum` items or a single
+    worker is requested, on executor otherwise (a pool of workers processes,
+    defaulting to the number of CPUs, is created when executor is None). At most
+    window tasks (defaulting to twice the workers) are in flight.
+    Function must be picklable to run on a pool of processes.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise InvalidParameter("Workers must be positive, received {}".format(workers))
+    head, count = [], 0
+    for task in tasks:
+        head.append(task)
+        count += len(task[1])
+        if count >= minimum:
+            break
+    tasks = itertools.chain(head, tasks)
+    if count < minimum or (workers == 1 and executor is None):
+        for task in tasks:
+            yield function(task)
+        return
+    window = window or 2 * workers
+    if executor is not None:
+        yield from ordered_map(function, tasks, executor, window)
+        return
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    with concurrent.futures.ProcessPoolExecutor(workers, mp_context=context) as pool:
+        yield from ordered_map(function, tasks, pool, window)
+
+
+def encode_parallel(
+    cls: Type[generic.GenericInterface],
+    instances: Iterable[Any],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    window: Optional[int] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> Iterator[str]:
+    """
+    Yields the JSON strings of instances configurations (equal to :meth:`to_json` outputs)
+    in input order, encoded by chunks of chunksize objects on workers processes
+    (defaulting to the number of CPUs) or on the given executor.
+    At most window chunks (defaulting to twice the workers) are in flight.
+    Objects which cannot be encoded raise :class:`InvalidParameter` with their index.
+    """
+    chunksize = chunksize or cls.chunksize
+    configurations = (instance.to_dict() for instance in instances)
+    tasks = _chunks(configurations, chunksize)
+    function = functools.partial(_encode_chunk, cls)
+    for documents in map_tasks(function, tasks, workers, window, executor):
+        yield from documents
+
+
+def decode_parallel(
+    cls: Type[generic.GenericInterface],
+    documents: Iterable[Any],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    window: Optional[int] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> Iterator[Any]:
+    """
+    Yields objects created from JSON documents (strings or bytes, one configuration each,
+    eg. NDJSON lines) in input order, like :meth:`GenericInterface.from_json`. Documents are
+    parsed and decoded by chunks on workers processes, objects are created in the calling
+    process.
+    Malformed documents raise :class:`InvalidParameter` with their index.
+    See :func:`encode_parallel` for other parameters.
+    """
+    chunksize = chunksize or cls.chunksize
+    tasks = _chunks(documents, chunksize)
+    function = functools.partial(_decode_chunk, cls)
+    for configurations in map_tasks(function, tasks, workers, window, executor):
+        for configuration in configurations:
+            yield cls(**configuration)
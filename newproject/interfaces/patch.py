@@ -0,0 +1,280 @@
+"""
+Module :py:mod:`newproject.interfaces.patch` computes and applies JSON patches
+(`RFC 6902 <https://www.rfc-editor.org/rfc/rfc6902>`_) between object configurations
+(see :meth:`GenericInterface.to_patch`).
+
+A snapshot records a private copy of the object configuration. A patch then holds
+only operations on keys changed since the snapshot: nested dictionaries are compared
+recursively, lists of the same length item by item, lists extended at their end with
+``add`` operations on ``/-``, any other change replaces the value.
+Unchanged sub-trees are detected by native equality and are neither copied nor encoded:
+
+.. code-block:: python
+
+    a = SimpleCase(value={"name": "sensor", "limits": [0, 10]})
+    a.snapshot()
+    a.value["limits"][1] = 20
+    patch = a.to_patch()  # [{"op": "replace", "path": "/value/limits/1", "value": 20}]
+    # on receiver side, received was equal to a at snapshot time:
+    received = SimpleCase(value={"name": "sensor", "limits": [0, 10]})
+    received = received.apply_patch(patch)
+
+Snapshots are kept in a side table keyed by object identity and dropped when objects
+are garbage collected, objects must therefore support weak references.
+"""
+
+import copy
+import weakref
+from typing import Any, Dict, List, Tuple
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import arrays
+
+_NATIVE = (str, int, float, bool, type(None))
+_MISSING = object()
+
+#: Snapshots of objects, keyed by object identity
+_snapshots: Dict[int, Any] = {}
+
+
+def clone(value: Any) -> Any:
+    """
+    Returns a private copy of a configuration: containers are copied recursively,
+    native values are shared and other values are deep copied.
+    """
+    if isinstance(value, _NATIVE):
+        return value
+    if type(value) is dict:
+        return {key: clone(item) for key, item in value.items()}
+    if type(value) is list:
+        return [clone(item) for item in value]
+    if type(value) is tuple:
+        return tuple(clone(item) for item in value)
+    return copy.deepcopy(value)
+
+
+def escape(token: Any) -> str:
+    """
+    Returns the JSON pointer token of a key.
+    """
+    text = str(token)
+    if "~" in text or "/" in text:
+        return text.replace("~", "~0").replace("/", "~1")
+    return text
+
+
+def unescape(token: str) -> str:
+    """
+    Returns the key of a JSON pointer token.
+    """
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _equal(old: Any, new: Any) -> bool:
+    """
+    Returns True when values are equal and of the same type (NumPy arrays included).
+    """
+    if type(old) is not type(new):
+        return False
+    try:
+        equal = old == new
+    except (TypeError, ValueError):
+        # Containers holding arrays are compared item by item:
+        return False
+    if type(equal) is bool:
+        return equal
+    if arrays.is_ndarray(old):
+        import numpy as np
+
+        return old.dtype == new.dtype and np.array_equal(old, new)
+    return bool(equal)
+
+
+def _diff(old: Any, new: Any, path: str, operations: List[dict]) -> Any:
+    """
+    Appends operations turning old into new and returns the snapshot of new
+    (old sub-trees are reused where unchanged).
+    """
+    if _equal(old, new):
+        return old
+    if type(old) is dict and type(new) is dict:
+        snapshot = {}
+        for key in old:
+            if key not in new:
+                operations.append({"op": "remove", "path": path + "/" + escape(key)})
+        for key, item in new.items():
+            previous = old.get(key, _MISSING)
+            if previous is _MISSING:
+                pointer = path + "/" + escape(key)
+                operations.append({"op": "add", "path": pointer, "value": item})
+                snapshot[key] = clone(item)
+            elif _equal(previous, item):
+                snapshot[key] = previous
+            else:
+                pointer = path + "/" + escape(key)
+                snapshot[key] = _diff(previous, item, pointer, operations)
+        return snapshot
+    if type(old) is list and type(new) is list:
+        if len(old) == len(new):
+            return [
+                _diff(previous, item, "{}/{}".format(path, index), operations)
+                for index, (previous, item) in enumerate(zip(old, new))
+            ]
+        if len(old) < len(new) and _equal(old, new[: len(old)]):
+            for item in new[len(old) :]:
+                operations.append({"op": "add", "path": path + "/-", "value": item})
+            return old + [clone(item) for item in new[len(old) :]]
+    operations.append({"op": "replace", "path": path, "value": new})
+    return clone(new)
+
+
+def diff(old: Any, new: Any) -> List[dict]:
+    """
+    Returns the JSON patch turning old configuration into new configuration.
+    Operations values are not copied: they are the values of new.
+    """
+    operations: List[dict] = []
+    _diff(old, new, "", operations)
+    return operations
+
+
+def _parent(document: Any, path: str) -> Tuple[Any, str]:
+    """
+    Returns the container holding the target of a JSON pointer and the target token.
+    """
+    if not isinstance(path, str) or (path and not path.startswith("/")):
+        raise InvalidParameter("Invalid JSON pointer {!r}".format(path))
+    if not path:
+        raise InvalidParameter("Operations on the whole document are not supported")
+    *tokens, last = [unescape(token) for token in path.split("/")[1:]]
+    target = document
+    for token in tokens:
+        target = _child(target, token, path)
+    return target, last
+
+
+def _index(container: list, token: str, path: str, insert: bool = False) -> int:
+    """
+    Returns the list index of a JSON pointer token.
+    """
+    if insert and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise InvalidParameter("Invalid array index {!r} in {!r}".format(token, path))
+    index = int(token)
+    if index > len(container) or (index == len(container) and not insert):
+        raise InvalidParameter(
+            "Array index {} out of range in {!r}".format(index, path)
+        )
+    return index
+
+
+def _child(container: Any, token: str, path: str) -> Any:
+    """
+    Returns the value of a container at a JSON pointer token.
+    """
+    if isinstance(container, dict):
+        if token not in container:
+            raise InvalidParameter("Path {!r} does not exist".format(path))
+        return container[token]
+    if isinstance(container, list):
+        return container[_index(container, token, path)]
+    raise InvalidParameter("Path {!r} does not exist".format(path))
+
+
+def _get(document: Any, path: str) -> Any:
+    parent, token = _parent(document, path)
+    return _child(parent, token, path)
+
+
+def _remove(document: Any, path: str) -> Any:
+    parent, token = _parent(document, path)
+    value = _child(parent, token, path)
+    if isinstance(parent, list):
+        del parent[_index(parent, token, path)]
+    else:
+        del parent[token]
+    return value
+
+
+def _add(document: Any, path: str, value: Any) -> None:
+    parent, token = _parent(document, path)
+    if isinstance(parent, list):
+        parent.insert(_index(parent, token, path, insert=True), value)
+    elif isinstance(parent, dict):
+        parent[token] = value
+    else:
+        raise InvalidParameter("Path {!r} does not exist".format(path))
+
+
+def apply(document: dict, operations: List[dict]) -> dict:
+    """
+    Returns a patched copy of the document (the document is left unchanged).
+    Supports all RFC 6902 operations on members of the document: ``add``, ``remove``,
+    ``replace``, ``move``, ``copy`` and ``test``. Patch is applied atomically: when an
+    operation fails, :class:`InvalidParameter` is raised and no result is returned.
+    """
+    document = clone(document)
+    for operation in operations:
+        try:
+            kind, path = operation["op"], operation["path"]
+            if kind == "add":
+                _add(document, path, clone(operation["value"]))
+            elif kind == "remove":
+                _remove(document, path)
+            elif kind == "replace":
+                _remove(document, path)
+                _add(document, path, clone(operation["value"]))
+            elif kind == "move":
+                source = operation["from"]
+                if path.startswith(source + "/"):
+                    raise InvalidParameter(
+                        "Cannot move {!r} into its child {!r}".format(source, path)
+                    )
+                _add(document, path, _remove(document, source))
+            elif kind == "copy":
+                _add(document, path, clone(_get(document, operation["from"])))
+            elif kind == "test":
+                if _get(document, path) != operation["value"]:
+                    raise InvalidParameter("Test failed at {!r}".format(path))
+            else:
+                raise InvalidParameter("Unknown patch operation {!r}".format(kind))
+        except (KeyError, TypeError) as error:
+            raise InvalidParameter(
+                "Invalid patch operation {!r}".format(operation)
+            ) from error
+    return document
+
+
+def snapshot(instance: Any, configuration: dict) -> None:
+    """
+    Records a private copy of the object configuration.
+    """
+    key = id(instance)
+    if key not in _snapshots:
+        try:
+            weakref.finalize(instance, _snapshots.pop, key, None)
+        except TypeError as error:
+            raise InvalidParameter(
+                "{} objects do not support weak references required by snapshots".format(
+                    type(instance).__name__
+                )
+            ) from error
+    _snapshots[key] = clone(configuration)
+
+
+def changes(instance: Any, configuration: dict, update: bool = True) -> List[dict]:
+    """
+    Returns the JSON patch of the object configuration since its last snapshot,
+    the snapshot is updated to the configuration when update is true.
+    """
+    key = id(instance)
+    if key not in _snapshots:
+        raise InvalidParameter(
+            "No snapshot recorded for this {} object".format(type(instance).__name__)
+        )
+    operations: List[dict] = []
+    current = _diff(_snapshots[key], configuration, "", operations)
+    if update:
+        _snapshots[key] = current
+    return operations
@@ -0,0 +1,481 @@
+"""
+Module :py:mod:`newproject.interfaces.stream` loads interface objects incrementally from
+NDJSON or JSON array streams (files, sockets or any iterable of byte chunks).
+
+:class:`StreamParser` is a push parser: byte chunks of any size are fed to it and it
+returns the complete records they terminate, each with the byte offset where it starts
+in the stream. Only the pending record is buffered, so memory is bounded by the largest
+record instead of the document size. The stream format is detected from its first
+significant byte: a top-level JSON array (``[``) or newline delimited JSON.
+Array elements are decoded in place while they are valid, malformed elements are
+delimited by a scanner tracking strings and nesting depth and reported on their own,
+so a malformed record does not abort the stream.
+
+:func:`load_iter` builds objects lazily from a stream:
+
+.. code-block:: python
+
+    errors = []
+    with open("export.ndjson", "rb") as handler:
+        for instance in load_iter(handler, SimpleCase, on_error=errors.append):
+            ...
+    errors[0].offset  # byte offset of the first malformed record
+
+"""
+
+import collections
+import json
+import os
+import re
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from newproject.errors import InvalidParameter
+
+#: Decoded record (value is None when error is set)
+Record = collections.namedtuple("Record", ["offset", "value", "error"])
+
+#: Default size of chunks read from streams
+CHUNK_SIZE = 2**16
+
+_WHITESPACE = b" \t\r\n"
+_BOM = b"\xef\xbb\xbf"
+_STRUCTURE = re.compile(rb'[\[\]{}",]')
+_STRING = re.compile(rb'["\\]')
+_SIGNIFICANT = re.compile(rb"[^ \t\r\n]")
+_WHITESPACE_TEXT = re.compile(r"[ \t\r\n]*")
+
+
+def _skip(text: str, index: int) -> int:
+    """
+    Returns the index of the first character of text from index which is not whitespace.
+    """
+    match = _WHITESPACE_TEXT.match(text, index)
+    assert match is not None  # the pattern matches empty strings
+    return match.end()
+
+
+def malformed(offset: int, message: str) -> InvalidParameter:
+    """
+    Returns the error of a malformed record starting at offset (exposed as ``error.offset``).
+    """
+    error = InvalidParameter("Malformed record at byte {}: {}".format(offset, message))
+    error.offset = offset
+    return error
+
+
+class StreamParser:
+    """
+    Push parser of NDJSON and JSON array streams (see module
+    :py:mod:`newproject.interfaces.stream`). Mode is ``"ndjson"``, ``"array"`` or detected
+    from the stream when None. Records are decoded with :func:`json.loads` and object_hook.
+    """
+
+    def __init__(
+        self, mode: Optional[str] = None, object_hook: Optional[Callable] = None
+    ) -> None:
+        if mode not in (None, "ndjson", "array"):
+            raise InvalidParameter(
+                "Mode must be 'ndjson', 'array' or None, received {!r}".format(mode)
+            )
+        self.mode = mode
+        self.object_hook = object_hook
+        self._buffer = bytearray()
+        # Absolute offset of the buffer start and scan position in the buffer:
+        self._base = 0
+        self._pos = 0
+        # Array scanner state:
+        self._state = "start"
+        self._depth = 0
+        self._in_string = False
+        self._separated = False
+        self._scanning = False
+        # Scanner of the decoder (not declared by JSONDecoder type hints):
+        decoder: Any = json.JSONDecoder(object_hook=object_hook)
+        self._scan_once: Callable[[str, int], Tuple[Any, int]] = decoder.scan_once
+        self._start: Optional[int] = None
+        self._records: List[Record] = []
+
+    @property
+    def offset(self) -> int:
+        """
+        Returns the offset of the first byte not consumed by a returned record.
+        """
+        if self._start is not None:
+            return self._base + self._start
+        return self._base + self._pos
+
+    def _pending(self) -> int:
+        """
+        Returns the buffer position of the pending array element.
+        """
+        assert self._start is not None, "no pending array element"
+        return self._start
+
+    def _emit(self, start: int, end: int) -> None:
+        """
+        Decodes the record between buffer positions start and end (whitespace stripped).
+        """
+        data = bytes(self._buffer[start:end])
+        stripped = data.lstrip(_WHITESPACE)
+        offset = self._base + start + len(data) - len(stripped)
+        stripped = stripped.rstrip(_WHITESPACE)
+        if not stripped:
+            self._records.append(
+                Record(offset, None, malformed(offset, "empty record"))
+            )
+            return
+        try:
+            value = json.loads(stripped, object_hook=self.object_hook)
+        except ValueError as error:
+            self._records.append(Record(offset, None, malformed(offset, str(error))))
+        else:
+            self._records.append(Record(offset, value, None))
+
+    def _detect(self) -> bool:
+        """
+        Detects the stream mode, returns False until a significant byte is received.
+        """
+        buffer = self._buffer
+        if self._base == 0 and buffer.startswith(_BOM):
+            self._pos = max(self._pos, len(_BOM))
+        elif self._base == 0 and len(buffer) < len(_BOM) and _BOM.startswith(buffer):
+            return False
+        match = _SIGNIFICANT.search(buffer, self._pos)
+        if match is None:
+            self._pos = len(buffer)
+            return False
+        self._pos = match.start()
+        if self.mode is None:
+            self.mode = "array" if buffer[self._pos] == ord("[") else "ndjson"
+        if self.mode == "array":
+            if buffer[self._pos] != ord("["):
+                offset = self._base + self._pos
+                self._records.append(
+                    Record(
+                        offset, None, malformed(offset, "stream is not a JSON array")
+                    )
+                )
+                self._state = "done"
+                return False
+            self._pos += 1
+            self._depth = 1
+            self._start = self._pos
+        self._state = "body"
+        return True
+
+    def _text(self, start: int) -> Tuple[str, Callable[[int], int]]:
+        """
+        Returns the text of the buffer from position start (up to an incomplete trailing
+        character) and the function mapping increasing text indices to buffer positions.
+        Text is empty when the buffer holds invalid UTF-8.
+        """
+        buffer = self._buffer
+        try:
+            text = buffer[start:].decode()
+        except UnicodeDecodeError as error:
+            if error.reason != "unexpected end of data":
+                return "", lambda index: start
+            text = buffer[start : start + error.start].decode()
+        if len(text) == len(buffer) - start:
+            return text, lambda index: start + index
+        chars, position = 0, start
+
+        def locate(index: int) -> int:
+            nonlocal chars, position
+            position += len(text[chars:index].encode())
+            chars = index
+            return position
+
+        return text, locate
+
+    def _scan_lines(self) -> None:
+        """
+        Emits complete lines: lines holding a single JSON value are decoded in place,
+        other lines are decoded on their own to report their error.
+        """
+        pos = self._pos
+        text, locate = self._text(pos)
+        scan = self._scan_once
+        records = self._records
+        base = self._base
+        index = 0
+        while True:
+            end = text.find("\n", index)
+            if end < 0:
+                break
+            first = _skip(text, index)
+            if first < end:
+                try:
+                    value, last = scan(text, first)
+                except (StopIteration, ValueError):
+                    last = -1
+                if 0 <= last <= end and _skip(text, last) > end:
+                    records.append(Record(base + locate(first), value, None))
+                else:
+                    self._emit(locate(index), locate(end))
+            index = end + 1
+        pos = locate(index)
+        # Invalid UTF-8 lines are reported by the line decoder:
+        buffer = self._buffer
+        while True:
+            end = buffer.find(b"\n", pos)
+            if end < 0:
+                break
+            if buffer[pos:end].strip():
+                self._emit(pos, end)
+            pos = end + 1
+        self._pos = pos
+
+    def _scan_array(self) -> None:
+        """
+        Emits array elements: elements are decoded in place while they are valid JSON,
+        malformed or incomplete elements are delimited by the structure scanner.
+        """
+        while self._state == "body":
+            if not self._scanning:
+                if self._decode_elements():
+                    return
+                self._scanning = True
+                self._pos = self._pending()
+            if not self._scan_element():
+                return
+            self._scanning = False
+
+    def _decode_elements(self) -> bool:
+        """
+        Decodes elements from the pending element, returns False when the element at
+        :attr:`_start` requires the structure scanner.
+        """
+        text, locate = self._text(self._pending())
+        scan = self._scan_once
+        records = self._records
+        base = self._base
+        length = len(text)
+        index = _skip(text, 0)
+        while index < length:
+            if text[index] == "]" and not self._separated:
+                self._start = None
+                self._pos = locate(index + 1)
+                self._state = "done"
+                return True
+            try:
+                value, end = scan(text, index)
+            except (StopIteration, ValueError):
+                return False
+            if end < length and text[end] != ",":
+                end = _skip(text, end)
+            if end == length:
+                return True
+            delimiter = text[end]
+            if delimiter != "," and delimiter != "]":
+                return False
+            records.append(Record(base + locate(index), value, None))
+            if delimiter == "]":
+                self._start = None
+                self._pos = locate(end + 1)
+                self._state = "done"
+                return True
+            self._separated = True
+            self._start = self._pos = locate(end + 1)
+            index = _skip(text, end + 1)
+        return True
+
+    def _scan_element(self) -> bool:
+        """
+        Scans the pending element structure from :attr:`_pos`, returns True once the element
+        is emitted and False when more data is required.
+        """
+        buffer = self._buffer
+        start = self._pending()
+        pos = self._pos
+        depth = self._depth
+        try:
+            while True:
+                if self._in_string:
+                    match = _STRING.search(buffer, pos)
+                    if match is None:
+                        pos = len(buffer)
+                        return False
+                    if buffer[match.start()] == ord("\\"):
+                        if match.end() >= len(buffer):
+                            pos = match.start()
+                            return False
+                        pos = match.end() + 1
+                        continue
+                    self._in_string = False
+                    pos = match.end()
+                    continue
+                match = _STRUCTURE.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    return False
+                char = buffer[match.start()]
+                pos = match.end()
+                if char == ord('"'):
+                    self._in_string = True
+                elif char in b"[{":
+                    depth += 1
+                elif char in b"]}":
+                    depth -= 1
+                    if depth == 0:
+                        # End of the top-level array (empty arrays hold no record):
+                        if self._separated or buffer[start : match.start()].strip():
+                            self._emit(start, match.start())
+                        self._start = None
+                        self._state = "done"
+                        return True
+                elif depth == 1:
+                    self._emit(start, match.start())
+                    self._start = pos
+                    self._separated = True
+                    return True
+        finally:
+            self._depth = depth
+            self._pos = pos
+
+    def _trailing(self) -> None:
+        """
+        Reports significant bytes after the top-level array once.
+        """
+        match = _SIGNIFICANT.search(self._buffer, self._pos)
+        if match is not None:
+            offset = self._base + match.start()
+            self._records.append(
+                Record(offset, None, malformed(offset, "extra data after JSON array"))
+            )
+            self._state = "ignore"
+        self._pos = len(self._buffer)
+
+    def _compact(self) -> None:
+        """
+        Drops consumed bytes from the buffer.
+        """
+        cut = self._pos if self._start is None else min(self._start, self._pos)
+        if cut:
+            del self._buffer[:cut]
+            self._base += cut
+            self._pos -= cut
+            if self._start is not None:
+                self._start -= cut
+
+    def feed(self, data: bytes) -> List[Record]:
+        """
+        Appends a chunk of the stream and returns the records it completes.
+        """
+        self._buffer += data
+        if self._state == "start":
+            self._detect()
+        if self._state == "body":
+            if self.mode == "ndjson":
+                self._scan_lines()
+            else:
+                self._scan_array()
+        if self._state == "done":
+            self._trailing()
+        if self._state == "ignore":
+            self._pos = len(self._buffer)
+        self._compact()
+        records, self._records = self._records, []
+        return records
+
+    def close(self) -> List[Record]:
+        """
+        Ends the stream and returns its last records: the last NDJSON line when it is not
+        newline terminated, or an error when the JSON array is not terminated.
+        """
+        records = self.feed(b"")
+        if self._state == "body" and self.mode == "ndjson":
+            if self._buffer[self._pos :].strip():
+                self._emit(self._pos, len(self._buffer))
+            self._pos = len(self._buffer)
+        elif self._state == "body":
+            start = self._pending()
+            match = _SIGNIFICANT.search(self._buffer, start)
+            offset = self._base + (start if match is None else match.start())
+            self._records.append(
+                Record(offset, None, malformed(offset, "unterminated JSON array"))
+            )
+        self._state = "closed"
+        self._buffer.clear()
+        records += self._records
+        self._records = []
+        return records
+
+
+def chunks(source: Any, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yields byte chunks of a source: a path, a binary or text file-like object (``read``),
+    a socket (``recv``) or an iterable of bytes or strings.
+    Text is encoded in UTF-8, so offsets are byte offsets of its UTF-8 encoding.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as handler:
+            yield from chunks(handler, chunk_size)
+        return
+    read = getattr(source, "read", None) or getattr(source, "recv", None)
+    iterator: Iterable = (
+        iter(lambda: read(chunk_size), None) if read is not None else source
+    )
+    for chunk in iterator:
+        if not chunk:
+            if read is not None:
+                break
+            continue
+        yield chunk.encode() if isinstance(chunk, str) else chunk
+
+
+def build(
+    records: List[Record],
+    factory: Callable[..., Any],
+    on_error: Optional[Callable[[InvalidParameter], Any]] = None,
+) -> Iterator[Any]:
+    """
+    Yields objects created with ``factory(**record)`` from parsed records, malformed records
+    (invalid JSON, non object records or records rejected by the factory) raise their
+    error unless on_error is given (see :func:`load_iter`).
+    """
+    for offset, value, error in records:
+        if error is None:
+            if not isinstance(value, dict):
+                error = malformed(
+                    offset,
+                    "record must be a JSON object, received {}".format(
+                        type(value).__name__
+                    ),
+                )
+            else:
+                try:
+                    instance = factory(**value)
+                except (TypeError, ValueError, InvalidParameter) as exception:
+                    error = malformed(
+                        offset, "{}: {}".format(type(exception).__name__, exception)
+                    )
+                    error.__cause__ = exception
+                else:
+                    yield instance
+                    continue
+        if on_error is None:
+            raise error
+        on_error(error)
+
+
+def load_iter(
+    source: Union[str, os.PathLike, IO, Iterable],
+    factory: type,
+    chunk_size: int = CHUNK_SIZE,
+    on_error: Optional[Callable[[InvalidParameter], Any]] = None,
+    mode: Optional[str] = None,
+    object_hook: Optional[Callable] = None,
+) -> Iterator[Any]:
+    """
+    Yields objects created with ``factory(**record)`` from the records of a NDJSON or
+    JSON array stream (see :func:`chunks` for accepted sources), reading chunk_size bytes
+    at once. Malformed records (invalid JSON, non object records or records rejected by
+    the factory) raise :class:`InvalidParameter` holding their byte offset
+    (``error.offset``), unless on_error is given: it is then called with the error
+    and loading goes on with the next record.
+    """
+    parser = StreamParser(mode=mode, object_hook=object_hook)
+    for chunk in chunks(source, chunk_size):
+        yield from build(parser.feed(chunk), factory, on_error)
+    yield from build(parser.close(), factory, on_error)
@@ -0,0 +1,521 @@
+"""
+Module :py:mod:`newproject.interfaces.validation` validates and coerces constructor
+arguments of interfaces from their type annotations.
+
+Interfaces setting the class attribute :attr:`GenericInterface.validated` to true get
+their :meth:`__init__` replaced by a validating one, compiled from the annotations of its
+parameters (or declared fields types of declarative interfaces) on first construction and
+cached on the class. Each annotated parameter gets a check which accepts instances of the
+annotated type, coerces values in their JSON encoded form like
+:py:mod:`newproject.interfaces.decoding` does (eg. ISO 8601 strings for datetime fields,
+integers for float fields) and rejects anything else. All invalid arguments are reported
+at once by an :class:`InvalidParameter` exposing messages by parameter as
+``error.errors``:
+
+.. code-block:: python
+
+    class Point(GenericInterface):
+        validated = True
+
+        def __init__(self, x: float, y: float = 0.0) -> None:
+            ...
+
+    Point(x=1).x  # returns: 1.0
+    Point(x="a", y=None)
+    # InvalidParameter: Invalid Point parameters: x: expected float, received str; ...
+
+Parameters annotated with :data:`typing.Any` (or not annotated) and arguments which are
+their parameter default value are not checked, so checks only cost for typed arguments.
+:func:`validate_many` checks a batch of configurations with the same compiled checks and
+returns per-record errors instead of raising on the first invalid record:
+
+.. code-block:: python
+
+    result = Point.validate_many([{"x": 1}, {"x": "a"}, {"z": 2}])
+    result.configurations  # [{"x": 1.0}, None, None]
+    result.errors  # {1: {"x": "expected float, received str"}, 2: {...}}
+
+"""
+
+import collections
+import collections.abc
+import enum
+import functools
+import inspect
+import typing
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import decoding, generic
+from newproject.interfaces.declarative import _compile
+
+#: Errors raised by checks
+failures = (TypeError, ValueError, ArithmeticError, InvalidParameter)
+
+#: Result of :func:`validate_many`: coerced configurations (None for invalid records)
+#: and error messages by parameter keyed by index of invalid records
+Validation = collections.namedtuple("Validation", ["configurations", "errors"])
+
+#: Compiled checks of a class: checks by parameter, constructor and configuration checker
+Plan = collections.namedtuple("Plan", ["checks", "constructor", "configuration"])
+
+_UNIONS = decoding._UNIONS
+
+
+def _name(kind: Any) -> str:
+    return getattr(kind, "__qualname__", None) or str(kind)
+
+
+def _described(
+    check: Callable[[Any], Any], expected: str, exact: Optional[type] = None
+) -> Callable[[Any], Any]:
+    """
+    Returns check described by the accepted values (``check.expected``) and the type
+    of values accepted as is (``check.exact``, when given).
+    """
+    setattr(check, "expected", expected)
+    if exact is not None:
+        setattr(check, "exact", exact)
+    return check
+
+
+def _items(
+    origin: type, item: Callable[[Any], Any], accepted: tuple
+) -> Callable[[Any], Any]:
+    """
+    Returns the check of containers of the accepted types converted to origin,
+    with items checked by item.
+    """
+
+    def check(value: Any) -> Any:
+        if not isinstance(value, accepted):
+            raise TypeError(
+                "expected {}, received {}".format(origin.__name__, type(value).__name__)
+            )
+        result = []
+        for index, x in enumerate(value):
+            try:
+                result.append(item(x))
+            except failures as error:
+                raise TypeError("item {}: {}".format(index, error)) from error
+        return origin(result)
+
+    return _described(check, origin.__name__)
+
+
+def _mapping(
+    key: Callable[[Any], Any], item: Callable[[Any], Any]
+) -> Callable[[Any], Any]:
+    def check(value: Any) -> Any:
+        if not isinstance(value, dict):
+            raise TypeError("expected dict, received {}".format(type(value).__name__))
+        result = {}
+        for k, x in value.items():
+            try:
+                result[key(k)] = item(x)
+            except failures as error:
+                raise TypeError("item {!r}: {}".format(k, error)) from error
+        return result
+
+    return _described(check, "dict")
+
+
+def _union(
+    checks: List[Optional[Callable[[Any], Any]]], nullable: bool
+) -> Optional[Callable[[Any], Any]]:
+    """
+    Returns the check accepting the first member type which accepts values.
+    When a single member accepts the value type but rejects its content (eg. an item
+    of a list), its error is raised so the message points at the invalid part.
+    """
+    members = [check for check in checks if check is not None]
+    if len(members) < len(checks):
+        return None
+    names = " or ".join(getattr(check, "expected", "?") for check in members)
+
+    def check(value: Any) -> Any:
+        if value is None and nullable:
+            return None
+        errors = []
+        for member in members:
+            try:
+                return member(value)
+            except failures as error:
+                errors.append(error)
+        # Type mismatches are reported as "expected <type>, received <type>":
+        matched = [error for error in errors if not str(error).startswith("expected ")]
+        if len(matched) == 1:
+            raise matched[0]
+        raise TypeError(
+            "expected {}{}, received {}".format(
+                names, " or None" if nullable else "", type(value).__name__
+            )
+        )
+
+    return _described(check, names)
+
+
+def _instance(kind: type) -> Callable[[Any], Any]:
+    """
+    Returns the check of instances of kind, values in encoded form are decoded first.
+    """
+    decoder = decoding.value_decoder(kind)
+    name = _name(kind)
+    strict = kind in (int, float, complex)
+    numbers = {int: (int,), float: (int, float), complex: (int, float, complex)}.get(
+        kind, ()
+    )
+
+    def check(value: Any) -> Any:
+        if strict:
+            # Booleans are integers but not numbers:
+            if type(value) in numbers:
+                return kind(value) if type(value) is not kind else value
+            if isinstance(value, kind) and not isinstance(value, bool):
+                return value
+        elif isinstance(value, kind):
+            return value
+        elif decoder is not None and value is not None:
+            decoded = decoder(value)
+            if isinstance(decoded, kind):
+                return decoded
+        raise TypeError("expected {}, received {}".format(name, type(value).__name__))
+
+    return _described(check, name, kind)
+
+
+def value_check(kind: Any) -> Optional[Callable[[Any], Any]]:
+    """
+    Returns the check validating and coercing values of the annotated type,
+    or None when values of this type are not checked (eg. :data:`typing.Any`).
+    """
+    if kind is Any or kind is object or isinstance(kind, (str, typing.TypeVar)):
+        return None
+    supertype = getattr(kind, "__supertype__", None)
+    if supertype is not None:
+        # NewType:
+        return value_check(supertype)
+    origin = typing.get_origin(kind)
+    arguments = typing.get_args(kind)
+    if origin is typing.Annotated:
+        return value_check(arguments[0])
+    if origin is typing.Literal:
+        expected = " or ".join(repr(argument) for argument in arguments)
+
+        def literal(value: Any) -> Any:
+            if value not in arguments:
+                raise ValueError("expected {}, received {!r}".format(expected, value))
+            return value
+
+        return _described(literal, expected)
+    if origin in _UNIONS:
+        members = [argument for argument in arguments if argument is not type(None)]
+        return _union(
+            [value_check(member) for member in members], len(members) < len(arguments)
+        )
+    if origin is not None:
+        identity = decoding._identity
+        check: Callable[[Any], Any]
+        if origin in (dict, collections.abc.Mapping, collections.abc.MutableMapping):
+            key, item = (arguments + (Any, Any))[:2]
+            check = _mapping(
+                value_check(key) or identity, value_check(item) or identity
+            )
+        elif origin is tuple and arguments and arguments[-1] is not Ellipsis:
+            checks = [value_check(argument) or identity for argument in arguments]
+
+            def fixed(value: Any) -> Any:
+                if not isinstance(value, (tuple, list)) or len(value) != len(checks):
+                    raise TypeError(
+                        "expected tuple of {} items, received {}".format(
+                            len(checks), type(value).__name__
+                        )
+                    )
+                return tuple(item(x) for item, x in zip(checks, value))
+
+            check = _described(fixed, "tuple")
+        elif origin in (
+            list,
+            collections.abc.Sequence,
+            collections.abc.MutableSequence,
+        ):
+            item = value_check(arguments[0]) if arguments else None
+            check = _items(list, item or identity, (list, tuple))
+        elif origin in (tuple, set, frozenset):
+            item = value_check(arguments[0]) if arguments else None
+            check = _items(origin, item or identity, (list, tuple, set, frozenset))
+        elif isinstance(origin, type):
+            return value_check(origin)
+        else:
+            return None
+        return check
+    if not isinstance(kind, type):
+        return None
+    if kind in (tuple, set, frozenset):
+        return _items(kind, decoding._identity, (list, tuple, set, frozenset))
+    if issubclass(kind, enum.Enum):
+        enumeration = kind
+
+        def member(value: Any) -> Any:
+            try:
+                return enumeration(value)
+            except ValueError:
+                raise ValueError(
+                    "expected {}, received {!r}".format(kind.__name__, value)
+                ) from None
+
+        return _described(member, kind.__name__)
+    return _instance(kind)
+
+
+def _report(errors: Optional[dict], name: str, error: Exception) -> dict:
+    """
+    Returns errors updated with the message of the invalid parameter.
+    """
+    if errors is None:
+        errors = {}
+    errors[name] = str(error)
+    return errors
+
+
+def invalid(
+    cls: Type[generic.GenericInterface], errors: Dict[str, str]
+) -> InvalidParameter:
+    """
+    Returns the error reporting invalid parameters of cls (exposed as ``error.errors``).
+    """
+    error = InvalidParameter(
+        "Invalid {} parameters: {}".format(
+            cls.__name__,
+            "; ".join(
+                "{}: {}".format(name, message) for name, message in errors.items()
+            ),
+        )
+    )
+    error.errors = errors
+    return error
+
+
+def _original(cls: Type[generic.GenericInterface]) -> Callable:
+    """
+    Returns the initialization method of cls before it was replaced by a validating one.
+    """
+    init: Any = cls.__init__
+    original: Callable = (
+        init.__wrapped__ if getattr(init, "_validated", False) else init
+    )
+    return original
+
+
+def _check_source(name: str, indent: str, default: bool, exact: bool) -> str:
+    """
+    Returns the source checking variable name and recording its error, the check is
+    skipped for the parameter default value and values of the exact annotated type.
+    """
+    lines = [
+        "try:",
+        "    {0} = __checks[{0!r}]({0})".format(name),
+        "except __failures as __error:",
+        "    __errors = __report(__errors, {!r}, __error)".format(name),
+    ]
+    conditions = []
+    if default:
+        conditions.append("{0} is not __defaults[{0!r}]".format(name))
+    if exact:
+        conditions.append("type({0}) is not __exact[{0!r}]".format(name))
+    if conditions:
+        lines = ["if {}:".format(" and ".join(conditions))] + [
+            "    " + line for line in lines
+        ]
+    return "".join(indent + line + "\n" for line in lines)
+
+
+def plan(cls: Type[generic.GenericInterface]) -> Plan:
+    """
+    Returns the checks of cls parameters compiled into a constructor and a configuration
+    checker, resolved once per class.
+    """
+    compiled: Optional[Plan] = cls.__dict__.get("_validator_plan")
+    if compiled is not None:
+        return compiled
+    init = _original(cls)
+    types = decoding.field_types(cls)
+    parameters = list(inspect.signature(init).parameters.values())[1:]
+    checks = {}
+    for parameter in parameters:
+        if parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            check = value_check(types.get(parameter.name, Any))
+            if check is not None:
+                checks[parameter.name] = check
+    defaults = {
+        parameter.name: parameter.default
+        for parameter in parameters
+        if parameter.default is not parameter.empty
+    }
+    scope: Dict[str, Any] = {
+        "__checks": checks,
+        "__exact": {
+            name: getattr(check, "exact")
+            for name, check in checks.items()
+            if getattr(check, "exact", None) is not None
+        },
+        "__defaults": defaults,
+        "__failures": failures,
+        "__report": _report,
+        "__invalid": functools.partial(invalid, cls),
+        "__init": init,
+        "__names": frozenset(
+            parameter.name
+            for parameter in parameters
+            if parameter.kind
+            in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY)
+        ),
+    }
+
+    # Constructor with the original signature:
+    signature, arguments = [], []
+    keywords = False
+    for parameter in parameters:
+        name = parameter.name
+        if parameter.kind is parameter.VAR_POSITIONAL:
+            signature.append("*" + name)
+            arguments.append("*" + name)
+            keywords = True
+        elif parameter.kind is parameter.VAR_KEYWORD:
+            signature.append("**" + name)
+            arguments.append("**" + name)
+        else:
+            if parameter.kind is parameter.KEYWORD_ONLY:
+                if not keywords:
+                    signature.append("*")
+                    keywords = True
+                arguments.append("{0}={0}".format(name))
+            else:
+                arguments.append(name)
+            if name in defaults:
+                signature.append("{0}=__defaults[{0!r}]".format(name))
+            else:
+                signature.append(name)
+        if parameter.kind is parameter.POSITIONAL_ONLY and (
+            parameter is parameters[-1]
+            or parameters[parameters.index(parameter) + 1].kind
+            is not parameter.POSITIONAL_ONLY
+        ):
+            signature.append("/")
+    source = "def __init__(self{}{}):\n    __errors = None\n".format(
+        ", " if signature else "", ", ".join(signature)
+    )
+    for name in checks:
+        source += _check_source(
+            name, "    ", name in defaults, name in scope["__exact"]
+        )
+    source += "    if __errors:\n        raise __invalid(__errors)\n"
+    source += "    __init(self{}{})\n".format(
+        ", " if arguments else "", ", ".join(arguments)
+    )
+    constructor = functools.update_wrapper(_compile("__init__", source, scope), init)
+    setattr(constructor, "_validated", True)
+
+    # Configuration checker:
+    source = (
+        "def check(__configuration):\n"
+        "    __errors = None\n"
+        "    __result = dict(__configuration)\n"
+    )
+    if not any(parameter.kind is parameter.VAR_KEYWORD for parameter in parameters):
+        source += (
+            "    for __name in sorted(__configuration.keys() - __names):\n"
+            "        __errors = __report(__errors, __name, 'unexpected parameter')\n"
+        )
+    for parameter in parameters:
+        name = parameter.name
+        if parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            continue
+        if name not in defaults:
+            source += (
+                "    if {0!r} not in __result:\n"
+                "        __errors = __report(__errors, {0!r}, 'missing parameter')\n"
+            ).format(name)
+        if name in checks:
+            source += (
+                "    if {0!r} in __result:\n        {0} = __result[{0!r}]\n".format(
+                    name
+                )
+            )
+            source += _check_source(
+                name, "        ", name in defaults, name in scope["__exact"]
+            )
+            source += "        __result[{0!r}] = {0}\n".format(name)
+    source += "    return __result, __errors\n"
+    compiled = Plan(checks, constructor, _compile("check", source, scope))
+    cls._validator_plan = compiled
+    return compiled
+
+
+def install(cls: Type[generic.GenericInterface]) -> None:
+    """
+    Replaces the initialization method of cls by a validating one when
+    :attr:`GenericInterface.validated` is true (restores the original one otherwise).
+    Checks are compiled on first construction.
+    """
+    init: Any = cls.__init__
+    validated = getattr(init, "_validated", False)
+    if not cls.validated:
+        if validated:
+            setattr(cls, "__init__", init.__wrapped__)
+        return
+    if validated and "__init__" not in cls.__dict__:
+        return
+    if init is object.__init__:
+        return
+
+    @functools.wraps(init)
+    def __init__(self: Any, *args: Any, **kwargs: Any) -> None:
+        constructor = plan(cls).constructor
+        if cls.__dict__.get("__init__") is __init__:
+            setattr(cls, "__init__", constructor)
+        constructor(self, *args, **kwargs)
+
+    setattr(__init__, "_validated", True)
+    setattr(cls, "__init__", __init__)
+
+
+def validate(cls: Type[generic.GenericInterface], configuration: dict) -> dict:
+    """
+    Returns the configuration with values checked and coerced by cls checks,
+    invalid configurations raise :class:`InvalidParameter` (see :func:`invalid`).
+    """
+    result: dict
+    result, errors = plan(cls).configuration(configuration)
+    if errors:
+        raise invalid(cls, errors)
+    return result
+
+
+def validate_many(
+    cls: Type[generic.GenericInterface], configurations: Iterable[Any]
+) -> Validation:
+    """
+    Checks configurations in one pass and returns the coerced configurations (None for
+    invalid records) with error messages by parameter keyed by index of invalid records.
+    """
+    check = plan(cls).configuration
+    results: List[Optional[dict]] = []
+    errors: Dict[int, Dict[str, str]] = {}
+    append = results.append
+    for index, configuration in enumerate(configurations):
+        if not isinstance(configuration, dict):
+            errors[index] = {
+                "": "expected configuration mapping, received {}".format(
+                    type(configuration).__name__
+                )
+            }
+            append(None)
+            continue
+        result, failed = check(configuration)
+        if failed:
+            errors[index] = failed
+            append(None)
+        else:
+            append(result)
+    return Validation(results, errors)
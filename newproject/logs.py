@@ -0,0 +1,266 @@
+"""
+Module :py:mod:`newproject.logs` provides the optional asynchronous logging pipeline.
+
+In queued mode, package logger handlers are moved behind a bounded queue: logging calls only
+enqueue records while a background listener thread formats them and writes them by batches.
+When the queue is full, records are either dropped and counted (``drop`` policy)
+or the caller waits for free room (``block`` policy).
+
+Mode is selected in the ``logging`` section of the settings file:
+
+.. code-block:: JSON
+
+    {
+        "logging": {
+            "mode": "queued",
+            "queue_size": 10000,
+            "batch_size": 256,
+            "policy": "drop"
+        }
+    }
+
+Queued records are flushed by :func:`shutdown` which is registered at interpreter exit
+and called by :py:func:`newproject.service.main` before it exits. Forked processes
+(eg. service workers) restart their own listeners.
+"""
+
+import atexit
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Any, List, Optional
+
+from newproject.errors import InvalidParameter
+
+_listeners: List["BatchQueueListener"] = []
+_lock = threading.Lock()
+
+#: Queue of records shared by handlers and listeners
+RecordQueue = queue.Queue
+
+#: Record enqueued to stop listener threads
+_STOP: Any = object()
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler enqueuing records without blocking the caller.
+    Records which do not fit in the queue are dropped and counted in :attr:`dropped`
+    (``drop`` policy) or wait for room at most :attr:`timeout` seconds (``block`` policy).
+    """
+
+    policies = ("drop", "block")
+
+    queue: RecordQueue
+
+    def __init__(
+        self, queue_: RecordQueue, policy: str = "drop", timeout: float = 1.0
+    ) -> None:
+        if policy not in self.policies:
+            raise InvalidParameter(
+                "Policy must be one of {}, received {!r}".format(self.policies, policy)
+            )
+        super().__init__(queue_)
+        self.policy = policy
+        self.timeout = timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merges message arguments and exception traceback into the record copy,
+        formatting itself is left to the listener thread.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Enqueues the record according to the overload policy.
+        """
+        try:
+            if self.policy == "drop":
+                self.queue.put_nowait(record)
+            else:
+                self.queue.put(record, timeout=self.timeout)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener dequeuing records by batches of at most :attr:`batch_size` records.
+    Stream handlers receive each batch in a single write followed by a single flush,
+    other handlers receive records one by one.
+    """
+
+    queue: RecordQueue
+    #: Logger whose handlers are served, set by :func:`configure`
+    logger: logging.Logger
+    #: Queue handler installed on the logger, set by :func:`configure`
+    handler: BoundedQueueHandler
+
+    def __init__(
+        self,
+        queue_: RecordQueue,
+        *handlers: logging.Handler,
+        batch_size: int = 256,
+        respect_handler_level: bool = True,
+    ) -> None:
+        super().__init__(queue_, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = batch_size
+
+    def enqueue_sentinel(self) -> None:
+        """
+        Enqueues the stop sentinel, waiting for room when the queue is full.
+        """
+        self.queue.put(_STOP)
+
+    def _monitor(self) -> None:
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        stop = False
+        while not stop:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            records = batch[:-1] if stop else batch
+            if records:
+                self.handle_batch(records)
+            if has_task_done:
+                for _ in batch:
+                    q.task_done()
+
+    def handle_batch(self, records: List[logging.LogRecord]) -> None:
+        """
+        Dispatches a batch of records to handlers.
+        """
+        for handler in self.handlers:
+            selected = [
+                record
+                for record in records
+                if not self.respect_handler_level or record.levelno >= handler.level
+            ]
+            if not selected:
+                continue
+            if (
+                isinstance(handler, logging.StreamHandler)
+                and handler.stream is not None
+            ):
+                emit_batch(handler, selected)
+            else:
+                for record in selected:
+                    handler.handle(record)
+
+
+def emit_batch(
+    handler: logging.StreamHandler, records: List[logging.LogRecord]
+) -> None:
+    """
+    Formats records and writes them to the handler stream in a single write.
+    """
+    lines = []
+    for record in records:
+        if not handler.filter(record):
+            continue
+        try:
+            lines.append(handler.format(record) + handler.terminator)
+        except Exception:  # pylint: disable=broad-except
+            handler.handleError(record)
+    if not lines:
+        return
+    handler.acquire()
+    try:
+        handler.stream.write("".join(lines))
+        handler.flush()
+    except Exception:  # pylint: disable=broad-except
+        handler.handleError(records[-1])
+    finally:
+        handler.release()
+
+
+def configure(
+    logger: logging.Logger,
+    mode: str = "sync",
+    queue_size: int = 10000,
+    batch_size: int = 256,
+    policy: str = "drop",
+) -> Optional[BatchQueueListener]:
+    """
+    Configures logger according to the logging mode.
+    In ``sync`` mode logger is left unchanged, in ``queued`` mode its handlers are moved
+    behind a :class:`BoundedQueueHandler` served by a started :class:`BatchQueueListener`
+    which is returned.
+    """
+    if mode == "sync":
+        return None
+    if mode != "queued":
+        raise InvalidParameter(
+            "Logging mode must be 'sync' or 'queued', received {!r}".format(mode)
+        )
+    queue_: RecordQueue = queue.Queue(maxsize=queue_size)
+    handlers = list(logger.handlers)
+    handler = BoundedQueueHandler(queue_, policy=policy)
+    listener = BatchQueueListener(queue_, *handlers, batch_size=batch_size)
+    for existing in handlers:
+        logger.removeHandler(existing)
+    logger.addHandler(handler)
+    listener.logger = logger
+    listener.handler = handler
+    listener.start()
+    with _lock:
+        _listeners.append(listener)
+    return listener
+
+
+def shutdown() -> int:
+    """
+    Flushes and stops all queued logging listeners, original handlers are restored.
+    Returns the number of records dropped because of overload.
+    """
+    with _lock:
+        listeners = list(_listeners)
+        _listeners.clear()
+    dropped = 0
+    for listener in listeners:
+        listener.stop()
+        listener.logger.removeHandler(listener.handler)
+        for handler in listener.handlers:
+            listener.logger.addHandler(handler)
+        if listener.handler.dropped:
+            listener.logger.warning(
+                "Queued logging dropped %d records", listener.handler.dropped
+            )
+        dropped += listener.handler.dropped
+    return dropped
+
+
+def _after_fork_in_child() -> None:
+    """
+    Restarts queued logging in forked processes: listener threads do not survive fork,
+    each listener gets a fresh queue (records pending in the parent are left to it)
+    and a new thread.
+    """
+    for listener in _listeners:
+        fresh: RecordQueue = queue.Queue(maxsize=listener.queue.maxsize)
+        listener.queue = fresh
+        listener.handler.queue = fresh
+        listener.handler.dropped = 0
+        listener._thread = None
+        listener.start()
+
+
+atexit.register(shutdown)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,344 @@
+"""
+Module :py:mod:`newproject.memory` accounts live interface objects and their memory.
+
+Accounting is disabled by default and costs nothing until :func:`enable` is called: it then
+installs a :meth:`__new__` on :class:`newproject.interfaces.generic.GenericInterface`
+registering each created object (including objects unpickled or decoded from graphs)
+by a weak reference keyed by its id (objects do not need to be hashable), so objects
+are counted as long as they are alive and never kept alive by the tracker.
+:func:`disable` stops registering, objects created in between are counted until they
+are collected. The hook itself stays installed once enabled (CPython cannot restore the
+default constructor slot of existing classes), it then only checks the enabled flag.
+
+:func:`report` returns per class live counts and an estimate of the memory they hold:
+the deep size of a sample of objects (object, attributes, containers and NumPy buffers,
+shared values counted once per class) extrapolated to all live objects. When enabled
+with ``tracemalloc=True``, the report also lists the package source lines which allocated
+the most memory still in use, with their growth since the previous report, so leaking
+allocation sites stand out between reports:
+
+.. code-block:: python
+
+    from newproject import memory
+
+    memory.enable(tracemalloc=True)
+    instances = [SimpleCase(value=list(range(100))) for _ in range(1000)]
+    memory.report()["classes"]["newproject.interfaces.examples.SimpleCase"]
+    # {"count": 1000, "size": 1028000, "sampled": 100}
+
+Accounting is exposed by the service ``/memory`` request (``--memory`` option of
+:py:mod:`newproject.service`) and by the settings entry point
+(``python -m newproject.settings --memory``), it can be enabled at settings load
+by the ``memory`` section of the settings file.
+"""
+
+import os
+import pathlib
+import sys
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Set, Type
+
+from newproject.interfaces import generic
+from newproject.interfaces.generic import GenericInterface
+
+#: Number of objects measured per class to estimate memory
+sample = 100
+
+#: Number of allocation sites reported
+sites = 20
+
+#: Directory of package sources, allocations are attributed to lines of these files
+package = pathlib.Path(__file__).resolve().parent
+
+
+def deep_size(value: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Returns the estimated memory size in bytes of a value and everything it references:
+    containers items, object attributes (``__dict__`` and slots) and NumPy array buffers.
+    Values whose ids are in seen are not counted again (seen is updated).
+    Classes, modules and functions are not counted.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        key = id(value)
+        if key in seen or isinstance(value, (type, type(sys), type(deep_size))):
+            continue
+        seen.add(key)
+        try:
+            size += sys.getsizeof(value)
+        except TypeError:
+            continue
+        kind = type(value)
+        if kind in (str, bytes, int, float, bool, type(None)):
+            continue
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stack.extend(value)
+        elif hasattr(value, "nbytes") and hasattr(value, "base"):
+            # NumPy arrays: owned buffer (getsizeof includes it for owners already):
+            if value.base is not None:
+                stack.append(value.base)
+            continue
+        else:
+            attributes = getattr(value, "__dict__", None)
+            if attributes is not None:
+                stack.append(attributes)
+            for klass in kind.__mro__:
+                for slot in klass.__dict__.get("__slots__", ()):
+                    if slot not in ("__dict__", "__weakref__"):
+                        stack.append(getattr(value, slot, None))
+    return size
+
+
+class _Registry(dict):
+    """
+    Weak references of live objects keyed by their ids.
+    """
+
+    def add(self, instance: Any) -> None:
+        key = id(instance)
+        self[key] = weakref.KeyedRef(instance, self._remove, key)
+
+    def _remove(self, reference: weakref.KeyedRef) -> None:
+        if self.get(reference.key) is reference:
+            del self[reference.key]
+
+    def objects(self) -> List[Any]:
+        return [
+            instance
+            for instance in (reference() for reference in list(self.values()))
+            if instance is not None
+        ]
+
+
+class Tracker:
+    """
+    Live objects registry of interface classes, see module :py:mod:`newproject.memory`.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.instances: Dict[type, _Registry] = {}
+        #: Number of created objects which do not support weak references, by class
+        self.untracked: Dict[type, int] = {}
+        self._lock = threading.Lock()
+        self._tracing = False
+        self._installed = False
+        self._previous: Dict[str, int] = {}
+
+    def register(self, instance: Any) -> None:
+        """
+        Registers a live object.
+        """
+        kind = type(instance)
+        instances = self.instances.get(kind)
+        if instances is None:
+            with self._lock:
+                instances = self.instances.setdefault(kind, _Registry())
+        try:
+            instances.add(instance)
+        except TypeError:
+            self.untracked[kind] = self.untracked.get(kind, 0) + 1
+
+    def enable(self, tracemalloc: bool = False, frames: int = 10) -> None:
+        """
+        Registers interface objects created from now on, and starts tracing memory
+        allocations with the given traceback depth when tracemalloc is true.
+        """
+        with self._lock:
+            if tracemalloc and not self._tracing:
+                import tracemalloc as tracing
+
+                if not tracing.is_tracing():
+                    tracing.start(frames)
+                    self._tracing = True
+            self.enabled = True
+            if self._installed:
+                return
+            self._installed = True
+            tracker = self
+
+            def __new__(cls: Type[GenericInterface], *args: Any, **kwargs: Any) -> Any:
+                parent = super(GenericInterface, cls).__new__
+                if parent is object.__new__:
+                    instance = parent(cls)
+                else:
+                    instance = parent(cls, *args, **kwargs)
+                if tracker.enabled:
+                    tracker.register(instance)
+                return instance
+
+            setattr(GenericInterface, "__new__", staticmethod(__new__))
+
+    def disable(self) -> None:
+        """
+        Stops registering new objects and tracing allocations started by :meth:`enable`,
+        registered objects are counted until they are collected.
+        """
+        with self._lock:
+            if self._tracing:
+                import tracemalloc
+
+                tracemalloc.stop()
+                self._tracing = False
+                self._previous = {}
+            self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Forgets registered objects and the allocations of the previous report.
+        """
+        with self._lock:
+            self.instances.clear()
+            self.untracked.clear()
+            self._previous = {}
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns the number of live objects keyed by fully qualified class name.
+        """
+        return {
+            generic._type_name(kind): len(instances)
+            for kind, instances in list(self.instances.items())
+            if len(instances)
+        }
+
+    def classes(self, sample: int = sample) -> Dict[str, dict]:
+        """
+        Returns live objects count and estimated deep size (in bytes) keyed by fully
+        qualified class name, size is extrapolated from at most sample objects per class.
+        """
+        result = {}
+        for kind, instances in list(self.instances.items()):
+            objects = instances.objects()
+            if not objects:
+                continue
+            measured = objects[:sample]
+            seen: Set[int] = set()
+            size = sum(deep_size(instance, seen) for instance in measured)
+            result[generic._type_name(kind)] = {
+                "count": len(objects),
+                "size": size * len(objects) // len(measured),
+                "sampled": len(measured),
+            }
+        return result
+
+    def allocations(self, limit: int = sites) -> Optional[List[dict]]:
+        """
+        Returns the package source lines holding the most traced memory (size in bytes,
+        number of blocks and size growth since the previous call), allocations made
+        by other modules are attributed to the innermost package line of their traceback.
+        Returns None when allocations are not traced.
+        """
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            return None
+        pattern = str(package / "*")
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, pattern, all_frames=True)]
+        )
+        sites: Dict[str, List[int]] = {}
+        prefix = os.path.join(str(package), "")
+        for statistic in snapshot.statistics("traceback"):
+            # Traces kept by the filter have at least one package frame:
+            frame = next(
+                frame
+                for frame in reversed(statistic.traceback)
+                if frame.filename.startswith(prefix)
+            )
+            if frame.filename == __file__:
+                # Registrations and reports of the tracker itself:
+                continue
+            site = "{}:{}".format(
+                pathlib.Path(frame.filename).relative_to(package.parent).as_posix(),
+                frame.lineno,
+            )
+            totals = sites.setdefault(site, [0, 0])
+            totals[0] += statistic.size
+            totals[1] += statistic.count
+        previous, self._previous = self._previous, {
+            site: size for site, (size, _) in sites.items()
+        }
+        ranked = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)
+        return [
+            {
+                "site": site,
+                "size": size,
+                "count": count,
+                "growth": size - previous.get(site, 0),
+            }
+            for site, (size, count) in ranked[:limit]
+        ]
+
+    def report(self, sample: int = sample, allocations: int = sites) -> Dict[str, Any]:
+        """
+        Returns classes accounting (see :meth:`classes`), objects created without weak
+        reference support and traced allocation sites (see :meth:`allocations`).
+        """
+        return {
+            "enabled": self.enabled,
+            "classes": self.classes(sample=sample),
+            "untracked": {
+                generic._type_name(kind): count
+                for kind, count in list(self.untracked.items())
+            },
+            "allocations": self.allocations(limit=allocations),
+        }
+
+
+#: Package tracker
+tracker = Tracker()
+
+
+def enable(tracemalloc: bool = False, frames: int = 10) -> None:
+    """
+    Enables accounting (see :meth:`Tracker.enable`).
+    """
+    tracker.enable(tracemalloc=tracemalloc, frames=frames)
+
+
+def disable() -> None:
+    """
+    Disables accounting (see :meth:`Tracker.disable`).
+    """
+    tracker.disable()
+
+
+def reset() -> None:
+    """
+    Forgets registered objects.
+    """
+    tracker.reset()
+
+
+def counts() -> Dict[str, int]:
+    """
+    Returns live objects counts (see :meth:`Tracker.counts`).
+    """
+    return tracker.counts()
+
+
+def report(sample: int = sample, allocations: int = sites) -> Dict[str, Any]:
+    """
+    Returns the memory report (see :meth:`Tracker.report`).
+    """
+    return tracker.report(sample=sample, allocations=allocations)
+
+
+def configure(section: Dict[str, Any]) -> None:
+    """
+    Enables accounting from the ``memory`` section of the settings file:
+    ``{"track": true, "tracemalloc": false, "frames": 10}``.
+    """
+    if section.get("track"):
+        enable(
+            tracemalloc=bool(section.get("tracemalloc", False)),
+            frames=int(section.get("frames", 10)),
+        )
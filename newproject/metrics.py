@@ -0,0 +1,366 @@
+"""
+Module :py:mod:`newproject.metrics` instruments interfaces hot paths.
+
+Instrumentation is disabled by default and costs nothing until :func:`enable` is called:
+it then wraps the :attr:`methods` of :class:`newproject.interfaces.generic.GenericInterface`
+and of all its subclasses (including classes created afterward) with timers, and
+:func:`disable` restores the original methods.
+For each interface class it records call counts, cumulative and percentile timings
+and the number of values serialized by the attributes fallback of
+:meth:`GenericInterface.serializer` (values of types without registered handler):
+
+.. code-block:: python
+
+    from newproject import metrics
+
+    metrics.enable()
+    SimpleCase(value=1).to_json()
+    metrics.stats()["classes"]["newproject.interfaces.examples.SimpleCase"]["to_json"]
+
+Bulk generator methods are timed while they produce items, until they are exhausted
+or closed.
+Calls chained through ``super()`` on the same object are timed once, nested calls on
+other objects (eg. collection items) are timed on their own.
+Timers of the service are exposed by its ``/metrics`` request (see :py:mod:`newproject.service`).
+Module also provides :func:`profile` to capture cProfile and tracemalloc snapshots.
+"""
+
+import collections
+import contextlib
+import functools
+import inspect
+import os
+import pathlib
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, Iterator, Optional, Type
+
+from newproject.interfaces import generic
+from newproject.interfaces.generic import GenericInterface
+
+#: Instrumented methods
+methods = (
+    "to_dict",
+    "to_json",
+    "to_bytes",
+    "serializer",
+    "to_json_many",
+    "to_ndjson_many",
+)
+
+#: Number of recent durations kept per timer to estimate percentiles
+samples = 1024
+
+#: Reported percentiles
+percentiles = (50, 90, 99)
+
+
+class Timer:
+    """
+    Call counter and duration accumulator (durations in seconds).
+    Percentiles are estimated on the :attr:`samples` most recent durations.
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "recent")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+        self.recent: collections.deque = collections.deque(maxlen=samples)
+
+    def record(self, duration: float) -> None:
+        """
+        Records a call duration.
+        """
+        self.count += 1
+        self.total += duration
+        if duration < self.minimum:
+            self.minimum = duration
+        if duration > self.maximum:
+            self.maximum = duration
+        self.recent.append(duration)
+
+    def to_dict(self) -> dict:
+        """
+        Returns timer statistics.
+        """
+        recent = sorted(self.recent)
+        result = {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.minimum if self.count else 0.0,
+            "max": self.maximum,
+        }
+        for percentile in percentiles:
+            index = min(len(recent) - 1, len(recent) * percentile // 100)
+            result["p{}".format(percentile)] = recent[index] if recent else 0.0
+        return result
+
+
+class Registry:
+    """
+    Timers and fallback counters of interface classes, see module :py:mod:`newproject.metrics`.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.timers: Dict[tuple, Timer] = {}
+        self.fallbacks: Dict[tuple, int] = collections.defaultdict(int)
+        self._originals: Dict[tuple, Any] = {}
+        self._init_subclass: Optional[classmethod] = None
+        self._active = threading.local()
+        self._lock = threading.Lock()
+
+    def timer(self, cls: type, method: str) -> Timer:
+        """
+        Returns the timer of a class method, created on first call.
+        """
+        key = (cls, method)
+        timer = self.timers.get(key)
+        if timer is None:
+            with self._lock:
+                timer = self.timers.setdefault(key, Timer())
+        return timer
+
+    def _wrap(self, function: Callable, method: str) -> Callable:
+        """
+        Returns function wrapped by a timer keyed by its bound object class.
+        """
+        if inspect.isgeneratorfunction(function):
+            return self._wrap_generator(function, method)
+        perf_counter = time.perf_counter
+        active = self._active
+
+        @functools.wraps(function)
+        def wrapper(bound: Any, *args: Any, **kwargs: Any) -> Any:
+            calls = active.__dict__.setdefault("calls", set())
+            key = (id(bound), method)
+            if key in calls:
+                return function(bound, *args, **kwargs)
+            calls.add(key)
+            start = perf_counter()
+            try:
+                return function(bound, *args, **kwargs)
+            finally:
+                duration = perf_counter() - start
+                calls.discard(key)
+                cls = bound if isinstance(bound, type) else type(bound)
+                self.timer(cls, method).record(duration)
+
+        return wrapper
+
+    def _wrap_generator(self, function: Callable, method: str) -> Callable:
+        """
+        Returns generator function wrapped by a timer recording the time spent producing
+        items, from the first item until the generator is exhausted or closed.
+        """
+        perf_counter = time.perf_counter
+        active = self._active
+
+        @functools.wraps(function)
+        def wrapper(bound: Any, *args: Any, **kwargs: Any) -> Generator[Any, Any, Any]:
+            calls = active.__dict__.setdefault("calls", set())
+            key = (id(bound), method)
+            if key in calls:
+                return (yield from function(bound, *args, **kwargs))
+            generator = function(bound, *args, **kwargs)
+            duration = 0.0
+            try:
+                while True:
+                    calls = active.__dict__.setdefault("calls", set())
+                    calls.add(key)
+                    start = perf_counter()
+                    try:
+                        item = next(generator)
+                    except StopIteration as stop:
+                        return stop.value
+                    finally:
+                        duration += perf_counter() - start
+                        calls.discard(key)
+                    yield item
+            finally:
+                generator.close()
+                cls = bound if isinstance(bound, type) else type(bound)
+                self.timer(cls, method).record(duration)
+
+        return wrapper
+
+    def _wrap_serializer(self, function: Callable) -> Callable:
+        """
+        Returns serializer wrapped by a timer counting values serialized by fallback.
+        """
+        wrapper = self._wrap(function, "serializer")
+        fallbacks = self.fallbacks
+
+        @functools.wraps(function)
+        def serializer(cls: Type[GenericInterface], instance: Any) -> Any:
+            result = wrapper(cls, instance)
+            kind = type(instance)
+            if cls._serializer_cache.get(kind) is generic._fallback:
+                fallbacks[(cls, generic._type_name(kind))] += 1
+            return result
+
+        return serializer
+
+    def instrument(self, cls: type) -> None:
+        """
+        Wraps the instrumented methods defined by the class.
+        """
+        for method in methods:
+            original = cls.__dict__.get(method)
+            if original is None or (cls, method) in self._originals:
+                continue
+            wrapped: Any
+            if isinstance(original, classmethod):
+                function = original.__func__
+                if method == "serializer" and cls is GenericInterface:
+                    wrapped = classmethod(self._wrap_serializer(function))
+                else:
+                    wrapped = classmethod(self._wrap(function, method))
+            elif callable(original) and not getattr(
+                original, "__isabstractmethod__", False
+            ):
+                wrapped = self._wrap(original, method)
+            else:
+                continue
+            self._originals[(cls, method)] = original
+            setattr(cls, method, wrapped)
+
+    @staticmethod
+    def _reset_encoders() -> None:
+        """
+        Drops encoders cached by interface classes, they are bound to the serializer
+        method in use when they were created.
+        """
+        for cls in generic._subclasses(GenericInterface):
+            for attribute in ("_encoder", "_binary_serializer", "_canonical_encoder"):
+                if attribute in cls.__dict__:
+                    delattr(cls, attribute)
+
+    def enable(self) -> None:
+        """
+        Instruments all interface classes, classes created later are instrumented
+        when they are defined.
+        """
+        with self._lock:
+            if self.enabled:
+                return
+            self.enabled = True
+            for cls in generic._subclasses(GenericInterface):
+                self.instrument(cls)
+            registry = self
+            original = GenericInterface.__dict__["__init_subclass__"]
+            self._init_subclass = original
+
+            def __init_subclass__(cls, **kwargs: Any) -> None:
+                original.__func__(cls, **kwargs)
+                registry.instrument(cls)
+
+            setattr(
+                GenericInterface, "__init_subclass__", classmethod(__init_subclass__)
+            )
+            self._reset_encoders()
+
+    def disable(self) -> None:
+        """
+        Restores original methods, recorded statistics are kept.
+        """
+        with self._lock:
+            if not self.enabled:
+                return
+            self.enabled = False
+            for (cls, method), original in self._originals.items():
+                setattr(cls, method, original)
+            self._originals.clear()
+            setattr(GenericInterface, "__init_subclass__", self._init_subclass)
+            self._init_subclass = None
+            self._reset_encoders()
+
+    def reset(self) -> None:
+        """
+        Clears recorded statistics.
+        """
+        with self._lock:
+            self.timers.clear()
+            self.fallbacks.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns recorded statistics keyed by fully qualified class name then method
+        (durations in seconds) and fallback counts keyed by class then value type name.
+        """
+        classes: dict = {}
+        for (cls, method), timer in list(self.timers.items()):
+            classes.setdefault(generic._type_name(cls), {})[method] = timer.to_dict()
+        fallbacks: dict = {}
+        for (cls, kind), count in list(self.fallbacks.items()):
+            fallbacks.setdefault(generic._type_name(cls), {})[kind] = count
+        return {"enabled": self.enabled, "classes": classes, "fallbacks": fallbacks}
+
+
+#: Package registry
+registry = Registry()
+
+
+def enable() -> None:
+    """
+    Enables instrumentation (see :meth:`Registry.enable`).
+    """
+    registry.enable()
+
+
+def disable() -> None:
+    """
+    Disables instrumentation (see :meth:`Registry.disable`).
+    """
+    registry.disable()
+
+
+def reset() -> None:
+    """
+    Clears recorded statistics.
+    """
+    registry.reset()
+
+
+def stats() -> dict:
+    """
+    Returns recorded statistics (see :meth:`Registry.stats`).
+    """
+    return registry.stats()
+
+
+@contextlib.contextmanager
+def profile(directory: Any, name: Optional[str] = None) -> Iterator[pathlib.Path]:
+    """
+    Profiles the enclosed block with cProfile and tracemalloc. On exit, writes the
+    profile statistics (``{name}.prof``, readable with :py:mod:`pstats`), the memory
+    snapshot (``{name}.tracemalloc``, readable with :meth:`tracemalloc.Snapshot.load`)
+    and a summary of the top allocations (``{name}.memory.txt``) into directory.
+    Name defaults to ``profile-{pid}``, the common path prefix is yielded.
+    """
+    import cProfile
+    import tracemalloc
+
+    directory = pathlib.Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    prefix = directory / (name or "profile-{}".format(os.getpid()))
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield prefix
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        if not tracing:
+            tracemalloc.stop()
+        profiler.dump_stats(str(prefix.with_name(prefix.name + ".prof")))
+        snapshot.dump(str(prefix.with_name(prefix.name + ".tracemalloc")))
+        lines = [str(line) for line in snapshot.statistics("lineno")[:50]]
+        prefix.with_name(prefix.name + ".memory.txt").write_text("\n".join(lines))
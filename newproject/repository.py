@@ -0,0 +1,387 @@
+"""
+Module :py:mod:`newproject.repository` persists interface objects in SQLite.
+
+The database is given by an URL, by default the ``database`` setting
+(``DATABASE`` environment variable, see module :py:mod:`newproject.settings`):
+
+  * ``sqlite://`` or ``sqlite:///:memory:`` for an in-memory database,
+    shared by all connections of the repository pool and used by one thread at a time;
+  * ``sqlite:///relative/path.db`` or ``sqlite:////absolute/path.db`` for a file database,
+    opened in WAL mode so readers do not block the writer.
+
+Connections are reused from a thread-safe :class:`ConnectionPool`, statements are
+parameterized constant strings so SQLite reuses their prepared form (statement cache
+of each connection), and bulk inserts are sent by batches with ``executemany``:
+
+.. code-block:: python
+
+    with Repository(SimpleCase) as repository:
+        repository.add_many(SimpleCase(value=i) for i in range(100000))
+        rows = repository.iterate(
+            where="json_extract(data, '$.value') > ?", parameters=(99990,)
+        )
+        for id_, instance in rows:
+            ...
+
+Objects are stored as their JSON configuration (``encoding="json"``, queryable with
+SQLite JSON functions) or in the binary format (``encoding="bytes"``).
+"""
+
+import contextlib
+import itertools
+import json
+import queue
+import re
+import sqlite3
+import threading
+import uuid
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces.generic import GenericInterface
+
+_scheme = "sqlite://"
+_identifier = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def parse_database(url: str) -> Tuple[str, bool]:
+    """
+    Returns the SQLite database name and whether it is an URI from a database URL.
+    In-memory databases get a unique shared-cache URI.
+    """
+    if not url.startswith(_scheme):
+        raise InvalidParameter(
+            "Database URL must start with {!r}, received {!r}".format(_scheme, url)
+        )
+    path = url[len(_scheme) :]
+    if path in ("", "/", "/:memory:"):
+        return "file:newproject-{}?mode=memory&cache=shared".format(uuid.uuid4()), True
+    if not path.startswith("/"):
+        raise InvalidParameter(
+            "Database URL path must start with '/', received {!r}".format(url)
+        )
+    return path[1:], False
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of at most :attr:`size` SQLite connections created on demand.
+    A connection is used by a single thread at a time.
+    """
+
+    def __init__(
+        self, database: str, uri: bool = False, size: int = 5, timeout: float = 30.0
+    ) -> None:
+        if size < 1:
+            raise InvalidParameter(
+                "Pool size must be positive, received {}".format(size)
+            )
+        self.database = database
+        self.uri = uri
+        self.size = size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._connections: list = []
+        self._lock = threading.Lock()
+        self._closed = False
+        memory = "mode=memory" in database
+        # In-memory databases live as long as one of their connections is open:
+        self._anchor = self._connect() if memory else None
+        # Shared-cache connections fail instead of waiting for each other's table
+        # locks, threads are serialized so uncommitted rows are never read:
+        self._access: Optional[threading.RLock] = threading.RLock() if memory else None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.database,
+            uri=self.uri,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        if connection.execute("PRAGMA journal_mode=WAL").fetchone()[0] == "wal":
+            connection.execute("PRAGMA synchronous=NORMAL")
+        else:
+            # shared-cache readers do not lock tables against the writer, a thread
+            # only reads its own committed rows as threads are serialized
+            connection.execute("PRAGMA read_uncommitted=1")
+        return connection
+
+    @contextlib.contextmanager
+    def _serialized(self) -> Iterator[None]:
+        """
+        Context manager holding the in-memory database for the current thread,
+        waits at most :attr:`timeout` seconds for other threads.
+        """
+        if self._access is None:
+            yield
+            return
+        if not self._access.acquire(timeout=self.timeout):
+            raise InvalidParameter(
+                "Database not released by other threads after {}s".format(self.timeout)
+            )
+        try:
+            yield
+        finally:
+            self._access.release()
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager lending a connection, waits at most :attr:`timeout` seconds
+        when all connections are in use. Pending transactions are rolled back on return.
+        Connections to in-memory databases are lent to one thread at a time.
+        """
+        with self._serialized():
+            with self._lend() as connection:
+                yield connection
+
+    @contextlib.contextmanager
+    def _lend(self) -> Iterator[sqlite3.Connection]:
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = None
+            with self._lock:
+                if self._closed:
+                    raise InvalidParameter("Connection pool is closed")
+                if len(self._connections) < self.size:
+                    connection = self._connect()
+                    self._connections.append(connection)
+            if connection is None:
+                try:
+                    connection = self._idle.get(timeout=self.timeout)
+                except queue.Empty as error:
+                    raise InvalidParameter(
+                        "No connection available after {}s (pool size {})".format(
+                            self.timeout, self.size
+                        )
+                    ) from error
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                connection.rollback()
+            with self._lock:
+                closed = self._closed
+                if not closed:
+                    self._idle.put(connection)
+            if closed:
+                # the pool was closed while the connection was lent:
+                connection.close()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager lending a connection within a transaction, committed on success
+        and rolled back on error.
+        """
+        with self.connection() as connection, connection:
+            yield connection
+
+    def close(self) -> None:
+        """
+        Closes idle connections, lent connections are closed when they are returned.
+        Connections can no longer be lent once the pool is closed.
+        """
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._connections.clear()
+            if self._anchor is not None:
+                self._anchor.close()
+                self._anchor = None
+
+
+class Repository:
+    """
+    SQLite table of objects created by the same interface factory, identified by
+    an integer id assigned on insertion.
+    """
+
+    #: Supported encodings
+    encodings = ("json", "bytes")
+
+    def __init__(
+        self,
+        factory: type,
+        database: Optional[str] = None,
+        table: Optional[str] = None,
+        encoding: str = "json",
+        pool_size: int = 5,
+        batch_size: int = 1000,
+    ) -> None:
+        """
+        Initialization method takes the interface class of stored objects, the database URL
+        (``database`` setting when omitted), the table name (factory name when omitted),
+        the objects encoding, the connection pool size and the number of rows
+        sent or fetched at once.
+        """
+        if not (isinstance(factory, type) and issubclass(factory, GenericInterface)):
+            raise InvalidParameter(
+                "Factory must be a GenericInterface subclass, received {!r}".format(
+                    factory
+                )
+            )
+        if encoding not in self.encodings:
+            raise InvalidParameter(
+                "Encoding must be one of {}, received {!r}".format(
+                    self.encodings, encoding
+                )
+            )
+        table = table or factory.__name__.lower()
+        if not _identifier.match(table):
+            raise InvalidParameter("Invalid table name {!r}".format(table))
+        if database is None:
+            from newproject.settings import get_settings
+
+            database = get_settings().database
+        self.factory = factory
+        self.database = database
+        self.table = table
+        self.encoding = encoding
+        self.batch_size = batch_size
+        self.pool = ConnectionPool(*parse_database(database), size=pool_size)
+        self._insert = 'INSERT INTO "{}" (data) VALUES (?)'.format(table)
+        self._select = 'SELECT data FROM "{}" WHERE id = ?'.format(table)
+        self._update = 'UPDATE "{}" SET data = ? WHERE id = ?'.format(table)
+        self._delete = 'DELETE FROM "{}" WHERE id = ?'.format(table)
+        self._count = 'SELECT COUNT(*) FROM "{}"'.format(table)
+        self._iterate = 'SELECT id, data FROM "{}"'.format(table)
+        with self.pool.transaction() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS "{}" '
+                "(id INTEGER PRIMARY KEY, data NOT NULL)".format(table)
+            )
+
+    def __repr__(self) -> str:
+        return "{}(factory={}, database={!r}, table={!r})".format(
+            type(self).__name__, self.factory.__qualname__, self.database, self.table
+        )
+
+    def __enter__(self) -> "Repository":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self.pool.connection() as connection:
+            count: int = connection.execute(self._count).fetchone()[0]
+        return count
+
+    def close(self) -> None:
+        """
+        Closes pool connections (in-memory databases are dropped).
+        """
+        self.pool.close()
+
+    def encode(self, instance: GenericInterface) -> Any:
+        """
+        Returns the stored value of an object (JSON text or binary blob).
+        """
+        if self.encoding == "json":
+            return instance.to_json()
+        return instance.to_bytes()
+
+    def decode(self, data: Any) -> GenericInterface:
+        """
+        Returns the object of a stored value, JSON text and binary blobs
+        can be mixed in the same table.
+        """
+        if isinstance(data, str):
+            return self.factory(**json.loads(data))
+        return self.factory.from_bytes(data)
+
+    def add(self, instance: GenericInterface) -> int:
+        """
+        Inserts an object and returns its id.
+        """
+        with self.pool.transaction() as connection:
+            id_ = connection.execute(self._insert, (self.encode(instance),)).lastrowid
+        if id_ is None:
+            raise InvalidParameter("No id assigned to the inserted row")
+        return id_
+
+    def add_many(
+        self, instances: Iterable[GenericInterface], batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Inserts objects by batches of :attr:`batch_size` rows (one transaction
+        per batch) and returns the number of inserted objects.
+        """
+        batch_size = batch_size or self.batch_size
+        iterator = iter(instances)
+        count = 0
+        while True:
+            rows = [
+                (self.encode(instance),)
+                for instance in itertools.islice(iterator, batch_size)
+            ]
+            if not rows:
+                break
+            with self.pool.transaction() as connection:
+                connection.executemany(self._insert, rows)
+            count += len(rows)
+        return count
+
+    def get(self, id_: int) -> GenericInterface:
+        """
+        Returns the object with the given id, raises :class:`KeyError` when missing.
+        """
+        with self.pool.connection() as connection:
+            row = connection.execute(self._select, (id_,)).fetchone()
+        if row is None:
+            raise KeyError(id_)
+        return self.decode(row[0])
+
+    def update(self, id_: int, instance: GenericInterface) -> None:
+        """
+        Replaces the object with the given id, raises :class:`KeyError` when missing.
+        """
+        with self.pool.transaction() as connection:
+            cursor = connection.execute(self._update, (self.encode(instance), id_))
+            if cursor.rowcount == 0:
+                raise KeyError(id_)
+
+    def delete(self, id_: int) -> None:
+        """
+        Removes the object with the given id, raises :class:`KeyError` when missing.
+        """
+        with self.pool.transaction() as connection:
+            if connection.execute(self._delete, (id_,)).rowcount == 0:
+                raise KeyError(id_)
+
+    def iterate(
+        self,
+        where: Optional[str] = None,
+        parameters: Iterable[Any] = (),
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Tuple[int, GenericInterface]]:
+        """
+        Yields (id, object) pairs ordered by id, optionally filtered by a SQL condition
+        with parameters (eg. ``where="json_extract(data, '$.value') > ?"``).
+        Rows are fetched by batches of :attr:`batch_size`, the result set is never
+        loaded at once. The connection is returned to the pool when the iterator ends
+        or is closed, other threads wait until then on in-memory databases.
+        """
+        statement = self._iterate
+        if where:
+            statement += " WHERE " + where
+        statement += " ORDER BY id"
+        with self.pool.connection() as connection:
+            cursor = connection.execute(statement, tuple(parameters))
+            cursor.arraysize = batch_size or self.batch_size
+            try:
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    for id_, data in rows:
+                        yield id_, self.decode(data)
+            finally:
+                cursor.close()
@@ -1,12 +1,607 @@
 """
-Service module
+Service module serves interface objects over local TCP and Unix sockets.
+
+Service speaks newline delimited JSON: each request line holds either a configuration
+(JSON object) or an array of configurations. Configurations are turned into objects
+using the service interface (``factory(**configuration)``) and the response line holds
+their :meth:`to_json` output (an array for array requests).
+Failing requests are answered by an error envelope and keep the connection open:
+
+.. code-block:: text
+
+    > {"value": "Hello World!"}
+    < {"value": "Hello World!"}
+    > [{"value": 1}, {"value": 2}]
+    < [{"value": 1}, {"value": 2}]
+    > {"unknown": 1}
+    < {"error": {"type": "TypeError", "message": "..."}}
+
+Request line ``/metrics`` is answered by the service statistics: interfaces timers
+(see :py:mod:`newproject.metrics`, enabled by the ``--metrics`` option), live interface
+objects counts and service counters. Request line ``/memory`` is answered by the memory
+report (see :py:mod:`newproject.memory`, enabled by the ``--memory`` option).
+
+Connections are kept alive until the client closes them (or stay idle too long) and
+requests can be pipelined, responses are always written in request order.
+Service can be started from the command line:
+
+.. code-block:: bash
+
+    python -m newproject.service --port 8765 --unix /tmp/newproject.sock
+
+Option ``--metrics`` enables interfaces instrumentation, ``--memory`` enables live objects
+accounting and allocations tracing, and ``--profile [directory]`` writes
+cProfile and tracemalloc snapshots (default into ``.cache/reports``) when the service stops.
+
+And queried with the included :class:`Client`:
+
+.. code-block:: python
+
+    async with await Client.connect(port=8765) as client:
+        await client.request({"value": "Hello World!"})
+
 """
 
+import asyncio
+import copy
+import importlib
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import socket
 import sys
+import time
+from typing import Any, Iterable, List, Optional, Tuple
 
+from newproject import logs, memory, metrics
+from newproject.errors import InvalidParameter
+from newproject.interfaces.generic import GenericInterface
 from newproject.settings import settings
 
 
+def resolve_interface(path: str) -> type:
+    """
+    Returns the interface class from its fully qualified name
+    (eg. ``newproject.interfaces.examples.SimpleCase``).
+    """
+    module, _, name = path.rpartition(".")
+    try:
+        factory = getattr(importlib.import_module(module), name)
+    except (ImportError, AttributeError, ValueError) as error:
+        raise InvalidParameter("Cannot import interface {!r}".format(path)) from error
+    if not (isinstance(factory, type) and issubclass(factory, GenericInterface)):
+        raise InvalidParameter("{!r} is not a GenericInterface subclass".format(path))
+    return factory
+
+
+class Service:
+    """
+    Asyncio server building interface objects from NDJSON configurations.
+    Service listens on TCP when :attr:`port` is given (``0`` picks a free port) and on a Unix
+    socket when :attr:`path` is given, or on already listening :attr:`sockets` (which take
+    precedence). At most :attr:`max_connections` connections are served concurrently,
+    others wait for a free slot.
+    """
+
+    def __init__(
+        self,
+        factory: type,
+        host: str = "127.0.0.1",
+        port: Optional[int] = 0,
+        path: Optional[str] = None,
+        max_connections: int = 128,
+        idle_timeout: float = 300.0,
+        limit: int = 2**20,
+        sockets: Iterable[socket.socket] = (),
+    ) -> None:
+        if not (isinstance(factory, type) and issubclass(factory, GenericInterface)):
+            raise InvalidParameter(
+                "Factory must be a GenericInterface subclass, received {!r}".format(
+                    factory
+                )
+            )
+        sockets = list(sockets)
+        if port is None and path is None and not sockets:
+            raise InvalidParameter(
+                "Service requires a TCP port, a Unix socket path or listening sockets"
+            )
+        self.factory = factory
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.limit = limit
+        self.sockets = sockets
+        self._servers: List[asyncio.Server] = []
+        self._connections: set = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def addresses(self) -> list:
+        """
+        Returns the addresses the service listens on.
+        """
+        return [
+            listener.getsockname()
+            for server in self._servers
+            for listener in server.sockets
+        ]
+
+    def build(self, configuration: Any) -> GenericInterface:
+        """
+        Returns the interface object built from a configuration.
+        """
+        if not isinstance(configuration, dict):
+            raise InvalidParameter(
+                "Configuration must be a JSON object, received {}".format(
+                    type(configuration).__name__
+                )
+            )
+        return self.factory(**configuration)
+
+    def process(self, line: bytes) -> bytes:
+        """
+        Returns the response line of a request line.
+        """
+        if line.startswith(b"/"):
+            return self.control(line)
+        self.requests += 1
+        try:
+            payload = json.loads(line)
+            if isinstance(payload, list):
+                instances = [self.build(configuration) for configuration in payload]
+                response = "".join(self.factory.to_json_many(instances))
+            else:
+                response = self.build(payload).to_json()
+        except Exception as error:  # pylint: disable=broad-except
+            settings.logger.debug("Request failed: %r", error)
+            self.failures += 1
+            return self.error(error)
+        return response.encode() + b"\n"
+
+    def control(self, line: bytes) -> bytes:
+        """
+        Returns the response line of a control request (eg. ``/metrics``).
+        """
+        command = line.strip()
+        if command == b"/metrics":
+            return json.dumps(self.stats()).encode() + b"\n"
+        if command == b"/memory":
+            return json.dumps(memory.report()).encode() + b"\n"
+        return self.error(
+            InvalidParameter("Unknown control request {!r}".format(command.decode()))
+        )
+
+    def stats(self) -> dict:
+        """
+        Returns service counters, interfaces statistics (see :func:`newproject.metrics.stats`)
+        and live objects counts (see :func:`newproject.memory.counts`).
+        """
+        statistics = metrics.stats()
+        statistics["memory"] = memory.counts()
+        statistics["service"] = {
+            "pid": os.getpid(),
+            "interface": "{}.{}".format(
+                self.factory.__module__, self.factory.__qualname__
+            ),
+            "connections": len(self._connections),
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+        return statistics
+
+    @staticmethod
+    def error(error: Exception) -> bytes:
+        """
+        Returns the error envelope line of a failed request.
+        """
+        envelope = {"error": {"type": type(error).__name__, "message": str(error)}}
+        return json.dumps(envelope).encode() + b"\n"
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serves a connection until the client closes it, stays idle for
+        :attr:`idle_timeout` seconds or the service stops.
+        """
+        slots, stopping = self._started()
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            async with slots:
+                while not stopping.is_set():
+                    try:
+                        line = await asyncio.wait_for(
+                            reader.readline(), self.idle_timeout
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                    except ValueError as error:
+                        writer.write(self.error(error))
+                        break
+                    if not line:
+                        break
+                    if line.strip():
+                        writer.write(self.process(line))
+                        await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    def _started(self) -> Tuple[asyncio.Semaphore, asyncio.Event]:
+        """
+        Returns the connection slots and stop event created by :meth:`start`.
+        """
+        if self._slots is None or self._stopping is None:
+            raise InvalidParameter("Service is not started")
+        return self._slots, self._stopping
+
+    async def start(self) -> None:
+        """
+        Starts listening.
+        """
+        self._slots = asyncio.Semaphore(self.max_connections)
+        self._stopping = asyncio.Event()
+        if self.sockets:
+            for listener in self.sockets:
+                start = (
+                    asyncio.start_unix_server
+                    if listener.family == getattr(socket, "AF_UNIX", None)
+                    else asyncio.start_server
+                )
+                self._servers.append(
+                    await start(self.handle, sock=listener, limit=self.limit)
+                )
+            settings.logger.info("Service listening on %s", self.addresses)
+            return
+        if self.path is not None:
+            self._servers.append(
+                await asyncio.start_unix_server(
+                    self.handle, path=self.path, limit=self.limit
+                )
+            )
+        if self.port is not None:
+            self._servers.append(
+                await asyncio.start_server(
+                    self.handle, self.host, self.port, limit=self.limit
+                )
+            )
+        settings.logger.info("Service listening on %s", self.addresses)
+
+    def stop(self) -> None:
+        """
+        Requests the service to stop (see :meth:`run`).
+        """
+        _, stopping = self._started()
+        stopping.set()
+
+    async def close(self, grace: float = 5.0) -> None:
+        """
+        Stops listening and waits at most grace seconds for connections to finish
+        their current request before cancelling them.
+        """
+        if self._stopping is not None:
+            self._stopping.set()
+        for server in self._servers:
+            server.close()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+        if self._connections:
+            _, pending = await asyncio.wait(list(self._connections), timeout=grace)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        settings.logger.info("Service closed")
+
+    async def run(self) -> None:
+        """
+        Starts the service and serves until :meth:`stop` is called or SIGINT/SIGTERM
+        is received, then closes it gracefully.
+        """
+        await self.start()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+        _, stopping = self._started()
+        try:
+            await stopping.wait()
+        finally:
+            await self.close()
+
+    async def __aenter__(self) -> "Service":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+
+def _work(
+    service: Service,
+    inherited: List[socket.socket],
+    reuse_port: bool,
+    profile: Optional[str] = None,
+) -> None:
+    """
+    Worker process entrypoint: closes inherited sockets it does not serve, opens its own
+    ``SO_REUSEPORT`` socket if required and runs the service (profiled into the profile
+    directory when given).
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    for listener in inherited:
+        if listener not in service.sockets:
+            listener.close()
+    if reuse_port:
+        service.sockets.append(
+            socket.create_server(
+                (service.host, service.port), reuse_port=True, backlog=1024
+            )
+        )
+    settings.logger.info("Worker started (pid %d)", os.getpid())
+    try:
+        _serve(service, profile)
+    finally:
+        logs.shutdown()
+
+
+def _serve(service: Service, profile: Optional[str] = None) -> None:
+    """
+    Runs the service, under :func:`newproject.metrics.profile` when profile directory is given.
+    """
+    if profile is None:
+        asyncio.run(service.run())
+        return
+    name = "service-{}".format(os.getpid())
+    with metrics.profile(profile, name) as prefix:
+        asyncio.run(service.run())
+    settings.logger.info("Service profile written to %s.*", prefix)
+
+
+class Supervisor:
+    """
+    Pre-fork supervisor running :attr:`workers` processes of the same :class:`Service`.
+
+    Workers are forked from the supervisor so they share its already loaded settings and
+    interfaces. On TCP, when ``SO_REUSEPORT`` is available, the supervisor only reserves the
+    address and each worker listens on its own socket so the kernel balances connections,
+    otherwise (or when :attr:`reuse_port` is false, and always for Unix sockets) workers
+    accept connections from a shared listening socket.
+    Crashed workers are restarted, on SIGTERM or SIGINT workers are asked to drain
+    their connections and stop. When :attr:`profile` directory is given, each worker
+    writes its profile there.
+    """
+
+    def __init__(
+        self,
+        service: Service,
+        workers: int = 2,
+        reuse_port: Optional[bool] = None,
+        grace: float = 10.0,
+        profile: Optional[str] = None,
+    ) -> None:
+        if workers < 1:
+            raise InvalidParameter(
+                "Workers count must be positive, received {}".format(workers)
+            )
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise InvalidParameter("Pre-fork workers require the fork start method")
+        if reuse_port is None:
+            reuse_port = hasattr(socket, "SO_REUSEPORT")
+        self.service = service
+        self.workers = workers
+        self.reuse_port = reuse_port and service.port is not None
+        self.grace = grace
+        self.profile = profile
+        self.restarts = 0
+        self.processes: List[multiprocessing.process.BaseProcess] = []
+        self.sockets: List[socket.socket] = []
+        self._context = multiprocessing.get_context("fork")
+        self._stopping = False
+
+    def bind(self) -> None:
+        """
+        Creates the sockets shared with workers.
+        """
+        service = self.service
+        if service.path is not None:
+            if os.path.exists(service.path):
+                os.unlink(service.path)
+            self.sockets.append(socket.socket(socket.AF_UNIX, socket.SOCK_STREAM))
+            self.sockets[-1].bind(service.path)
+            self.sockets[-1].listen(1024)
+        if service.port is not None and self.reuse_port:
+            # Reserve the address without listening, workers listen on their own sockets:
+            reserved = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            reserved.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            reserved.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            reserved.bind((service.host, service.port))
+            service.port = reserved.getsockname()[1]
+            self.sockets.append(reserved)
+        elif service.port is not None:
+            self.sockets.append(
+                socket.create_server((service.host, service.port), backlog=1024)
+            )
+            service.port = self.sockets[-1].getsockname()[1]
+
+    def spawn(self) -> multiprocessing.process.BaseProcess:
+        """
+        Forks a new worker process.
+        """
+        service = copy.copy(self.service)
+        service.sockets = [
+            listener
+            for listener in self.sockets
+            if not (self.reuse_port and listener.family == socket.AF_INET)
+        ]
+        process = self._context.Process(
+            target=_work,
+            args=(service, self.sockets, self.reuse_port, self.profile),
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def stop(self, *args: Any) -> None:
+        """
+        Requests the supervisor to stop (used as signal handler).
+        """
+        self._stopping = True
+
+    def run(self) -> None:
+        """
+        Starts workers and supervises them until SIGTERM or SIGINT is received (or :meth:`stop`
+        is called), then stops workers gracefully.
+        """
+        self.bind()
+        previous = {
+            signum: signal.signal(signum, self.stop)
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            self.processes = [self.spawn() for _ in range(self.workers)]
+            settings.logger.info(
+                "Supervisor (pid %d) started %d workers on port %s",
+                os.getpid(),
+                self.workers,
+                self.service.port,
+            )
+            while not self._stopping:
+                multiprocessing.connection.wait(
+                    [process.sentinel for process in self.processes], timeout=0.2
+                )
+                for index, process in enumerate(self.processes):
+                    if not process.is_alive() and not self._stopping:
+                        settings.logger.warning(
+                            "Worker (pid %d) exited with code %s, restarting",
+                            process.pid,
+                            process.exitcode,
+                        )
+                        process.close()
+                        self.processes[index] = self.spawn()
+                        self.restarts += 1
+        finally:
+            self.shutdown()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def shutdown(self) -> None:
+        """
+        Asks workers to drain and stop, kills workers still alive after :attr:`grace` seconds.
+        """
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + self.grace
+        for process in self.processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+        self.processes.clear()
+        for listener in self.sockets:
+            listener.close()
+        self.sockets.clear()
+        if self.service.path is not None and os.path.exists(self.service.path):
+            os.unlink(self.service.path)
+        settings.logger.info("Supervisor stopped")
+
+
+class Client:
+    """
+    Asyncio client of :class:`Service` supporting pipelined requests.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(
+        cls,
+        host: str = "127.0.0.1",
+        port: Optional[int] = None,
+        path: Optional[str] = None,
+        limit: int = 2**20,
+    ) -> "Client":
+        """
+        Opens a connection to a service listening on a TCP port or a Unix socket path.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=limit)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=limit)
+        return cls(reader, writer)
+
+    async def request(self, payload: Any) -> Any:
+        """
+        Sends a configuration (or an array of configurations) and returns the decoded response.
+        """
+        return (await self.pipeline([payload]))[0]
+
+    async def pipeline(self, payloads: Iterable[Any]) -> list:
+        """
+        Sends all requests before reading their responses, responses are returned
+        in request order.
+        """
+        lines = [json.dumps(payload).encode() + b"\n" for payload in payloads]
+        self.writer.writelines(lines)
+        await self.writer.drain()
+        return [json.loads(await self.reader.readline()) for _ in lines]
+
+    async def metrics(self) -> dict:
+        """
+        Returns the service statistics (``/metrics`` request).
+        """
+        self.writer.write(b"/metrics\n")
+        await self.writer.drain()
+        statistics: dict = json.loads(await self.reader.readline())
+        return statistics
+
+    async def memory(self) -> dict:
+        """
+        Returns the service memory report (``/memory`` request).
+        """
+        self.writer.write(b"/memory\n")
+        await self.writer.drain()
+        report: dict = json.loads(await self.reader.readline())
+        return report
+
+    async def close(self) -> None:
+        """
+        Closes the connection.
+        """
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def __aenter__(self) -> "Client":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+
 def main():
     """
     Service entrypoint
@@ -25,11 +620,82 @@ def main():
     cli_parser.add_argument(
         "--config", type=str, default=str(settings.file), help="Configuration path"
     )
+    cli_parser.add_argument(
+        "--interface",
+        type=str,
+        default="newproject.interfaces.examples.SimpleCase",
+        help="Interface class used to build objects",
+    )
+    cli_parser.add_argument("--host", type=str, default="127.0.0.1", help="TCP host")
+    cli_parser.add_argument(
+        "--port", type=int, default=8765, help="TCP port (negative to disable TCP)"
+    )
+    cli_parser.add_argument("--unix", type=str, default=None, help="Unix socket path")
+    cli_parser.add_argument(
+        "--max-connections", type=int, default=128, help="Concurrent connections limit"
+    )
+    cli_parser.add_argument(
+        "--idle-timeout", type=float, default=300.0, help="Idle connection timeout (s)"
+    )
+    cli_parser.add_argument(
+        "--workers", type=int, default=1, help="Number of pre-forked worker processes"
+    )
+    cli_parser.add_argument(
+        "--shared-socket",
+        action="store_true",
+        help="Workers accept from a shared socket instead of using SO_REUSEPORT",
+    )
+    cli_parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Instrument interfaces (statistics served by /metrics requests)",
+    )
+    cli_parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Account live objects and trace allocations (served by /memory requests)",
+    )
+    cli_parser.add_argument(
+        "--profile",
+        type=str,
+        nargs="?",
+        const=".cache/reports",
+        default=None,
+        help="Write cProfile and tracemalloc snapshots into this directory on exit",
+    )
     cli_parameters = cli_parser.parse_args()
 
     # Set Logger Level
     settings.logger.setLevel(cli_parameters.verbose)
 
+    # Instrumentation:
+    if cli_parameters.metrics:
+        metrics.enable()
+    if cli_parameters.memory:
+        memory.enable(tracemalloc=True)
+
+    # Serve:
+    service = Service(
+        resolve_interface(cli_parameters.interface),
+        host=cli_parameters.host,
+        port=cli_parameters.port if cli_parameters.port >= 0 else None,
+        path=cli_parameters.unix,
+        max_connections=cli_parameters.max_connections,
+        idle_timeout=cli_parameters.idle_timeout,
+    )
+    try:
+        if cli_parameters.workers > 1:
+            Supervisor(
+                service,
+                workers=cli_parameters.workers,
+                reuse_port=False if cli_parameters.shared_socket else None,
+                profile=cli_parameters.profile,
+            ).run()
+        else:
+            _serve(service, cli_parameters.profile)
+    finally:
+        # Flush queued logging:
+        logs.shutdown()
     sys.exit(0)
 
 
@@ -4,10 +4,15 @@ User can adapt the default package settings using the `settings.json` file
 stored in user home directory **~/newproject**.
 
 If the settings file is missing, a fresh copy of default settings file is created
-in this directory before the package loads settings.
+in this directory before the package loads settings. When the home directory is
+not writable, default settings shipped with the package are used instead.
 
 Update of the settings file is not taken into account until package is restarted.
 
+Settings are loaded lazily: importing this module has no side effect, the user directory,
+settings file and logging configuration are only touched when the :attr:`settings`
+attribute is first accessed (PEP 562).
+
 Settings also hold package logger as well and are available in Python as follow:
 
 .. code-block:: python
@@ -17,50 +22,119 @@ Settings also hold package logger as well and are available in Python as follow:
 
 """
 
-import json
-import logging.config
 import os
 import pathlib
 import sys
-import uuid
+import threading
 from types import SimpleNamespace
 
-# Settings Namespace:
-settings = SimpleNamespace()
-
-# Directories:
-settings.home = pathlib.Path.home()
-settings.package = pathlib.Path(__file__).parent
-settings.resources = settings.package / "resources"
-settings.name = settings.package.parts[-1]
-settings.user = settings.home / settings.name
-settings.user.mkdir(exist_ok=True)
-
-# Logger:
-settings.logger = logging.getLogger(settings.name)
-with (settings.resources / "logging.json").open("r") as fh:
-    data = json.load(fh)
-    data["loggers"][settings.name] = data["loggers"]["default"]
-    logging.config.dictConfig(data)
-
-# Settings file:
-filename = "settings.json"
-settings.file = settings.user / filename
-if not settings.file.exists():
-    settings.file.write_bytes((settings.resources / filename).read_bytes())
-settings.settings = json.loads(settings.file.read_bytes())
-
-# Application Settings:
-settings.database = os.environ.get("DATABASE", "sqlite://")
-settings.secretkey = os.environ.get("SECRETKEY", os.urandom(64))
-settings.uuid4 = uuid.uuid4()
+_lock = threading.Lock()
+
+
+def load() -> SimpleNamespace:
+    """
+    Loads package settings: creates user directory and settings file if missing,
+    configures package logger and reads application settings.
+    """
+    import json
+    import logging.config
+    import uuid
+
+    # Settings Namespace:
+    settings = SimpleNamespace()
+
+    # Directories:
+    settings.home = pathlib.Path.home()
+    settings.package = pathlib.Path(__file__).parent
+    settings.resources = settings.package / "resources"
+    settings.name = settings.package.parts[-1]
+    settings.user = settings.home / settings.name
+
+    # Logger:
+    settings.logger = logging.getLogger(settings.name)
+    with (settings.resources / "logging.json").open("r") as fh:
+        data = json.load(fh)
+        data["loggers"][settings.name] = data["loggers"]["default"]
+        logging.config.dictConfig(data)
+
+    # Settings file:
+    filename = "settings.json"
+    settings.file = settings.user / filename
+    try:
+        settings.user.mkdir(exist_ok=True)
+        if not settings.file.exists():
+            settings.file.write_bytes((settings.resources / filename).read_bytes())
+    except OSError as error:
+        settings.logger.warning(
+            "Cannot write user settings in %s (%s), using package defaults",
+            settings.user,
+            error,
+        )
+        settings.file = settings.resources / filename
+    settings.settings = json.loads(settings.file.read_bytes())
+
+    # Logging mode:
+    from newproject import logs
+
+    settings.listener = logs.configure(
+        settings.logger, **settings.settings.get("logging", {})
+    )
+
+    # Memory accounting:
+    from newproject import memory
+
+    settings.memory = settings.settings.get("memory", {})
+    memory.configure(settings.memory)
+
+    # Application Settings:
+    # Database URL used by newproject.repository (in-memory SQLite by default):
+    settings.database = os.environ.get("DATABASE", "sqlite://")
+    settings.secretkey = os.environ.get("SECRETKEY", os.urandom(64))
+    settings.uuid4 = uuid.uuid4()
+
+    return settings
+
+
+def get_settings() -> SimpleNamespace:
+    """
+    Returns package settings, loading them once on first call (thread-safe).
+    """
+    with _lock:
+        if "settings" not in globals():
+            globals()["settings"] = load()
+    settings: SimpleNamespace = globals()["settings"]
+    return settings
+
+
+def __getattr__(name):
+    """
+    Loads settings on first access of the :attr:`settings` attribute.
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 def main():
     """
-    Settings entrypoint
+    Settings entrypoint, option ``--memory`` prints the memory report
+    (see :py:mod:`newproject.memory`) after loading settings.
     """
+    import argparse
+
+    cli_parser = argparse.ArgumentParser(description="Package settings")
+    cli_parser.add_argument(
+        "--memory", action="store_true", help="Print the memory report as JSON"
+    )
+    cli_parameters = cli_parser.parse_args()
+    settings = get_settings()
     settings.logger.info("Settings: %s", settings.__dict__)
+    if cli_parameters.memory:
+        import json
+
+        from newproject import memory
+
+        print(json.dumps(memory.report(), indent=2))
     sys.exit(0)
 
 
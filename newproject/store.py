@@ -0,0 +1,602 @@
+"""
+Module :py:mod:`newproject.store` defines the class :class:`Store` which persists
+interface configurations in append-only segment files.
+
+Each record holds a key and an object configuration encoded with
+:meth:`newproject.interfaces.generic.GenericInterface.to_bytes` (or ``to_json``),
+protected by a CRC32 checksum. Records are appended to the active segment file,
+which is sealed and replaced by a new one once it reaches :attr:`Store.segment_size` bytes.
+An in-memory index maps each key to the location of its latest record: reads map segment
+files in memory (:mod:`mmap`) and only decode the requested records.
+
+Sealed segments get a hint file holding their keys and offsets, so reopening a store
+does not read the segments themselves. Old segments are compacted in a background
+thread, rewriting live records only, when enough segments are sealed:
+
+.. code-block:: python
+
+    with Store("/data/cases", SimpleCase) as store:
+        store.put("a", SimpleCase(value=1))
+        store.get("a")  # returns: SimpleCase(value=1)
+        for key, instance in store.scan():
+            ...
+
+"""
+
+import array
+import json
+import mmap
+import os
+import pathlib
+import struct
+import threading
+import zlib
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import binary
+from newproject.interfaces.generic import GenericInterface
+
+#: Record header: checksum (CRC32 of the record after it), flags, key size and value size
+HEADER = struct.Struct("<IBII")
+
+#: Record flags
+TOMBSTONE = 0x01
+JSON = 0x02
+
+SEGMENT_SUFFIX = ".seg"
+HINT_SUFFIX = ".hint"
+TEMPORARY_SUFFIX = ".tmp"
+
+_MISSING = object()
+
+
+def _record(key: bytes, value: bytes, flags: int) -> bytes:
+    """
+    Returns a record ready to be appended to a segment.
+    """
+    record = HEADER.pack(0, flags, len(key), len(value)) + key + value
+    return struct.pack("<I", zlib.crc32(record[4:])) + record[4:]
+
+
+def _map_file(path: pathlib.Path, size: int = 0) -> mmap.mmap:
+    """
+    Returns the read-only memory map of a file (whole file when size is 0).
+    """
+    with path.open("rb") as fh:
+        return mmap.mmap(fh.fileno(), size, access=mmap.ACCESS_READ)
+
+
+def _read(view: memoryview, offset: int) -> Tuple[int, memoryview, memoryview, int]:
+    """
+    Returns flags, key, value and end offset of the record at offset.
+    Raises :class:`InvalidParameter` when the record is truncated or corrupted.
+    """
+    end = offset + HEADER.size
+    if end > len(view):
+        raise InvalidParameter("Truncated record header at offset {}".format(offset))
+    checksum, flags, key_size, value_size = HEADER.unpack_from(view, offset)
+    key_end = end + key_size
+    value_end = key_end + value_size
+    if value_end > len(view):
+        raise InvalidParameter("Truncated record at offset {}".format(offset))
+    with view[offset + 4 : value_end] as checked:
+        if zlib.crc32(checked) != checksum:
+            raise InvalidParameter("Corrupted record at offset {}".format(offset))
+    return flags, view[end:key_end], view[key_end:value_end], value_end
+
+
+class Store:
+    """
+    Append-only key/value store of interface objects created by the same factory.
+    Objects are encoded in the binary format (``encoding="bytes"``) or as JSON
+    (``encoding="json"``), both can be read from the same store.
+    """
+
+    #: Supported encodings
+    encodings = ("bytes", "json")
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path],
+        factory: type,
+        encoding: str = "bytes",
+        segment_size: int = 64 * 2**20,
+        compact_segments: int = 4,
+    ) -> None:
+        """
+        Initialization method takes the store directory (created if missing),
+        the interface class of stored objects, the records encoding, the size
+        above which the active segment is sealed and the number of sealed segments
+        triggering a background compaction (0 disables it).
+        """
+        if not (isinstance(factory, type) and issubclass(factory, GenericInterface)):
+            raise InvalidParameter(
+                "Factory must be a GenericInterface subclass, received {!r}".format(
+                    factory
+                )
+            )
+        if encoding not in self.encodings:
+            raise InvalidParameter(
+                "Encoding must be one of {}, received {!r}".format(
+                    self.encodings, encoding
+                )
+            )
+        self.path = pathlib.Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.factory = factory
+        self.encoding = encoding
+        self.segment_size = segment_size
+        self.compact_segments = compact_segments
+        self._lock = threading.RLock()
+        self._idle = threading.Condition(self._lock)
+        self._scans = 0
+        self._compaction: Optional[threading.Thread] = None
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._segments: List[int] = []
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._entries: List[Tuple[str, int, int]] = []
+        self._file: Optional[BinaryIO] = None
+        self._dirty = False
+        self._open()
+
+    def __repr__(self) -> str:
+        return "{}(path={!r}, factory={}, size={}, segments={})".format(
+            type(self).__name__,
+            str(self.path),
+            self.factory.__qualname__,
+            len(self._index),
+            len(self._segments),
+        )
+
+    def __enter__(self) -> "Store":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __getitem__(self, key: str) -> GenericInterface:
+        instance: GenericInterface = self.get(key, _MISSING)
+        if instance is _MISSING:
+            raise KeyError(key)
+        return instance
+
+    def __setitem__(self, key: str, instance: GenericInterface) -> None:
+        self.put(key, instance)
+
+    def __delitem__(self, key: str) -> None:
+        self.delete(key)
+
+    def keys(self) -> List[str]:
+        """
+        Returns the keys of stored objects.
+        """
+        with self._lock:
+            return list(self._index)
+
+    def segment_file(self, segment: int) -> pathlib.Path:
+        """
+        Returns the path of a segment file.
+        """
+        return self.path / "{:08d}{}".format(segment, SEGMENT_SUFFIX)
+
+    def hint_file(self, segment: int) -> pathlib.Path:
+        """
+        Returns the path of a segment hint file.
+        """
+        return self.path / "{:08d}{}".format(segment, HINT_SUFFIX)
+
+    # Writing:
+
+    def put(self, key: str, instance: GenericInterface) -> None:
+        """
+        Stores the object configuration under key, replacing any previous object.
+        """
+        self.put_many([(key, instance)])
+
+    def put_many(self, items: Iterable[Tuple[str, GenericInterface]]) -> None:
+        """
+        Stores (key, object) pairs with a single write per segment.
+        """
+        encode, flags = (
+            (self._encode_json, JSON)
+            if self.encoding == "json"
+            else (self._encode_bytes, 0)
+        )
+        records = ((key, encode(instance), flags) for key, instance in items)
+        self._append(records)
+
+    def delete(self, key: str) -> None:
+        """
+        Removes the object stored under key, raises :class:`KeyError` when missing.
+        """
+        with self._lock:
+            if key not in self._index:
+                raise KeyError(key)
+            self._append([(key, b"", TOMBSTONE)])
+
+    def flush(self) -> None:
+        """
+        Writes buffered records to the active segment file.
+        """
+        with self._lock:
+            if self._file is not None and self._dirty:
+                self._file.flush()
+                self._dirty = False
+
+    def close(self) -> None:
+        """
+        Waits for a running compaction, flushes and closes segment files.
+        """
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        with self._lock:
+            if self._file is None:
+                return
+            self.flush()
+            self._file.close()
+            self._file = None
+            for segment in list(self._maps):
+                self._unmap(segment)
+
+    # Reading:
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns the object stored under key, or default when missing.
+        """
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                return default
+            segment, offset = location
+            with memoryview(self._map(segment, offset)) as view:
+                flags, stored_key, value, _ = _read(view, offset)
+                try:
+                    return self._decode(value, flags)
+                finally:
+                    stored_key.release()
+                    value.release()
+
+    def scan(self) -> Iterator[Tuple[str, GenericInterface]]:
+        """
+        Yields (key, object) pairs of stored objects in writing order,
+        reading segment files sequentially.
+        Compaction does not replace segments while a scan is running.
+        """
+        with self._lock:
+            self.flush()
+            self._scans += 1
+            segments = list(self._segments)
+        try:
+            for segment in segments:
+                yield from self._scan_segment(segment)
+        finally:
+            with self._lock:
+                self._scans -= 1
+                self._idle.notify_all()
+
+    def _scan_segment(self, segment: int) -> Iterator[Tuple[str, GenericInterface]]:
+        with self._lock:
+            size = self._size(segment)
+        if size == 0:
+            return
+        data = _map_file(self.segment_file(segment), size)
+        with data, memoryview(data) as view:
+            offset = 0
+            while offset < size:
+                flags, key, value, end = _read(view, offset)
+                name = str(key, "utf-8")
+                instance = None
+                if not flags & TOMBSTONE and self._index.get(name) == (segment, offset):
+                    instance = self._decode(value, flags)
+                key.release()
+                value.release()
+                if instance is not None:
+                    yield name, instance
+                offset = end
+
+    # Compaction:
+
+    def compact(self, wait: bool = True) -> Optional[threading.Thread]:
+        """
+        Rewrites live records of sealed segments into as few segments as possible
+        and removes replaced and deleted records. When wait is false, compaction runs
+        in a background thread which is returned (None if a compaction is running).
+        """
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                if not wait:
+                    return None
+                compaction = self._compaction
+            else:
+                compaction = threading.Thread(
+                    target=self._compact, name="store-compaction", daemon=True
+                )
+                self._compaction = compaction
+                compaction.start()
+        if wait:
+            compaction.join()
+        return compaction
+
+    def _compact(self) -> None:
+        with self._lock:
+            sealed = [segment for segment in self._segments if segment != self._active]
+            if not sealed:
+                return
+            locations = {
+                key: location
+                for key, location in self._index.items()
+                if location[0] in sealed
+            }
+        outputs = self._rewrite(sealed, locations)
+        with self._lock:
+            if not self._idle.wait_for(lambda: not self._scans, timeout=10.0):
+                for segment, _ in outputs:
+                    self._temporary_file(segment).unlink()
+                return
+            for segment in sealed:
+                self._unmap(segment)
+            for segment, entries in outputs:
+                self.hint_file(segment).unlink(missing_ok=True)
+                os.replace(self._temporary_file(segment), self.segment_file(segment))
+                self._write_hint(segment, entries)
+                for key, offset, _ in entries:
+                    if self._index.get(key) == locations[key]:
+                        self._index[key] = (segment, offset)
+            kept = {segment for segment, _ in outputs}
+            for segment in sealed:
+                if segment not in kept:
+                    self.segment_file(segment).unlink()
+                    self.hint_file(segment).unlink(missing_ok=True)
+            self._segments = sorted(
+                kept | (set(self._segments) - set(sealed)) | {self._active}
+            )
+
+    def _rewrite(
+        self, sealed: List[int], locations: Dict[str, Tuple[int, int]]
+    ) -> List[Tuple[int, list]]:
+        """
+        Writes live records of sealed segments in temporary files named after
+        the lowest sealed segments and returns their entries.
+        """
+        by_segment: Dict[int, list] = {}
+        for key, (segment, offset) in locations.items():
+            by_segment.setdefault(segment, []).append((offset, key))
+        targets = iter(sealed)
+        outputs: List[Tuple[int, list]] = []
+        output = None
+        size = 0
+        for segment in sealed:
+            records = sorted(by_segment.get(segment, ()))
+            if not records:
+                continue
+            path = self.segment_file(segment)
+            with _map_file(path) as data, memoryview(data) as view:
+                for offset, key in records:
+                    end = _read(view, offset)[3]
+                    record = view[offset:end]
+                    if output is None or size + len(record) > self.segment_size:
+                        if output is not None:
+                            output.close()
+                        target = next(targets)
+                        output = self._temporary_file(target).open("wb")
+                        outputs.append((target, []))
+                        size = 0
+                    output.write(record)
+                    outputs[-1][1].append((key, size, view[offset + 4]))
+                    size += len(record)
+                    record.release()
+        if output is not None:
+            output.close()
+        return outputs
+
+    def _temporary_file(self, segment: int) -> pathlib.Path:
+        return self.path / "{:08d}{}{}".format(
+            segment, SEGMENT_SUFFIX, TEMPORARY_SUFFIX
+        )
+
+    # Internals:
+
+    def _encode_bytes(self, instance: GenericInterface) -> bytes:
+        return instance.to_bytes()
+
+    def _encode_json(self, instance: GenericInterface) -> bytes:
+        return instance.to_json().encode("utf-8")
+
+    def _decode(self, value: memoryview, flags: int) -> GenericInterface:
+        if flags & JSON:
+            return self.factory(**json.loads(str(value, "utf-8")))
+        return self.factory.from_bytes(value)
+
+    def _size(self, segment: int) -> int:
+        if segment == self._active:
+            self.flush()
+            return self._active_file().tell()
+        return self.segment_file(segment).stat().st_size
+
+    def _active_file(self) -> BinaryIO:
+        """
+        Returns the file of the active segment, raises when the store is closed.
+        """
+        if self._file is None:
+            raise InvalidParameter("Store {} is closed".format(self.path))
+        return self._file
+
+    def _map(self, segment: int, offset: int) -> mmap.mmap:
+        """
+        Returns the memory map of a segment holding the record at offset, the active
+        segment is remapped when the record was appended after its current map.
+        """
+        data = self._maps.get(segment)
+        if data is not None and segment == self._active:
+            self.flush()
+            end = offset + HEADER.size
+            if end <= len(data):
+                end += sum(HEADER.unpack_from(data, offset)[2:])
+            if end > len(data):
+                self._unmap(segment)
+                data = None
+        if data is None:
+            data = _map_file(self.segment_file(segment), self._size(segment))
+            self._maps[segment] = data
+        return data
+
+    def _unmap(self, segment: int) -> None:
+        data = self._maps.pop(segment, None)
+        if data is not None:
+            data.close()
+
+    def _append(self, records: Iterable[Tuple[str, bytes, int]]) -> None:
+        with self._lock:
+            buffer = bytearray()
+            offset = self._offset
+            for key, value, flags in records:
+                record = _record(key.encode("utf-8"), value, flags)
+                position = offset + len(buffer)
+                if position and position + len(record) > self.segment_size:
+                    self._write(buffer)
+                    self._roll()
+                    buffer = bytearray()
+                    offset = position = 0
+                buffer += record
+                self._entries.append((key, position, flags))
+                if flags & TOMBSTONE:
+                    self._index.pop(key, None)
+                else:
+                    self._index[key] = (self._active, position)
+            self._write(buffer)
+
+    def _write(self, buffer: bytearray) -> None:
+        if buffer:
+            handler = self._active_file()
+            handler.write(buffer)
+            self._offset = handler.tell()
+            self._dirty = True
+
+    def _roll(self) -> None:
+        """
+        Seals the active segment (writing its hint file) and starts a new one.
+        """
+        self.flush()
+        self._active_file().close()
+        self._unmap(self._active)
+        self._write_hint(self._active, self._entries)
+        self._active += 1
+        self._segments.append(self._active)
+        self._entries = []
+        self._file = self.segment_file(self._active).open("ab")
+        self._offset = 0
+        sealed = len(self._segments) - 1
+        if self.compact_segments and sealed >= self.compact_segments:
+            self.compact(wait=False)
+
+    def _write_hint(self, segment: int, entries: List[Tuple[str, int, int]]) -> None:
+        """
+        Writes the hint file of a sealed segment: its size and the key, offset
+        and flags of its records.
+        """
+        offsets = array.array("Q", [offset for _, offset, _ in entries])
+        data = binary.packb(
+            [
+                self.segment_file(segment).stat().st_size,
+                [key for key, _, _ in entries],
+                offsets.tobytes(),
+                bytes(flags for _, _, flags in entries),
+            ]
+        )
+        temporary = self.hint_file(segment).with_suffix(TEMPORARY_SUFFIX)
+        temporary.write_bytes(data)
+        os.replace(temporary, self.hint_file(segment))
+
+    def _read_hint(self, segment: int) -> Optional[List[Tuple[str, int, int]]]:
+        """
+        Returns entries of a segment hint file, None if missing or outdated.
+        """
+        try:
+            size, keys, offsets, flags = binary.unpackb(
+                self.hint_file(segment).read_bytes()
+            )
+        except (OSError, InvalidParameter, ValueError):
+            return None
+        if size != self.segment_file(segment).stat().st_size:
+            return None
+        return list(zip(keys, array.array("Q", offsets), flags))
+
+    def _read_segment(self, segment: int, last: bool) -> List[Tuple[str, int, int]]:
+        """
+        Returns entries of a segment read record by record. A truncated or corrupted
+        tail of the last segment (interrupted write) is discarded.
+        """
+        path = self.segment_file(segment)
+        size = path.stat().st_size
+        entries: List[Tuple[str, int, int]] = []
+        if size == 0:
+            return entries
+        with _map_file(path) as data, memoryview(data) as view:
+            offset = 0
+            while offset < size:
+                try:
+                    flags, key, value, end = _read(view, offset)
+                except InvalidParameter as error:
+                    if not last:
+                        raise InvalidParameter(
+                            "Segment {}: {}".format(path, error)
+                        ) from error
+                    break
+                entries.append((str(key, "utf-8"), offset, flags))
+                key.release()
+                value.release()
+                offset = end
+        if offset < size:
+            with path.open("r+b") as fh:
+                fh.truncate(offset)
+        return entries
+
+    def _open(self) -> None:
+        """
+        Loads the index from hint files or segments and opens the active segment.
+        """
+        for path in self.path.glob("*" + TEMPORARY_SUFFIX):
+            path.unlink()
+        self._segments = sorted(
+            int(path.name[: -len(SEGMENT_SUFFIX)])
+            for path in self.path.glob("*" + SEGMENT_SUFFIX)
+        )
+        for position, segment in enumerate(self._segments):
+            last = position == len(self._segments) - 1
+            entries = None if last else self._read_hint(segment)
+            if entries is None:
+                entries = self._read_segment(segment, last)
+                if not last:
+                    self._write_hint(segment, entries)
+            index = self._index
+            for key, offset, flags in entries:
+                if flags & TOMBSTONE:
+                    index.pop(key, None)
+                else:
+                    index[key] = (segment, offset)
+            if last:
+                self._entries = entries
+        if not self._segments:
+            self._segments = [0]
+        self._active = self._segments[-1]
+        self._file = self.segment_file(self._active).open("ab")
+        self._offset = self._active_file().tell()
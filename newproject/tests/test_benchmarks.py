@@ -0,0 +1,87 @@
+import contextlib
+import io
+import json
+import pathlib
+import tempfile
+import unittest
+
+from newproject import benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_registry(self):
+        names = set(benchmarks.registry())
+        for name in ["to_json", "to_json_many", "roundtrip.json", "import.settings"]:
+            self.assertIn(name, names)
+        self.assertIn("service.request", names)
+
+    def test_select(self):
+        selected = benchmarks.select(["roundtrip.*"])
+        self.assertTrue(selected)
+        self.assertTrue(all(item.name.startswith("roundtrip.") for item in selected))
+
+    def test_run(self):
+        results = benchmarks.run(["to_json", "to_json_many"], repeat=2, scale=0.01)
+        self.assertEqual(set(results["benchmarks"]), {"to_json", "to_json_many"})
+        for result in results["benchmarks"].values():
+            self.assertGreater(result["median"], 0.0)
+            self.assertLessEqual(result["min"], result["median"])
+            self.assertLessEqual(result["median"], result["max"])
+        self.assertEqual(results["benchmarks"]["to_json_many"]["items"], 1000)
+
+    def test_service(self):
+        results = benchmarks.run(["service.pipeline"], repeat=1, scale=0.05)
+        self.assertGreater(results["benchmarks"]["service.pipeline"]["median"], 0.0)
+
+    def test_compare(self):
+        results = {
+            "benchmarks": {
+                "fast": {"median": 1.0, "threshold": None},
+                "slow": {"median": 2.0, "threshold": None},
+                "noisy": {"median": 1.4, "threshold": 0.5},
+                "new": {"median": 1.0, "threshold": None},
+            }
+        }
+        baseline = {
+            "benchmarks": {
+                "fast": {"median": 1.0},
+                "slow": {"median": 1.0},
+                "noisy": {"median": 1.0},
+            }
+        }
+        comparison = benchmarks.compare(results, baseline, threshold=0.25)
+        regressions = {row["name"]: row["regression"] for row in comparison}
+        self.assertEqual(regressions, {"fast": False, "slow": True, "noisy": False})
+
+    def test_main(self):
+        output = self.path / "reports" / "benchmarks.json"
+        baseline = self.path / "reports" / "baseline.json"
+        arguments = [
+            "--filter=to_dict",
+            "--repeat=1",
+            "--scale=0.01",
+            f"--output={output:}",
+            f"--baseline={baseline:}",
+        ]
+        with contextlib.redirect_stdout(io.StringIO()):
+            # First run stores baseline:
+            self.assertEqual(benchmarks.main(arguments), 0)
+            self.assertTrue(baseline.exists())
+            self.assertEqual(json.loads(output.read_text())["comparison"], [])
+            # Faster baseline makes current run regress:
+            reference = json.loads(baseline.read_text())
+            reference["benchmarks"]["to_dict"]["median"] /= 100.0
+            baseline.write_text(json.dumps(reference))
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(benchmarks.main(arguments), 1)
+            comparison = json.loads(output.read_text())["comparison"]
+            self.assertTrue(comparison[0]["regression"])
+            # Generous threshold accepts it:
+            self.assertEqual(benchmarks.main(arguments + ["--threshold=1000"]), 0)
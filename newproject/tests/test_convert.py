@@ -0,0 +1,236 @@
+import datetime
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from newproject import convert
+from newproject.errors import InvalidParameter
+from newproject.interfaces import parallel
+from newproject.interfaces.examples import SimpleCase, ValidatedCase
+
+VALUES = [
+    1,
+    2.5,
+    "text",
+    "",
+    "123",
+    "true",
+    " null",
+    None,
+    True,
+    [1, {"key": "a,b\n"}],
+    {"nested": [None, "é"]},
+]
+
+SUFFIXES = {"binary": "bin"}
+
+
+def pyarrow_installed():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class Interrupted(Exception):
+    pass
+
+
+class TestConvert(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name)
+        self.records = [{"value": value} for value in VALUES * 20]
+        self.source = self.path / "source.ndjson"
+        self.source.write_text(
+            "".join(json.dumps(record) + "\n" for record in self.records)
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, path, factory=SimpleCase):
+        target = self.path / "read.ndjson"
+        convert.convert(path, target, factory)
+        return [json.loads(line) for line in target.read_text().splitlines()]
+
+    def test_detect(self):
+        self.assertEqual("ndjson", convert.detect("a.jsonl"))
+        self.assertEqual("binary", convert.detect("a.data", "binary"))
+        with self.assertRaises(InvalidParameter):
+            convert.detect("a.data")
+        with self.assertRaises(InvalidParameter):
+            convert.detect("a.json", "xml")
+
+    def test_round_trips(self):
+        formats = ["json", "binary", "csv"]
+        if pyarrow_installed():
+            formats.append("parquet")
+        for format in formats:
+            with self.subTest(format=format):
+                target = self.path / ("target." + SUFFIXES.get(format, format))
+                result = convert.convert(self.source, target, SimpleCase, batch_size=16)
+                self.assertEqual(len(self.records), result.records)
+                self.assertEqual(0, result.errors)
+                self.assertEqual(self.records, self.read(target))
+                self.assertFalse(target.with_name(target.name + ".checkpoint").exists())
+
+    def test_json_output(self):
+        target = self.path / "target.json"
+        convert.convert(self.source, target, SimpleCase, batch_size=7)
+        self.assertEqual(self.records, json.loads(target.read_text()))
+        empty = self.path / "empty.ndjson"
+        empty.write_text("")
+        convert.convert(empty, target, SimpleCase)
+        self.assertEqual([], json.loads(target.read_text()))
+
+    def test_typed_fields(self):
+        records = [
+            {"name": "a", "count": 1, "start": "2021-01-01T00:00:00", "tags": ["x"]},
+            {"name": "b", "ratio": 0.5},
+        ]
+        source = self.path / "typed.json"
+        source.write_text(json.dumps(records))
+        target = self.path / "typed.csv"
+        convert.convert(source, target, ValidatedCase)
+        self.assertEqual(
+            ["name,count,ratio,start,tags", 'a,1,1.0,2021-01-01T00:00:00,"[""x""]"'],
+            target.read_text().splitlines()[:2],
+        )
+        instances = [
+            ValidatedCase.from_dict(record)
+            for record in self.read(target, ValidatedCase)
+        ]
+        self.assertEqual(datetime.datetime(2021, 1, 1), instances[0].start)
+        self.assertEqual(
+            ValidatedCase(name="b", ratio=0.5).to_dict(), instances[1].to_dict()
+        )
+
+    def test_invalid_records(self):
+        source = self.path / "invalid.json"
+        source.write_text('[{"value": 1}, {"other": 2}, {"value": }, 3, {"value": 4}]')
+        target = self.path / "target.ndjson"
+        with self.assertRaises(InvalidParameter):
+            convert.convert(source, target, SimpleCase)
+        errors = []
+        result = convert.convert(source, target, SimpleCase, on_error=errors.append)
+        self.assertEqual((2, 3), (result.records, result.errors))
+        self.assertEqual([{"value": 1}, {"value": 4}], self.read(target))
+        self.assertEqual(
+            [1, 2], sorted(error.index for error in errors if hasattr(error, "index"))
+        )
+        malformed = [error for error in errors if hasattr(error, "offset")]
+        self.assertEqual(1, len(malformed))
+        self.assertEqual(b"{", source.read_bytes()[malformed[0].offset :][:1])
+
+    def test_truncated_binary(self):
+        source = self.path / "source.bin"
+        convert.convert(self.source, source, SimpleCase)
+        source.write_bytes(source.read_bytes()[:-1])
+        with self.assertRaisesRegex(InvalidParameter, "Truncated"):
+            convert.convert(source, self.path / "target.json", SimpleCase)
+
+    def test_workers(self):
+        target = self.path / "target.bin"
+        with mock.patch.object(parallel, "minimum", 10):
+            result = convert.convert(
+                self.source, target, SimpleCase, workers=2, batch_size=8, window=2
+            )
+        self.assertEqual(len(self.records), result.records)
+        self.assertEqual(self.records, self.read(target))
+
+    def test_resume(self):
+        for source_format, target_format in [
+            ("ndjson", "json"),
+            ("json", "csv"),
+            ("binary", "ndjson"),
+            ("csv", "binary"),
+        ]:
+            with self.subTest(source=source_format, target=target_format):
+                source = self.path / (
+                    "resume." + SUFFIXES.get(source_format, source_format)
+                )
+                if source_format != "ndjson":
+                    convert.convert(self.source, source, SimpleCase)
+                else:
+                    source = self.source
+                expected = self.path / (
+                    "expected." + SUFFIXES.get(target_format, target_format)
+                )
+                convert.convert(source, expected, SimpleCase, batch_size=10)
+                target = self.path / (
+                    "target." + SUFFIXES.get(target_format, target_format)
+                )
+                states = []
+
+                def interrupt(state):
+                    states.append(state)
+                    if len(states) == 5:
+                        raise Interrupted()
+
+                with self.assertRaises(Interrupted):
+                    convert.convert(
+                        source,
+                        target,
+                        SimpleCase,
+                        batch_size=10,
+                        interval=0.0,
+                        progress=interrupt,
+                    )
+                checkpoint = target.with_name(target.name + ".checkpoint")
+                self.assertEqual(50, json.loads(checkpoint.read_text())["records"])
+                # Output written after the checkpoint is discarded on resume:
+                with open(target, "ab") as handler:
+                    handler.write(b"garbage")
+                result = convert.convert(
+                    source, target, SimpleCase, batch_size=10, resume=True
+                )
+                self.assertEqual(len(self.records), result.records)
+                self.assertEqual(expected.read_bytes(), target.read_bytes())
+                self.assertFalse(checkpoint.exists())
+
+    def test_resume_other_conversion(self):
+        target = self.path / "target.json"
+        checkpoint = self.path / "state.checkpoint"
+        checkpoint.write_text(
+            json.dumps({"source": "other.ndjson", "offset": 0, "records": 0})
+        )
+        with self.assertRaisesRegex(InvalidParameter, "another conversion"):
+            convert.convert(
+                self.source, target, SimpleCase, checkpoint=checkpoint, resume=True
+            )
+        convert.convert(self.source, target, SimpleCase, checkpoint=checkpoint)
+        self.assertFalse(checkpoint.exists())
+
+    @unittest.skipIf(pyarrow_installed(), "pyarrow is installed")
+    def test_parquet_requires_pyarrow(self):
+        with self.assertRaisesRegex(InvalidParameter, "pyarrow"):
+            convert.convert(self.source, self.path / "target.parquet", SimpleCase)
+
+    def test_command_line(self):
+        target = self.path / "target.csv"
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "newproject",
+                "convert",
+                str(self.source),
+                str(target),
+                "--interface=newproject.interfaces.examples.SimpleCase",
+                "--workers=1",
+                "--interval=0",
+            ],
+            capture_output=True,
+            text=True,
+            cwd=str(pathlib.Path(__file__).parents[2]),
+        )
+        self.assertEqual(0, result.returncode, result.stderr)
+        self.assertIn("Converted 220 records (100.0%)", result.stderr)
+        self.assertEqual(self.records, self.read(target))
+        self.assertEqual(1, convert.main([str(self.source), str(self.path / "a.xml")]))
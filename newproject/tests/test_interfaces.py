@@ -6,7 +6,7 @@ class :class:`newproject.interfaces.generic.GenericInterface` and its children.
 import json
 import unittest
 
-from newproject.interfaces import GenericInterface
+from newproject.interfaces import GenericInterface, binary
 
 
 class TestGenericInterface(unittest.TestCase):
@@ -65,3 +65,58 @@ class TestGenericInterfaceImplementation:
         """
         instance = self.factory(**self.instance.to_dict())
         self.assertEqual(self.instance.to_dict(), instance.to_dict())
+
+    def test_to_json_many_configuration(self) -> None:
+        """
+        Test bulk JSON array export is equal to the array of expected JSON
+        defined in :attr:`json_configuration`.
+        """
+        chunks = list(self.factory.to_json_many([self.instance] * 3, chunksize=2))
+        self.assertEqual(3, len(chunks))
+        self.assertEqual(
+            "[" + ", ".join([self.json_configuration] * 3) + "]", "".join(chunks)
+        )
+
+    def test_to_ndjson_many_configuration(self) -> None:
+        """
+        Test bulk NDJSON export holds one expected JSON defined
+        in :attr:`json_configuration` per line.
+        """
+        chunks = list(self.factory.to_ndjson_many([self.instance] * 3, chunksize=2))
+        self.assertEqual(2, len(chunks))
+        self.assertEqual((self.json_configuration + "\n") * 3, "".join(chunks))
+
+    def test_to_bytes_configuration(self) -> None:
+        """
+        Test binary export decodes to the expected values
+        defined in :attr:`json_configuration`.
+        """
+        data = self.instance.to_bytes()
+        self.assertEqual(json.loads(self.json_configuration), binary.unpackb(data))
+
+    def test_config_hash_equality(self) -> None:
+        """
+        Test objects are compared by identity by default, and by configuration with a
+        shared hash once the class is hashable.
+        """
+        reverse = dict(reversed(list(self.dict_configuration.items())))
+        other = self.factory(**reverse)
+        self.assertIsNot(self.instance, other)
+        self.assertEqual(self.instance.config_hash(), other.config_hash())
+        self.assertNotEqual(self.instance, other)
+        self.assertEqual(2, len({self.instance, other}))
+        factory = type(self.factory.__name__, (self.factory,), {"hashable": True})
+        first, second = factory(**self.dict_configuration), factory(**reverse)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, self.dict_configuration)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(1, len({first, second}))
+
+    def test_from_json_configuration(self) -> None:
+        """
+        Test object decoded from its JSON export encodes to the same JSON.
+        """
+        text = self.instance.to_json()
+        other = self.factory.from_json(text)
+        self.assertIsInstance(other, self.factory)
+        self.assertEqual(text, other.to_json())
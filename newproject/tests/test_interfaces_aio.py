@@ -0,0 +1,215 @@
+import asyncio
+import concurrent.futures
+import datetime
+import json
+import unittest
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import aio
+from newproject.interfaces.examples import (
+    SimpleCase,
+    SimpleCaseWithSerializer,
+    SimpleDeclarativeCase,
+)
+
+
+class BufferWriter:
+    """
+    Stream writer collecting written data.
+    """
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.drains = 0
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        self.drains += 1
+
+
+async def connect(handler):
+    """
+    Returns a stream writer connected to a server running handler(reader).
+    """
+    done = asyncio.get_running_loop().create_future()
+
+    async def serve(reader, writer):
+        try:
+            done.set_result(await handler(reader))
+        except Exception as error:
+            done.set_exception(error)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    _, writer = await asyncio.open_connection("127.0.0.1", port)
+    return server, writer, done
+
+
+class TestAsyncDump(unittest.TestCase):
+    def setUp(self) -> None:
+        self.instances = [
+            SimpleCase(value={"index": i, "label": "é-%d" % i}) for i in range(1000)
+        ]
+
+    def test_ndjson(self):
+        writer = BufferWriter()
+        count = asyncio.run(aio.async_dump(writer, self.instances, chunksize=64))
+        self.assertEqual(1000, count)
+        self.assertEqual(16, writer.drains)
+        expected = "".join(self.instances[0].to_ndjson_many(self.instances))
+        self.assertEqual(expected, writer.data.decode())
+
+    def test_json_array(self):
+        async def instances():
+            for instance in self.instances:
+                yield instance
+
+        for source in [self.instances, instances()]:
+            writer = BufferWriter()
+            asyncio.run(aio.async_dump(writer, source, format="json", chunksize=300))
+            expected = "".join(SimpleCase.to_json_many(self.instances))
+            self.assertEqual(expected, writer.data.decode())
+        writer = BufferWriter()
+        self.assertEqual(0, asyncio.run(aio.async_dump(writer, [], format="json")))
+        self.assertEqual(b"[]", bytes(writer.data))
+        with self.assertRaises(InvalidParameter):
+            asyncio.run(aio.async_dump(writer, [], format="csv"))
+
+    def test_executors(self):
+        instances = [
+            SimpleCaseWithSerializer(value=datetime.datetime(2021, 1, 1)),
+            SimpleDeclarativeCase(value=[1, 2]),
+        ] * 100
+        expected = "".join(instance.to_json() + "\n" for instance in instances)
+        for executor in [
+            concurrent.futures.ThreadPoolExecutor(2),
+            concurrent.futures.ProcessPoolExecutor(2),
+        ]:
+            with executor:
+                writer = BufferWriter()
+                asyncio.run(
+                    aio.async_dump(writer, instances, chunksize=16, executor=executor)
+                )
+                self.assertEqual(expected, writer.data.decode())
+
+    def test_loop_is_not_stalled(self):
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.create_task(ticker())
+            await aio.async_dump(BufferWriter(), self.instances, chunksize=10)
+            task.cancel()
+            return ticks
+
+        self.assertGreaterEqual(asyncio.run(run()), 90)
+
+    def test_backpressure(self):
+        instances = self.instances * 20
+        peak = 0
+
+        async def slow(reader):
+            count = 0
+            while True:
+                data = await reader.read(2**14)
+                if not data:
+                    return count
+                count += data.count(b"\n")
+                await asyncio.sleep(0.001)
+
+        async def run():
+            nonlocal peak
+            server, writer, done = await connect(slow)
+            writer.transport.set_write_buffer_limits(high=2**15)
+            original = writer.write
+
+            def write(data):
+                nonlocal peak
+                original(data)
+                peak = max(peak, writer.transport.get_write_buffer_size())
+
+            writer.write = write
+            count = await aio.async_dump(writer, instances, chunksize=100)
+            writer.close()
+            received = await done
+            server.close()
+            await server.wait_closed()
+            return count, received
+
+        count, received = asyncio.run(run())
+        self.assertEqual(len(instances), count)
+        self.assertEqual(count, received)
+        chunk = 2 * len(next(SimpleCase.to_json_many(self.instances[:100])))
+        self.assertLess(peak, 2**15 + chunk)
+
+
+class TestAsyncLoad(unittest.TestCase):
+    def load(self, data: bytes, factory=SimpleCase, **kwargs) -> list:
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            return [
+                instance
+                async for instance in aio.async_load(
+                    reader, factory, chunk_size=7, **kwargs
+                )
+            ]
+
+        return asyncio.run(run())
+
+    def test_load(self):
+        values = [{"value": i, "label": "é"} for i in range(50)]
+        ndjson = "".join(json.dumps({"value": value}) + "\n" for value in values)
+        instances = self.load(ndjson.encode())
+        self.assertEqual(values, [instance.value for instance in instances])
+        array = json.dumps([{"value": value} for value in values]).encode()
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            instances = self.load(array, executor=executor)
+        self.assertEqual(values, [instance.value for instance in instances])
+
+    def test_errors(self):
+        errors = []
+        instances = self.load(
+            b'{"value": 1}\n{"value": \n{"other": 3}\n{"value": 4}',
+            on_error=errors.append,
+        )
+        self.assertEqual([1, 4], [instance.value for instance in instances])
+        self.assertEqual([13, 24], [error.offset for error in errors])
+        with self.assertRaises(InvalidParameter):
+            self.load(b'{"value": 1}\n[')
+        with concurrent.futures.ProcessPoolExecutor(1) as executor:
+            with self.assertRaises(InvalidParameter):
+                self.load(b"", executor=executor)
+
+    def test_roundtrip(self):
+        instances = [SimpleDeclarativeCase(value=i) for i in range(5000)]
+
+        async def handler(reader):
+            return [
+                instance
+                async for instance in aio.async_load(reader, SimpleDeclarativeCase)
+            ]
+
+        async def run():
+            server, writer, done = await connect(handler)
+            await aio.async_dump(writer, instances, format="json")
+            writer.close()
+            result = await done
+            server.close()
+            await server.wait_closed()
+            return result
+
+        self.assertEqual(
+            [instance.to_dict() for instance in instances],
+            [instance.to_dict() for instance in asyncio.run(run())],
+        )
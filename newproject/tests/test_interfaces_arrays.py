@@ -0,0 +1,139 @@
+"""
+Module :mod:`newproject.tests.test_interfaces_arrays` implements test suite for
+NumPy array support defined in module :mod:`newproject.interfaces.arrays`.
+"""
+
+import copy
+import json
+import pickle
+import unittest
+
+import numpy as np
+
+from newproject.interfaces import arrays, binary
+from newproject.interfaces.examples import SimpleCase, SimpleDeclarativeCase
+from newproject.interfaces.generic import GenericInterface
+
+
+class Derived(GenericInterface):
+    """
+    Interface whose configuration holds a value which is not an :meth:`__init__` parameter
+    """
+
+    def __init__(self, x: float) -> None:
+        self.x = x
+
+    def to_dict(self) -> dict:
+        return {"x": self.x, "double": 2 * self.x}
+
+
+class TestArrayEncodings(unittest.TestCase):
+    """
+    JSON and binary array encoding tests
+    """
+
+    samples = [
+        np.arange(6.0).reshape(2, 3),
+        np.arange(12, dtype=np.int32).reshape(3, 4).T,
+        np.zeros((0, 3)),
+        np.array(5),
+        np.arange(3, dtype=">i4"),
+        np.array(["ab", "c"]),
+        np.array(["2020-01-01"], dtype="datetime64[ns]"),
+        np.array([True, False]),
+    ]
+
+    def assertArrayEqual(self, expected: np.ndarray, array: np.ndarray) -> None:
+        self.assertIsInstance(array, np.ndarray)
+        self.assertEqual(expected.dtype, array.dtype)
+        self.assertEqual(expected.shape, array.shape)
+        self.assertTrue(np.array_equal(expected, array))
+
+    def test_json_round_trip(self) -> None:
+        for sample in self.samples:
+            with self.subTest(dtype=sample.dtype, shape=sample.shape):
+                text = SimpleCase(value=sample).to_json()
+                decoded = json.loads(text, object_hook=arrays.object_hook)
+                self.assertArrayEqual(sample, decoded["value"])
+                self.assertTrue(decoded["value"].flags.writeable)
+
+    def test_json_envelope(self) -> None:
+        text = SimpleCase(value=np.array([1.0], dtype="<f8")).to_json()
+        self.assertEqual(
+            '{"value": {"__ndarray__": "AAAAAAAA8D8=", "dtype": "<f8", "shape": [1]}}',
+            text,
+        )
+
+    def test_binary_round_trip(self) -> None:
+        for sample in self.samples:
+            with self.subTest(dtype=sample.dtype, shape=sample.shape):
+                instance = SimpleCase(value={"array": sample})
+                created = SimpleCase.from_bytes(instance.to_bytes())
+                self.assertArrayEqual(sample, created.value["array"])
+                self.assertTrue(created.value["array"].flags.writeable)
+
+    def test_binary_raw_buffer(self) -> None:
+        sample = np.arange(1000.0)
+        data = SimpleCase(value=sample).to_bytes()
+        self.assertLess(len(data), sample.nbytes + 64)
+        self.assertIn(sample.tobytes(), data)
+
+    def test_binary_zero_copy(self) -> None:
+        data = bytearray(SimpleCase(value=np.arange(100.0)).to_bytes())
+        created = SimpleCase.from_bytes(data, zero_copy=True)
+        created.value[0] = 42.0
+        self.assertEqual(42.0, SimpleCase.from_bytes(data).value[0])
+
+    def test_object_arrays_as_lists(self) -> None:
+        sample = np.array([1, "a", None], dtype=object)
+        self.assertEqual(
+            '{"value": [1, "a", null]}', SimpleCase(value=sample).to_json()
+        )
+        data = SimpleCase(value=sample).to_bytes()
+        self.assertEqual({"value": [1, "a", None]}, binary.unpackb(data))
+
+    def test_unknown_extension(self) -> None:
+        data = binary.packb({"value": binary.ExtType(42, b"raw")})
+        self.assertEqual(binary.ExtType(42, b"raw"), SimpleCase.from_bytes(data).value)
+
+
+class TestInterfacePickling(unittest.TestCase):
+    """
+    Pickling tests
+    """
+
+    def test_pickle_round_trip(self) -> None:
+        for factory in (SimpleCase, SimpleDeclarativeCase):
+            with self.subTest(factory=factory.__name__):
+                instance = factory(value={"label": "a", "array": np.arange(4)})
+                created = pickle.loads(pickle.dumps(instance))
+                self.assertIs(factory, type(created))
+                self.assertEqual("a", created.value["label"])
+                self.assertTrue(np.array_equal(np.arange(4), created.value["array"]))
+
+    def test_out_of_band_buffers(self) -> None:
+        sample = np.arange(100000.0)
+        instance = SimpleCase(value=sample)
+        buffers = []
+        data = pickle.dumps(instance, protocol=5, buffer_callback=buffers.append)
+        self.assertLess(len(data), 1024)
+        self.assertEqual(1, len(buffers))
+        created = pickle.loads(data, buffers=buffers)
+        self.assertTrue(np.shares_memory(sample, created.value))
+
+    def test_deepcopy(self) -> None:
+        instance = SimpleCase(value=np.arange(3))
+        created = copy.deepcopy(instance)
+        self.assertFalse(np.shares_memory(instance.value, created.value))
+        self.assertTrue(np.array_equal(instance.value, created.value))
+
+    def test_state_outside_configuration(self) -> None:
+        instance = Derived(2.0)
+        instance.note = "kept"
+        for created in (
+            copy.copy(instance),
+            copy.deepcopy(instance),
+            pickle.loads(pickle.dumps(instance)),
+        ):
+            self.assertEqual({"x": 2.0, "double": 4.0}, created.to_dict())
+            self.assertEqual("kept", created.note)
@@ -0,0 +1,169 @@
+"""
+Module :mod:`newproject.tests.test_interfaces_binary` implements test suite for
+the binary wire format defined in module :mod:`newproject.interfaces.binary`.
+"""
+
+import collections
+import datetime
+import enum
+import json
+import unittest
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import binary
+from newproject.interfaces.examples import SimpleCase, SimpleCaseWithSerializer
+
+
+class TestBinaryFormat(unittest.TestCase):
+    """
+    Encoding and decoding tests
+    """
+
+    def test_reference_encodings(self) -> None:
+        """
+        Test encodings match the MessagePack specification.
+        """
+        references = [
+            (None, b"\xc0"),
+            (False, b"\xc2"),
+            (True, b"\xc3"),
+            (0, b"\x00"),
+            (127, b"\x7f"),
+            (128, b"\xcc\x80"),
+            (65535, b"\xcd\xff\xff"),
+            (2**32, b"\xcf\x00\x00\x00\x01\x00\x00\x00\x00"),
+            (-1, b"\xff"),
+            (-32, b"\xe0"),
+            (-33, b"\xd0\xdf"),
+            (-(2**15), b"\xd1\x80\x00"),
+            (1.5, b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00"),
+            ("a", b"\xa1a"),
+            ("x" * 32, b"\xd9\x20" + b"x" * 32),
+            (b"\x01", b"\xc4\x01\x01"),
+            ([1, 2], b"\x92\x01\x02"),
+            ({"a": 1}, b"\x81\xa1a\x01"),
+            (binary.ExtType(5, b"\x00\x01"), b"\xd5\x05\x00\x01"),
+            (binary.ExtType(5, b"abc"), b"\xc7\x03\x05abc"),
+        ]
+        for value, encoded in references:
+            with self.subTest(value=value):
+                self.assertEqual(encoded, binary.packb(value))
+                self.assertEqual(value, binary.unpackb(encoded))
+
+    def test_size_boundaries(self) -> None:
+        values = [
+            -(2**63),
+            -(2**31) - 1,
+            2**64 - 1,
+            "é" * 40000,
+            b"\x00" * 70000,
+            list(range(20)),
+            list(range(70000)),
+            {str(i): i for i in range(20)},
+            {str(i): i for i in range(70000)},
+            binary.ExtType(1, b"\x00" * 16),
+            binary.ExtType(1, b"\x00" * 300),
+            binary.ExtType(1, b"\x00" * 70000),
+        ]
+        for value in values:
+            with self.subTest(kind=type(value).__name__):
+                self.assertEqual(value, binary.unpackb(binary.packb(value)))
+
+    def test_tuples_decode_as_lists(self) -> None:
+        self.assertEqual([1, [2]], binary.unpackb(binary.packb((1, (2,)))))
+
+    def test_builtin_subclasses(self) -> None:
+        Point = collections.namedtuple("Point", ["x", "y"])
+        Level = enum.IntEnum("Level", ["LOW", "HIGH"])
+        value = {"point": Point(1, 2), "level": Level.HIGH}
+        self.assertEqual(
+            {"point": [1, 2], "level": 2}, binary.unpackb(binary.packb(value))
+        )
+
+    def test_integer_overflow(self) -> None:
+        with self.assertRaises(OverflowError):
+            binary.packb(2**64)
+
+    def test_default_hook(self) -> None:
+        data = binary.packb({1, 2}, default=sorted)
+        self.assertEqual([1, 2], binary.unpackb(data))
+        with self.assertRaises(TypeError):
+            binary.packb({1, 2})
+        with self.assertRaises(TypeError):
+            binary.packb(object(), default=lambda instance: object())
+
+    def test_zero_copy(self) -> None:
+        data = bytearray(binary.packb({"blob": b"payload"}))
+        decoded = binary.unpackb(memoryview(data), zero_copy=True)
+        self.assertIsInstance(decoded["blob"], memoryview)
+        self.assertIs(data, decoded["blob"].obj)
+        self.assertEqual(b"payload", decoded["blob"])
+        self.assertIsInstance(binary.unpackb(data)["blob"], bytes)
+
+    def test_ext_hook(self) -> None:
+        data = binary.packb([binary.ExtType(7, b"\x2a")])
+        decoded = binary.unpackb(data, ext_hook=lambda code, view: (code, view[0]))
+        self.assertEqual([(7, 42)], decoded)
+
+    def test_unpack_from(self) -> None:
+        data = binary.packb("first") + binary.packb([2])
+        first, offset = binary.unpack_from(data)
+        self.assertEqual("first", first)
+        self.assertEqual(([2], len(data)), binary.unpack_from(data, offset))
+
+    def test_invalid_data(self) -> None:
+        for data in (b"", b"\x92\x01", b"\xa5abc", b"\xa1\xff", b"\xc1", b"\x01\x02"):
+            with self.subTest(data=data):
+                with self.assertRaises(InvalidParameter):
+                    binary.unpackb(data)
+        with self.assertRaisesRegex(InvalidParameter, "list map key at offset 1"):
+            binary.unpackb(b"\x81\x91\x01\x01")
+
+
+class TestInterfaceBytes(unittest.TestCase):
+    """
+    :meth:`to_bytes` and :meth:`from_bytes` tests
+    """
+
+    def test_round_trip(self) -> None:
+        instance = SimpleCase(value={"items": [1, 2.5, None, True], "blob": b"\xff"})
+        created = SimpleCase.from_bytes(memoryview(instance.to_bytes()))
+        self.assertEqual(instance.to_dict(), created.to_dict())
+
+    def test_serializer_hooks(self) -> None:
+        instance = SimpleCaseWithSerializer(value=datetime.datetime(2020, 1, 1))
+        created = SimpleCaseWithSerializer.from_bytes(instance.to_bytes())
+        self.assertEqual(json.loads(instance.to_json()), created.to_dict())
+
+    def test_circular_configuration(self) -> None:
+        value: list = []
+        value.append(value)
+        with self.assertRaisesRegex(InvalidParameter, "too deep"):
+            SimpleCase(value=value).to_bytes()
+
+    def test_from_bytes_requires_mapping(self) -> None:
+        with self.assertRaises(InvalidParameter):
+            SimpleCase.from_bytes(binary.packb([1]))
+
+
+class TestBinarySize(unittest.TestCase):
+    """
+    Compare binary format with JSON text (throughput is measured by the ``to_bytes``
+    and ``roundtrip.bytes`` benchmarks)
+    """
+
+    size = 1000
+
+    def test_size(self) -> None:
+        instances = [
+            SimpleCase(value={"index": i, "label": "item-%d" % i, "ratio": i / 7})
+            for i in range(self.size)
+        ]
+        texts = [instance.to_json() for instance in instances]
+        datas = [instance.to_bytes() for instance in instances]
+        self.assertEqual(
+            [json.loads(text) for text in texts],
+            [SimpleCase.from_bytes(data).to_dict() for data in datas],
+        )
+        json_size = sum(len(text.encode()) for text in texts)
+        self.assertLess(sum(map(len, datas)), json_size)
@@ -0,0 +1,72 @@
+"""
+Module :mod:`newproject.tests.test_interfaces_bulk` implements test suite for
+bulk serialization methods of :class:`newproject.interfaces.generic.GenericInterface`.
+"""
+
+import io
+import json
+import unittest
+
+from newproject.interfaces.examples import SimpleCase, SimpleCaseWithSerializer
+
+
+class TestBulkSerialization(unittest.TestCase):
+    """
+    Bulk serialization tests
+    """
+
+    factory = SimpleCase
+    size = 20000
+
+    def setUp(self) -> None:
+        self.instances = [
+            self.factory(value={"index": i, "label": "item-%d" % i, "ratio": i / 7})
+            for i in range(self.size)
+        ]
+
+    def test_empty_json_array(self) -> None:
+        self.assertEqual("[]", "".join(self.factory.to_json_many([])))
+
+    def test_empty_ndjson(self) -> None:
+        self.assertEqual("", "".join(self.factory.to_ndjson_many([])))
+
+    def test_dump_json(self) -> None:
+        stream = io.StringIO()
+        self.factory.dump_json(iter(self.instances), stream)
+        self.assertEqual(
+            [instance.to_dict() for instance in self.instances],
+            json.loads(stream.getvalue()),
+        )
+
+    def test_dump_ndjson(self) -> None:
+        stream = io.StringIO()
+        self.factory.dump_ndjson(iter(self.instances), stream)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual([instance.to_json() for instance in self.instances], lines)
+
+    def test_chunks_are_lazy(self) -> None:
+        def instances():
+            yield self.instances[0]
+            raise RuntimeError("Generator must not be consumed ahead of chunks")
+
+        chunks = self.factory.to_ndjson_many(instances(), chunksize=1)
+        self.assertEqual(self.instances[0].to_json() + "\n", next(chunks))
+
+    def test_subclass_serializer(self) -> None:
+        import datetime
+
+        instances = [SimpleCaseWithSerializer(value=datetime.datetime(2020, 1, 1))] * 2
+        self.assertEqual(
+            '[{"value": "2020-01-01T00:00:00"}, {"value": "2020-01-01T00:00:00"}]',
+            "".join(SimpleCaseWithSerializer.to_json_many(instances)),
+        )
+
+    def test_dump_ndjson_matches_loop(self) -> None:
+        """
+        Bulk NDJSON export is equal to a loop of :meth:`to_json` (throughput is measured
+        by the ``to_ndjson_many`` and ``to_json.loop`` benchmarks).
+        """
+        loop = "".join([instance.to_json() + "\n" for instance in self.instances])
+        stream = io.StringIO()
+        self.factory.dump_ndjson(self.instances, stream, chunksize=999)
+        self.assertEqual(loop, stream.getvalue())
@@ -0,0 +1,116 @@
+"""
+Module :mod:`newproject.tests.test_interfaces_cache` implements test suite for
+the caching mixin :class:`newproject.interfaces.cache.CachedInterface`.
+"""
+
+import copy
+import unittest
+from typing import Any
+
+from newproject.interfaces.cache import CachedInterface, LRUCache
+from newproject.interfaces.declarative import DeclarativeInterface
+from newproject.interfaces.examples import SimpleCase
+from newproject.tests.test_interfaces import TestGenericInterfaceImplementation
+
+
+class CachedSimpleCase(CachedInterface, SimpleCase):
+    cache = LRUCache(maxsize=8)
+    calls = 0
+
+    def to_dict(self) -> dict:
+        type(self).calls += 1
+        return super().to_dict()
+
+
+class CachedDeclarativeCase(CachedInterface, DeclarativeInterface):
+    cache = LRUCache(maxsize=8)
+
+    value: Any = None
+    label: str = ""
+
+
+class TestCachedSimpleCase(TestGenericInterfaceImplementation, unittest.TestCase):
+
+    factory = CachedSimpleCase
+    dict_configuration = {"value": "Hello World!"}
+    json_configuration = """{"value": "Hello World!"}"""
+
+
+class TestCachedDeclarativeCase(TestGenericInterfaceImplementation, unittest.TestCase):
+
+    factory = CachedDeclarativeCase
+    dict_configuration = {"value": [1, 2], "label": "a"}
+    json_configuration = """{"value": [1, 2], "label": "a"}"""
+
+
+class TestCachedInterface(unittest.TestCase):
+    """
+    Caching mixin tests
+    """
+
+    def setUp(self) -> None:
+        CachedSimpleCase.cache.clear()
+        CachedSimpleCase.calls = 0
+        CachedDeclarativeCase.cache.clear()
+
+    def test_memoization(self) -> None:
+        instance = CachedSimpleCase(value=1)
+        self.assertEqual({"value": 1}, instance.to_dict())
+        self.assertEqual({"value": 1}, instance.to_dict())
+        self.assertEqual('{"value": 1}', instance.to_json())
+        self.assertEqual('{"value": 1}', instance.to_json())
+        self.assertEqual(1, CachedSimpleCase.calls)
+        info = CachedSimpleCase.cache.info()
+        self.assertEqual((3, 2, 0, 8, 2), tuple(info))
+
+    def test_invalidation_on_set(self) -> None:
+        instance = CachedSimpleCase(value=1)
+        self.assertEqual('{"value": 1}', instance.to_json())
+        instance.value = 2
+        self.assertEqual('{"value": 2}', instance.to_json())
+        self.assertEqual({"value": 2}, instance.to_dict())
+        del instance.value
+        with self.assertRaises(AttributeError):
+            instance.to_json()
+
+    def test_declarative_slots(self) -> None:
+        instance = CachedDeclarativeCase(value=1, label="a")
+        self.assertFalse(hasattr(instance, "__dict__"))
+        self.assertEqual('{"value": 1, "label": "a"}', instance.to_json())
+        instance.label = "b"
+        self.assertEqual('{"value": 1, "label": "b"}', instance.to_json())
+        self.assertEqual('{"value": 1, "label": "b"}', instance.to_json())
+        self.assertEqual(1, CachedDeclarativeCase.cache.info().hits)
+
+    def test_returned_dict_is_a_copy(self) -> None:
+        instance = CachedSimpleCase(value=1)
+        instance.to_dict()["value"] = 2
+        self.assertEqual({"value": 1}, instance.to_dict())
+
+    def test_copies_do_not_share_cache(self) -> None:
+        instance = CachedSimpleCase(value=1)
+        instance.to_json()
+        other = copy.copy(instance)
+        other.value = 2
+        self.assertEqual('{"value": 2}', other.to_json())
+        self.assertEqual('{"value": 1}', instance.to_json())
+
+    def test_eviction(self) -> None:
+        instances = [CachedSimpleCase(value=index) for index in range(10)]
+        for instance in instances:
+            instance.to_json()
+        info = CachedSimpleCase.cache.info()
+        self.assertEqual(8, info.currsize)
+        self.assertEqual(12, info.evictions)
+        self.assertEqual('{"value": 0}', instances[0].to_json())
+
+    def test_lru_cache(self) -> None:
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(1, cache.get("a"))
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(3, cache.get("c"))
+        cache.resize(1)
+        self.assertEqual((2, 1, 2, 1, 1), tuple(cache.info()))
@@ -0,0 +1,126 @@
+"""
+Module :mod:`newproject.tests.test_interfaces_collection` implements test suite for
+the class :class:`newproject.interfaces.collection.InterfaceCollection`.
+"""
+
+import datetime
+import io
+import json
+import unittest
+from typing import Any
+
+import numpy as np
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces.collection import InterfaceCollection
+from newproject.interfaces.declarative import DeclarativeInterface
+from newproject.interfaces.examples import SimpleCase
+
+
+class Measure(DeclarativeInterface):
+    name: str
+    value: float
+    count: int = 0
+    extra: Any = None
+
+
+class TestInterfaceCollection(unittest.TestCase):
+    """
+    Interface collection tests
+    """
+
+    def setUp(self) -> None:
+        self.instances = [
+            Measure("m%d" % i, i / 2, i, None if i % 2 else [i]) for i in range(10)
+        ]
+        self.collection = InterfaceCollection.from_instances(Measure, self.instances)
+
+    def test_columns(self) -> None:
+        self.assertEqual(10, len(self.collection))
+        self.assertEqual(("name", "value", "count", "extra"), self.collection.fields)
+        self.assertEqual(np.float64, self.collection.column("value").dtype)
+        self.assertEqual(np.int64, self.collection.column("count").dtype)
+        self.assertEqual(object, self.collection.column("name").dtype)
+        self.assertEqual(object, self.collection.column("extra").dtype)
+
+    def test_mixed_numbers_are_objects(self) -> None:
+        collection = InterfaceCollection.from_dicts(
+            SimpleCase, [{"value": 1}, {"value": 1.5}, {"value": 2**70}]
+        )
+        self.assertEqual(object, collection.column("value").dtype)
+        self.assertEqual([1, 1.5, 2**70], collection.column("value").tolist())
+
+    def test_materialization(self) -> None:
+        instance = self.collection[3]
+        self.assertIsInstance(instance, Measure)
+        self.assertIsInstance(instance.value, float)
+        self.assertIsInstance(instance.count, int)
+        self.assertEqual(self.instances[3].to_dict(), instance.to_dict())
+        self.assertEqual(self.instances[-1].to_dict(), self.collection[-1].to_dict())
+        with self.assertRaises(IndexError):
+            self.collection[10]
+
+    def test_iteration(self) -> None:
+        self.assertEqual(
+            [instance.to_dict() for instance in self.instances],
+            [instance.to_dict() for instance in self.collection],
+        )
+
+    def test_filter(self) -> None:
+        subset = self.collection.filter(self.collection.column("value") >= 3.0)
+        self.assertEqual([6, 7, 8, 9], subset.column("count").tolist())
+        self.assertEqual(["m2"], self.collection.where(count=2).column("name").tolist())
+        self.assertEqual(3, len(self.collection[2:5]))
+        self.assertEqual([9, 0], self.collection[[9, 0]].column("count").tolist())
+        with self.assertRaises(InvalidParameter):
+            self.collection.filter([True])
+
+    def test_sort(self) -> None:
+        self.assertEqual(
+            list(range(9, -1, -1)),
+            self.collection.sort("value", reverse=True).column("count").tolist(),
+        )
+
+    def test_to_dicts(self) -> None:
+        self.assertEqual(
+            [instance.to_dict() for instance in self.instances],
+            self.collection.to_dicts(),
+        )
+        self.assertEqual(
+            self.collection.to_dicts(), list(self.collection.iter_dicts(chunksize=3))
+        )
+
+    def test_to_ndjson(self) -> None:
+        stream = io.StringIO()
+        self.collection.dump_ndjson(stream, chunksize=4)
+        self.assertEqual(
+            "".join(Measure.to_ndjson_many(self.instances)), stream.getvalue()
+        )
+
+    def test_serializer_is_used(self) -> None:
+        collection = InterfaceCollection.from_instances(
+            SimpleCase, [SimpleCase(datetime.date(2020, 1, 1))]
+        )
+        self.assertEqual(
+            {"value": "2020-01-01"}, json.loads("".join(collection.to_ndjson()))
+        )
+
+    def test_dataframe_round_trip(self) -> None:
+        frame = self.collection.to_dataframe()
+        self.assertEqual(list(self.collection.fields), list(frame.columns))
+        self.assertEqual(10, len(frame))
+        collection = InterfaceCollection.from_dataframe(Measure, frame)
+        self.assertEqual(self.collection.to_dicts(), collection.to_dicts())
+
+    def test_invalid_configurations(self) -> None:
+        with self.assertRaises(InvalidParameter):
+            InterfaceCollection.from_dicts(SimpleCase, [{"value": 1}, {"other": 1}])
+        with self.assertRaises(InvalidParameter):
+            InterfaceCollection(SimpleCase, {"a": [1, 2], "b": [1]})
+        with self.assertRaises(InvalidParameter):
+            InterfaceCollection(dict, {})
+
+    def test_empty(self) -> None:
+        collection = InterfaceCollection.from_dicts(SimpleCase, [])
+        self.assertEqual(0, len(collection))
+        self.assertEqual([], collection.to_dicts())
@@ -0,0 +1,104 @@
+"""
+Module :mod:`newproject.tests.test_interfaces_declarative` implements test suite for
+the class :class:`newproject.interfaces.declarative.DeclarativeInterface`.
+"""
+
+import pickle
+import sys
+import unittest
+import weakref
+from typing import Any, ClassVar
+
+from newproject.interfaces.declarative import DeclarativeInterface
+from newproject.interfaces.examples import SimpleCase, SimpleDeclarativeCase
+
+
+class Point(DeclarativeInterface):
+    x: float
+    y: float = 0.0
+    dimension: ClassVar[int] = 2
+
+
+class LabeledPoint(Point):
+    label: Any = None
+
+
+class Pair(DeclarativeInterface):
+    fields = ("left", "right")
+    right = None
+
+
+class CustomPoint(Point):
+    def to_dict(self) -> dict:
+        return {"x": self.x}
+
+
+class TestDeclarativeInterface(unittest.TestCase):
+    """
+    Declarative interface tests
+    """
+
+    def test_abstract_class(self) -> None:
+        with self.assertRaises(TypeError):
+            DeclarativeInterface()
+
+    def test_fields_from_annotations(self) -> None:
+        self.assertEqual(("x", "y"), Point._fields)
+        self.assertEqual({"y": 0.0}, Point._field_defaults)
+        self.assertEqual({"x": float, "y": float}, Point._field_types)
+        self.assertEqual(2, Point.dimension)
+
+    def test_fields_from_tuple(self) -> None:
+        self.assertEqual(("left", "right"), Pair._fields)
+        self.assertEqual({"left": 1, "right": None}, Pair(1).to_dict())
+
+    def test_inherited_fields(self) -> None:
+        point = LabeledPoint(1.0, label="a")
+        self.assertEqual(("x", "y", "label"), LabeledPoint._fields)
+        self.assertEqual(("label",), LabeledPoint.__slots__)
+        self.assertEqual({"x": 1.0, "y": 0.0, "label": "a"}, point.to_dict())
+        self.assertEqual('{"x": 1.0, "y": 0.0, "label": "a"}', point.to_json())
+        self.assertEqual("LabeledPoint(x=1.0, y=0.0, label='a')", repr(point))
+
+    def test_required_field(self) -> None:
+        with self.assertRaises(TypeError):
+            Point()
+
+    def test_slots(self) -> None:
+        point = Point(1.0)
+        self.assertFalse(hasattr(point, "__dict__"))
+        with self.assertRaises(AttributeError):
+            point.z = 1.0
+        self.assertIs(point, weakref.ref(point)())
+        self.assertLess(
+            sys.getsizeof(SimpleDeclarativeCase(1)),
+            sys.getsizeof(SimpleCase(1)) + sys.getsizeof(SimpleCase(1).__dict__),
+        )
+
+    def test_custom_methods_are_kept(self) -> None:
+        point = CustomPoint(1.0, 2.0)
+        self.assertEqual({"x": 1.0}, point.to_dict())
+        self.assertEqual('{"x": 1.0}', point.to_json())
+
+    def test_pickle(self) -> None:
+        point = LabeledPoint(1.0, 2.0, "a")
+        self.assertEqual(point.to_dict(), pickle.loads(pickle.dumps(point)).to_dict())
+
+    def test_default_after_required(self) -> None:
+        with self.assertRaises(TypeError):
+
+            class Invalid(DeclarativeInterface):
+                x: int = 0
+                y: int
+
+    def test_mutable_default(self) -> None:
+        with self.assertRaises(TypeError):
+
+            class Invalid(DeclarativeInterface):
+                x: list = []
+
+    def test_invalid_field_names(self) -> None:
+        for field in ["class", "def", "self", "__private", "not-valid"]:
+            with self.subTest(field=field):
+                with self.assertRaisesRegex(TypeError, "Invalid field name"):
+                    type("Invalid", (DeclarativeInterface,), {"fields": (field,)})
@@ -0,0 +1,180 @@
+import datetime
+import decimal
+import enum
+import json
+import pathlib
+import unittest
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import decoding
+from newproject.interfaces.collection import InterfaceCollection
+from newproject.interfaces.declarative import DeclarativeInterface
+from newproject.interfaces.examples import (
+    SimpleCase,
+    SimpleCaseWithSerializer,
+    TemporalCase,
+)
+from newproject.interfaces.generic import GenericInterface
+
+
+class Color(enum.Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class TypedCase(DeclarativeInterface):
+    amount: decimal.Decimal
+    identifier: Optional[uuid.UUID] = None
+    path: pathlib.Path = pathlib.Path(".")
+    color: Color = Color.RED
+    times: Optional[List[datetime.time]] = None
+    schedule: Dict[str, datetime.datetime] = None
+    window: Tuple[datetime.date, datetime.date] = None
+    tags: Set[str] = frozenset()
+    samples: np.ndarray = None
+    nested: Optional[TemporalCase] = None
+    other: Any = None
+
+
+class InitCase(GenericInterface):
+    def __init__(self, when: datetime.datetime, label: "str" = "") -> None:
+        self.when = when
+        self.label = label
+
+    def to_dict(self) -> dict:
+        return {"when": self.when, "label": self.label}
+
+
+class TestDecoderPlan(unittest.TestCase):
+    def test_plan(self):
+        plan = decoding.plan(TypedCase)
+        self.assertIs(plan, decoding.plan(TypedCase))
+        self.assertNotIn("other", plan)
+        self.assertEqual({"when"}, set(decoding.plan(InitCase)))
+        self.assertEqual({}, decoding.plan(SimpleCase))
+        self.assertEqual({}, decoding.plan(SimpleCaseWithSerializer))
+
+    def test_roundtrip(self):
+        instance = TypedCase(
+            amount=decimal.Decimal("10.25"),
+            identifier=uuid.uuid4(),
+            path=pathlib.Path("a/b"),
+            color=Color.BLUE,
+            times=[datetime.time(10, 30)],
+            schedule={
+                "start": datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+            },
+            window=(datetime.date(2021, 1, 1), datetime.date(2021, 2, 1)),
+            tags={"a", "b"},
+            samples=np.arange(4.0),
+            nested=TemporalCase(start=datetime.datetime(2021, 1, 1)),
+            other="2021-01-01",
+        )
+        other = TypedCase.from_json(instance.to_json())
+        for field in TypedCase._fields:
+            if field == "samples":
+                np.testing.assert_array_equal(instance.samples, other.samples)
+            elif field == "nested":
+                self.assertEqual(instance.nested.to_dict(), other.nested.to_dict())
+            else:
+                self.assertEqual(getattr(instance, field), getattr(other, field), field)
+        self.assertEqual(instance.to_json(), other.to_json())
+        self.assertIsInstance(other.tags, set)
+
+    def test_values(self):
+        other = TypedCase.from_dict(
+            {
+                "amount": 1.1,
+                "identifier": None,
+                "schedule": {"a": "2021-01-01T10:00:00Z"},
+                "color": Color.RED,
+            }
+        )
+        self.assertEqual(decimal.Decimal("1.1"), other.amount)
+        self.assertIsNone(other.identifier)
+        self.assertEqual(datetime.timezone.utc, other.schedule["a"].tzinfo)
+        self.assertIs(Color.RED, other.color)
+        instance = InitCase.from_json('{"when": "2021-01-01T00:00:00", "label": "a"}')
+        self.assertEqual(datetime.datetime(2021, 1, 1), instance.when)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(InvalidParameter, "'start'"):
+            TemporalCase.from_dict({"start": "yesterday"})
+        with self.assertRaisesRegex(InvalidParameter, "'color'"):
+            TypedCase.from_dict({"amount": 1, "color": "green"})
+        with self.assertRaises(InvalidParameter):
+            TemporalCase.from_json("[]")
+
+    def test_from_dicts(self):
+        configurations = [
+            {"start": "2021-01-01T00:00:{:02d}".format(i), "duration": i}
+            for i in range(60)
+        ]
+        instances = list(TemporalCase.from_dicts(iter(configurations)))
+        self.assertEqual(60, len(instances))
+        self.assertEqual(datetime.datetime(2021, 1, 1, 0, 0, 59), instances[-1].start)
+        self.assertEqual(datetime.timedelta(seconds=59), instances[-1].duration)
+
+    def test_decode_json_texts(self):
+        base = datetime.datetime(2021, 1, 1)
+        texts = [
+            TemporalCase(
+                start=base + datetime.timedelta(seconds=i),
+                duration=datetime.timedelta(seconds=i),
+            ).to_json()
+            for i in range(100)
+        ]
+        for i, text in enumerate(texts):
+            instance = TemporalCase.from_json(text)
+            self.assertEqual(base + datetime.timedelta(seconds=i), instance.start)
+            self.assertEqual(datetime.timedelta(seconds=i), instance.duration)
+
+
+class TestColumns(unittest.TestCase):
+    def test_parse_datetimes(self):
+        values = ["2021-01-01T00:00:00", None, "2021-01-01T01:00:00+01:00"]
+        array = decoding.parse_datetimes(values)
+        self.assertEqual(np.dtype("datetime64[us]"), array.dtype)
+        self.assertTrue(np.isnat(array[1]))
+        self.assertEqual(array[0], array[2])
+        with self.assertRaises(InvalidParameter):
+            decoding.parse_datetimes(["not a date"])
+
+    def test_parse_timedeltas(self):
+        array = decoding.parse_timedeltas([1.5, None, datetime.timedelta(minutes=1)])
+        self.assertEqual(datetime.timedelta(seconds=1.5), array[0].item())
+        self.assertTrue(np.isnat(array[1]))
+        self.assertEqual(datetime.timedelta(minutes=1), array[2].item())
+
+    def test_collection(self):
+        base = datetime.datetime(2021, 1, 1)
+        instances = [
+            TemporalCase(
+                start=base + datetime.timedelta(minutes=i),
+                duration=datetime.timedelta(seconds=i),
+                end=datetime.date(2021, 1, 1 + i % 28),
+            )
+            for i in range(1000)
+        ]
+        configurations = [json.loads(instance.to_json()) for instance in instances]
+        collection = InterfaceCollection.from_dicts(
+            TemporalCase, configurations, decode=True
+        )
+        self.assertEqual("M", collection.column("start").dtype.kind)
+        self.assertEqual("m", collection.column("duration").dtype.kind)
+        self.assertEqual(np.dtype("datetime64[D]"), collection.column("end").dtype)
+        self.assertEqual(instances[10].to_dict(), collection[10].to_dict())
+        self.assertEqual(
+            [instance.to_dict() for instance in instances],
+            [instance.to_dict() for instance in collection],
+        )
+        later = collection.filter(
+            collection.column("start") >= np.datetime64(base.replace(hour=10))
+        )
+        self.assertEqual(400, len(later))
+        raw = InterfaceCollection.from_dicts(TemporalCase, configurations)
+        self.assertEqual("O", raw.column("start").dtype.kind)
@@ -7,7 +7,13 @@ and interface examples defined in module :mod:`newproject.interfaces.examples`.
 import datetime
 import unittest
 
-from newproject.interfaces.examples import SimpleCase, SimpleCaseWithSerializer
+from newproject.interfaces.examples import (
+    SimpleCase,
+    SimpleCaseWithSerializer,
+    SimpleDeclarativeCase,
+    TemporalCase,
+    ValidatedCase,
+)
 from newproject.tests.test_interfaces import TestGenericInterfaceImplementation
 
 
@@ -23,7 +29,7 @@ class TestSimpleCaseWithNoSerializer(
 ):
 
     factory = SimpleCase
-    dict_configuration = {"value": datetime.datetime(2020, 1, 1)}
+    dict_configuration = {"value": complex(1.0, 2.0)}
     json_configuration = None
 
     def test_serializer(self) -> None:
@@ -33,6 +39,33 @@ class TestSimpleCaseWithNoSerializer(
         with self.assertRaises(AttributeError) as context:
             super().test_to_json_configuration()
 
+    def test_to_json_many_configuration(self) -> None:
+        with self.assertRaises(AttributeError) as context:
+            super().test_to_json_many_configuration()
+
+    def test_to_ndjson_many_configuration(self) -> None:
+        with self.assertRaises(AttributeError) as context:
+            super().test_to_ndjson_many_configuration()
+
+    def test_to_bytes_configuration(self) -> None:
+        with self.assertRaises(AttributeError) as context:
+            super().test_to_bytes_configuration()
+
+    def test_from_json_configuration(self) -> None:
+        with self.assertRaises(AttributeError) as context:
+            super().test_from_json_configuration()
+
+    def test_config_hash_equality(self) -> None:
+        with self.assertRaises(AttributeError) as context:
+            self.instance.config_hash()
+        self.assertNotEqual(self.instance, self.factory(**self.dict_configuration))
+        factory = type(self.factory.__name__, (self.factory,), {"hashable": True})
+        self.assertEqual(
+            factory(**self.dict_configuration), factory(**self.dict_configuration)
+        )
+        with self.assertRaises(TypeError):
+            hash(factory(**self.dict_configuration))
+
 
 class TestSimpleCaseWithSerializer(
     TestGenericInterfaceImplementation, unittest.TestCase
@@ -41,3 +74,44 @@ class TestSimpleCaseWithSerializer(
     factory = SimpleCaseWithSerializer
     dict_configuration = {"value": datetime.datetime(2020, 1, 1)}
     json_configuration = """{"value": "2020-01-01T00:00:00"}"""
+
+
+class TestSimpleDeclarativeCase(TestGenericInterfaceImplementation, unittest.TestCase):
+
+    factory = SimpleDeclarativeCase
+    dict_configuration = {"value": datetime.datetime(2020, 1, 1)}
+    json_configuration = """{"value": "2020-01-01T00:00:00"}"""
+
+
+class TestTemporalCase(TestGenericInterfaceImplementation, unittest.TestCase):
+
+    factory = TemporalCase
+    dict_configuration = {
+        "start": datetime.datetime(2020, 1, 1, 12, 30),
+        "duration": datetime.timedelta(minutes=90),
+        "end": datetime.date(2020, 1, 2),
+    }
+    json_configuration = (
+        """{"start": "2020-01-01T12:30:00", "duration": 5400.0, "end": "2020-01-02"}"""
+    )
+
+    def test_from_json_types(self) -> None:
+        other = self.factory.from_json(self.json_configuration)
+        self.assertEqual(self.dict_configuration, other.to_dict())
+        self.assertEqual(self.instance.to_json(), other.to_json())
+
+
+class TestValidatedCase(TestGenericInterfaceImplementation, unittest.TestCase):
+
+    factory = ValidatedCase
+    dict_configuration = {
+        "name": "case",
+        "count": 2,
+        "ratio": 0.5,
+        "start": datetime.datetime(2020, 1, 1, 12, 30),
+        "tags": ["a", "b"],
+    }
+    json_configuration = (
+        """{"name": "case", "count": 2, "ratio": 0.5, """
+        """"start": "2020-01-01T12:30:00", "tags": ["a", "b"]}"""
+    )
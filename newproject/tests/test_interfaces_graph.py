@@ -0,0 +1,140 @@
+import datetime
+import json
+import unittest
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import graph
+from newproject.interfaces.examples import (
+    SimpleCase,
+    SimpleCaseWithSerializer,
+    SimpleDeclarativeCase,
+)
+
+
+class Node:
+    def __init__(self, name, children=()):
+        self.name = name
+        self.children = list(children)
+
+
+class TestGraph(unittest.TestCase):
+    def roundtrip(self, instance, types=()):
+        data = instance.to_json_graph()
+        return json.loads(data), type(instance).from_json_graph(data, types=types)
+
+    def test_tree_is_plain(self):
+        instance = SimpleCase(value={"a": [1, 2.5, "x", None, True]})
+        data, copy = self.roundtrip(instance)
+        self.assertEqual(
+            {
+                "$type": "newproject.interfaces.examples.SimpleCase",
+                "$config": instance.to_dict(),
+            },
+            data,
+        )
+        self.assertEqual(instance.to_dict(), copy.to_dict())
+
+    def test_shared_interfaces(self):
+        leaf = SimpleDeclarativeCase(value="leaf")
+        instance = SimpleCase(value=[leaf, leaf, {"again": leaf}])
+        data, copy = self.roundtrip(instance)
+        self.assertEqual(1, json.dumps(data).count('"leaf"'))
+        first, second, mapping = copy.value
+        self.assertIsInstance(first, SimpleDeclarativeCase)
+        self.assertIs(first, second)
+        self.assertIs(first, mapping["again"])
+
+    def test_shared_containers(self):
+        values = [1, 2, 3]
+        mapping = {"values": values}
+        instance = SimpleCase(value=[values, mapping, mapping])
+        _, copy = self.roundtrip(instance)
+        self.assertEqual(
+            [[1, 2, 3], {"values": [1, 2, 3]}, {"values": [1, 2, 3]}], copy.value
+        )
+        self.assertIs(copy.value[0], copy.value[1]["values"])
+        self.assertIs(copy.value[1], copy.value[2])
+
+    def test_cycles(self):
+        instance = SimpleCase(value=[])
+        instance.value.append(instance)
+        instance.value.append(instance.value)
+        with self.assertRaises(ValueError):
+            instance.to_json()
+        _, copy = self.roundtrip(instance)
+        self.assertIs(copy, copy.value[0])
+        self.assertIs(copy.value, copy.value[1])
+        mapping = {}
+        mapping["self"] = mapping
+        _, copy = self.roundtrip(SimpleCase(value=mapping))
+        self.assertIs(copy.value, copy.value["self"])
+
+    def test_fallback_objects(self):
+        root = Node("root")
+        child = Node("child", [root])
+        root.children = [child, child]
+        instance = SimpleCase(value=root)
+        with self.assertRaises(InvalidParameter):
+            self.roundtrip(instance)
+        _, copy = self.roundtrip(instance, types=[Node])
+        self.assertIsInstance(copy.value, Node)
+        self.assertIs(copy.value.children[0], copy.value.children[1])
+        self.assertIs(copy.value, copy.value.children[0].children[0])
+
+    def test_serializer(self):
+        moment = datetime.datetime(2020, 1, 1)
+        instance = SimpleCaseWithSerializer(value=[moment, moment, {1, 2}])
+        data, copy = self.roundtrip(instance)
+        self.assertEqual(
+            ["2020-01-01T00:00:00", "2020-01-01T00:00:00", [1, 2]], copy.value
+        )
+        self.assertEqual(json.loads(instance.to_json()), data["$config"])
+
+    def test_escaped_keys(self):
+        instance = SimpleCase(value={"$ref": 1, "$list": [2]})
+        _, copy = self.roundtrip(instance)
+        self.assertEqual(instance.value, copy.value)
+
+    def test_invalid(self):
+        with self.assertRaises(InvalidParameter):
+            SimpleCase.from_graph({"$ref": 3})
+        with self.assertRaises(InvalidParameter):
+            SimpleCase.from_graph({"$type": "os.system", "$config": {}})
+        with self.assertRaises(InvalidParameter):
+            SimpleCase.from_graph(
+                {
+                    "$type": "newproject.interfaces.examples.SimpleDeclarativeCase",
+                    "$config": {},
+                }
+            )
+        with self.assertRaises(InvalidParameter):
+            graph.decode({"$list": 1})
+
+    def test_too_deep(self):
+        value: list = []
+        for _ in range(2000):
+            value = [value]
+        with self.assertRaisesRegex(InvalidParameter, "too deep"):
+            SimpleCase(value=value).to_graph()
+        data: dict = {"value": []}
+        for _ in range(2000):
+            data = {"value": data}
+        with self.assertRaisesRegex(InvalidParameter, "too deep"):
+            SimpleCase.from_graph(
+                {"$type": "newproject.interfaces.examples.SimpleCase", "$config": data}
+            )
+
+    def test_linear_dag(self):
+        # Each level references the previous one twice, tree expansion would be 2**depth:
+        depth = 60
+        node = SimpleCase(value="leaf")
+        for _ in range(depth):
+            node = SimpleCase(value=[node, node])
+        data = node.to_json_graph()
+        self.assertLess(len(data), 200 * (depth + 1))
+        # Every level but the root is written once then referenced once:
+        self.assertEqual(depth, data.count('"$id"'))
+        self.assertEqual(depth, data.count('"$ref"'))
+        copy = SimpleCase.from_json_graph(data)
+        self.assertIs(copy.value[0], copy.value[1])
+        self.assertIs(copy.value[0].value[0], copy.value[1].value[1])
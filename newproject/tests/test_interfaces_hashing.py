@@ -0,0 +1,169 @@
+import datetime
+import gc
+import hashlib
+import threading
+import unittest
+
+import numpy as np
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import hashing
+from newproject.interfaces.examples import (
+    SimpleCase,
+    SimpleCaseWithSerializer,
+    SimpleDeclarativeCase,
+)
+from newproject.tests.test_interfaces_cache import CachedSimpleCase
+
+
+class HashableCase(SimpleDeclarativeCase):
+    hashable = True
+
+
+class HashableSimpleCase(SimpleCase):
+    hashable = True
+
+
+class HashableSerializerCase(SimpleCaseWithSerializer):
+    hashable = True
+
+
+class TestConfigHash(unittest.TestCase):
+    def test_canonical(self):
+        a = SimpleCase(value={"b": [1, {"y": 2, "x": 1}], "a": "é"})
+        b = SimpleCase(value={"a": "é", "b": [1, {"x": 1, "y": 2}]})
+        self.assertEqual(
+            '{"value":{"a":"\\u00e9","b":[1,{"x":1,"y":2}]}}', hashing.canonical(a)
+        )
+        self.assertEqual(hashing.canonical(a), hashing.canonical(b))
+        digest = hashlib.blake2b(hashing.canonical(a).encode(), digest_size=16)
+        self.assertEqual(digest.hexdigest(), a.config_hash())
+        self.assertEqual(32, len(a.config_hash()))
+
+    def test_equality(self):
+        self.assertNotEqual(SimpleCase(value=1), SimpleCase(value=1))
+        instance = SimpleCase(value=1)
+        self.assertEqual(instance, instance)
+        self.assertEqual(
+            HashableSimpleCase(value={"a": [1, {"b": None}]}),
+            HashableSimpleCase(value={"a": [1, {"b": None}]}),
+        )
+        self.assertNotEqual(
+            HashableSimpleCase(value=[1, 2]), HashableSimpleCase(value=(1, 2))
+        )
+        self.assertNotEqual(HashableSimpleCase(value=1), HashableSimpleCase(value=1.0))
+        self.assertNotEqual(HashableSimpleCase(value=1), HashableSimpleCase(value=True))
+        self.assertNotEqual(HashableSimpleCase(value=1), HashableSimpleCase(value=2))
+        self.assertNotEqual(
+            HashableSimpleCase(value=1), HashableSerializerCase(value=1)
+        )
+        self.assertNotEqual(HashableSimpleCase(value=1), HashableCase(value=1))
+        self.assertNotEqual(
+            HashableSimpleCase(value={1: "a"}), HashableSimpleCase(value={"1": "a"})
+        )
+        self.assertNotEqual(
+            HashableSimpleCase(value={True: "a"}),
+            HashableSimpleCase(value={"true": "a"}),
+        )
+        self.assertNotEqual(
+            HashableSimpleCase(value={1: "a"}), HashableSimpleCase(value={True: "a"})
+        )
+        date = datetime.datetime(2021, 1, 1)
+        self.assertNotEqual(
+            HashableSerializerCase(value=date),
+            HashableSerializerCase(value="2021-01-01T00:00:00"),
+        )
+        self.assertEqual(
+            HashableSerializerCase(value=date),
+            HashableSerializerCase(value=datetime.datetime(2021, 1, 1)),
+        )
+        self.assertEqual(
+            HashableSimpleCase(value=np.arange(3)),
+            HashableSimpleCase(value=np.arange(3)),
+        )
+        self.assertNotEqual(
+            HashableSimpleCase(value=np.arange(3)),
+            HashableSimpleCase(value=np.arange(3.0)),
+        )
+        self.assertEqual(
+            HashableSimpleCase(value=[np.arange(3)]),
+            HashableSimpleCase(value=[np.arange(3)]),
+        )
+
+    def test_hashable(self):
+        instances = [SimpleDeclarativeCase(value=index % 10) for index in range(100)]
+        self.assertEqual(100, len(set(instances)))
+        instances = [HashableCase(value=index % 10) for index in range(100)]
+        self.assertEqual(10, len(set(instances)))
+        self.assertEqual(10, len(dict.fromkeys(instances)))
+
+    def test_circular(self):
+        value: list = []
+        value.append(value)
+        with self.assertRaises(InvalidParameter):
+            SimpleCase(value=value).config_hash()
+
+    def test_unsortable_keys(self):
+        with self.assertRaises(InvalidParameter):
+            SimpleCase(value={1: "a", "b": 2}).config_hash()
+        self.assertEqual(
+            HashableSimpleCase(value={2: "a", 1: "b"}),
+            HashableSimpleCase(value={1: "b", 2: "a"}),
+        )
+
+    def test_cached_interface(self):
+        CachedSimpleCase.cache.clear()
+        CachedSimpleCase.calls = 0
+        instance = CachedSimpleCase(value=1)
+        digest = instance.config_hash()
+        self.assertEqual(digest, instance.config_hash())
+        self.assertEqual(1, CachedSimpleCase.calls)
+        instance.value = 2
+        self.assertNotEqual(digest, instance.config_hash())
+        self.assertEqual(
+            CachedSimpleCase(value=2).config_hash(), instance.config_hash()
+        )
+
+
+class TestInternTable(unittest.TestCase):
+    def test_intern(self):
+        table = hashing.InternTable()
+        a = table.intern(SimpleCase(value={"x": 1, "y": [1, 2]}))
+        b = table.intern(SimpleCase(value={"y": [1, 2], "x": 1}))
+        c = table.intern(SimpleDeclarativeCase(value={"x": 1, "y": [1, 2]}))
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+        self.assertEqual(2, len(table))
+        del a, b, c
+        gc.collect()
+        self.assertEqual(0, len(table))
+
+    def test_different_values(self):
+        table = hashing.InternTable()
+        date = SimpleCaseWithSerializer(value=datetime.datetime(2021, 1, 1))
+        text = SimpleCaseWithSerializer(value="2021-01-01T00:00:00")
+        self.assertIs(date, table.intern(date))
+        self.assertIs(text, table.intern(text))
+        self.assertIsInstance(text.intern().value, str)
+        self.assertIs(date, table.intern(SimpleCaseWithSerializer(value=date.value)))
+
+    def test_default_table(self):
+        instances = [
+            SimpleDeclarativeCase(value=index % 3).intern() for index in range(30)
+        ]
+        self.assertEqual(3, len({id(instance) for instance in instances}))
+        self.assertIs(instances[0], SimpleDeclarativeCase(value=0).intern())
+
+    def test_threads(self):
+        table = hashing.InternTable()
+        results = []
+
+        def intern():
+            results.extend(table.intern(SimpleCase(value=i % 5)) for i in range(500))
+
+        threads = [threading.Thread(target=intern) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(5, len({id(result) for result in results}))
@@ -0,0 +1,140 @@
+import concurrent.futures
+import datetime
+import itertools
+import json
+import unittest
+from unittest import mock
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import parallel
+from newproject.interfaces.examples import (
+    SimpleCase,
+    SimpleCaseWithSerializer,
+    SimpleDeclarativeCase,
+)
+
+
+class TestOrderedMap(unittest.TestCase):
+    def test_order(self):
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            results = parallel.ordered_map(abs, range(0, -100, -1), executor, 3)
+            self.assertEqual(list(range(100)), list(results))
+
+    def test_bounded(self):
+        consumed = []
+
+        def items():
+            for item in range(100):
+                consumed.append(item)
+                yield item
+
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            results = parallel.ordered_map(str, items(), executor, 5)
+            self.assertEqual(["0", "1"], list(itertools.islice(results, 2)))
+            self.assertLessEqual(len(consumed), 7)
+            results.close()
+            self.assertLessEqual(len(consumed), 7)
+
+    def test_errors(self):
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            with self.assertRaises(ZeroDivisionError):
+                list(parallel.ordered_map(lambda x: 1 / x, [1, 0, 2], executor, 2))
+            with self.assertRaises(InvalidParameter):
+                list(parallel.ordered_map(abs, [1], executor, 0))
+
+
+def _total(task):
+    start, items = task
+    return start, sum(items)
+
+
+class TestMapTasks(unittest.TestCase):
+    def test_tasks(self):
+        tasks = [(start, list(range(start, start + 10))) for start in range(0, 100, 10)]
+        expected = [_total(task) for task in tasks]
+        self.assertEqual(expected, list(parallel.map_tasks(_total, iter(tasks))))
+        with mock.patch.object(parallel, "minimum", 20):
+            with concurrent.futures.ThreadPoolExecutor(2) as executor:
+                results = parallel.map_tasks(
+                    _total, iter(tasks), window=2, executor=executor
+                )
+                self.assertEqual(expected, list(results))
+            self.assertEqual(expected, list(parallel.map_tasks(_total, iter(tasks), 2)))
+        with self.assertRaises(InvalidParameter):
+            list(parallel.map_tasks(_total, iter(tasks), workers=-1))
+
+
+class TestParallel(unittest.TestCase):
+    size = 5000
+
+    def setUp(self) -> None:
+        self.instances = [
+            SimpleCase(value={"index": i, "date": datetime.date(2020, 1, 1 + i % 28)})
+            for i in range(self.size)
+        ]
+
+    def test_in_process(self):
+        with mock.patch("concurrent.futures.ProcessPoolExecutor") as pool:
+            documents = list(SimpleCase.encode_parallel(self.instances, workers=4))
+            instances = list(SimpleCase.decode_parallel(documents, workers=4))
+            pool.assert_not_called()
+        self.assertEqual([instance.to_json() for instance in self.instances], documents)
+        self.assertEqual(
+            [instance.to_dict()["value"]["index"] for instance in self.instances],
+            [instance.value["index"] for instance in instances],
+        )
+        self.assertEqual([], list(SimpleCase.encode_parallel([])))
+        self.assertEqual([], list(SimpleCase.decode_parallel([])))
+
+    def test_pool(self):
+        with mock.patch.object(parallel, "minimum", 100):
+            documents = list(
+                SimpleCase.encode_parallel(self.instances, workers=2, chunksize=128)
+            )
+            self.assertEqual(
+                [instance.to_json() for instance in self.instances], documents
+            )
+            lines = [document.encode() for document in documents]
+            instances = list(
+                SimpleCase.decode_parallel(lines, workers=2, chunksize=300)
+            )
+        self.assertEqual(self.size, len(instances))
+        self.assertEqual(
+            [json.loads(document)["value"] for document in documents],
+            [instance.value for instance in instances],
+        )
+
+    def test_executor(self):
+        instances = [SimpleDeclarativeCase(value=i) for i in range(1000)]
+        with mock.patch.object(parallel, "minimum", 10):
+            with concurrent.futures.ProcessPoolExecutor(2) as executor:
+                for factory in [SimpleDeclarativeCase, SimpleCaseWithSerializer]:
+                    documents = factory.encode_parallel(
+                        instances, chunksize=64, executor=executor
+                    )
+                    decoded = factory.decode_parallel(
+                        documents, chunksize=64, executor=executor
+                    )
+                    self.assertEqual(
+                        list(range(1000)), [instance.value for instance in decoded]
+                    )
+
+    def test_errors(self):
+        circular: list = []
+        circular.append(circular)
+        instances = self.instances[:300] + [SimpleCase(value=circular)]
+        documents = [instance.to_json() for instance in self.instances[:300]]
+        for minimum in [10, parallel.minimum]:
+            with mock.patch.object(parallel, "minimum", minimum):
+                with self.assertRaisesRegex(InvalidParameter, "object 300"):
+                    list(SimpleCase.encode_parallel(instances, chunksize=64, workers=2))
+                with self.assertRaisesRegex(InvalidParameter, "document 301"):
+                    list(
+                        SimpleCase.decode_parallel(
+                            documents + ['{"value": 1}', "{"], chunksize=64, workers=2
+                        )
+                    )
+                with self.assertRaisesRegex(InvalidParameter, "Document 300"):
+                    list(SimpleCase.decode_parallel(documents + ["[]"], workers=2))
+        with self.assertRaises(InvalidParameter):
+            list(SimpleCase.encode_parallel(self.instances, workers=-1))
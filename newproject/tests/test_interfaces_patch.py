@@ -0,0 +1,158 @@
+import datetime
+import gc
+import json
+import unittest
+
+import numpy as np
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import patch
+from newproject.interfaces.examples import SimpleCase, SimpleDeclarativeCase
+
+
+class TestPatch(unittest.TestCase):
+    def setUp(self):
+        self.value = {
+            "name": "sensor",
+            "limits": [0, 10],
+            "tags": {"a/b": 1, "c~d": 2},
+            "nested": {"deep": {"x": 1, "y": [1, 2]}},
+        }
+        self.sender = SimpleCase(value=json.loads(json.dumps(self.value)))
+        self.receiver = SimpleCase(value=json.loads(json.dumps(self.value)))
+        self.sender.snapshot()
+
+    def sync(self):
+        self.receiver = self.receiver.apply_patch(self.sender.to_json_patch())
+        self.assertEqual(
+            json.loads(self.sender.to_json()), json.loads(self.receiver.to_json())
+        )
+
+    def test_no_changes(self):
+        self.assertEqual([], self.sender.to_patch())
+
+    def test_nested_replace(self):
+        self.sender.value["limits"][1] = 20
+        self.sender.value["nested"]["deep"]["x"] = 2
+        self.assertEqual(
+            [
+                {"op": "replace", "path": "/value/limits/1", "value": 20},
+                {"op": "replace", "path": "/value/nested/deep/x", "value": 2},
+            ],
+            self.sender.to_patch(update=False),
+        )
+        self.sync()
+        self.assertEqual([], self.sender.to_patch())
+
+    def test_add_remove_escaped(self):
+        del self.sender.value["tags"]["a/b"]
+        self.sender.value["tags"]["e~f/g"] = 3
+        self.sender.value["limits"].extend([30, 40])
+        operations = self.sender.to_patch(update=False)
+        self.assertIn({"op": "remove", "path": "/value/tags/a~1b"}, operations)
+        self.assertIn(
+            {"op": "add", "path": "/value/tags/e~0f~1g", "value": 3}, operations
+        )
+        self.assertIn({"op": "add", "path": "/value/limits/-", "value": 40}, operations)
+        self.sync()
+
+    def test_type_change_and_serializer(self):
+        self.sender.value["nested"] = [1, 2, 3]
+        self.sender.value["limits"] = [5]
+        self.sender.value["moment"] = datetime.date(2020, 1, 1)
+        self.sync()
+        self.assertEqual("2020-01-01", self.receiver.value["moment"])
+
+    def test_incremental(self):
+        self.sender.value["name"] = "first"
+        self.assertEqual(1, len(self.sender.to_patch()))
+        self.sender.value["limits"].append(11)
+        self.assertEqual(
+            [{"op": "add", "path": "/value/limits/-", "value": 11}],
+            self.sender.to_patch(),
+        )
+
+    def test_snapshot_is_private(self):
+        limits = self.sender.value["limits"]
+        limits.append(99)
+        self.assertEqual(1, len(self.sender.to_patch()))
+        limits.append(100)
+        self.assertEqual(
+            [{"op": "add", "path": "/value/limits/-", "value": 100}],
+            self.sender.to_patch(),
+        )
+
+    def test_arrays(self):
+        instance = SimpleCase(value={"data": np.arange(3), "other": 1})
+        instance.snapshot()
+        self.assertEqual([], instance.to_patch())
+        instance.value["data"] = np.arange(4)
+        self.assertEqual(["/value/data"], [op["path"] for op in instance.to_patch()])
+
+    def test_declarative(self):
+        instance = SimpleDeclarativeCase(value=1)
+        instance.snapshot()
+        instance.value = 2
+        self.assertEqual(
+            SimpleDeclarativeCase(value=2).to_dict(),
+            SimpleDeclarativeCase(value=1).apply_patch(instance.to_patch()).to_dict(),
+        )
+
+    def test_snapshot_released(self):
+        instance = SimpleCase(value=1)
+        instance.snapshot()
+        key = id(instance)
+        self.assertIn(key, patch._snapshots)
+        del instance
+        gc.collect()
+        self.assertNotIn(key, patch._snapshots)
+
+    def test_missing_snapshot(self):
+        with self.assertRaises(InvalidParameter):
+            SimpleCase(value=1).to_patch()
+
+    def test_apply_operations(self):
+        document = {"a": {"b": [1, 2, 3]}, "c": 1}
+        result = patch.apply(
+            document,
+            [
+                {"op": "add", "path": "/a/b/0", "value": 0},
+                {"op": "remove", "path": "/a/b/3"},
+                {"op": "move", "from": "/c", "path": "/d"},
+                {"op": "copy", "from": "/a/b", "path": "/e"},
+                {"op": "test", "path": "/e/1", "value": 1},
+                {"op": "replace", "path": "/a/b/1", "value": 9},
+            ],
+        )
+        self.assertEqual({"a": {"b": [0, 9, 2]}, "d": 1, "e": [0, 1, 2]}, result)
+        self.assertEqual({"a": {"b": [1, 2, 3]}, "c": 1}, document)
+
+    def test_apply_invalid(self):
+        document = {"a": [1]}
+        for operations in [
+            [{"op": "test", "path": "/a/0", "value": 2}],
+            [{"op": "remove", "path": "/b"}],
+            [{"op": "add", "path": "/a/2", "value": 1}],
+            [{"op": "add", "path": "/a/01", "value": 1}],
+            [{"op": "add", "path": "a", "value": 1}],
+            [{"op": "move", "from": "/a", "path": "/a/0"}],
+            [{"op": "unknown", "path": "/a"}],
+            [{"path": "/a"}],
+        ]:
+            with self.assertRaises(InvalidParameter):
+                patch.apply(document, operations)
+
+    def test_patch_size(self):
+        value = {
+            "key{}".format(index): {"values": list(range(20)), "label": "x" * 20}
+            for index in range(500)
+        }
+        instance = SimpleCase(value=value)
+        instance.snapshot()
+        value["key10"]["label"] = "changed"
+        data = instance.to_json_patch(update=False)
+        self.assertLess(len(data) * 100, len(instance.to_json()))
+        self.assertEqual(
+            [{"op": "replace", "path": "/value/key10/label", "value": "changed"}],
+            json.loads(data),
+        )
@@ -0,0 +1,118 @@
+"""
+Module :mod:`newproject.tests.test_interfaces_serializers` implements test suite for
+the serializer registry of :class:`newproject.interfaces.generic.GenericInterface`.
+"""
+
+import datetime
+import decimal
+import enum
+import pathlib
+import unittest
+import uuid
+
+import numpy as np
+
+from newproject.interfaces.examples import SimpleCase, SimpleCaseWithSerializer
+from newproject.interfaces.generic import GenericInterface
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class TestSerializerRegistry(unittest.TestCase):
+    """
+    Serializer registry tests
+    """
+
+    def setUp(self) -> None:
+        class RegistryCase(SimpleCase):
+            pass
+
+        class RegistryCaseChild(RegistryCase):
+            pass
+
+        self.factory = RegistryCase
+        self.child = RegistryCaseChild
+
+    def test_default_handlers(self) -> None:
+        cases = [
+            ("text", "text"),
+            (1, 1),
+            (None, None),
+            (datetime.datetime(2020, 1, 1, 12), "2020-01-01T12:00:00"),
+            (datetime.date(2020, 1, 1), "2020-01-01"),
+            (datetime.time(12, 30), "12:30:00"),
+            (datetime.timedelta(minutes=1), 60.0),
+            (decimal.Decimal("1.10"), "1.10"),
+            (uuid.UUID(int=1), "00000000-0000-0000-0000-000000000001"),
+            (pathlib.PurePosixPath("/tmp/file"), "/tmp/file"),
+            (Color.RED, "red"),
+            ({3, 1, 2}, [1, 2, 3]),
+            (frozenset({"a"}), ["a"]),
+            (np.float32(0.5), 0.5),
+            (np.int64(3), 3),
+            (np.bool_(True), True),
+            (Point(1, 2), {"x": 1, "y": 2}),
+        ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(expected, self.factory.serializer(value))
+
+    def test_to_json(self) -> None:
+        instance = self.factory(value=[decimal.Decimal("2.5"), {np.int8(1)}])
+        self.assertEqual('{"value": ["2.5", [1]]}', instance.to_json())
+
+    def test_fallback_error(self) -> None:
+        with self.assertRaises(AttributeError):
+            self.factory.serializer(object())
+
+    def test_resolution_is_cached(self) -> None:
+        self.factory.serializer(decimal.Decimal(1))
+        self.assertIn(decimal.Decimal, self.factory._serializer_cache)
+        self.assertIs(
+            self.factory._serializer_cache[decimal.Decimal],
+            self.factory.resolve_serializer(decimal.Decimal),
+        )
+
+    def test_register_on_subclass(self) -> None:
+        self.factory.register_serializer(complex, lambda z: [z.real, z.imag])
+        self.assertEqual([1.0, 2.0], self.factory.serializer(complex(1, 2)))
+        self.assertEqual([1.0, 2.0], self.child.serializer(complex(1, 2)))
+        with self.assertRaises(AttributeError):
+            GenericInterface.serializer(complex(1, 2))
+
+    def test_register_decorator_by_name(self) -> None:
+        @self.factory.register_serializer("builtins.complex")
+        def handler(z):
+            return str(z)
+
+        self.assertEqual("(1+2j)", self.factory.serializer(complex(1, 2)))
+
+    def test_register_invalidates_cache(self) -> None:
+        self.assertEqual("2020-01-01", self.child.serializer(datetime.date(2020, 1, 1)))
+        self.factory.register_serializer(datetime.date, lambda d: d.toordinal())
+        self.assertEqual(737425, self.child.serializer(datetime.date(2020, 1, 1)))
+        self.assertEqual(
+            "2020-01-01", GenericInterface.serializer(datetime.date(2020, 1, 1))
+        )
+
+    def test_most_specific_type_wins(self) -> None:
+        self.factory.register_serializer(datetime.datetime, lambda d: d.year)
+        self.assertEqual(2020, self.child.serializer(datetime.datetime(2020, 1, 1)))
+        self.assertEqual("2020-01-01", self.child.serializer(datetime.date(2020, 1, 1)))
+
+    def test_override_uses_registry(self) -> None:
+        self.assertEqual(
+            "2020-01-01T00:00:00",
+            SimpleCaseWithSerializer.serializer(datetime.datetime(2020, 1, 1)),
+        )
+        self.assertEqual(
+            "1.5", SimpleCaseWithSerializer.serializer(decimal.Decimal("1.5"))
+        )
@@ -0,0 +1,177 @@
+import io
+import json
+import pathlib
+import socket
+import tempfile
+import threading
+import unittest
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import arrays, stream
+from newproject.interfaces.examples import SimpleCase, SimpleDeclarativeCase
+
+
+def split(data: bytes, size: int) -> list:
+    return [data[index : index + size] for index in range(0, len(data), size)]
+
+
+class TestStreamParser(unittest.TestCase):
+    values = [
+        {"value": 1},
+        {"value": 'a, [b] {c} \\ "d" é'},
+        {"value": [1, {"x": [2, 3]}]},
+        {"value": None},
+    ]
+
+    def parse(self, data: bytes, size: int, mode=None) -> list:
+        parser = stream.StreamParser(mode=mode)
+        records = []
+        for chunk in split(data, size):
+            records += parser.feed(chunk)
+        return records + parser.close()
+
+    def check(self, data: bytes) -> None:
+        for size in [1, 2, 3, 7, len(data)]:
+            records = self.parse(data, size)
+            self.assertEqual(self.values, [record.value for record in records], size)
+            for record in records:
+                self.assertIsNone(record.error)
+                self.assertIn(data[record.offset : record.offset + 1], [b"{", b"["])
+
+    def test_ndjson(self):
+        data = "".join(json.dumps(value) + "\n" for value in self.values).encode()
+        self.check(data)
+        self.check(b"\r\n\n" + data[:-1])
+
+    def test_array(self):
+        self.check(json.dumps(self.values).encode())
+        self.check(b"\xef\xbb\xbf [\n" + json.dumps(self.values, indent=2)[1:].encode())
+
+    def test_scalars_and_empty(self):
+        self.assertEqual([], self.parse(b"[ ]", 1))
+        self.assertEqual([], self.parse(b"", 1))
+        records = self.parse(b'[1, true, null, "]"]', 2)
+        self.assertEqual([1, True, None, "]"], [record.value for record in records])
+
+    def test_malformed_records(self):
+        data = b'{"value": 1}\n{"value": \n{"value": 3}\n'
+        records = self.parse(data, 4)
+        self.assertEqual({"value": 3}, records[2].value)
+        self.assertIsInstance(records[1].error, InvalidParameter)
+        self.assertEqual(13, records[1].error.offset)
+        data = b'[{"value": 1}, {"value": }, , {"value": 4}] x'
+        records = self.parse(data, 5)
+        self.assertEqual([1, 15, 28, 30, 44], [record.offset for record in records])
+        self.assertEqual(
+            [False, True, True, False, True],
+            [record.error is not None for record in records],
+        )
+        self.assertIn("extra data", str(records[-1].error))
+
+    def test_unterminated(self):
+        records = self.parse(b'[{"value": 1}, {"value"', 4)
+        self.assertEqual({"value": 1}, records[0].value)
+        self.assertIn("unterminated", str(records[1].error))
+        self.assertEqual(15, records[1].offset)
+
+    def test_mode(self):
+        records = self.parse(b"[1]\n[2]\n", 3, mode="ndjson")
+        self.assertEqual([[1], [2]], [record.value for record in records])
+        records = self.parse(b'{"value": 1}', 3, mode="array")
+        self.assertIsNotNone(records[0].error)
+        with self.assertRaises(InvalidParameter):
+            stream.StreamParser(mode="csv")
+
+    def test_bounded_buffer(self):
+        parser = stream.StreamParser()
+        parser.feed(b"[")
+        for index in range(1000):
+            parser.feed(json.dumps({"value": index}).encode() + b", ")
+        self.assertLess(len(parser._buffer), 64)
+
+
+class TestLoadIter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name)
+        self.instances = [SimpleCase(value=index) for index in range(100)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_files(self):
+        expected = [instance.to_dict() for instance in self.instances]
+        with (self.path / "data.json").open("w") as handler:
+            SimpleCase.dump_json(self.instances, handler)
+        with (self.path / "data.ndjson").open("w") as handler:
+            SimpleCase.dump_ndjson(self.instances, handler)
+        for name in ["data.json", "data.ndjson"]:
+            path = self.path / name
+            loaded = stream.load_iter(path, SimpleCase, chunk_size=10)
+            self.assertEqual(expected, [instance.to_dict() for instance in loaded])
+            with path.open("r") as handler:
+                loaded = SimpleDeclarativeCase.load_iter(handler, chunk_size=7)
+                self.assertEqual(expected, [instance.to_dict() for instance in loaded])
+
+    def test_lazy(self):
+        def chunks():
+            yield b'{"value": 1}\n'
+            raise RuntimeError("consumed")
+
+        iterator = stream.load_iter(chunks(), SimpleCase)
+        self.assertEqual(1, next(iterator).value)
+        with self.assertRaises(RuntimeError):
+            next(iterator)
+
+    def test_errors(self):
+        data = b'{"value": 1}\n[1]\n{"other": 2}\n{bad\n{"value": 5}\n'
+        with self.assertRaises(InvalidParameter) as context:
+            list(stream.load_iter(io.BytesIO(data), SimpleCase))
+        self.assertEqual(13, context.exception.offset)
+        errors = []
+        loaded = list(
+            stream.load_iter(io.BytesIO(data), SimpleCase, on_error=errors.append)
+        )
+        self.assertEqual([1, 5], [instance.value for instance in loaded])
+        self.assertEqual([13, 17, 30], [error.offset for error in errors])
+        self.assertIsInstance(errors[1].__cause__, TypeError)
+
+    def test_object_hook(self):
+        import numpy as np
+
+        instance = SimpleCase(value=np.arange(3))
+        loaded = list(
+            stream.load_iter(
+                [instance.to_json().encode()],
+                SimpleCase,
+                object_hook=arrays.object_hook,
+            )
+        )
+        np.testing.assert_array_equal(np.arange(3), loaded[0].value)
+
+    def test_socket(self):
+        left, right = socket.socketpair()
+        lines = "".join(SimpleCase.to_ndjson_many(self.instances)).encode()
+
+        def send():
+            with left:
+                for chunk in split(lines, 100):
+                    left.sendall(chunk)
+
+        thread = threading.Thread(target=send)
+        thread.start()
+        with right:
+            loaded = list(stream.load_iter(right, SimpleCase, chunk_size=64))
+        thread.join()
+        self.assertEqual(100, len(loaded))
+
+    def test_large_array(self):
+        instances = [
+            SimpleCase(value={"index": index, "label": "x"}) for index in range(5000)
+        ]
+        data = "".join(SimpleCase.to_json_many(instances)).encode()
+        loaded = list(stream.load_iter([data], SimpleCase))
+        self.assertEqual(
+            [instance.value for instance in instances],
+            [instance.value for instance in loaded],
+        )
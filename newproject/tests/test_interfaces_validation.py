@@ -0,0 +1,203 @@
+import datetime
+import decimal
+import enum
+import inspect
+import pickle
+import unittest
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Union
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces import validation
+from newproject.interfaces.declarative import DeclarativeInterface
+from newproject.interfaces.examples import SimpleCase, TemporalCase, ValidatedCase
+from newproject.interfaces.generic import GenericInterface
+
+
+class Color(enum.Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Point(DeclarativeInterface):
+    validated = True
+
+    x: float
+    y: float = 0.0
+
+
+class Point3D(Point):
+    z: int = 0
+
+
+class Unchecked(ValidatedCase):
+    validated = False
+
+
+class Signature(GenericInterface):
+    validated = True
+
+    def __init__(self, a: int, /, b: str = "b", *args: Any, c: float, **kwargs: Any):
+        self.arguments = (a, b, args, c, kwargs)
+
+    def to_dict(self) -> dict:
+        return {}
+
+
+class TestValueCheck(unittest.TestCase):
+    def check(self, kind: Any, value: Any) -> Any:
+        return validation.value_check(kind)(value)
+
+    def test_unchecked(self):
+        for kind in [Any, object, "Forward", Union[int, Any]]:
+            self.assertIsNone(validation.value_check(kind))
+
+    def test_scalars(self):
+        self.assertEqual(1.0, self.check(float, 1))
+        self.assertIs(float, type(self.check(float, 1)))
+        self.assertEqual(decimal.Decimal("1.5"), self.check(decimal.Decimal, "1.5"))
+        self.assertIs(Color.BLUE, self.check(Color, "blue"))
+        self.assertEqual(
+            datetime.datetime(2021, 1, 1), self.check(datetime.datetime, "2021-01-01")
+        )
+        for kind, value in [
+            (int, True),
+            (int, "1"),
+            (float, None),
+            (str, 1),
+            (Color, "green"),
+            (datetime.datetime, "not a date"),
+            (datetime.timedelta, "1"),
+        ]:
+            with self.subTest(kind=kind, value=value):
+                with self.assertRaises(validation.failures):
+                    self.check(kind, value)
+
+    def test_containers(self):
+        self.assertEqual([1.0, 2.0], self.check(List[float], (1, 2)))
+        self.assertEqual({"a": 1.0}, self.check(Dict[str, float], {"a": 1}))
+        self.assertEqual((1, "a"), self.check(Tuple[int, str], [1, "a"]))
+        self.assertEqual((1, 2), self.check(Tuple[int, ...], [1, 2]))
+        self.assertEqual({Color.RED}, self.check(Set[Color], ["red"]))
+        with self.assertRaisesRegex(TypeError, "item 1: expected int"):
+            self.check(List[int], [1, "2"])
+        with self.assertRaisesRegex(TypeError, "item 'b'"):
+            self.check(Dict[str, int], {"a": 1, "b": None})
+        with self.assertRaises(TypeError):
+            self.check(Tuple[int, str], [1])
+
+    def test_unions_and_literals(self):
+        self.assertIsNone(self.check(Optional[int], None))
+        self.assertEqual("a", self.check(Union[int, str], "a"))
+        with self.assertRaisesRegex(TypeError, "expected int or str or None"):
+            self.check(Optional[Union[int, str]], 1.5)
+        with self.assertRaisesRegex(TypeError, "^item 0: expected int, received str$"):
+            self.check(Optional[List[int]], ["b"])
+        with self.assertRaisesRegex(TypeError, "^item 'a': item 1: expected int"):
+            self.check(Union[str, Dict[str, List[int]]], {"a": [1, "b"]})
+        with self.assertRaisesRegex(TypeError, "expected list or None, received str"):
+            self.check(Optional[List[int]], "b")
+        self.assertEqual("a", self.check(Literal["a", "b"], "a"))
+        with self.assertRaises(ValueError):
+            self.check(Literal["a", "b"], "c")
+
+
+class TestValidatedConstructor(unittest.TestCase):
+    def test_coercion(self):
+        instance = ValidatedCase(name="a", ratio=2, start="2021-01-01T00:00:00")
+        self.assertEqual(2.0, instance.ratio)
+        self.assertEqual(datetime.datetime(2021, 1, 1), instance.start)
+        configuration = instance.to_dict()
+        self.assertEqual(
+            configuration, ValidatedCase.from_json(instance.to_json()).to_dict()
+        )
+        self.assertEqual(configuration, pickle.loads(pickle.dumps(instance)).to_dict())
+
+    def test_errors_reported_at_once(self):
+        with self.assertRaises(InvalidParameter) as context:
+            ValidatedCase(name=None, count="1", tags=["a", 2])
+        self.assertEqual(
+            {
+                "name": "expected str, received NoneType",
+                "count": "expected int, received str",
+                "tags": "item 1: expected str, received int",
+            },
+            context.exception.errors,
+        )
+        self.assertIn("Invalid ValidatedCase parameters", str(context.exception))
+        with self.assertRaises(TypeError):
+            ValidatedCase(count=1)
+
+    def test_signature_kept(self):
+        self.assertEqual(
+            ["self", "name", "count", "ratio", "start", "tags"],
+            list(inspect.signature(ValidatedCase.__init__).parameters),
+        )
+        instance = Signature(1, "x", 2, c=1, d=4)
+        self.assertEqual((1, "x", (2,), 1.0, {"d": 4}), instance.arguments)
+        with self.assertRaises(InvalidParameter):
+            Signature("1", c=1)
+        with self.assertRaises(TypeError):
+            Signature(a=1, c=1)
+
+    def test_declarative(self):
+        self.assertEqual(Point(x=1.0, y=2.0).to_dict(), Point(1, 2).to_dict())
+        self.assertEqual("Point3D(x=1.0, y=0.0, z=2)", repr(Point3D(x=1, z=2)))
+        with self.assertRaises(InvalidParameter):
+            Point3D(x=1, z=2.5)
+        with self.assertRaises(InvalidParameter):
+            Point(x="1")
+
+    def test_disabled(self):
+        self.assertEqual("1", Unchecked(name=None, count="1").count)
+        self.assertEqual("1", SimpleCase(value="1").value)
+        self.assertEqual("2021", TemporalCase(start="2021").start)
+
+    def test_checks_compiled_once(self):
+        Point(x=1)
+        compiled = Point.__dict__["_validator_plan"]
+        Point(x=2)
+        self.assertIs(compiled, validation.plan(Point))
+        self.assertIs(compiled.constructor, Point.__dict__["__init__"])
+
+
+class TestValidateMany(unittest.TestCase):
+    def test_per_record_errors(self):
+        configurations = [
+            {"name": "a", "count": 1, "start": "2021-01-01T00:00:00"},
+            {"name": 1},
+            {"count": 2, "other": 3},
+            [("name", "a")],
+            {"name": "b", "ratio": 1},
+        ]
+        result = ValidatedCase.validate_many(iter(configurations))
+        self.assertEqual(5, len(result.configurations))
+        self.assertEqual(
+            {"name": "a", "count": 1, "start": datetime.datetime(2021, 1, 1)},
+            result.configurations[0],
+        )
+        self.assertEqual({"name": "b", "ratio": 1.0}, result.configurations[4])
+        self.assertEqual([None] * 3, result.configurations[1:4])
+        self.assertEqual(
+            {
+                1: {"name": "expected str, received int"},
+                2: {"other": "unexpected parameter", "name": "missing parameter"},
+                3: {"": "expected configuration mapping, received list"},
+            },
+            result.errors,
+        )
+        self.assertEqual(1, configurations[0]["count"])
+        self.assertEqual("2021-01-01T00:00:00", configurations[0]["start"])
+
+    def test_unvalidated_classes(self):
+        result = TemporalCase.validate_many([{"start": "2021-01-01"}, {"start": 1}])
+        self.assertEqual(
+            datetime.datetime(2021, 1, 1), result.configurations[0]["start"]
+        )
+        self.assertIn("start", result.errors[1])
+        self.assertEqual({}, SimpleCase.validate_many([{"value": 1}]).errors)
+
+    def test_validate(self):
+        self.assertEqual({"x": 1.0}, validation.validate(Point, {"x": 1}))
+        with self.assertRaises(InvalidParameter) as context:
+            validation.validate(Point, {"y": "a"})
+        self.assertEqual({"x", "y"}, set(context.exception.errors))
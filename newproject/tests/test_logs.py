@@ -0,0 +1,142 @@
+"""
+Module :mod:`newproject.tests.test_logs` implements test suite for
+the queued logging pipeline defined in :mod:`newproject.logs`.
+"""
+
+import io
+import logging
+import threading
+import unittest
+
+from newproject import logs
+from newproject.errors import InvalidParameter
+
+
+class CountingStream(io.StringIO):
+    """
+    Stream counting write calls
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+class SlowHandler(logging.Handler):
+    """
+    Handler blocked until released
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.released = threading.Event()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.released.wait()
+        self.records.append(record)
+
+
+class TestQueuedLogging(unittest.TestCase):
+    """
+    Queued logging tests
+    """
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger("newproject.tests.logs.%s" % self.id())
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.stream = CountingStream()
+        self.handler = logging.StreamHandler(self.stream)
+        self.handler.setFormatter(logging.Formatter("%(levelname)s:%(message)s"))
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self) -> None:
+        logs.shutdown()
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+
+    def test_sync_mode(self) -> None:
+        self.assertIsNone(logs.configure(self.logger, mode="sync"))
+        self.assertEqual([self.handler], self.logger.handlers)
+
+    def test_invalid_configuration(self) -> None:
+        with self.assertRaises(InvalidParameter):
+            logs.configure(self.logger, mode="async")
+        with self.assertRaises(InvalidParameter):
+            logs.configure(self.logger, mode="queued", policy="ignore")
+
+    def test_queued_records_are_flushed(self) -> None:
+        listener = logs.configure(self.logger, mode="queued", batch_size=100)
+        self.assertIsInstance(self.logger.handlers[0], logs.BoundedQueueHandler)
+        for index in range(1000):
+            self.logger.info("message %d", index)
+        try:
+            raise ValueError("failure")
+        except ValueError:
+            self.logger.exception("error")
+        self.assertEqual(0, logs.shutdown())
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(["INFO:message %d" % i for i in range(1000)], lines[:1000])
+        self.assertEqual("ERROR:error", lines[1000])
+        self.assertIn("ValueError: failure", lines[-1])
+        self.assertLessEqual(self.stream.writes, 1000)
+        self.assertEqual([self.handler], self.logger.handlers)
+        self.assertIsNone(listener._thread)
+
+    def test_handler_level(self) -> None:
+        self.handler.setLevel(logging.WARNING)
+        logs.configure(self.logger, mode="queued")
+        self.logger.info("hidden")
+        self.logger.warning("shown")
+        logs.shutdown()
+        self.assertEqual("WARNING:shown\n", self.stream.getvalue())
+
+    def test_drop_policy(self) -> None:
+        self.logger.removeHandler(self.handler)
+        slow = SlowHandler()
+        self.logger.addHandler(slow)
+        logs.configure(self.logger, mode="queued", queue_size=10, batch_size=1)
+        for index in range(100):
+            self.logger.info("message %d", index)
+        handler = self.logger.handlers[0]
+        self.assertGreater(handler.dropped, 0)
+        slow.released.set()
+        self.assertEqual(handler.dropped, logs.shutdown())
+        self.assertEqual(100 - handler.dropped + 1, len(slow.records))
+        self.assertIn("dropped", slow.records[-1].getMessage())
+
+    def test_mode_from_settings(self) -> None:
+        import json
+        import os
+        import pathlib
+        import subprocess
+        import sys
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as home:
+            user = pathlib.Path(home) / "newproject"
+            user.mkdir()
+            (user / "settings.json").write_text(
+                json.dumps({"logging": {"mode": "queued", "queue_size": 100}})
+            )
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "from newproject.settings import settings;"
+                    "settings.logger.info('queued message');"
+                    "print(type(settings.logger.handlers[0]).__name__)",
+                ],
+                capture_output=True,
+                text=True,
+                env=dict(os.environ, HOME=home),
+                cwd=str(pathlib.Path(__file__).parents[2]),
+                check=True,
+            )
+        self.assertEqual("BoundedQueueHandler", result.stdout.strip())
+        self.assertIn("queued message", result.stderr)
@@ -0,0 +1,138 @@
+import gc
+import pickle
+import sys
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from newproject import memory
+from newproject.interfaces.examples import (
+    SimpleCase,
+    SimpleDeclarativeCase,
+    TemporalCase,
+)
+from newproject.interfaces.generic import GenericInterface
+
+NAME = "newproject.interfaces.examples.SimpleCase"
+
+
+class Slotted(GenericInterface):
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def to_dict(self):
+        return {"value": self.value}
+
+
+class Constructed(SimpleCase):
+    def __new__(cls, *args, **kwargs):
+        instance = super().__new__(cls)
+        instance.constructed = True
+        return instance
+
+
+class TestDeepSize(unittest.TestCase):
+    def test_containers(self):
+        value = [1, "text", {"key": (2.0, None)}]
+        expected = sum(
+            sys.getsizeof(item)
+            for item in [value, 1, "text", value[2], "key", (2.0, None), 2.0, None]
+        )
+        self.assertEqual(expected, memory.deep_size(value))
+
+    def test_shared_values(self):
+        shared = list(range(1000))
+        seen = set()
+        first = memory.deep_size(SimpleCase(value=shared), seen)
+        second = memory.deep_size(SimpleCase(value=shared), seen)
+        self.assertGreater(first, memory.deep_size(shared))
+        self.assertLess(second, first / 10)
+
+    def test_slots_and_arrays(self):
+        array = np.zeros(1000)
+        self.assertGreater(memory.deep_size(SimpleDeclarativeCase(value=array)), 8000)
+        self.assertGreater(memory.deep_size(Slotted(array[10:])), 8000)
+        self.assertEqual(0, memory.deep_size(SimpleCase))
+
+
+class TestMemory(unittest.TestCase):
+    def setUp(self):
+        memory.reset()
+        memory.enable()
+
+    def tearDown(self):
+        memory.disable()
+        memory.reset()
+
+    def test_counts(self):
+        instances = [SimpleCase(value=[index]) for index in range(10)]
+        instances.append(SimpleDeclarativeCase(value=1))
+        self.assertEqual(
+            {NAME: 10, "newproject.interfaces.examples.SimpleDeclarativeCase": 1},
+            memory.counts(),
+        )
+        del instances[5:]
+        gc.collect()
+        self.assertEqual({NAME: 5}, memory.counts())
+
+    def test_objects_created_without_init(self):
+        instance = TemporalCase.from_json('{"start": "2021-01-01T00:00:00"}')
+        copy = pickle.loads(pickle.dumps(instance))
+        constructed = Constructed(value=1)
+        self.assertTrue(constructed.constructed)
+        counts = memory.counts()
+        self.assertEqual(2, counts["newproject.interfaces.examples.TemporalCase"])
+        self.assertEqual(1, counts[__name__ + ".Constructed"])
+        del instance, copy, constructed
+
+    def test_disable(self):
+        kept = SimpleCase(value=1)
+        memory.disable()
+        other = SimpleCase(value=2)
+        self.assertEqual(2, Constructed(value=2).value)
+        self.assertEqual({NAME: 1}, memory.counts())
+        self.assertFalse(memory.report()["enabled"])
+        del kept, other
+
+    def test_report(self):
+        instances = [SimpleCase(value=list(range(100))) for _ in range(50)]
+        instances.append(Slotted(1))
+        report = memory.report(sample=10)
+        self.assertTrue(report["enabled"])
+        self.assertEqual({__name__ + ".Slotted": 1}, report["untracked"])
+        classes = report["classes"][NAME]
+        self.assertEqual(50, classes["count"])
+        self.assertEqual(10, classes["sampled"])
+        # Small integers are shared by all lists, lists are not:
+        self.assertGreater(classes["size"], 50 * sys.getsizeof(list(range(100))))
+        if not tracemalloc.is_tracing():
+            self.assertIsNone(report["allocations"])
+        del instances
+
+    def test_allocations(self):
+        memory.disable()
+        if tracemalloc.is_tracing():
+            self.skipTest("Allocations already traced")
+        memory.enable(tracemalloc=True)
+        instances = [SimpleCase(value=index) for index in range(100)]
+        first = memory.report()["allocations"]
+        documents = [instance.to_json() for instance in instances]
+        second = memory.tracker.report()["allocations"]
+        self.assertTrue(all(site["site"].startswith("newproject/") for site in second))
+        sites = [site["site"] for site in first + second]
+        self.assertFalse(any(site.startswith("newproject/memory.py") for site in sites))
+        self.assertGreater(sum(site["growth"] for site in second), 0)
+        memory.disable()
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertIsNone(memory.report()["allocations"])
+        del documents
+
+    def test_configure(self):
+        memory.disable()
+        memory.configure({"track": False})
+        self.assertFalse(memory.report()["enabled"])
+        memory.configure({"track": True, "frames": 1})
+        self.assertTrue(memory.report()["enabled"])
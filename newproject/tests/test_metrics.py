@@ -0,0 +1,121 @@
+import datetime
+import pathlib
+import pstats
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+from newproject import metrics
+from newproject.interfaces.examples import (
+    SimpleCase,
+    SimpleCaseWithSerializer,
+    SimpleDeclarativeCase,
+)
+from newproject.interfaces.generic import GenericInterface
+
+
+class Opaque:
+    def __init__(self):
+        self.payload = 1
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        metrics.enable()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.reset()
+
+    def classes(self):
+        return metrics.stats()["classes"]
+
+    def test_disabled_restores_methods(self):
+        metrics.disable()
+        for cls, method in [(SimpleCase, "to_dict"), (GenericInterface, "to_json")]:
+            self.assertFalse(hasattr(cls.__dict__[method], "__wrapped__"))
+        metrics.reset()
+        SimpleCase(value=1).to_json()
+        self.assertEqual({}, self.classes())
+        self.assertFalse(metrics.stats()["enabled"])
+
+    def test_counts(self):
+        for index in range(10):
+            SimpleCase(value=index).to_json()
+        stats = self.classes()["newproject.interfaces.examples.SimpleCase"]
+        self.assertEqual(10, stats["to_json"]["count"])
+        self.assertEqual(10, stats["to_dict"]["count"])
+        for key in ["total", "mean", "min", "max", "p50", "p90", "p99"]:
+            self.assertGreaterEqual(stats["to_json"][key], 0.0)
+        self.assertLessEqual(stats["to_json"]["min"], stats["to_json"]["p50"])
+        self.assertLessEqual(stats["to_json"]["p99"], stats["to_json"]["max"])
+
+    def test_super_calls_counted_once(self):
+        value = datetime.datetime(2020, 1, 1)
+        SimpleCaseWithSerializer(value=[value, datetime.date(2020, 1, 1)]).to_json()
+        stats = self.classes()[
+            "newproject.interfaces.examples.SimpleCaseWithSerializer"
+        ]
+        self.assertEqual(2, stats["serializer"]["count"])
+        self.assertEqual(1, stats["to_dict"]["count"])
+
+    def test_fallbacks(self):
+        SimpleCase(value=[Opaque(), Opaque(), datetime.date(2020, 1, 1)]).to_json()
+        fallbacks = metrics.stats()["fallbacks"][
+            "newproject.interfaces.examples.SimpleCase"
+        ]
+        self.assertEqual({__name__ + ".Opaque": 2}, fallbacks)
+
+    def test_declarative_and_bulk(self):
+        instances = [SimpleDeclarativeCase(value=index) for index in range(5)]
+        "".join(SimpleDeclarativeCase.to_json_many(instances))
+        stats = self.classes()["newproject.interfaces.examples.SimpleDeclarativeCase"]
+        self.assertEqual(1, stats["to_json_many"]["count"])
+        self.assertEqual(5, stats["to_dict"]["count"])
+
+    def test_bulk_timed_until_exhausted(self):
+        instances = [SimpleDeclarativeCase(value=index) for index in range(20000)]
+        for method in ["to_json_many", "to_ndjson_many"]:
+            start = time.perf_counter()
+            "".join(getattr(SimpleDeclarativeCase, method)(instances))
+            wall = time.perf_counter() - start
+            stats = self.classes()[
+                "newproject.interfaces.examples.SimpleDeclarativeCase"
+            ]
+            self.assertEqual(1, stats[method]["count"])
+            self.assertGreater(stats[method]["total"], wall / 2, method)
+            self.assertLessEqual(stats[method]["total"], wall, method)
+        chunks = SimpleDeclarativeCase.to_json_many(instances, chunksize=10)
+        next(chunks)
+        chunks.close()
+        stats = self.classes()["newproject.interfaces.examples.SimpleDeclarativeCase"]
+        self.assertEqual(2, stats["to_json_many"]["count"])
+
+    def test_classes_created_later(self):
+        class LateCase(SimpleCase):
+            def to_dict(self):
+                return {"value": self.value, "late": True}
+
+        LateCase(value=1).to_bytes()
+        stats = self.classes()[LateCase.__module__ + "." + LateCase.__qualname__]
+        self.assertEqual(1, stats["to_dict"]["count"])
+        self.assertEqual(1, stats["to_bytes"]["count"])
+        metrics.disable()
+        self.assertEqual({"value": 1, "late": True}, LateCase(value=1).to_dict())
+        self.assertNotIn("__wrapped__", LateCase.__dict__["to_dict"].__dict__)
+
+
+class TestProfile(unittest.TestCase):
+    def test_profile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with metrics.profile(directory, "case") as prefix:
+                [SimpleCase(value=index).to_json() for index in range(100)]
+            self.assertEqual(pathlib.Path(directory) / "case", prefix)
+            statistics = pstats.Stats(str(prefix) + ".prof")
+            self.assertTrue(any(name == "to_json" for _, _, name in statistics.stats))
+            snapshot = tracemalloc.Snapshot.load(str(prefix) + ".tracemalloc")
+            self.assertTrue(snapshot.traces)
+            self.assertTrue((pathlib.Path(directory) / "case.memory.txt").read_text())
+        self.assertFalse(tracemalloc.is_tracing())
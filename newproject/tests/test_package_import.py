@@ -0,0 +1,96 @@
+"""
+Package Import Test Suite
+"""
+
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+def run(code: str, home: str = None, *options: str) -> subprocess.CompletedProcess:
+    """
+    Runs Python code in a fresh interpreter (with an isolated home directory).
+    """
+    env = dict(os.environ)
+    if home is not None:
+        env["HOME"] = home
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=str(pathlib.Path(__file__).parents[2]),
+        check=True,
+    )
+
+
+def import_times(code: str) -> dict:
+    """
+    Returns cumulative import time (µs) of each module imported by the code
+    as reported by ``-X importtime`` (durations are measured by the ``import.*``
+    benchmarks, tests only assert which modules are imported).
+    """
+    result = run(code, None, "-X", "importtime")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestPackageImport(unittest.TestCase):
+    """
+    Package cold start tests
+    """
+
+    def test_import_is_lightweight(self) -> None:
+        times = import_times("import newproject")
+        self.assertIn("newproject", times)
+        for module in ["newproject.settings", "newproject.interfaces", "numpy", "uuid"]:
+            self.assertNotIn(module, times)
+
+    def test_interfaces_do_not_import_numpy(self) -> None:
+        times = import_times("import newproject; newproject.SimpleCase")
+        self.assertIn("newproject.interfaces.examples", times)
+        self.assertNotIn("numpy", times)
+        self.assertNotIn("newproject.settings", times)
+
+    def test_lazy_attributes(self) -> None:
+        import newproject
+
+        # Lazy attribute access imports the module:
+        self.assertIs(
+            newproject.GenericInterface, newproject.interfaces.generic.GenericInterface
+        )
+        self.assertIn("InterfaceCollection", dir(newproject))
+        with self.assertRaises(AttributeError):
+            newproject.MissingInterface
+
+    def test_lazy_subpackage(self) -> None:
+        result = run(
+            "import newproject; print(newproject.interfaces.GenericInterface.__name__)"
+        )
+        self.assertEqual("GenericInterface", result.stdout.strip())
+
+    def test_settings_are_loaded_on_first_access(self) -> None:
+        with tempfile.TemporaryDirectory() as home:
+            user = pathlib.Path(home) / "newproject"
+            run("import newproject.settings", home)
+            self.assertFalse(user.exists())
+            run("from newproject.settings import settings", home)
+            self.assertTrue((user / "settings.json").exists())
+
+    def test_read_only_home(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            home = pathlib.Path(directory) / "file"
+            home.write_text("")
+            result = run(
+                "from newproject.settings import settings; print(settings.file)",
+                str(home),
+            )
+            self.assertIn("resources", result.stdout)
@@ -0,0 +1,259 @@
+"""
+Module :mod:`newproject.tests.test_repository` implements test suite for
+the SQLite persistence layer defined in module :mod:`newproject.repository`.
+"""
+
+import os
+import pathlib
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces.examples import SimpleCase, SimpleCaseWithSerializer
+from newproject.repository import ConnectionPool, Repository, parse_database
+
+
+class TestParseDatabase(unittest.TestCase):
+    def test_memory(self) -> None:
+        for url in ("sqlite://", "sqlite:///:memory:"):
+            database, uri = parse_database(url)
+            self.assertTrue(uri)
+            self.assertIn("mode=memory&cache=shared", database)
+        self.assertNotEqual(parse_database("sqlite://"), parse_database("sqlite://"))
+
+    def test_files(self) -> None:
+        self.assertEqual(
+            ("data/cases.db", False), parse_database("sqlite:///data/cases.db")
+        )
+        self.assertEqual(
+            ("/tmp/cases.db", False), parse_database("sqlite:////tmp/cases.db")
+        )
+
+    def test_invalid(self) -> None:
+        for url in ("postgresql://localhost/db", "sqlite:relative.db"):
+            with self.subTest(url=url):
+                with self.assertRaises(InvalidParameter):
+                    parse_database(url)
+
+
+class TestConnectionPool(unittest.TestCase):
+    def test_bounded(self) -> None:
+        pool = ConnectionPool(*parse_database("sqlite://"), size=2, timeout=0.1)
+        with pool.connection() as first, pool.connection() as second:
+            self.assertIsNot(first, second)
+            with self.assertRaises(InvalidParameter):
+                with pool.connection():
+                    pass
+        with pool.connection() as connection:
+            self.assertIn(connection, (first, second))
+        pool.close()
+
+    def test_close_while_lent(self) -> None:
+        pool = ConnectionPool(*parse_database("sqlite://"), size=2)
+        with pool.connection() as connection:
+            with pool.connection() as idle:
+                pass
+            pool.close()
+            with self.assertRaises(sqlite3.ProgrammingError):
+                idle.execute("SELECT 1")
+            self.assertEqual((1,), connection.execute("SELECT 1").fetchone())
+        with self.assertRaises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+        with self.assertRaises(InvalidParameter):
+            with pool.connection():
+                pass
+
+    def test_memory_isolation(self) -> None:
+        pool = ConnectionPool(*parse_database("sqlite://"), size=2, timeout=5)
+        with pool.transaction() as connection:
+            connection.execute("CREATE TABLE t (x)")
+        counts = []
+
+        def count():
+            with pool.connection() as connection:
+                counts.append(connection.execute("SELECT COUNT(*) FROM t").fetchone())
+
+        with pool.transaction() as connection:
+            connection.execute("INSERT INTO t VALUES (1)")
+            reader = threading.Thread(target=count)
+            reader.start()
+            reader.join(0.2)
+            # the reader waits for the transaction instead of reading uncommitted rows
+            self.assertTrue(reader.is_alive())
+        reader.join()
+        self.assertEqual([(1,)], counts)
+        pool.close()
+
+    def test_rollback_on_return(self) -> None:
+        pool = ConnectionPool(*parse_database("sqlite://"), size=1)
+        with pool.connection() as connection:
+            connection.execute("CREATE TABLE t (x)")
+            connection.execute("INSERT INTO t VALUES (1)")
+            self.assertTrue(connection.in_transaction)
+        with pool.connection() as connection:
+            self.assertEqual(
+                0, connection.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+            )
+        pool.close()
+
+
+class TestRepository(unittest.TestCase):
+    """
+    Repository tests
+    """
+
+    database = "sqlite://"
+    encoding = "json"
+
+    def setUp(self) -> None:
+        self.repository = Repository(
+            SimpleCase, self.database, encoding=self.encoding, batch_size=100
+        )
+
+    def tearDown(self) -> None:
+        self.repository.close()
+
+    def test_invalid_parameters(self) -> None:
+        with self.assertRaises(InvalidParameter):
+            Repository(dict, "sqlite://")
+        with self.assertRaises(InvalidParameter):
+            Repository(SimpleCase, "sqlite://", table="cases; DROP TABLE x")
+        with self.assertRaises(InvalidParameter):
+            Repository(SimpleCase, "sqlite://", encoding="xml")
+
+    def test_crud(self) -> None:
+        id_ = self.repository.add(SimpleCase(value={"label": "a"}))
+        self.assertEqual({"label": "a"}, self.repository.get(id_).value)
+        self.repository.update(id_, SimpleCase(value=2))
+        self.assertEqual(2, self.repository.get(id_).value)
+        self.assertEqual(1, len(self.repository))
+        self.repository.delete(id_)
+        self.assertEqual(0, len(self.repository))
+        for method, arguments in [
+            (self.repository.get, (id_,)),
+            (self.repository.update, (id_, SimpleCase(value=1))),
+            (self.repository.delete, (id_,)),
+        ]:
+            with self.assertRaises(KeyError):
+                method(*arguments)
+
+    def test_add_many(self) -> None:
+        count = self.repository.add_many(SimpleCase(value=i) for i in range(1050))
+        self.assertEqual(1050, count)
+        self.assertEqual(1050, len(self.repository))
+        self.assertEqual(0, self.repository.add_many([]))
+
+    def test_iterate(self) -> None:
+        self.repository.add_many(SimpleCase(value=i) for i in range(250))
+        values = [instance.value for _, instance in self.repository.iterate()]
+        self.assertEqual(list(range(250)), values)
+        selected = self.repository.iterate(where="id > ?", parameters=(245,))
+        self.assertEqual([245, 246, 247, 248, 249], [i.value for _, i in selected])
+
+    def test_iterate_is_lazy(self) -> None:
+        self.repository.add_many(SimpleCase(value=i) for i in range(250))
+        rows = self.repository.iterate(batch_size=10)
+        self.assertEqual(0, next(rows)[1].value)
+        self.repository.add(SimpleCase(value=250))
+        self.assertGreaterEqual(len(list(rows)), 249)
+        rows = self.repository.iterate()
+        next(rows)
+        rows.close()
+        self.assertEqual(251, len(self.repository))
+
+    def test_json_query(self) -> None:
+        self.repository.add_many(SimpleCase(value=i) for i in range(250))
+        selected = self.repository.iterate(
+            where="json_extract(data, '$.value') >= ?", parameters=(245,)
+        )
+        self.assertEqual([245, 246, 247, 248, 249], [i.value for _, i in selected])
+
+    def test_serializer_hooks(self) -> None:
+        import datetime
+
+        repository = Repository(
+            SimpleCaseWithSerializer, self.database, encoding=self.encoding
+        )
+        id_ = repository.add(
+            SimpleCaseWithSerializer(value=datetime.datetime(2020, 1, 1))
+        )
+        self.assertEqual("2020-01-01T00:00:00", repository.get(id_).value)
+        repository.close()
+
+    def test_threads(self) -> None:
+        def worker():
+            self.repository.add_many(SimpleCase(value=i) for i in range(500))
+            for i in range(20):
+                self.repository.add(SimpleCase(value=i))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(8 * 520, len(self.repository))
+
+    def test_add_many_matches_add(self) -> None:
+        instances = [SimpleCase(value={"index": i}) for i in range(2000)]
+        for instance in instances:
+            self.repository.add(instance)
+        self.repository.add_many(instances, batch_size=300)
+        values = [instance.value for _, instance in self.repository.iterate()]
+        self.assertEqual([i.value for i in instances] * 2, values)
+
+
+class TestFileRepository(TestRepository):
+    encoding = "bytes"
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = "sqlite:///" + str(
+            pathlib.Path(self.directory.name) / "cases.db"
+        )
+        super().setUp()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.directory.cleanup()
+
+    def test_json_query(self) -> None:
+        pass
+
+    def test_wal_mode(self) -> None:
+        with self.repository.pool.connection() as connection:
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual("wal", mode)
+
+    def test_persistence(self) -> None:
+        self.repository.add_many(SimpleCase(value=i) for i in range(10))
+        self.repository.close()
+        with Repository(SimpleCase, self.database) as repository:
+            self.assertEqual(
+                list(range(10)), [i.value for _, i in repository.iterate()]
+            )
+            repository.add(SimpleCase(value="json"))
+            self.assertEqual("json", repository.get(11).value)
+
+
+class TestRepositorySettings(unittest.TestCase):
+    def test_database_setting(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / "settings.db"
+            environment = dict(
+                os.environ, HOME=directory, DATABASE="sqlite:///" + str(path)
+            )
+            code = (
+                "from newproject.interfaces import SimpleCase\n"
+                "from newproject.repository import Repository\n"
+                "with Repository(SimpleCase) as repository:\n"
+                "    repository.add(SimpleCase(value=1))\n"
+            )
+            subprocess.run(
+                [sys.executable, "-c", code], env=environment, check=True, timeout=60
+            )
+            with Repository(SimpleCase, "sqlite:///" + str(path)) as repository:
+                self.assertEqual(1, repository.get(1).value)
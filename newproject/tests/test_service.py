@@ -0,0 +1,238 @@
+"""
+Module :mod:`newproject.tests.test_service` implements test suite for
+the asyncio service defined in :mod:`newproject.service`.
+"""
+
+import asyncio
+import json
+import os
+import pathlib
+import queue
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from typing import Any
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces.examples import SimpleCase, SimpleCaseWithSerializer
+from newproject.service import Client, Service, resolve_interface
+
+
+class TestResolveInterface(unittest.TestCase):
+    def test_resolve(self) -> None:
+        self.assertIs(
+            SimpleCase, resolve_interface("newproject.interfaces.examples.SimpleCase")
+        )
+
+    def test_invalid(self) -> None:
+        for path in ["newproject.missing.Case", "json.JSONEncoder", "SimpleCase"]:
+            with self.subTest(path=path):
+                with self.assertRaises(InvalidParameter):
+                    resolve_interface(path)
+
+
+class TestService(unittest.IsolatedAsyncioTestCase):
+    """
+    Service tests on localhost
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = str(pathlib.Path(self.directory.name) / "service.sock")
+        self.service = Service(SimpleCase, port=0, path=self.path, max_connections=2)
+        await self.service.start()
+        self.port = [
+            address for address in self.service.addresses if isinstance(address, tuple)
+        ][0][1]
+
+    async def asyncTearDown(self) -> None:
+        await self.service.close(grace=0.1)
+        self.directory.cleanup()
+
+    async def test_tcp_request(self) -> None:
+        async with await Client.connect(port=self.port) as client:
+            self.assertEqual(
+                {"value": "Hello World!"},
+                await client.request({"value": "Hello World!"}),
+            )
+
+    async def test_unix_request(self) -> None:
+        async with await Client.connect(path=self.path) as client:
+            self.assertEqual({"value": 1}, await client.request({"value": 1}))
+
+    async def test_array_request(self) -> None:
+        async with await Client.connect(port=self.port) as client:
+            self.assertEqual(
+                [{"value": 1}, {"value": 2}],
+                await client.request([{"value": 1}, {"value": 2}]),
+            )
+
+    async def test_keep_alive_and_pipelining(self) -> None:
+        async with await Client.connect(port=self.port) as client:
+            payloads = [{"value": index} for index in range(500)]
+            self.assertEqual(payloads, await client.pipeline(payloads))
+            self.assertEqual(
+                {"value": "again"}, await client.request({"value": "again"})
+            )
+
+    async def test_errors_keep_connection(self) -> None:
+        async with await Client.connect(port=self.port) as client:
+            responses = await client.pipeline([{"unknown": 1}, 12, {"value": 3}])
+            self.assertEqual("TypeError", responses[0]["error"]["type"])
+            self.assertEqual("InvalidParameter", responses[1]["error"]["type"])
+            self.assertEqual({"value": 3}, responses[2])
+            client.writer.write(b"{not json\n")
+            response = json.loads(await client.reader.readline())
+            self.assertEqual("JSONDecodeError", response["error"]["type"])
+            self.assertEqual({"value": 4}, await client.request({"value": 4}))
+
+    async def test_metrics(self) -> None:
+        async with await Client.connect(port=self.port) as client:
+            await client.pipeline([{"value": 1}, {"unknown": 1}])
+            statistics = await client.metrics()
+            self.assertEqual(
+                {
+                    "interface": "newproject.interfaces.examples.SimpleCase",
+                    "connections": 1,
+                    "requests": 2,
+                    "failures": 1,
+                },
+                {k: v for k, v in statistics["service"].items() if k != "pid"},
+            )
+            self.assertIn("classes", statistics)
+            client.writer.write(b"/unknown\n")
+            response = json.loads(await client.reader.readline())
+            self.assertEqual("InvalidParameter", response["error"]["type"])
+
+    async def test_memory(self) -> None:
+        from newproject import memory
+
+        memory.enable()
+        try:
+            async with await Client.connect(port=self.port) as client:
+                kept = SimpleCase(value=1)
+                statistics = await client.metrics()
+                name = "newproject.interfaces.examples.SimpleCase"
+                self.assertGreaterEqual(statistics["memory"][name], 1)
+                report = await client.memory()
+                self.assertTrue(report["enabled"])
+                self.assertIn(name, report["classes"])
+                del kept
+        finally:
+            memory.disable()
+            memory.reset()
+
+    async def test_serializer(self) -> None:
+        self.service.factory = SimpleCaseWithSerializer
+        async with await Client.connect(port=self.port) as client:
+            self.assertEqual({"value": [1, 2]}, await client.request({"value": [1, 2]}))
+
+    async def test_connection_limit(self) -> None:
+        first = await Client.connect(port=self.port)
+        second = await Client.connect(port=self.port)
+        third = await Client.connect(port=self.port)
+        await first.request({"value": 1})
+        await second.request({"value": 2})
+        pending = asyncio.ensure_future(third.request({"value": 3}))
+        await asyncio.sleep(0.1)
+        self.assertFalse(pending.done())
+        await first.close()
+        self.assertEqual({"value": 3}, await asyncio.wait_for(pending, 5.0))
+        await second.close()
+        await third.close()
+
+    async def test_invalid_service(self) -> None:
+        with self.assertRaises(InvalidParameter):
+            Service(dict)
+        with self.assertRaises(InvalidParameter):
+            Service(SimpleCase, port=None, path=None)
+
+
+class TestSupervisor(unittest.TestCase):
+    """
+    Pre-fork workers tests (service started in a subprocess)
+    """
+
+    workers = 2
+    shared_socket = False
+
+    def setUp(self) -> None:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        options = ["--shared-socket"] if self.shared_socket else []
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "newproject.service",
+                "--verbose=20",
+                "--port=%d" % self.port,
+                "--workers=%d" % self.workers,
+                *options,
+            ],
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=str(pathlib.Path(__file__).parents[2]),
+        )
+        self.lines = queue.Queue()
+        self.unread = []
+        self.reader = threading.Thread(
+            target=lambda: [self.lines.put(line) for line in self.process.stderr],
+            daemon=True,
+        )
+        self.reader.start()
+
+    def tearDown(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self.process.stderr.close()
+
+    def wait_for(self, text: str, count: int = 1) -> list:
+        """
+        Returns the first count unread log lines containing text.
+        """
+        deadline = time.monotonic() + 20.0
+        while len([line for line in self.unread if text in line]) < count:
+            self.unread.append(
+                self.lines.get(timeout=max(0.01, deadline - time.monotonic()))
+            )
+        matches = [line for line in self.unread if text in line][:count]
+        for line in matches:
+            self.unread.remove(line)
+        return matches
+
+    def request(self, value: Any) -> Any:
+        with socket.create_connection(("127.0.0.1", self.port), timeout=10) as client:
+            client.sendall(json.dumps({"value": value}).encode() + b"\n")
+            with client.makefile("rb") as stream:
+                return json.loads(stream.readline())
+
+    def worker_pids(self, count: int) -> list:
+        return [
+            int(line.rsplit("pid ", 1)[1].rstrip(")\n"))
+            for line in self.wait_for("Worker started", count)
+        ]
+
+    def test_workers_restart_and_drain(self) -> None:
+        pids = self.worker_pids(self.workers)
+        self.wait_for("Supervisor")
+        for index in range(20):
+            self.assertEqual({"value": index}, self.request(index))
+        os.kill(pids[0], signal.SIGKILL)
+        restarted = self.worker_pids(1)
+        self.assertNotIn(restarted[0], pids)
+        for index in range(20):
+            self.assertEqual({"value": index}, self.request(index))
+        self.process.send_signal(signal.SIGTERM)
+        self.assertEqual(0, self.process.wait(timeout=20))
+
+
+class TestSupervisorSharedSocket(TestSupervisor):
+    shared_socket = True
@@ -0,0 +1,202 @@
+"""
+Module :mod:`newproject.tests.test_store` implements test suite for
+the class :class:`newproject.store.Store`.
+"""
+
+import json
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+
+from newproject.errors import InvalidParameter
+from newproject.interfaces.examples import SimpleCase, SimpleDeclarativeCase
+from newproject.store import HINT_SUFFIX, SEGMENT_SUFFIX, Store
+
+
+class TestStore(unittest.TestCase):
+    """
+    Store tests
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def open(self, **kwargs) -> Store:
+        kwargs.setdefault("compact_segments", 0)
+        return Store(self.path, SimpleCase, **kwargs)
+
+    def segments(self) -> list:
+        return sorted(self.path.glob("*" + SEGMENT_SUFFIX))
+
+    def test_invalid_parameters(self) -> None:
+        with self.assertRaises(InvalidParameter):
+            Store(self.path, dict)
+        with self.assertRaises(InvalidParameter):
+            Store(self.path, SimpleCase, encoding="xml")
+
+    def test_put_get_delete(self) -> None:
+        with self.open() as store:
+            store.put("a", SimpleCase(value=1))
+            store["b"] = SimpleCase(value={"label": "b"})
+            self.assertEqual(1, store.get("a").value)
+            self.assertEqual({"label": "b"}, store["b"].value)
+            store.put("a", SimpleCase(value=2))
+            self.assertEqual(2, store["a"].value)
+            self.assertEqual(2, len(store))
+            del store["a"]
+            self.assertNotIn("a", store)
+            self.assertIsNone(store.get("a"))
+            with self.assertRaises(KeyError):
+                store["a"]
+            with self.assertRaises(KeyError):
+                store.delete("a")
+            self.assertEqual(["b"], store.keys())
+
+    def test_reopen(self) -> None:
+        with self.open(segment_size=1024) as store:
+            store.put_many(("key-%d" % i, SimpleCase(value=i)) for i in range(100))
+            store.delete("key-0")
+        self.assertGreater(len(self.segments()), 1)
+        self.assertEqual(
+            len(self.segments()) - 1, len(list(self.path.glob("*" + HINT_SUFFIX)))
+        )
+        with self.open() as store:
+            self.assertEqual(99, len(store))
+            self.assertEqual(42, store["key-42"].value)
+            self.assertNotIn("key-0", store)
+
+    def test_outdated_hint(self) -> None:
+        with self.open(segment_size=1024) as store:
+            store.put_many(("key-%d" % i, SimpleCase(value=i)) for i in range(100))
+        for hint in self.path.glob("*" + HINT_SUFFIX):
+            hint.write_bytes(b"\xc1")
+        with self.open() as store:
+            self.assertEqual(100, len(store))
+            self.assertEqual(42, store["key-42"].value)
+
+    def test_json_encoding(self) -> None:
+        with self.open(encoding="json") as store:
+            store.put("a", SimpleCase(value=[1, "a"]))
+        with self.open() as store:
+            store.put("b", SimpleCase(value=[2, "b"]))
+            self.assertEqual([1, "a"], store["a"].value)
+            self.assertEqual([2, "b"], store["b"].value)
+        self.assertIn(b'{"value": [1, "a"]}', self.segments()[0].read_bytes())
+
+    def test_declarative_and_arrays(self) -> None:
+        with Store(self.path, SimpleDeclarativeCase) as store:
+            store.put("a", SimpleDeclarativeCase(value=np.arange(5.0)))
+            value = store["a"].value
+        self.assertTrue(np.array_equal(np.arange(5.0), value))
+
+    def test_scan(self) -> None:
+        with self.open(segment_size=512) as store:
+            for i in range(50):
+                store.put("key-%d" % (i % 20), SimpleCase(value=i))
+            store.delete("key-19")
+            items = [(key, instance.value) for key, instance in store.scan()]
+        self.assertEqual(19, len(items))
+        self.assertEqual(dict(items)["key-0"], 40)
+        self.assertEqual(
+            sorted(items, key=lambda item: item[1]), items, "writing order"
+        )
+
+    def test_scan_is_lazy(self) -> None:
+        with self.open() as store:
+            store.put_many(("key-%d" % i, SimpleCase(value=i)) for i in range(10))
+            scan = store.scan()
+            self.assertEqual(("key-0", 0), next((k, i.value) for k, i in scan))
+            scan.close()
+
+    def test_compaction(self) -> None:
+        with self.open(segment_size=512) as store:
+            for i in range(200):
+                store.put("key-%d" % (i % 10), SimpleCase(value=i))
+            store.delete("key-9")
+            before = len(self.segments())
+            store.compact()
+            self.assertLess(len(self.segments()), before)
+            self.assertEqual(
+                {"key-%d" % i: 190 + i for i in range(9)},
+                {key: instance.value for key, instance in store.scan()},
+            )
+            store.put("key-0", SimpleCase(value=-1))
+            self.assertEqual(-1, store["key-0"].value)
+        with self.open() as store:
+            self.assertEqual(9, len(store))
+            self.assertEqual(-1, store["key-0"].value)
+            self.assertEqual(191, store["key-1"].value)
+
+    def test_background_compaction(self) -> None:
+        with self.open(segment_size=256, compact_segments=3) as store:
+            for i in range(500):
+                store.put("key-%d" % (i % 5), SimpleCase(value=i))
+                self.assertEqual(i, store["key-%d" % (i % 5)].value)
+            store.close()
+            self.assertLess(len(self.segments()), 10)
+        with self.open() as store:
+            self.assertEqual(
+                {"key-%d" % i: 495 + i for i in range(5)},
+                {key: store[key].value for key in store.keys()},
+            )
+
+    def test_interrupted_write(self) -> None:
+        with self.open() as store:
+            store.put("a", SimpleCase(value=1))
+            store.put("b", SimpleCase(value=2))
+        segment = self.segments()[-1]
+        data = segment.read_bytes()
+        segment.write_bytes(data[:-3])
+        with self.open() as store:
+            self.assertEqual(["a"], store.keys())
+            store.put("c", SimpleCase(value=3))
+        with self.open() as store:
+            self.assertEqual(["a", "c"], store.keys())
+
+    def test_corrupted_sealed_segment(self) -> None:
+        with self.open(segment_size=256) as store:
+            store.put_many(("key-%d" % i, SimpleCase(value=i)) for i in range(50))
+        segment = self.segments()[0]
+        data = bytearray(segment.read_bytes())
+        data[20] ^= 0xFF
+        segment.write_bytes(bytes(data))
+        for hint in self.path.glob("*" + HINT_SUFFIX):
+            hint.unlink()
+        with self.assertRaises(InvalidParameter):
+            self.open()
+
+    def test_reload_matches_json(self) -> None:
+        """
+        Reloaded store reads are equal to a parsed JSON file (timings are measured
+        by the ``store.*`` benchmarks).
+        """
+        size = 2000
+        instances = [
+            SimpleCase(value={"index": i, "label": "item-%d" % i, "ratio": i / 7})
+            for i in range(size)
+        ]
+        json_file = self.path / "cases.json"
+        with json_file.open("w") as fh:
+            SimpleCase.dump_json(instances, fh)
+        with Store(self.path / "store", SimpleCase) as store:
+            store.put_many(
+                ("key-%d" % i, instance) for i, instance in enumerate(instances)
+            )
+
+        with json_file.open() as fh:
+            loaded = [SimpleCase(**configuration) for configuration in json.load(fh)]
+        with Store(self.path / "store", SimpleCase) as store:
+            random = [store["key-%d" % i] for i in range(0, size, 100)]
+            scanned = [instance for _, instance in store.scan()]
+
+        self.assertEqual(loaded[100].to_dict(), random[1].to_dict())
+        self.assertEqual(
+            [instance.to_dict() for instance in loaded],
+            [instance.to_dict() for instance in scanned],
+        )
@@ -152,6 +152,27 @@ def tests(session):
     session.run("anybadge", f"--value={count:}/{elapsed:}s", f"--file={badge:}", "--label=tests")
 
 
+@nox.session
+def benchmarks(session):
+    """Package Benchmarks Report (badge), fails on regressions (pass options after --)"""
+    report = reports_path / "benchmarks.log"
+    results = reports_path / "benchmarks.json"
+    with report.open("w") as handler:
+        session.run("python", "-m", "newproject.benchmarks",
+                    "--output", str(results),
+                    "--baseline", str(reports_path / "benchmarks-baseline.json"),
+                    *session.posargs, stdout=handler, success_codes=[0, 1])
+    with results.open() as handler:
+        comparison = json.load(handler)["comparison"]
+    count = sum(row["regression"] for row in comparison)
+    badge = reports_path / 'benchmarks.svg'
+    badge.unlink(missing_ok=True)
+    session.run("anybadge", f"--value={count:}", f"--file={badge:}", "--label=regressions",
+                "1=green", "2=red")
+    if count:
+        session.error(f"{count:} benchmarks regressed, see {report:}")
+
+
 @nox.session
 def coverage(session):
     """Package Test Suite Coverage Report (badge)"""